@@ -0,0 +1,32 @@
+"""
+Alembic migration adding the (database_type, table_name, column_name, categories)
+unique constraint on datatableschema, used as the extraction upsert conflict target.
+Existing duplicates are removed first, keeping the lowest id.
+"""
+from alembic import op
+
+revision = '20251016_datatableschema_unique_column_categories'
+down_revision = '50eec9000b64'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.execute(
+        """
+        DELETE FROM datatableschema d
+        USING datatableschema k
+        WHERE d.database_type = k.database_type
+          AND d.table_name = k.table_name
+          AND d.column_name = k.column_name
+          AND d.categories IS NOT DISTINCT FROM k.categories
+          AND d.id > k.id
+        """
+    )
+    op.create_unique_constraint(
+        'uq_datatableschema_column_categories',
+        'datatableschema',
+        ['database_type', 'table_name', 'column_name', 'categories'],
+    )
+
+def downgrade():
+    op.drop_constraint('uq_datatableschema_column_categories', 'datatableschema', type_='unique')
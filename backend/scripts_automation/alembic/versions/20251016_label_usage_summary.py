@@ -0,0 +1,48 @@
+"""
+Alembic migration adding label_usage_summary, the optional materialized per-label
+usage aggregates of the sensitivity analytics (SENSITIVITY_ANALYTICS_SUMMARY=true),
+populated from the existing proposals and audits.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20251016_label_usage_summary'
+down_revision = '20251016_lineage_edges_traversal_indexes'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'label_usage_summary',
+        sa.Column('label_id', sa.Integer(), primary_key=True),
+        sa.Column('proposal_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('approved_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('pending_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_used', sa.DateTime(), nullable=True),
+        sa.Column('last_audit_at', sa.DateTime(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+    )
+    op.execute(
+        """
+        INSERT INTO label_usage_summary
+            (label_id, proposal_count, approved_count, pending_count, last_used, last_audit_at, refreshed_at)
+        SELECT l.id,
+               COUNT(p.id),
+               COALESCE(SUM(CASE WHEN p.status = 'approved' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN p.status = 'proposed' THEN 1 ELSE 0 END), 0),
+               MAX(p.updated_at),
+               MAX(a.last_audit_at),
+               now()
+        FROM sensitivity_labels l
+        LEFT JOIN label_proposals p ON p.label_id = l.id
+        LEFT JOIN (
+            SELECT pr.label_id, MAX(au.timestamp) AS last_audit_at
+            FROM label_audits au JOIN label_proposals pr ON au.proposal_id = pr.id
+            GROUP BY pr.label_id
+        ) a ON a.label_id = l.id
+        GROUP BY l.id
+        """
+    )
+
+def downgrade():
+    op.drop_table('label_usage_summary')
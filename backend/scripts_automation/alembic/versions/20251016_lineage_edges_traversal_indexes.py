@@ -0,0 +1,18 @@
+"""
+Alembic migration adding (source_type, source_id) and (target_type, target_id) indexes
+on lineage_edges, the join keys of the recursive lineage and impact queries.
+"""
+from alembic import op
+
+revision = '20251016_lineage_edges_traversal_indexes'
+down_revision = '20251016_datatableschema_unique_column_categories'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index('ix_lineage_edges_source', 'lineage_edges', ['source_type', 'source_id'])
+    op.create_index('ix_lineage_edges_target', 'lineage_edges', ['target_type', 'target_id'])
+
+def downgrade():
+    op.drop_index('ix_lineage_edges_target', table_name='lineage_edges')
+    op.drop_index('ix_lineage_edges_source', table_name='lineage_edges')
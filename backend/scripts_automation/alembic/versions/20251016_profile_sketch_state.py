@@ -0,0 +1,32 @@
+"""
+Alembic migration adding profilesketchstate, the persisted streaming-profile sketches
+incremental profiling folds new rows into.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20251016_profile_sketch_state'
+down_revision = '20251016_scan_jobs'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'profilesketchstate',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('data_source_id', sa.Integer(), sa.ForeignKey('datasource.id'), nullable=False),
+        sa.Column('schema_name', sa.String(), nullable=False),
+        sa.Column('table_name', sa.String(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('watermark_column', sa.String(), nullable=True),
+        sa.Column('watermark_value', sa.String(), nullable=True),
+        sa.Column('sketch_state', sa.JSON(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.UniqueConstraint('data_source_id', 'schema_name', 'table_name', name='uq_profile_sketch_table'),
+    )
+    op.create_index('ix_profilesketchstate_data_source_id', 'profilesketchstate', ['data_source_id'])
+
+def downgrade():
+    op.drop_index('ix_profilesketchstate_data_source_id', table_name='profilesketchstate')
+    op.drop_table('profilesketchstate')
@@ -0,0 +1,43 @@
+"""
+Alembic migration adding scan_jobs, the durable queue scan workers claim scans from
+with SELECT ... FOR UPDATE SKIP LOCKED and hold under a renewable lease.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20251016_scan_jobs'
+down_revision = '20251016_scanresult_fingerprint'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        'scan_jobs',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('scan_id', sa.Integer(), sa.ForeignKey('scan.id'), nullable=False),
+        sa.Column('data_source_id', sa.Integer(), sa.ForeignKey('datasource.id'), nullable=False),
+        sa.Column('priority', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('status', sa.Enum('QUEUED', 'RUNNING', 'COMPLETED', 'FAILED', 'CANCELLED', name='scanjobstatus'),
+                  nullable=False, server_default='QUEUED'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('max_attempts', sa.Integer(), nullable=False, server_default='3'),
+        sa.Column('run_after', sa.DateTime(), nullable=False),
+        sa.Column('lease_owner', sa.String(), nullable=True),
+        sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(), nullable=True),
+    )
+    op.create_index('ix_scan_jobs_scan_id', 'scan_jobs', ['scan_id'])
+    op.create_index('ix_scan_jobs_data_source_id', 'scan_jobs', ['data_source_id'])
+    op.create_index('ix_scan_jobs_claim', 'scan_jobs', ['status', 'priority', 'run_after'])
+    op.create_index('ix_scan_jobs_lease', 'scan_jobs', ['status', 'lease_expires_at'])
+
+def downgrade():
+    op.drop_index('ix_scan_jobs_lease', table_name='scan_jobs')
+    op.drop_index('ix_scan_jobs_claim', table_name='scan_jobs')
+    op.drop_index('ix_scan_jobs_data_source_id', table_name='scan_jobs')
+    op.drop_index('ix_scan_jobs_scan_id', table_name='scan_jobs')
+    op.drop_table('scan_jobs')
+    sa.Enum(name='scanjobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,17 @@
+"""
+Alembic migration adding scanresult.fingerprint, the Merkle fingerprint incremental scans
+compare to skip unchanged schemas and tables.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '20251016_scanresult_fingerprint'
+down_revision = '20251016_label_usage_summary'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column('scanresult', sa.Column('fingerprint', sa.JSON(), nullable=True))
+
+def downgrade():
+    op.drop_column('scanresult', 'fingerprint')
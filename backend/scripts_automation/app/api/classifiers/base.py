@@ -3,8 +3,15 @@
 from abc import ABC, abstractmethod
 from typing import List
 
+# Nombre de noms normalisés gardés en cache par classificateur
+CLASSIFICATION_CACHE_SIZE = 100_000
+
 class BaseClassifier(ABC):
     @abstractmethod
     def classify(self, column_name: str) -> List[str]:
         """Retourne une liste de catégories pour un nom de colonne"""
         pass
+
+    def classify_batch(self, column_names: List[str]) -> List[List[str]]:
+        """Retourne les catégories de chaque nom de colonne, dans l'ordre du lot"""
+        return [self.classify(column_name) for column_name in column_names]
@@ -2,14 +2,25 @@
 
 import os
 import json
-from typing import List
-from app.api.classifiers.base import BaseClassifier
+from functools import lru_cache
+from typing import List, Tuple
+from app.api.classifiers.base import BaseClassifier, CLASSIFICATION_CACHE_SIZE
+from app.api.classifiers.dictionary_index import DictionaryMatchIndex
 from difflib import SequenceMatcher
 
 class DictionaryClassifier(BaseClassifier):
-    def __init__(self):
+    def __init__(self, cache_size: int = CLASSIFICATION_CACHE_SIZE):
         self.dictionary = self.load_dictionaries()
         self.similarity_threshold = 0.8
+        # Mots-clés normalisés une seule fois
+        self.normalized_dictionary = {
+            category: [self.normalize(keyword) for keyword in keywords]
+            for category, keywords in self.dictionary.items()
+        }
+        # Index de correspondance (sous-chaînes + candidats de similarité)
+        self.index = DictionaryMatchIndex(self.normalized_dictionary)
+        # Mémoïsation par nom normalisé
+        self._match = lru_cache(maxsize=cache_size)(self._match_normalized)
 
     def load_dictionaries(self) -> dict:
         """
@@ -32,18 +43,20 @@ class DictionaryClassifier(BaseClassifier):
         """
         return SequenceMatcher(None, a, b).ratio()
 
+    def _match_normalized(self, name: str) -> Tuple[str, ...]:
+        return self.index.match(name, self.similarity_threshold)
+
     def classify(self, column_name: str) -> List[str]:
         """
         Classe une colonne par similarité et dictionnaire multilingue
         """
-        name = self.normalize(column_name)
-        categories = []
+        return list(self._match(self.normalize(column_name)))
 
-        for category, keywords in self.dictionary.items():
-            for keyword in keywords:
-                norm_keyword = self.normalize(keyword)
-                if norm_keyword in name or self.similar(norm_keyword, name) > self.similarity_threshold:
-                    categories.append(category)
-                    break
+    def classify_batch(self, column_names: List[str]) -> List[List[str]]:
+        """
+        Classe un lot de colonnes (les noms normalisés identiques ne sont calculés qu'une fois)
+        """
+        return [list(self._match(self.normalize(column_name))) for column_name in column_names]
 
-        return categories
+    def clear_cache(self) -> None:
+        self._match.cache_clear()
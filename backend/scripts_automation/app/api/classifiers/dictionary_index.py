@@ -0,0 +1,68 @@
+# classifiers/dictionary_index.py
+
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+
+
+class DictionaryMatchIndex:
+    """
+    Index précalculé des mots-clés métier.
+
+    Donne exactement le même résultat que « mot-clé contenu dans le nom OU
+    SequenceMatcher(mot-clé, nom).ratio() > seuil » :
+    - sous-chaînes : une expression compilée (alternance) par catégorie ;
+    - similarité : seuls les mots-clés dont la longueur permet d'atteindre le seuil
+      sont examinés, puis filtrés par les bornes supérieures exactes de ratio()
+      (longueurs, puis multiensemble de caractères) avant l'alignement complet.
+    """
+
+    def __init__(self, normalized_dictionary: Dict[str, List[str]]):
+        self.categories = list(normalized_dictionary)
+        self.substring_patterns = {
+            category: re.compile("|".join(re.escape(keyword) for keyword in keywords))
+            for category, keywords in normalized_dictionary.items() if keywords
+        }
+        # (longueur, ordre de catégorie, ordre du mot-clé, mot-clé, catégorie, histogramme)
+        entries = []
+        for category_index, (category, keywords) in enumerate(normalized_dictionary.items()):
+            for keyword_index, keyword in enumerate(keywords):
+                entries.append((len(keyword), category_index, keyword_index, keyword, category, Counter(keyword)))
+        entries.sort(key=lambda entry: entry[:3])
+        self.entries = entries
+        self.lengths = [entry[0] for entry in entries]
+
+    def _length_candidates(self, length: int, threshold: float) -> List[Tuple]:
+        # ratio = 2M / (la + lb) <= 2 min(la, lb) / (la + lb) : borne la autour de lb
+        if threshold <= 0:
+            return self.entries
+        low = int(threshold * length / (2 - threshold))
+        high = int(length * (2 - threshold) / threshold) + 1
+        return self.entries[bisect_left(self.lengths, low):bisect_right(self.lengths, high)]
+
+    def match(self, name: str, threshold: float) -> Tuple[str, ...]:
+        matched = {
+            category for category, pattern in self.substring_patterns.items()
+            if pattern.search(name)
+        }
+        if len(matched) < len(self.categories):
+            matcher = None
+            name_counts = None
+            for _, _, _, keyword, category, keyword_counts in self._length_candidates(len(name), threshold):
+                if category in matched:
+                    continue
+                if matcher is None:
+                    # seq2 (le nom) est fixe : SequenceMatcher ne l'indexe qu'une fois
+                    matcher = SequenceMatcher(None, "", name)
+                    name_counts = Counter(name)
+                if 2.0 * min(len(keyword), len(name)) / (len(keyword) + len(name)) <= threshold:
+                    continue
+                shared = sum((keyword_counts & name_counts).values())
+                if 2.0 * shared / (len(keyword) + len(name)) <= threshold:
+                    continue
+                matcher.set_seq1(keyword)
+                if matcher.ratio() > threshold:
+                    matched.add(category)
+        return tuple(category for category in self.categories if category in matched)
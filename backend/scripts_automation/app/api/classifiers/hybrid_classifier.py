@@ -74,17 +74,18 @@
 
 #         return final_categories if final_categories else ["Unclassified"]
 import os
-from typing import List, Dict
+from collections import OrderedDict
+from typing import List, Dict, Optional
 
 import joblib
-from app.api.classifiers.base import BaseClassifier
+from app.api.classifiers.base import BaseClassifier, CLASSIFICATION_CACHE_SIZE
 from app.api.classifiers.regex_classifier import RegexClassifier
 from app.api.classifiers.dictionary_classifier import DictionaryClassifier
 
 class HybridClassifier(BaseClassifier):
-    def __init__(self, use_ml: bool = True, verbose: bool = False):
-        self.regex = RegexClassifier()
-        self.dictionary = DictionaryClassifier()
+    def __init__(self, use_ml: bool = True, verbose: bool = False, cache_size: int = CLASSIFICATION_CACHE_SIZE):
+        self.regex = RegexClassifier(cache_size=cache_size)
+        self.dictionary = DictionaryClassifier(cache_size=cache_size)
         self.verbose = verbose
 
         # Pondération manuelle
@@ -95,6 +96,10 @@ class HybridClassifier(BaseClassifier):
         self.use_ml = use_ml
         self.ml_model = self.load_ml_model() if use_ml else None
 
+        # Prédictions ML mémoïsées par nom brut (le vectoriseur est sensible à la casse et aux espaces)
+        self.cache_size = cache_size
+        self._predictions: "OrderedDict[str, Optional[str]]" = OrderedDict()
+
     def load_ml_model(self):
         """
         Charge le modèle ML entraîné (Sklearn) depuis disk.
@@ -106,34 +111,75 @@ class HybridClassifier(BaseClassifier):
             print(f"⚠️  Modèle ML introuvable à {path}")
             return None
 
-    def classify(self, column_name: str) -> List[str]:
+    def clear_cache(self) -> None:
         """
-        Combine les résultats des classificateurs avec pondération et modèle ML optionnel.
+        Vide les caches (à appeler après un rechargement du modèle).
         """
-        scores: Dict[str, float] = {}
-
-        # Regex
-        regex_cats = self.regex.classify(column_name)
-        for cat in regex_cats:
-            scores[cat] = scores.get(cat, 0) + self.regex_weight
+        self.regex.clear_cache()
+        self.dictionary.clear_cache()
+        self._predictions.clear()
 
-        # Dictionary
-        dict_cats = self.dictionary.classify(column_name)
-        for cat in dict_cats:
-            scores[cat] = scores.get(cat, 0) + self.dict_weight
+    def predict_batch(self, column_names: List[str]) -> List[Optional[str]]:
+        """
+        Un seul appel predict() pour tous les noms absents du cache.
+        """
+        if not (self.use_ml and self.ml_model):
+            return [None] * len(column_names)
 
-        # Machine Learning (si activé)
-        if self.use_ml and self.ml_model:
+        missing = list(dict.fromkeys(name for name in column_names if name not in self._predictions))
+        if missing:
             try:
-                prediction = self.ml_model.predict([column_name])[0]
-                scores[prediction] = scores.get(prediction, 0) + self.ml_weight
+                predictions = list(self.ml_model.predict(missing))
             except Exception as e:
+                # Échec non mis en cache : l'appel suivant retente la prédiction
                 print(f"⚠️  Erreur prédiction ML : {e}")
+                return [self._predictions.get(name) for name in column_names]
+            for name, prediction in zip(missing, predictions):
+                self._predictions[name] = prediction
+            while len(self._predictions) > self.cache_size:
+                self._predictions.popitem(last=False)
+
+        results = []
+        for name in column_names:
+            prediction = self._predictions.get(name)
+            if name in self._predictions:
+                self._predictions.move_to_end(name)
+            results.append(prediction)
+        return results
+
+    def classify_batch_all(self, column_names: List[str]) -> List[Dict[str, List[str]]]:
+        """
+        Classe un lot de colonnes et retourne, pour chacune, les résultats regex,
+        dictionnaire et hybride (les résultats regex/dictionnaire sont partagés).
+        """
+        regex_results = self.regex.classify_batch(column_names)
+        dict_results = self.dictionary.classify_batch(column_names)
+        predictions = self.predict_batch(column_names)
+
+        results = []
+        for column_name, regex_cats, dict_cats, prediction in zip(column_names, regex_results, dict_results, predictions):
+            scores: Dict[str, float] = {}
+            for cat in regex_cats:
+                scores[cat] = scores.get(cat, 0) + self.regex_weight
+            for cat in dict_cats:
+                scores[cat] = scores.get(cat, 0) + self.dict_weight
+            if prediction is not None:
+                scores[prediction] = scores.get(prediction, 0) + self.ml_weight
+
+            # Retourner les catégories avec un score > 0.5
+            final_cats = [cat for cat, score in scores.items() if score >= 0.5]
+
+            if self.verbose:
+                print(f"[Hybrid] {column_name} → RegEx: {regex_cats}, Dict: {dict_cats}, Final: {final_cats}")
 
-        # Retourner les catégories avec un score > 0.5
-        final_cats = [cat for cat, score in scores.items() if score >= 0.5]
+            results.append({"regex": regex_cats, "dictionary": dict_cats, "hybrid": final_cats})
+        return results
 
-        if self.verbose:
-            print(f"[Hybrid] {column_name} → RegEx: {regex_cats}, Dict: {dict_cats}, Final: {final_cats}")
+    def classify_batch(self, column_names: List[str]) -> List[List[str]]:
+        return [result["hybrid"] for result in self.classify_batch_all(column_names)]
 
-        return final_cats
+    def classify(self, column_name: str) -> List[str]:
+        """
+        Combine les résultats des classificateurs avec pondération et modèle ML optionnel.
+        """
+        return self.classify_batch([column_name])[0]
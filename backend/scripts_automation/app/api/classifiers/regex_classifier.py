@@ -1,8 +1,9 @@
 # classifiers/regex_classifier.py
 
 import re
-from typing import List
-from app.api.classifiers.base import BaseClassifier
+from functools import lru_cache
+from typing import List, Tuple
+from app.api.classifiers.base import BaseClassifier, CLASSIFICATION_CACHE_SIZE
 
 PATTERNS = {
     "PII": [
@@ -29,18 +30,31 @@ PATTERNS = {
     ]
 }
 
+# Une seule expression compilée par catégorie (alternance des motifs)
+COMPILED_PATTERNS = {
+    category: re.compile("|".join(f"(?:{pattern})" for pattern in regex_list), re.IGNORECASE)
+    for category, regex_list in PATTERNS.items()
+}
+
 class RegexClassifier(BaseClassifier):
+    def __init__(self, cache_size: int = CLASSIFICATION_CACHE_SIZE):
+        # Mémoïsation par nom normalisé
+        self._match = lru_cache(maxsize=cache_size)(self._match_normalized)
+
     def normalize(self, name: str) -> str:
         return name.lower().replace(" ", "_")
 
+    def _match_normalized(self, normalized: str) -> Tuple[str, ...]:
+        return tuple(
+            category for category, pattern in COMPILED_PATTERNS.items()
+            if pattern.search(normalized)
+        )
+
     def classify(self, column_name: str) -> List[str]:
-        normalized = self.normalize(column_name)
-        categories = []
+        return list(self._match(self.normalize(column_name)))
 
-        for category, regex_list in PATTERNS.items():
-            for pattern in regex_list:
-                if re.search(pattern, normalized, re.IGNORECASE):
-                    categories.append(category)
-                    break
+    def classify_batch(self, column_names: List[str]) -> List[List[str]]:
+        return [list(self._match(self.normalize(column_name))) for column_name in column_names]
 
-        return categories
+    def clear_cache(self) -> None:
+        self._match.cache_clear()
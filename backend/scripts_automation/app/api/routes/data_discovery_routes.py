@@ -55,6 +55,18 @@ class ColumnProfileRequest(BaseModel):
     table_name: str = Field(..., description="Table name")
     column_name: str = Field(..., description="Column name")
 
+class TableProfileRequest(BaseModel):
+    data_source_id: int = Field(..., description="ID of the data source")
+    schema_name: str = Field(..., description="Schema name")
+    table_name: str = Field(..., description="Table name")
+    columns: Optional[List[str]] = Field(default=None, description="Columns to profile (all when omitted)")
+    sample_percent: Optional[float] = Field(
+        default=None, gt=0, le=100,
+        description="Profile a TABLESAMPLE of this percentage of the table"
+    )
+    approximate: bool = Field(default=False, description="Use approximate distinct counts")
+    top_n: int = Field(default=10, ge=1, le=100, description="Most common values returned per column")
+
 class TableSelectionRequest(BaseModel):
     data_source_id: int = Field(..., description="ID of the data source")
     selected_items: List[Dict[str, Any]] = Field(
@@ -406,7 +418,7 @@ async def profile_column_data(
             "schema_name": request.schema_name,
             "table_name": request.table_name,
             "column_name": request.column_name,
-            "profile": profile_result["profile"]
+            "profile": profile_result["column_profile"]
         }
         
     except HTTPException:
@@ -419,6 +431,55 @@ async def profile_column_data(
         )
 
 
+@router.post("/data-sources/profile-table")
+async def profile_table_data(
+    request: TableProfileRequest,
+    session: Session = Depends(get_session),
+    current_user: Dict[str, Any] = Depends(require_permission(PERMISSION_SCAN_VIEW))
+):
+    """
+    Profile all (or the selected) columns of a table in a single pass
+    """
+    try:
+        # Get data source
+        data_source = DataSourceService.get_data_source(session, request.data_source_id)
+        if not data_source:
+            raise HTTPException(status_code=404, detail="Data source not found")
+        
+        # Get table profile
+        profile_result = await connection_service.get_table_profile(
+            data_source,
+            request.schema_name,
+            request.table_name,
+            columns=request.columns,
+            sample_percent=request.sample_percent,
+            approximate=request.approximate,
+            top_n=request.top_n
+        )
+        
+        if not profile_result["success"]:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Table profiling failed: {profile_result.get('error', 'Unknown error')}"
+            )
+        
+        return {
+            "data_source_id": request.data_source_id,
+            "schema_name": request.schema_name,
+            "table_name": request.table_name,
+            "profile": profile_result["table_profile"]
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error in table profiling: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Table profiling failed: {str(e)}"
+        )
+
+
 @router.get("/data-sources/{data_source_id}/connection-status")
 async def get_connection_status(
     data_source_id: int,
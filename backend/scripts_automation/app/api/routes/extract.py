@@ -49,11 +49,8 @@ def extract_mysql_schema(request: ExtractionRequest, role: str = Depends(get_cur
         raise HTTPException(status_code=403, detail="Only admins can extract schemas.")
     if request.database_type.lower() != "mysql":
         raise HTTPException(status_code=400, detail="Invalid database type for this route")
+    # Extraction assigns data sensitivity labels to the rows it writes
     message = extract_sql_schema(request.connection_uri, "mysql")
-    # After extraction, assign data sensitivity labels
-    with get_session() as session:
-        from app.services.data_sensitivity_service import update_all_columns_data_sensitivity
-        update_all_columns_data_sensitivity(session)
     return message
 
 @router.post("/extract/postgresql", response_model=str)
@@ -63,9 +60,6 @@ def extract_postgresql_schema(request: ExtractionRequest, role: str = Depends(ge
     if request.database_type.lower() != "postgresql":
         raise HTTPException(status_code=400, detail="Invalid database type for this route")
     message = extract_sql_schema(request.connection_uri, "postgresql")
-    with get_session() as session:
-        from app.services.data_sensitivity_service import update_all_columns_data_sensitivity
-        update_all_columns_data_sensitivity(session)
     return message
 
 # === Extraction MongoDB ===
@@ -78,9 +72,6 @@ def extract_mongodb_schema(request: ExtractionRequest, role: str = Depends(get_c
     if not request.database_name:
         raise HTTPException(status_code=400, detail="Database name is required for MongoDB")
     message = extract_mongo_schema(request.connection_uri, request.database_name)
-    with get_session() as session:
-        from app.services.data_sensitivity_service import update_all_columns_data_sensitivity
-        update_all_columns_data_sensitivity(session)
     return message
 
 # === Search schemas (fuzzy + normal) ===
@@ -225,15 +225,15 @@ def delete_condition_template(template_id: int, db: Session = Depends(get_db), c
 from fastapi import HTTPException
 @router.post("/validate-condition")
 def validate_condition(condition: dict = Body(...)):
-    import json
+    from app.services.condition_compiler import validate_condition as compile_and_validate
     try:
-        # Dummy user/context for validation
-        dummy_user = type("User", (), {"id": 1, "department": "IT", "region": "EU"})()
-        _ = json.dumps(condition)  # Check serializable
-        # Optionally, run through ABAC logic with dummy values (future)
-        return {"valid": True}
+        # Compile the condition: checks JSON, operators and regexes
+        error = compile_and_validate(condition)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Invalid condition: {str(e)}")
+        error = str(e)
+    if error:
+        raise HTTPException(status_code=400, detail=f"Invalid condition: {error}")
+    return {"valid": True}
 @router.get("/role-assignments")
 def list_role_assignments(
     user_id: Optional[int] = None,
@@ -597,7 +597,10 @@ def list_permissions_api(db: Session = Depends(get_db), current_user: User = Dep
 async def create_permission_api(action: str = Body(...), resource: str = Body(...), conditions: Optional[str] = Body(None), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if not user_has_permission(db, current_user, "manage", "rbac") and getattr(current_user, "role", None) != "admin":
         raise HTTPException(status_code=403, detail="Admin or RBAC manager only")
-    perm = create_permission(db, action, resource, conditions)
+    try:
+        perm = create_permission(db, action, resource, conditions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     await broadcast_rbac_event("permission_created", {"permission_id": perm.id, "action": perm.action, "resource": perm.resource, "conditions": perm.conditions})
     return {"id": perm.id, "action": perm.action, "resource": perm.resource, "conditions": perm.conditions}
 
@@ -625,7 +628,10 @@ def delete_permission_api(permission_id: int, db: Session = Depends(get_db), cur
 def update_permission_api(permission_id: int, action: Optional[str] = Body(None), resource: Optional[str] = Body(None), conditions: Optional[str] = Body(None), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
     if not user_has_permission(db, current_user, "manage", "rbac") and getattr(current_user, "role", None) != "admin":
         raise HTTPException(status_code=403, detail="Admin or RBAC manager only")
-    perm = update_permission(db, permission_id, action, resource, conditions)
+    try:
+        perm = update_permission(db, permission_id, action, resource, conditions)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     if not perm:
         raise HTTPException(status_code=404, detail="Permission not found")
     return {"id": perm.id, "action": perm.action, "resource": perm.resource, "conditions": perm.conditions}
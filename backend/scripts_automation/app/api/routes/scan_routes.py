@@ -17,7 +17,7 @@ from app.services.data_source_connection_service import DataSourceConnectionServ
 from app.api.security import get_current_user, require_permission
 from app.api.security.rbac import (
     PERMISSION_SCAN_VIEW, PERMISSION_SCAN_CREATE, 
-    PERMISSION_SCAN_EDIT, PERMISSION_SCAN_DELETE
+    PERMISSION_SCAN_EDIT, PERMISSION_SCAN_DELETE, filter_permitted
 )
 from pydantic import BaseModel, Field
 from datetime import datetime, timedelta
@@ -1697,8 +1697,9 @@ async def get_data_source_catalog(
     try:
         from app.services.catalog_service import EnhancedCatalogService
         
-        # Get catalog items from database using enhanced service
+        # Get catalog items from database using enhanced service, then apply ABAC rules and denies
         catalog_items = EnhancedCatalogService.get_catalog_items_by_data_source(session, data_source_id)
+        catalog_items = filter_permitted(PERMISSION_SCAN_VIEW, "catalog", catalog_items, current_user, session)
         
         catalog_data = {
             "catalog": [
@@ -4,7 +4,10 @@ from typing import Dict, Any, List, Optional
 
 from app.db_session import get_session, get_db
 from app.services.auth_service import get_user_by_email, get_session_by_token
-from app.services.rbac_service import get_user_effective_permissions_rbac
+from app.services.rbac_service import (
+    get_user_effective_permission_set, get_user_effective_permissions_rbac, filter_resources_by_permission
+)
+from app.services.permission_cache import permission_cache
 
 
 # Define permission constants for the new features (dot notation)
@@ -133,17 +136,25 @@ ROLE_PERMISSIONS = {
     ]
 }
 
+# Set view of ROLE_PERMISSIONS for O(1) lookups
+ROLE_PERMISSION_SETS = {role: frozenset(permissions) for role, permissions in ROLE_PERMISSIONS.items()}
+
 def get_current_user(session_token: str = Cookie(None), db: Session = Depends(get_db)) -> Dict[str, Any]:
-    """Get the current user from the session token."""
+    """Get the current user from the session token (cached per token)."""
     if not session_token:
         raise HTTPException(status_code=401, detail="Not authenticated")
-    
+
+    cached_user = permission_cache.get_token(session_token)
+    if cached_user is not None:
+        return dict(cached_user)
+
+    version = permission_cache.version
     user_session = get_session_by_token(db, session_token)
     if not user_session or not user_session.user:
         raise HTTPException(status_code=401, detail="Invalid session")
     
     user = user_session.user
-    return {
+    current_user = {
         "id": user.id,
         "email": user.email,
         "username": user.username,
@@ -151,21 +162,19 @@ def get_current_user(session_token: str = Cookie(None), db: Session = Depends(ge
         "department": getattr(user, "department", None),
         "region": getattr(user, "region", None)
     }
+    permission_cache.set_token(session_token, current_user, version)
+    return dict(current_user)
 
 def check_permission(permission: str, current_user: Dict[str, Any] = Depends(get_current_user), db: Session = Depends(get_db)) -> bool:
     """Check if the current user has the specified permission."""
     # For simple role-based permissions
-    if current_user.get("role") in ROLE_PERMISSIONS:
-        if permission in ROLE_PERMISSIONS[current_user["role"]]:
-            return True
+    if permission in ROLE_PERMISSION_SETS.get(current_user.get("role"), ()):
+        return True
     
-    # For more complex RBAC with conditions
+    # For more complex RBAC with conditions (effective set cached per user)
     user_id = current_user.get("id")
     if user_id:
-        effective_permissions = get_user_effective_permissions_rbac(db, user_id)
-        for perm in effective_permissions:
-            if perm["action"] == permission and perm["is_effective"]:
-                return True
+        return permission in get_user_effective_permission_set(db, user_id)
     
     return False
 
@@ -179,4 +188,18 @@ def require_permission(permission: str):
                 detail=f"Not authorized to perform this action. Required permission: {permission}"
             )
         return current_user
-    return dependency
\ No newline at end of file
+    return dependency
+
+def filter_permitted(permission: str, resource: str, items: List[Any], current_user: Dict[str, Any], db: Session) -> List[Any]:
+    """
+    Filter list results by ABAC permissions and deny assignments for `resource`.
+    Permissions scoped to the resource narrow access to the items their conditions match;
+    without any, the role or action-level grant the route already required applies.
+    """
+    granted = permission in ROLE_PERMISSION_SETS.get(current_user.get("role"), ())
+    if not granted and current_user.get("id"):
+        granted = not any(
+            perm["action"] == permission and perm["resource"] == resource
+            for perm in get_user_effective_permissions_rbac(db, current_user["id"])
+        )
+    return filter_resources_by_permission(db, current_user, permission, resource, items, granted=granted)
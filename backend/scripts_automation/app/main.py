@@ -93,9 +93,16 @@ from app.api.routes.advanced_pattern_matching_routes import router as advanced_p
 from app.api.routes.rule_marketplace_routes import router as rule_marketplace_router
 
 from app.services.scan_scheduler_service import ScanSchedulerService
+from app.services.extraction_client import extraction_client
+from app.services.scan_worker import ScanWorkerPool
 from fastapi import Request
 import logging
 import asyncio
+import os
+
+# Run a scan worker pool inside the API process too (single-node setups without a scan_worker process)
+SCAN_WORKER_EMBEDDED = os.getenv("SCAN_WORKER_EMBEDDED", "false").lower() == "true"
+embedded_scan_workers = ScanWorkerPool() if SCAN_WORKER_EMBEDDED else None
 
 # Configure logging
 logging.basicConfig(
@@ -281,6 +288,9 @@ async def startup_event():
     # Start scan scheduler
     asyncio.create_task(ScanSchedulerService.start_scheduler())
     logger.info("Enterprise scan scheduler started")
+    if embedded_scan_workers:
+        asyncio.create_task(embedded_scan_workers.run())
+        logger.info("Embedded scan worker pool started")
     logger.info("🚀 Enterprise Data Governance Platform with Racine Main Manager started successfully!")
     logger.info("📊 All 7 core groups integrated: Data Sources, Compliance Rules, Classifications, Scan-Rule-Sets, Data Catalog, Scan Logic")
     logger.info("🏛️ Racine Main Manager: Ultimate orchestrator SPA system providing unified workspace management, AI assistance, and cross-group integration")
@@ -299,6 +309,13 @@ def shutdown_event():
     # Stop scan scheduler
     ScanSchedulerService.stop_scheduler()
     logger.info("Enterprise scan scheduler stopped")
+    if embedded_scan_workers:
+        embedded_scan_workers.stop()
+
+@app.on_event("shutdown")
+async def close_extraction_client():
+    """Close the pooled extraction service connections."""
+    await extraction_client.aclose()
 
 @app.get("/health")
 async def health_check():
@@ -127,7 +127,7 @@ class DataLineageNode(SQLModel, table=True):
     
     # Audit fields
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
     created_by: str = Field(default="system")
     
     # Additional metadata
@@ -212,7 +212,7 @@ class DataLineageEdge(SQLModel, table=True):
     
     # Audit fields
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow, sa_column_kwargs={"onupdate": datetime.utcnow})
     created_by: str = Field(default="system")
     discovery_method: Optional[str] = Field(default=None)  # scan, manual, import
     
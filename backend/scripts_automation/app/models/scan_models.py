@@ -341,6 +341,8 @@ class ScanResult(SQLModel, table=True):
     data_type: Optional[str] = None
     nullable: Optional[bool] = None
     scan_metadata: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    # Merkle fingerprint of this result's subtree (table: column hashes; incremental result: whole source)
+    fingerprint: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
 
     # Relationships
     scan: Scan = Relationship(back_populates="results")
@@ -387,6 +389,38 @@ class ScanSchedule(SQLModel, table=True):
     last_run: Optional[datetime] = None
     next_run: Optional[datetime] = None
 
+
+class ScanJobStatus(str, Enum):
+    """Status of a queued scan job."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class ScanJob(SQLModel, table=True):
+    """Durable queue entry for a scan, claimed and leased by scan workers."""
+    __tablename__ = "scan_jobs"
+    __table_args__ = (
+        Index('ix_scan_jobs_claim', 'status', 'priority', 'run_after'),
+        Index('ix_scan_jobs_lease', 'status', 'lease_expires_at'),
+    )
+    id: Optional[int] = Field(default=None, primary_key=True)
+    scan_id: int = Field(foreign_key="scan.id", index=True)
+    data_source_id: int = Field(foreign_key="datasource.id", index=True)
+    priority: int = Field(default=0)  # Higher runs first
+    status: ScanJobStatus = Field(default=ScanJobStatus.QUEUED)
+    attempts: int = Field(default=0)
+    max_attempts: int = Field(default=3)
+    run_after: datetime = Field(default_factory=datetime.utcnow)
+    lease_owner: Optional[str] = None
+    lease_expires_at: Optional[datetime] = None
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    completed_at: Optional[datetime] = None
+
     # Enhanced response models
 class DataSourceHealthResponse(SQLModel, table=True):
     status: str  # healthy, warning, critical
@@ -462,6 +496,20 @@ class GrowthMetric(SQLModel, table=True):
     growth_rate_bytes: Optional[float] = None  # bytes per day
     growth_rate_records: Optional[float] = None  # records per day
 
+class ProfileSketchState(SQLModel, table=True):
+    """Model for persisted streaming-profile sketch state of a table."""
+    __table_args__ = (UniqueConstraint("data_source_id", "schema_name", "table_name", name="uq_profile_sketch_table"),)
+    id: Optional[int] = Field(default=None, primary_key=True)
+    data_source_id: int = Field(foreign_key="datasource.id", index=True)
+    schema_name: str = Field(default="")
+    table_name: str
+    row_count: int = Field(default=0)
+    watermark_column: Optional[str] = None
+    watermark_value: Optional[str] = None  # highest watermark already folded into the sketches
+    sketch_state: Dict[str, Any] = Field(default_factory=dict, sa_column=Column(JSON))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
 
 # ===================== ENTERPRISE SCAN ORCHESTRATION MODELS =====================
 
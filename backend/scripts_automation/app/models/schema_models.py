@@ -2,6 +2,7 @@
 from unittest.mock import Base
 import uuid
 from sqlmodel import Boolean, Column, Integer, SQLModel, Field, String
+from sqlalchemy import UniqueConstraint
 from typing import List, Optional
 from datetime import datetime
 
@@ -55,6 +56,11 @@ class SchemaVersion(SQLModel, table=True):
 
 # ✅ Table principale stockant les métadonnées
 class DataTableSchema(SQLModel, table=True):
+    # One row per (column, classifier result): conflict target of the extraction upsert
+    __table_args__ = (
+        UniqueConstraint('database_type', 'table_name', 'column_name', 'categories', name='uq_datatableschema_column_categories'),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     database_type: str
     table_name: str
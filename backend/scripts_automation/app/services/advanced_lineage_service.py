@@ -65,6 +65,12 @@ from ..db_session import get_session
 from ..core.config import settings
 from ..services.ai_service import AIService
 from ..services.data_source_connection_service import DataSourceConnectionService
+from ..services.lineage_graph_delta import (
+    LINEAGE_GRAPH_REBUILD_RATIO, LINEAGE_GRAPH_FULL_RELOAD_SECONDS, LineageGraphDelta, node_attributes, edge_attributes, latest_change,
+    add_lineage_edge, remove_lineage_edge, apply_lineage_delta, build_lineage_graph,
+    needs_deletion_scan, removed_ids
+)
+from ..services.lineage_csr_graph import LINEAGE_CSR_BATCH_SECONDS, LINEAGE_GRAPH_BACKEND, CSRLineageGraph, Traversal
 from ..utils.performance_monitor import performance_monitor
 from ..utils.cache_manager import CacheManager
 from ..utils.error_handler import handle_service_error
@@ -169,6 +175,7 @@ class AdvancedLineageService:
         # Configuration
         self.max_graph_size = 100000  # Maximum nodes in memory graph
         self.cache_ttl = 3600  # 1 hour cache TTL
+        self.graph_refresh_interval = 60  # Delta refresh of the in-memory graph (seconds)
         self.real_time_updates = True
         self.enable_ai_discovery = True
         
@@ -179,7 +186,14 @@ class AdvancedLineageService:
             'real_time_updates': 0,
             'average_query_time': 0,
             'cache_hit_rate': 0,
-            'graph_size': 0
+            'graph_size': 0,
+            'graph_refreshes': 0,
+            'graph_full_reloads': 0,
+            'last_refresh_time': 0,
+            'average_refresh_time': 0,
+            'last_delta_nodes': 0,
+            'last_delta_edges': 0,
+            'last_delta_removed': 0
         }
         
         # Thread pool for concurrent operations
@@ -189,6 +203,17 @@ class AdvancedLineageService:
         self.lineage_graph = nx.MultiDiGraph()
         self.graph_last_updated = datetime.utcnow()
         self.graph_lock = threading.RLock()
+        # Only one refresh at a time; queries keep reading the current graph meanwhile
+        self.graph_refresh_lock = asyncio.Lock()
+        self.graph_loaded = False
+        self.graph_watermark: Optional[datetime] = None
+        self.graph_last_full_reload: Optional[datetime] = None
+        # "csr" keeps the graph in CSRLineageGraph (integer ids, NumPy adjacency) instead
+        self.graph_backend = LINEAGE_GRAPH_BACKEND
+        self.csr_graph: Optional[CSRLineageGraph] = None
+        # Real-time updates waiting for the next CSR rebuild (a flush or a refresh, whichever runs first)
+        self.csr_pending = LineageGraphDelta()
+        self.csr_flush_task: Optional[asyncio.Task] = None
     
     def _init_graph_components(self):
         """Initialize graph processing components"""
@@ -206,6 +231,13 @@ class AdvancedLineageService:
                 GraphAlgorithm.CENTRALITY_BASED: self._centrality_based_search
             }
             
+            # Algorithms served by the CSR backend; others fall back to breadth-first
+            self.csr_graph_algorithms = {
+                GraphAlgorithm.BREADTH_FIRST: self._csr_breadth_first_search,
+                GraphAlgorithm.DEPTH_FIRST: self._csr_breadth_first_search,
+                GraphAlgorithm.SHORTEST_PATH: self._csr_shortest_path_search
+            }
+            
             logger.info("Graph components initialized successfully")
             
         except Exception as e:
@@ -246,10 +278,16 @@ class AdvancedLineageService:
             await self._ensure_graph_loaded()
             
             # Execute lineage query using specified algorithm
-            algorithm_func = self.graph_algorithms.get(
-                algorithm, 
-                self._breadth_first_search
-            )
+            if self.csr_graph is not None:
+                algorithm_func = self.csr_graph_algorithms.get(
+                    algorithm,
+                    self._csr_breadth_first_search
+                )
+            else:
+                algorithm_func = self.graph_algorithms.get(
+                    algorithm, 
+                    self._breadth_first_search
+                )
             
             lineage_graph = await algorithm_func(query)
             
@@ -601,6 +639,72 @@ class AdvancedLineageService:
             }
         )
     
+    async def _csr_breadth_first_search(self, query: LineageQuery) -> LineageGraph:
+        """Breadth-first search on the CSR backend (vectorized, one frontier per level)"""
+        traversal = self.csr_graph.traverse(
+            query.asset_id,
+            query.direction.value,
+            query.max_depth,
+            min_confidence=query.filter_confidence,
+            max_nodes=self.max_graph_size
+        )
+        if traversal is None:
+            return self._empty_lineage_graph(query)
+        return self._lineage_graph_from_traversal(traversal, traversal.edges, query, 'breadth_first')
+    
+    async def _csr_shortest_path_search(self, query: LineageQuery) -> LineageGraph:
+        """Shortest paths on the CSR backend: the BFS tree of every node within max_depth"""
+        traversal = self.csr_graph.traverse(
+            query.asset_id,
+            query.direction.value,
+            query.max_depth,
+            max_nodes=self.max_graph_size
+        )
+        if traversal is None:
+            return self._empty_lineage_graph(query)
+        return self._lineage_graph_from_traversal(traversal, traversal.tree_edges, query, 'shortest_path')
+    
+    def _lineage_graph_from_traversal(
+        self,
+        traversal: Traversal,
+        edge_positions: np.ndarray,
+        query: LineageQuery,
+        algorithm: str
+    ) -> LineageGraph:
+        """Build LineageGraph object from a CSR traversal"""
+        graph = self.csr_graph
+        nodes = [LineageNode(**row) for row in graph.node_rows(traversal.nodes, traversal.distance)]
+        edges = [
+            LineageEdge(
+                source_id=row['source_id'],
+                target_id=row['target_id'],
+                lineage_type=LineageType(row['lineage_type'] or LineageType.TABLE_TO_TABLE.value),
+                transformation_type=row['transformation_type'],
+                confidence=row['confidence'],
+                metadata=row['metadata']
+            )
+            for row in graph.edge_rows(edge_positions)
+        ]
+        
+        return LineageGraph(
+            nodes=nodes,
+            edges=edges,
+            root_node=query.asset_id,
+            direction=query.direction,
+            max_depth=query.max_depth,
+            total_nodes=len(nodes),
+            total_edges=len(edges),
+            query_metadata={
+                'query_time': datetime.utcnow(),
+                'algorithm': algorithm,
+                'graph_backend': 'csr',
+                'filters_applied': {
+                    'confidence_threshold': query.filter_confidence,
+                    'asset_types': query.filter_asset_types
+                }
+            }
+        )
+    
     def _empty_lineage_graph(self, query: LineageQuery) -> LineageGraph:
         """Return empty lineage graph when asset not found"""
         return LineageGraph(
@@ -663,9 +767,15 @@ class AdvancedLineageService:
             overall_impact = np.mean(impact_scores) if impact_scores else 0
             
             # Find critical path
-            critical_path = await self._find_critical_path(
-                source_asset_id, lineage_graph
-            )
+            if self.csr_graph is not None:
+                traversal = self.csr_graph.traverse(
+                    source_asset_id, LineageDirection.DOWNSTREAM.value, query.max_depth
+                )
+                critical_path = self.csr_graph.critical_path(traversal) if traversal else [source_asset_id]
+            else:
+                critical_path = await self._find_critical_path(
+                    source_asset_id, lineage_graph
+                )
             
             # Generate recommendations
             recommendations = []
@@ -890,64 +1000,168 @@ class AdvancedLineageService:
     
     async def _ensure_graph_loaded(self):
         """Ensure the in-memory graph is loaded and current"""
-        with self.graph_lock:
-            # Check if graph needs refresh
-            if (datetime.utcnow() - self.graph_last_updated).seconds > self.cache_ttl:
+        if not self.graph_loaded:
+            async with self.graph_refresh_lock:
+                if not self.graph_loaded:
+                    await self._refresh_lineage_graph(full=True)
+            return
+        
+        if (datetime.utcnow() - self.graph_last_updated).total_seconds() < self.graph_refresh_interval:
+            return
+        
+        # A refresh already in flight: serve the current graph rather than wait for it
+        if self.graph_refresh_lock.locked():
+            return
+        
+        async with self.graph_refresh_lock:
+            try:
                 await self._refresh_lineage_graph()
+            except Exception:
+                # Keep serving the last loaded graph; the next query retries
+                self.graph_last_updated = datetime.utcnow()
     
-    async def _refresh_lineage_graph(self):
-        """Refresh the in-memory lineage graph from database"""
+    async def _refresh_lineage_graph(self, full: bool = False):
+        """
+        Refresh the in-memory lineage graph from database.
+        
+        Only nodes and edges created or updated since the last watermark are loaded and
+        applied in place; deletions are found by comparing row counts, then id sets.
+        A full load also runs every LINEAGE_GRAPH_FULL_RELOAD_SECONDS, catching writes
+        that change rows without bumping updated_at (raw SQL, other services).
+        Full (or large) loads are built into a new graph off the event loop and swapped
+        in, so queries never wait for database I/O or a rebuild.
+        """
+        started = time.perf_counter()
         try:
-            logger.info("Refreshing lineage graph from database")
+            full = full or self.graph_watermark is None or (
+                (datetime.utcnow() - self.graph_last_full_reload).total_seconds() >= LINEAGE_GRAPH_FULL_RELOAD_SECONDS
+            )
+            logger.info(f"Refreshing lineage graph from database ({'full' if full else 'delta'})")
             
-            async with get_session() as session:
-                # Load nodes
-                node_query = select(DataLineageNode)
-                node_result = await session.execute(node_query)
-                nodes = node_result.scalars().all()
-                
-                # Load edges
-                edge_query = select(DataLineageEdge)
-                edge_result = await session.execute(edge_query)
-                edges = edge_result.scalars().all()
-                
-                # Clear and rebuild graph
+            delta = await asyncio.to_thread(
+                self._load_lineage_delta,
+                None if full else self.graph_watermark,
+                self._graph_size()
+            )
+            
+            if self.graph_backend == 'csr':
+                await self._apply_csr_refresh(delta)
+            elif delta.full:
+                # Double buffer: build the next graph in a worker thread, then swap it in
+                graph = await asyncio.to_thread(build_lineage_graph, delta)
                 with self.graph_lock:
-                    self.lineage_graph.clear()
-                    
-                    # Add nodes
-                    for node in nodes:
-                        self.lineage_graph.add_node(
-                            node.node_id,
-                            asset_type=node.asset_type,
-                            asset_name=node.asset_name,
-                            schema_name=node.schema_name,
-                            database_name=node.database_name,
-                            metadata=node.custom_properties or {},
-                            business_importance=node.quality_score or 0.5
-                        )
-                    
-                    # Add edges
-                    for edge in edges:
-                        self.lineage_graph.add_edge(
-                            edge.source_node_id,
-                            edge.target_node_id,
-                            edge_id=edge.edge_id,
-                            lineage_type=edge.lineage_type.value,
-                            transformation_type=edge.transformation_type.value if edge.transformation_type else None,
-                            confidence=edge.confidence_level.value if hasattr(edge.confidence_level, 'value') else 1.0,
-                            metadata=edge.custom_properties or {}
-                        )
-                    
-                    self.graph_last_updated = datetime.utcnow()
-                    self.metrics['graph_size'] = len(self.lineage_graph.nodes())
+                    self.lineage_graph = graph
+                self.metrics['graph_full_reloads'] += 1
+            else:
+                if needs_deletion_scan(self.lineage_graph, delta):
+                    node_ids, edge_ids = await asyncio.to_thread(self._load_lineage_ids)
+                    delta.removed_node_ids, delta.removed_edge_ids = removed_ids(
+                        self.lineage_graph, node_ids, edge_ids
+                    )
+                if delta.size:
+                    with self.graph_lock:
+                        apply_lineage_delta(self.lineage_graph, delta)
             
-            logger.info(f"Graph refreshed: {len(nodes)} nodes, {len(edges)} edges")
+            self.graph_watermark = delta.watermark
+            if delta.full:
+                self.graph_last_full_reload = datetime.utcnow()
+            self.graph_loaded = True
+            self.graph_last_updated = datetime.utcnow()
+            self._update_refresh_metrics(delta, time.perf_counter() - started)
+            
+            logger.info(
+                f"Graph refreshed: {len(delta.nodes)} nodes, {len(delta.edges)} edges, "
+                f"{len(delta.removed_node_ids) + len(delta.removed_edge_ids)} removed "
+                f"in {self.metrics['last_refresh_time']:.3f}s"
+            )
             
         except Exception as e:
             logger.error(f"Failed to refresh lineage graph: {e}")
             raise
     
+    async def _apply_csr_refresh(self, delta: LineageGraphDelta):
+        """Apply a refresh to the CSR backend: the next graph is built off the event loop and swapped in.
+        
+        Callers hold graph_refresh_lock, which serializes every CSR swap so a concurrent
+        flush of real-time updates can't build on a stale base graph and drop this one.
+        Pending real-time updates are folded into the same rebuild.
+        """
+        graph = self.csr_graph
+        if delta.full or graph is None:
+            delta.merge(self._take_csr_pending())
+            self.csr_graph = await asyncio.to_thread(CSRLineageGraph.from_delta, delta)
+            self.metrics['graph_full_reloads'] += 1
+            return
+        if graph.needs_deletion_scan(delta):
+            node_ids, edge_ids = await asyncio.to_thread(self._load_lineage_ids)
+            delta.removed_node_ids, delta.removed_edge_ids = graph.removed_ids(node_ids, edge_ids)
+        delta.merge(self._take_csr_pending())
+        if delta.size:
+            self.csr_graph = await asyncio.to_thread(graph.with_delta, delta)
+    
+    def _graph_size(self) -> int:
+        """Number of nodes in the active in-memory graph"""
+        if self.graph_backend == 'csr':
+            return self.csr_graph.number_of_nodes() if self.csr_graph is not None else 0
+        return self.lineage_graph.number_of_nodes()
+    
+    def _load_lineage_delta(self, watermark: Optional[datetime], graph_size: int) -> LineageGraphDelta:
+        """Load lineage rows changed since the watermark (all rows when None); runs in a worker thread"""
+        with get_session() as session:
+            node_query = select(DataLineageNode)
+            edge_query = select(DataLineageEdge)
+            if watermark is not None:
+                # >= so rows sharing the watermark timestamp are not missed; re-applying is idempotent
+                node_query = node_query.where(or_(
+                    DataLineageNode.updated_at >= watermark, DataLineageNode.created_at >= watermark
+                ))
+                edge_query = edge_query.where(or_(
+                    DataLineageEdge.updated_at >= watermark, DataLineageEdge.created_at >= watermark
+                ))
+            nodes = session.execute(node_query).scalars().all()
+            edges = session.execute(edge_query).scalars().all()
+            
+            if watermark is not None and len(nodes) + len(edges) > LINEAGE_GRAPH_REBUILD_RATIO * max(graph_size, 1):
+                nodes = session.execute(select(DataLineageNode)).scalars().all()
+                edges = session.execute(select(DataLineageEdge)).scalars().all()
+                watermark = None
+            
+            delta = LineageGraphDelta(
+                nodes=[(node.node_id, node_attributes(node)) for node in nodes],
+                edges=[
+                    (edge.source_node_id, edge.target_node_id, edge.edge_id, edge_attributes(edge))
+                    for edge in edges
+                ],
+                watermark=latest_change(edges, latest_change(nodes, watermark)),
+                full=watermark is None
+            )
+            if delta.full:
+                delta.node_count, delta.edge_count = len(nodes), len(edges)
+            else:
+                delta.node_count = session.execute(select(func.count()).select_from(DataLineageNode)).scalar()
+                delta.edge_count = session.execute(select(func.count()).select_from(DataLineageEdge)).scalar()
+            return delta
+    
+    def _load_lineage_ids(self) -> Tuple[Set[str], Set[str]]:
+        """Load every node_id and edge_id (deletion detection); runs in a worker thread"""
+        with get_session() as session:
+            node_ids = set(session.execute(select(DataLineageNode.node_id)).scalars())
+            edge_ids = set(session.execute(select(DataLineageEdge.edge_id)).scalars())
+            return node_ids, edge_ids
+    
+    def _update_refresh_metrics(self, delta: LineageGraphDelta, refresh_time: float):
+        """Update graph refresh metrics"""
+        self.metrics['graph_refreshes'] += 1
+        refresh_count = self.metrics['graph_refreshes']
+        self.metrics['last_refresh_time'] = refresh_time
+        self.metrics['average_refresh_time'] = (
+            (self.metrics['average_refresh_time'] * (refresh_count - 1) + refresh_time) / refresh_count
+        )
+        self.metrics['last_delta_nodes'] = len(delta.nodes)
+        self.metrics['last_delta_edges'] = len(delta.edges)
+        self.metrics['last_delta_removed'] = len(delta.removed_node_ids) + len(delta.removed_edge_ids)
+        self.metrics['graph_size'] = self._graph_size()
+    
     async def _get_cached_lineage(self, query: LineageQuery) -> Optional[LineageGraph]:
         """Get cached lineage result"""
         try:
@@ -1052,6 +1266,11 @@ class AdvancedLineageService:
             if not self.real_time_updates:
                 return
             
+            if self.csr_graph is not None:
+                await self._apply_csr_real_time_update(update_type, lineage_data)
+                self.metrics['real_time_updates'] += 1
+                return
+            
             with self.graph_lock:
                 if update_type == LineageUpdateType.CREATE:
                     await self._handle_create_update(lineage_data)
@@ -1065,6 +1284,74 @@ class AdvancedLineageService:
         except Exception as e:
             logger.error(f"Real-time lineage update failed: {e}")
     
+    async def _apply_csr_real_time_update(self, update_type: LineageUpdateType, data: Dict[str, Any]):
+        """Queue a real-time update for the CSR backend.
+        
+        A CSR rebuild costs O(E log E) however small the delta, so updates arriving within
+        LINEAGE_CSR_BATCH_SECONDS are merged into one pending delta and applied by a single
+        flush, or by a refresh that gets the lock first.
+        """
+        self.csr_pending.merge(self._csr_real_time_delta(self.csr_graph, update_type, data))
+        if self.csr_flush_task is None:
+            self.csr_flush_task = asyncio.create_task(self._flush_csr_pending())
+    
+    async def _flush_csr_pending(self):
+        """Apply the pending real-time updates in one rebuild, under graph_refresh_lock"""
+        await asyncio.sleep(LINEAGE_CSR_BATCH_SECONDS)
+        # Updates queued from here on schedule the next flush
+        self.csr_flush_task = None
+        try:
+            async with self.graph_refresh_lock:
+                delta = self._take_csr_pending()
+                if delta.size and self.csr_graph is not None:
+                    self.csr_graph = await asyncio.to_thread(self.csr_graph.with_delta, delta)
+        except Exception as e:
+            logger.error(f"Failed to apply real-time lineage updates: {e}")
+    
+    def _take_csr_pending(self) -> LineageGraphDelta:
+        delta, self.csr_pending = self.csr_pending, LineageGraphDelta()
+        return delta
+    
+    def _csr_real_time_delta(
+        self,
+        graph: CSRLineageGraph,
+        update_type: LineageUpdateType,
+        data: Dict[str, Any]
+    ) -> LineageGraphDelta:
+        """Translate a real-time update into a LineageGraphDelta against the given CSR graph and pending updates"""
+        delta = LineageGraphDelta()
+        if update_type == LineageUpdateType.CREATE:
+            if 'node' in data:
+                node = data['node']
+                delta.nodes.append((node['node_id'], {k: v for k, v in node.items() if k != 'node_id'}))
+            if 'edge' in data:
+                edge = data['edge']
+                delta.edges.append((
+                    edge['source_id'],
+                    edge['target_id'],
+                    edge.get('edge_id') or str(uuid.uuid4()),
+                    {k: v for k, v in edge.items() if k not in ['source_id', 'target_id']}
+                ))
+        elif update_type == LineageUpdateType.DELETE:
+            if 'node_id' in data:
+                delta.removed_node_ids.add(data['node_id'])
+            if 'edge' in data:
+                edge = data['edge']
+                if edge.get('edge_id'):
+                    delta.removed_edge_ids.add(edge['edge_id'])
+                else:
+                    # The first matching edge, including ones still pending
+                    endpoints = (edge['source_id'], edge['target_id'])
+                    candidates = [
+                        edge_id for edge_id in graph.edge_ids_between(*endpoints)
+                        if edge_id not in self.csr_pending.removed_edge_ids
+                    ] + [
+                        edge_id for source_id, target_id, edge_id, _ in self.csr_pending.edges
+                        if (source_id, target_id) == endpoints
+                    ]
+                    delta.removed_edge_ids.update(candidates[:1])
+        return delta
+    
     async def _handle_create_update(self, data: Dict[str, Any]):
         """Handle creation of new lineage relationships"""
         if 'node' in data:
@@ -1076,10 +1363,11 @@ class AdvancedLineageService:
         
         if 'edge' in data:
             edge = data['edge']
-            self.lineage_graph.add_edge(
+            add_lineage_edge(
+                self.lineage_graph,
                 edge['source_id'],
                 edge['target_id'],
-                **{k: v for k, v in edge.items() if k not in ['source_id', 'target_id']}
+                {k: v for k, v in edge.items() if k not in ['source_id', 'target_id']}
             )
     
     async def _handle_update_update(self, data: Dict[str, Any]):
@@ -1095,6 +1383,8 @@ class AdvancedLineageService:
         
         if 'edge' in data:
             edge = data['edge']
+            if edge.get('edge_id') and remove_lineage_edge(self.lineage_graph, edge['edge_id']):
+                return
             if self.lineage_graph.has_edge(edge['source_id'], edge['target_id']):
                 self.lineage_graph.remove_edge(edge['source_id'], edge['target_id'])
     
@@ -1107,8 +1397,13 @@ class AdvancedLineageService:
         """Perform health check"""
         return {
             'status': 'healthy',
-            'graph_nodes': len(self.lineage_graph.nodes()),
-            'graph_edges': len(self.lineage_graph.edges()),
+            'graph_backend': self.graph_backend,
+            'graph_nodes': self._graph_size(),
+            'graph_edges': (
+                self.csr_graph.number_of_edges() if self.csr_graph is not None
+                else len(self.lineage_graph.edges())
+            ),
             'last_refresh': self.graph_last_updated.isoformat(),
+            'graph_watermark': self.graph_watermark.isoformat() if self.graph_watermark else None,
             'metrics': self.get_metrics()
         }
\ No newline at end of file
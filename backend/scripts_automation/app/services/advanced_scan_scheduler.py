@@ -34,7 +34,6 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
-import heapq
 from collections import defaultdict, deque
 import cron_descriptor
 
@@ -52,6 +51,7 @@ from ..core.cache import CacheManager
 from .ai_service import AIService
 from .scan_intelligence_service import ScanIntelligenceService
 from .data_source_connection_service import DataSourceConnectionService
+from .schedule_index import IndexedHeap, TimeBucketIndex
 
 logger = logging.getLogger(__name__)
 
@@ -99,6 +99,8 @@ class SchedulingConfig:
     dependency_resolution_enabled: bool = True
     resource_prediction_window_hours: int = 24
     schedule_optimization_interval: int = 300  # 5 minutes
+    density_bucket_seconds: int = 300  # Width of the schedule density index buckets
+    max_idle_seconds: int = 300  # Longest the scheduling loop sleeps without a deadline or queue change
 
 @dataclass 
 class ScheduledScan:
@@ -155,7 +157,14 @@ class AdvancedScanScheduler:
         
         # Scheduling state
         self.scheduled_scans: Dict[str, ScheduledScan] = {}
-        self.priority_queue = []
+        # Pending schedules keyed by (scheduled timestamp, priority value), earliest first
+        self.priority_queue = IndexedHeap()
+        # Completed recurring schedules keyed by their next execution timestamp
+        self.recurring_queue = IndexedHeap()
+        # Estimated minutes of every scheduled scan, bucketed by scheduled time
+        self.schedule_density = TimeBucketIndex(self.config.density_bucket_seconds)
+        # Set when a queue gets an earlier deadline, waking the scheduling loop
+        self._queue_changed = asyncio.Event()
         self.execution_queue = deque()
         self.completed_schedules = deque(maxlen=1000)
         self.failed_schedules = deque(maxlen=500)
@@ -273,16 +282,9 @@ class AdvancedScanScheduler:
                 recurring=cron_expression is not None
             )
             
-            # Add to scheduling system
+            # Add to scheduling system and priority queue
             self.scheduled_scans[schedule_id] = scheduled_scan
-            
-            # Add to priority queue
-            priority_value = self._get_priority_value(priority)
-            schedule_time_timestamp = scheduled_time.timestamp()
-            heapq.heappush(
-                self.priority_queue, 
-                (priority_value, schedule_time_timestamp, schedule_id)
-            )
+            self._queue_schedule(scheduled_scan)
             
             # Update dependency graph if dependencies exist
             if dependencies:
@@ -922,13 +924,9 @@ class AdvancedScanScheduler:
             window_start = target_time - time_window
             window_end = target_time + time_window
             
-            schedules_in_window = 0
-            total_estimated_duration = 0
-            
-            for scan in self.scheduled_scans.values():
-                if window_start <= scan.scheduled_time <= window_end:
-                    schedules_in_window += 1
-                    total_estimated_duration += scan.estimated_duration or 30
+            schedules_in_window, total_estimated_duration = self.schedule_density.window(
+                window_start.timestamp(), window_end.timestamp()
+            )
             
             # Calculate density as ratio of scheduled time to available time
             window_minutes = (window_end - window_start).total_seconds() / 60
@@ -964,43 +962,59 @@ class AdvancedScanScheduler:
     def _update_priority_queue(self, scheduled_scan: ScheduledScan):
         """Update priority queue after schedule changes"""
         try:
-            # Remove old entry and add new one
-            # This is a simplified approach; in production, you'd use more efficient data structures
-            
-            # Rebuild priority queue (simplified approach)
-            new_queue = []
-            for priority_val, schedule_time, schedule_id in self.priority_queue:
-                if schedule_id != scheduled_scan.schedule_id:
-                    new_queue.append((priority_val, schedule_time, schedule_id))
-            
-            # Add updated entry
-            priority_value = self._get_priority_value(scheduled_scan.priority)
-            schedule_time_timestamp = scheduled_scan.scheduled_time.timestamp()
-            new_queue.append((priority_value, schedule_time_timestamp, scheduled_scan.schedule_id))
-            
-            # Rebuild heap
-            self.priority_queue = new_queue
-            heapq.heapify(self.priority_queue)
-            
+            self._queue_schedule(scheduled_scan)
         except Exception as e:
             logger.error(f"Priority queue update failed: {e}")
     
+    def _queue_schedule(self, scheduled_scan: ScheduledScan):
+        """Queue a schedule, or move it to its new time, and index it for density queries"""
+        key = (scheduled_scan.scheduled_time.timestamp(), self._get_priority_value(scheduled_scan.priority))
+        head = self.priority_queue.peek()
+        self.priority_queue.push(scheduled_scan.schedule_id, key)
+        self.schedule_density.add(
+            scheduled_scan.schedule_id, key[0], scheduled_scan.estimated_duration or 30
+        )
+        if head is None or key < head[0]:
+            self._queue_changed.set()
+    
+    def _forget_schedule(self, schedule_id: str):
+        """Drop a schedule from the scheduling state and its indexes"""
+        self.scheduled_scans.pop(schedule_id, None)
+        self.priority_queue.remove(schedule_id)
+        self.recurring_queue.remove(schedule_id)
+        self.schedule_density.remove(schedule_id)
+    
+    async def _wait_for_next_deadline(self):
+        """Sleep until the earliest queued deadline, or until a queue gets an earlier one"""
+        self._queue_changed.clear()
+        deadlines = []
+        if self.priority_queue:
+            deadlines.append(self.priority_queue.peek()[0][0])
+        if self.recurring_queue:
+            deadlines.append(self.recurring_queue.peek()[0])
+        timeout = self.config.max_idle_seconds
+        if deadlines:
+            timeout = min(timeout, max(0.0, min(deadlines) - datetime.utcnow().timestamp()))
+        try:
+            await asyncio.wait_for(self._queue_changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
+    
     async def _scheduling_loop(self):
         """Background loop for processing scheduled scans"""
         while True:
             try:
-                current_time = datetime.utcnow()
+                current_timestamp = datetime.utcnow().timestamp()
                 
                 # Process due schedules
                 due_schedules = []
                 
                 while self.priority_queue:
-                    priority_val, schedule_time, schedule_id = self.priority_queue[0]
-                    schedule_datetime = datetime.fromtimestamp(schedule_time)
+                    (schedule_time, _), schedule_id = self.priority_queue.peek()
                     
-                    if schedule_datetime <= current_time:
+                    if schedule_time <= current_timestamp:
                         # Schedule is due
-                        heapq.heappop(self.priority_queue)
+                        self.priority_queue.pop()
                         
                         if schedule_id in self.scheduled_scans:
                             scheduled_scan = self.scheduled_scans[schedule_id]
@@ -1014,14 +1028,15 @@ class AdvancedScanScheduler:
                     else:
                         break  # No more due schedules
                 
-                # Execute due schedules
+                # Execute due schedules, most important first
+                due_schedules.sort(key=lambda scan: (self._get_priority_value(scan.priority), scan.scheduled_time))
                 for scheduled_scan in due_schedules:
                     await self._execute_scheduled_scan(scheduled_scan)
                 
                 # Process recurring schedules
                 await self._process_recurring_schedules()
                 
-                await asyncio.sleep(30)  # Check every 30 seconds
+                await self._wait_for_next_deadline()
                 
             except Exception as e:
                 logger.error(f"Error in scheduling loop: {e}")
@@ -1082,6 +1097,11 @@ class AdvancedScanScheduler:
                 # Handle dependent schedules
                 await self._notify_dependent_schedules(schedule_id)
                 
+                # Wake up again when the next recurring instance is due
+                if scheduled_scan.recurring and scheduled_scan.next_execution:
+                    self.recurring_queue.push(schedule_id, scheduled_scan.next_execution.timestamp())
+                    self._queue_changed.set()
+                
             else:
                 scheduled_scan.status = ScheduleStatus.FAILED
                 scheduled_scan.attempts += 1
@@ -1102,7 +1122,7 @@ class AdvancedScanScheduler:
             
             # Remove from scheduled scans if not recurring
             if not scheduled_scan.recurring or scheduled_scan.status == ScheduleStatus.FAILED:
-                self.scheduled_scans.pop(schedule_id, None)
+                self._forget_schedule(schedule_id)
             
             # Remove from execution queue
             if scheduled_scan in self.execution_queue:
@@ -1164,12 +1184,7 @@ class AdvancedScanScheduler:
             scheduled_scan.status = ScheduleStatus.RESCHEDULED
             
             # Add back to priority queue
-            priority_value = self._get_priority_value(scheduled_scan.priority)
-            schedule_time_timestamp = new_time.timestamp()
-            heapq.heappush(
-                self.priority_queue,
-                (priority_value, schedule_time_timestamp, scheduled_scan.schedule_id)
-            )
+            self._queue_schedule(scheduled_scan)
             
             logger.info(f"Rescheduled scan {scheduled_scan.schedule_id} to {new_time}")
             
@@ -1213,14 +1228,18 @@ class AdvancedScanScheduler:
     async def _process_recurring_schedules(self):
         """Process recurring schedules and create next instances"""
         try:
-            current_time = datetime.utcnow()
+            current_timestamp = datetime.utcnow().timestamp()
             
-            for schedule_id, scheduled_scan in list(self.scheduled_scans.items()):
-                if (scheduled_scan.recurring and 
+            # Only the recurring schedules whose next execution is due
+            while self.recurring_queue and self.recurring_queue.peek()[0] <= current_timestamp:
+                _, schedule_id = self.recurring_queue.pop()
+                scheduled_scan = self.scheduled_scans.get(schedule_id)
+                
+                if (scheduled_scan and
+                    scheduled_scan.recurring and 
                     scheduled_scan.cron_expression and 
                     scheduled_scan.status == ScheduleStatus.COMPLETED and
-                    scheduled_scan.next_execution and
-                    scheduled_scan.next_execution <= current_time):
+                    scheduled_scan.next_execution):
                     
                     # Create next instance
                     next_schedule_id = str(uuid.uuid4())
@@ -1240,21 +1259,15 @@ class AdvancedScanScheduler:
                         metadata=scheduled_scan.metadata.copy()
                     )
                     
-                    # Add to scheduling system
+                    # Add to scheduling system and priority queue
                     self.scheduled_scans[next_schedule_id] = next_scheduled_scan
-                    
-                    # Add to priority queue
-                    priority_value = self._get_priority_value(next_scheduled_scan.priority)
-                    schedule_time_timestamp = next_time.timestamp()
-                    heapq.heappush(
-                        self.priority_queue,
-                        (priority_value, schedule_time_timestamp, next_schedule_id)
-                    )
+                    self._queue_schedule(next_scheduled_scan)
                     
                     # Update next execution time for tracking
                     scheduled_scan.next_execution = self._calculate_next_cron_execution(
                         scheduled_scan.cron_expression
                     )
+                    self.recurring_queue.push(schedule_id, scheduled_scan.next_execution.timestamp())
                     
                     logger.info(f"Created next recurring instance {next_schedule_id} for {schedule_id}")
                     
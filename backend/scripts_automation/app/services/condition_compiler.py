@@ -0,0 +1,220 @@
+"""
+Condition Compiler
+Compiles ABAC permission conditions (JSON) into reusable predicate objects once per
+distinct condition, so permission checks and list filtering never re-parse JSON.
+"""
+
+import fnmatch
+import json
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Distinct condition strings kept compiled per process
+CONDITION_CACHE_SIZE = 4096
+
+# Placeholders resolved against the current user at evaluation time
+CURRENT_USER_ID = ":current_user_id"
+USER_ATTRIBUTE_PREFIX = ":user_"
+
+_MISSING = object()
+
+
+def get_attribute(obj: Any, name: str, default: Any = None) -> Any:
+    """Reads an attribute from a dict or an object; dotted names walk nested values."""
+    value = obj.get(name, _MISSING) if isinstance(obj, dict) else getattr(obj, name, _MISSING)
+    if value is not _MISSING:
+        return value
+    if "." in name:
+        for part in name.split("."):
+            obj = obj.get(part, _MISSING) if isinstance(obj, dict) else getattr(obj, part, _MISSING)
+            if obj is _MISSING:
+                return default
+        return obj
+    return default
+
+
+def _resolve_placeholder(value: Any, user: Any) -> Any:
+    if value == CURRENT_USER_ID:
+        return get_attribute(user, "id")
+    if isinstance(value, str) and value.startswith(USER_ATTRIBUTE_PREFIX):
+        return get_attribute(user, value[len(USER_ATTRIBUTE_PREFIX):])
+    return value
+
+
+def _is_placeholder(value: Any) -> bool:
+    return isinstance(value, str) and (value == CURRENT_USER_ID or value.startswith(USER_ATTRIBUTE_PREFIX))
+
+
+def _numeric(compare: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    return lambda val, operand: isinstance(val, (int, float)) and compare(val, operand)
+
+
+# $op name -> (value, operand) -> bool; "regex" and "user_attr" are handled when compiling
+OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "in": lambda val, operand: val in operand,
+    "not_in": lambda val, operand: val not in operand,
+    "eq": lambda val, operand: val == operand,
+    "ne": lambda val, operand: val != operand,
+    "gt": _numeric(lambda val, operand: val > operand),
+    "gte": _numeric(lambda val, operand: val >= operand),
+    "lt": _numeric(lambda val, operand: val < operand),
+    "lte": _numeric(lambda val, operand: val <= operand),
+    "exists": lambda val, operand: (val is not None) == bool(operand),
+    "contains": lambda val, operand: isinstance(val, (str, list, tuple, set)) and operand in val,
+    "startswith": lambda val, operand: isinstance(val, str) and val.startswith(operand),
+}
+
+
+# A compiled term takes (resource attribute value, user) and returns whether it matches
+Term = Callable[[Any, Any], bool]
+
+
+def _compile_term(expected: Any) -> Term:
+    """Compiles the expected value of one attribute."""
+    if isinstance(expected, str) and ("*" in expected or "?" in expected):
+        pattern = re.compile(fnmatch.translate(expected))
+        return lambda val, user: isinstance(val, str) and pattern.match(val) is not None
+    if isinstance(expected, list):
+        return lambda val, user: val in expected
+    if isinstance(expected, dict) and "$op" in expected:
+        op = expected["$op"]
+        operand = expected.get("value")
+        if op == "regex":
+            regex = re.compile(operand)
+            return lambda val, user: isinstance(val, str) and regex.match(val) is not None
+        if op == "user_attr":
+            return lambda val, user: get_attribute(user, operand) == val
+        compare = OPERATORS.get(op)
+        if compare is None:
+            raise ValueError(f"Unsupported condition operator: {op}")
+        if _is_placeholder(operand):
+            return lambda val, user: compare(val, _resolve_placeholder(operand, user))
+        return lambda val, user: compare(val, operand)
+    if _is_placeholder(expected):
+        return lambda val, user: val == _resolve_placeholder(expected, user)
+    return lambda val, user: val == expected
+
+
+class CompiledCondition:
+    """A permission condition parsed and compiled once.
+
+    ``user_effective`` keeps the user-only evaluation used for effective permissions;
+    ``matches``/``evaluate_many``/``filter`` apply the attribute terms to resources.
+    Keys ``$and``/``$or`` take lists of nested conditions and ``$not`` one condition.
+    """
+
+    def __init__(self, source: Any):
+        self.source = source
+        self.error: Optional[str] = None
+        self.parsed = False
+        self.data: Any = None
+        self.terms: List[Tuple[str, Term]] = []
+        self.any_of: List["CompiledCondition"] = []
+        self.all_of: List["CompiledCondition"] = []
+        self.none_of: List["CompiledCondition"] = []
+        try:
+            self.data = json.loads(source) if isinstance(source, str) else source
+            self.parsed = True
+            if isinstance(self.data, dict):
+                self._compile(self.data)
+        except Exception as e:
+            self.error = str(e)
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None and isinstance(self.data, dict)
+
+    def _compile(self, data: Dict[str, Any]) -> None:
+        for key, expected in data.items():
+            if key in ("$and", "$or"):
+                nested = [CompiledCondition(item) for item in expected]
+                for condition in nested:
+                    if not condition.is_valid:
+                        raise ValueError(condition.error or "Nested condition must be an object")
+                (self.all_of if key == "$and" else self.any_of).extend(nested)
+            elif key == "$not":
+                condition = CompiledCondition(expected)
+                if not condition.is_valid:
+                    raise ValueError(condition.error or "Nested condition must be an object")
+                self.none_of.append(condition)
+            else:
+                self.terms.append((key, _compile_term(expected)))
+
+    def user_effective(self, user: Any, user_id: Optional[int]) -> Tuple[bool, Optional[str]]:
+        """Effectiveness of the condition for a user alone (no resource), with a note."""
+        if not self.parsed:
+            return False, "Invalid condition format"
+        cond_obj = self.data
+        if "user_id" in cond_obj and cond_obj["user_id"] == CURRENT_USER_ID:
+            if getattr(user, "id", None) == user_id:
+                return True, None
+            return False, "User ID does not match (:current_user_id)"
+        if "department" in cond_obj and cond_obj["department"] == ":user_department":
+            if getattr(user, "department", None):
+                return True, None
+            return False, "User has no department"
+        if "region" in cond_obj and cond_obj["region"] == ":user_region":
+            if getattr(user, "region", None):
+                return True, None
+            return False, "User has no region"
+        return False, "Condition not matched or not evaluable"
+
+    def matches(self, resource: Any, user: Any = None) -> bool:
+        """Whether a resource (dict or object of attributes) satisfies the condition."""
+        if not self.is_valid:
+            return False
+        try:
+            return self._matches(resource, user)
+        except Exception:
+            # Values of the wrong type for an operator never match
+            return False
+
+    def _matches(self, resource: Any, user: Any) -> bool:
+        for key, term in self.terms:
+            if not term(get_attribute(resource, key), user):
+                return False
+        if self.all_of and not all(condition._matches(resource, user) for condition in self.all_of):
+            return False
+        if self.any_of and not any(condition._matches(resource, user) for condition in self.any_of):
+            return False
+        return not any(condition._matches(resource, user) for condition in self.none_of)
+
+    def evaluate_many(self, resources: Iterable[Any], user: Any = None) -> List[bool]:
+        """Evaluates the condition for every resource in one pass."""
+        if not self.is_valid:
+            return [False for _ in resources]
+        matches = self._matches
+        results = []
+        for resource in resources:
+            try:
+                results.append(matches(resource, user))
+            except Exception:
+                results.append(False)
+        return results
+
+    def filter(self, resources: Iterable[Any], user: Any = None) -> List[Any]:
+        resources = list(resources)
+        return [resource for resource, ok in zip(resources, self.evaluate_many(resources, user)) if ok]
+
+
+@lru_cache(maxsize=CONDITION_CACHE_SIZE)
+def _compile_cached(source: str) -> CompiledCondition:
+    return CompiledCondition(source)
+
+
+def compile_condition(conditions: Any) -> Optional[CompiledCondition]:
+    """Returns the compiled condition (cached by its JSON text), or None when empty."""
+    if not conditions:
+        return None
+    if not isinstance(conditions, str):
+        conditions = json.dumps(conditions, sort_keys=True)
+    return _compile_cached(conditions)
+
+
+def validate_condition(conditions: Any) -> Optional[str]:
+    """Returns an error message when the condition cannot be compiled, else None."""
+    compiled = compile_condition(conditions)
+    if compiled is None or compiled.is_valid:
+        return None
+    return compiled.error or "Condition must be a JSON object"
@@ -0,0 +1,256 @@
+"""
+Connection Pool Registry
+Process-wide registry of pooled SQLAlchemy engines and raw DBAPI pools shared by
+all data source connectors, keyed by data source id and a connection fingerprint.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple, Union
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool, Pool, QueuePool
+
+logger = logging.getLogger(__name__)
+
+# Defaults used when a data source does not define its own pool settings
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 1800
+
+RegistryKey = Tuple[Hashable, str]
+
+
+@dataclass
+class PooledResource:
+    """A pooled engine (or raw DBAPI pool) registered for a data source"""
+    data_source_id: Hashable
+    fingerprint: str
+    credential_digest: str
+    resource: Union[Engine, Pool]
+    created_at: datetime = field(default_factory=datetime.now)
+    last_used_at: datetime = field(default_factory=datetime.now)
+    checkouts: int = 0
+
+    @property
+    def pool(self) -> Pool:
+        return self.resource.pool if isinstance(self.resource, Engine) else self.resource
+
+    def dispose(self) -> None:
+        try:
+            self.resource.dispose()
+        except Exception as e:
+            logger.warning(f"Error disposing pool for data source {self.data_source_id}: {str(e)}")
+
+
+class ConnectionPoolRegistry:
+    """Thread-safe registry reusing one connection pool per data source and connection fingerprint.
+
+    A fingerprint covers the connection target, connect arguments, credentials and pool
+    settings. Registering a fingerprint whose credentials differ from the ones already held
+    for the same data source disposes the stale pools, so credential changes never leave
+    connections authenticated with old secrets around.
+    """
+
+    def __init__(self):
+        self._pools: Dict[RegistryKey, PooledResource] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _digest(value: Any) -> str:
+        payload = json.dumps(value, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def get_pool_settings(data_source: Any) -> Dict[str, int]:
+        """Resolve pool settings from a data source, falling back to defaults"""
+        return {
+            "pool_size": getattr(data_source, "pool_size", None) or DEFAULT_POOL_SIZE,
+            "max_overflow": getattr(data_source, "max_overflow", None)
+            if getattr(data_source, "max_overflow", None) is not None else DEFAULT_MAX_OVERFLOW,
+            "pool_timeout": getattr(data_source, "pool_timeout", None) or DEFAULT_POOL_TIMEOUT,
+        }
+
+    def fingerprint(
+        self,
+        target: str,
+        connect_args: Optional[Dict[str, Any]] = None,
+        credential: Optional[str] = None,
+        pool_settings: Optional[Dict[str, int]] = None,
+    ) -> str:
+        """Build a stable fingerprint for a connection configuration"""
+        return self._digest({
+            "target": target,
+            "connect_args": connect_args or {},
+            "credential": self._digest(credential),
+            "pool": pool_settings or {},
+        })
+
+    def _lookup(
+        self,
+        data_source_id: Hashable,
+        fingerprint: str,
+        credential_digest: str,
+        factory: Callable[[], Union[Engine, Pool]],
+    ) -> PooledResource:
+        key = (data_source_id, fingerprint)
+        with self._lock:
+            entry = self._pools.get(key)
+            if entry is None:
+                self._evict_stale_credentials(data_source_id, credential_digest)
+                entry = PooledResource(
+                    data_source_id=data_source_id,
+                    fingerprint=fingerprint,
+                    credential_digest=credential_digest,
+                    resource=factory(),
+                )
+                self._pools[key] = entry
+                logger.info(f"Created connection pool for data source {data_source_id}")
+            entry.last_used_at = datetime.now()
+            entry.checkouts += 1
+            return entry
+
+    def _evict_stale_credentials(self, data_source_id: Hashable, credential_digest: str) -> None:
+        stale = [
+            key for key, entry in self._pools.items()
+            if entry.data_source_id == data_source_id and entry.credential_digest != credential_digest
+        ]
+        for key in stale:
+            self._pools.pop(key).dispose()
+        if stale:
+            logger.info(f"Evicted {len(stale)} pool(s) for data source {data_source_id} after credential change")
+
+    def get_engine(
+        self,
+        data_source: Any,
+        connection_string: str,
+        connect_args: Optional[Dict[str, Any]] = None,
+        credential: Optional[str] = None,
+        **engine_kwargs: Any,
+    ) -> Engine:
+        """Get (or lazily create) the shared pooled engine for a data source.
+
+        Unsaved data sources (no id) get an unpooled engine so ad-hoc connection tests
+        do not accumulate pools in the registry.
+        """
+        connect_args = connect_args or {}
+        if getattr(data_source, "id", None) is None:
+            return create_engine(connection_string, connect_args=connect_args, poolclass=NullPool, **engine_kwargs)
+
+        pool_settings = self.get_pool_settings(data_source)
+        fingerprint = self.fingerprint(
+            connection_string, {**connect_args, **engine_kwargs}, credential, pool_settings
+        )
+
+        def factory() -> Engine:
+            return create_engine(
+                connection_string,
+                connect_args=connect_args,
+                pool_size=pool_settings["pool_size"],
+                max_overflow=pool_settings["max_overflow"],
+                pool_timeout=pool_settings["pool_timeout"],
+                pool_recycle=DEFAULT_POOL_RECYCLE,
+                pool_pre_ping=True,
+                **engine_kwargs,
+            )
+
+        entry = self._lookup(data_source.id, fingerprint, self._digest(credential), factory)
+        return entry.resource
+
+    def get_pool(
+        self,
+        data_source: Any,
+        target: str,
+        creator: Callable[[], Any],
+        credential: Optional[str] = None,
+        connect_args: Optional[Dict[str, Any]] = None,
+    ) -> Pool:
+        """Get (or lazily create) a raw DBAPI connection pool for drivers without a SQLAlchemy dialect"""
+        if getattr(data_source, "id", None) is None:
+            return NullPool(creator)
+
+        pool_settings = self.get_pool_settings(data_source)
+        fingerprint = self.fingerprint(target, connect_args, credential, pool_settings)
+
+        def factory() -> Pool:
+            return QueuePool(
+                creator,
+                pool_size=pool_settings["pool_size"],
+                max_overflow=pool_settings["max_overflow"],
+                timeout=pool_settings["pool_timeout"],
+                recycle=DEFAULT_POOL_RECYCLE,
+            )
+
+        entry = self._lookup(data_source.id, fingerprint, self._digest(credential), factory)
+        return entry.resource
+
+    def evict(self, data_source_id: Hashable) -> int:
+        """Dispose and remove every pool registered for a data source"""
+        with self._lock:
+            keys = [key for key in self._pools if key[0] == data_source_id]
+            for key in keys:
+                self._pools.pop(key).dispose()
+        if keys:
+            logger.info(f"Closed {len(keys)} connection pool(s) for data source {data_source_id}")
+        return len(keys)
+
+    def dispose_all(self) -> None:
+        """Dispose every registered pool (e.g. on application shutdown)"""
+        with self._lock:
+            entries = list(self._pools.values())
+            self._pools.clear()
+        for entry in entries:
+            entry.dispose()
+
+    def has_pool(self, data_source_id: Hashable) -> bool:
+        with self._lock:
+            return any(key[0] == data_source_id for key in self._pools)
+
+    @staticmethod
+    def _pool_counters(pool: Pool) -> Dict[str, Any]:
+        counters: Dict[str, Any] = {"status": pool.status()}
+        for name in ("size", "checkedin", "checkedout", "overflow"):
+            method = getattr(pool, name, None)
+            if callable(method):
+                counters[name] = method()
+        return counters
+
+    def get_stats(self, data_source_id: Hashable) -> Optional[Dict[str, Any]]:
+        """Get live pool statistics for a data source, or None if no pool is registered"""
+        with self._lock:
+            entries = [entry for key, entry in self._pools.items() if key[0] == data_source_id]
+        if not entries:
+            return None
+
+        pools: List[Dict[str, Any]] = []
+        for entry in entries:
+            counters = self._pool_counters(entry.pool)
+            pools.append({
+                "fingerprint": entry.fingerprint[:12],
+                "pool_size": counters.get("size", 0),
+                "checked_in": counters.get("checkedin", 0),
+                "checked_out": counters.get("checkedout", 0),
+                "overflow": counters.get("overflow", 0),
+                "checkouts": entry.checkouts,
+                "created_at": entry.created_at.isoformat(),
+                "last_used_at": entry.last_used_at.isoformat(),
+                "status": counters["status"],
+            })
+
+        return {
+            "pool_count": len(pools),
+            "active_connections": sum(p["checked_out"] for p in pools),
+            "idle_connections": sum(p["checked_in"] for p in pools),
+            "overflow_connections": sum(max(p["overflow"], 0) for p in pools),
+            "pools": pools,
+        }
+
+
+# Process-wide registry shared by all connectors
+connection_pool_registry = ConnectionPoolRegistry()
@@ -0,0 +1,130 @@
+"""
+Connector Executor
+Runs blocking connector I/O (SQLAlchemy, pymongo, boto3, Snowflake, redis-py) on a shared,
+bounded thread pool so discovery, preview and profiling never block the event loop.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+# Upper bound on threads used for connector I/O across all data sources
+DEFAULT_MAX_WORKERS = int(os.getenv("CONNECTOR_MAX_WORKERS", "32"))
+# Concurrent blocking calls allowed per data source when it has no pool_size configured
+DEFAULT_PER_SOURCE_CONCURRENCY = int(os.getenv("CONNECTOR_PER_SOURCE_CONCURRENCY", "4"))
+
+
+class ConnectorExecutor:
+    """Bounded thread pool for connector I/O with per-data-source concurrency limits.
+
+    The global pool caps total threads; a per-source semaphore (sized from the data
+    source's pool_size) keeps one busy source from starving the others and from
+    checking out more connections than its pool holds. Waiting on the semaphore is
+    async, so queued calls cost no threads.
+    """
+
+    def __init__(self, max_workers: int = DEFAULT_MAX_WORKERS,
+                 per_source_concurrency: int = DEFAULT_PER_SOURCE_CONCURRENCY):
+        self.max_workers = max_workers
+        self.per_source_concurrency = per_source_concurrency
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # Semaphores are bound to their loop: kept per loop, dropped once the loop is
+        # collected or closed (a semaphore that has had waiters references its loop)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+        self._stats: Dict[Hashable, Dict[str, float]] = {}
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="connector-io"
+                )
+            return self._executor
+
+    def _get_semaphore(self, source_key: Hashable, limit: Optional[int]) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            semaphores = self._semaphores.get(loop)
+            if semaphores is None:
+                for closed in [other for other in self._semaphores if other.is_closed()]:
+                    del self._semaphores[closed]
+                semaphores = self._semaphores[loop] = {}
+            semaphore = semaphores.get(source_key)
+            if semaphore is None:
+                semaphore = semaphores[source_key] = asyncio.Semaphore(max(1, limit or self.per_source_concurrency))
+            return semaphore
+
+    def _record(self, source_key: Hashable, waited: float, elapsed: float, failed: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(source_key, {
+                "calls": 0, "failures": 0, "in_flight": 0,
+                "total_wait_seconds": 0.0, "total_run_seconds": 0.0
+            })
+            stats["calls"] += 1
+            stats["failures"] += int(failed)
+            stats["total_wait_seconds"] += waited
+            stats["total_run_seconds"] += elapsed
+
+    def _adjust_in_flight(self, source_key: Hashable, delta: int) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(source_key, {
+                "calls": 0, "failures": 0, "in_flight": 0,
+                "total_wait_seconds": 0.0, "total_run_seconds": 0.0
+            })
+            stats["in_flight"] += delta
+
+    async def run(self, source_key: Hashable, func: Callable[..., T], *args: Any,
+                  limit: Optional[int] = None, **kwargs: Any) -> T:
+        """Run a blocking callable for a data source on the shared pool"""
+        semaphore = self._get_semaphore(source_key, limit)
+        queued_at = time.perf_counter()
+        async with semaphore:
+            started_at = time.perf_counter()
+            self._adjust_in_flight(source_key, 1)
+            failed = False
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+            except Exception:
+                failed = True
+                raise
+            finally:
+                self._adjust_in_flight(source_key, -1)
+                self._record(source_key, started_at - queued_at, time.perf_counter() - started_at, failed)
+
+    def get_stats(self, source_key: Optional[Hashable] = None) -> Dict[str, Any]:
+        """Get call/latency counters for one data source or for all of them"""
+        with self._lock:
+            if source_key is not None:
+                return dict(self._stats.get(source_key, {}))
+            return {
+                "max_workers": self.max_workers,
+                "per_source_concurrency": self.per_source_concurrency,
+                "sources": {key: dict(value) for key, value in self._stats.items()}
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._semaphores.clear()
+        if executor:
+            executor.shutdown(wait=wait)
+
+
+# Process-wide executor shared by all connectors
+connector_executor = ConnectorExecutor()
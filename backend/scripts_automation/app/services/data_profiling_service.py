@@ -1,11 +1,16 @@
-from typing import Dict, List, Any, Optional, Tuple, Union
+from typing import Dict, List, Any, Optional, Tuple, Union, Iterable, Iterator
+from datetime import datetime
 import pandas as pd
 import numpy as np
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from sqlmodel import Session, select
 from pymongo import MongoClient
 import logging
-from app.models.scan_models import DataSource, DataSourceType
+from app.models.scan_models import DataSource, DataSourceType, ProfileSketchState
 from app.services.data_source_service import DataSourceService
+from app.services.connection_pool_registry import connection_pool_registry
+from app.services.profiling_sketches import TableSketchProfile
+from app.services.table_sampling_service import TableSamplingService
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -15,7 +20,8 @@ class DataProfilingService:
     
     @staticmethod
     def sample_data(data_source: DataSource, table_name: str, schema_name: Optional[str] = None, 
-                   sample_size: int = 1000, app_secret: Optional[str] = None) -> pd.DataFrame:
+                   sample_size: int = 1000, app_secret: Optional[str] = None, seed: Optional[int] = None,
+                   sample_method: str = "auto", chunk_size: int = 10000) -> pd.DataFrame:
         """Sample data from a table.
         
         Args:
@@ -24,71 +30,78 @@ class DataProfilingService:
             schema_name: The schema name (for PostgreSQL)
             sample_size: The number of rows to sample
             app_secret: Optional app secret for decrypting passwords
+            seed: Seed for a reproducible sample (random when omitted)
+            sample_method: auto/random (cheapest native strategy) or first
+            chunk_size: Rows fetched per round trip
             
         Returns:
-            A pandas DataFrame containing the sampled data
+            A pandas DataFrame containing the sampled data; the sampling plan
+            (strategy, seed, estimated rows) is in ``attrs["sampling"]``
         """
+        supported = [DataSourceType.MYSQL, DataSourceType.POSTGRESQL, DataSourceType.ORACLE,
+                     DataSourceType.SQLSERVER, DataSourceType.MONGODB]
+        if data_source.source_type not in supported:
+            logger.error(f"Unsupported data source type for sampling: {data_source.source_type}")
+            return pd.DataFrame()
+        
         try:
-            # Get the password
-            password = DataSourceService.get_data_source_password(data_source, app_secret)
-            
-            if data_source.source_type in [DataSourceType.MYSQL, DataSourceType.POSTGRESQL, DataSourceType.ORACLE, DataSourceType.SQLSERVER]:
-                # Handle SQL databases
-                if data_source.source_type == DataSourceType.MYSQL:
-                    connection_uri = f"mysql+pymysql://{data_source.username}:{password}@{data_source.host}:{data_source.port}/{data_source.database_name or ''}"
-                    schema_clause = ""
-                elif data_source.source_type == DataSourceType.POSTGRESQL:
-                    connection_uri = f"postgresql+psycopg2://{data_source.username}:{password}@{data_source.host}:{data_source.port}/{data_source.database_name or ''}"
-                    schema_clause = f"\"{schema_name}\"." if schema_name else ""
-                elif data_source.source_type == DataSourceType.ORACLE:
-                    connection_uri = f"oracle+cx_oracle://{data_source.username}:{password}@{data_source.host}:{data_source.port}/{data_source.database_name or ''}"
-                    schema_clause = f"{schema_name}." if schema_name else ""
-                elif data_source.source_type == DataSourceType.SQLSERVER:
-                    connection_uri = f"mssql+pyodbc://{data_source.username}:{password}@{data_source.host}:{data_source.port}/{data_source.database_name or ''}?driver=ODBC+Driver+17+for+SQL+Server"
-                    schema_clause = f"[{schema_name}]." if schema_name else ""
-                
-                engine = create_engine(connection_uri)
-                
-                # Create a query that works for the specific database type
-                if data_source.source_type == DataSourceType.MYSQL:
-                    query = f"SELECT * FROM `{table_name}` ORDER BY RAND() LIMIT {sample_size}"
-                elif data_source.source_type == DataSourceType.POSTGRESQL:
-                    query = f"SELECT * FROM {schema_clause}\"{table_name}\" ORDER BY RANDOM() LIMIT {sample_size}"
-                elif data_source.source_type == DataSourceType.ORACLE:
-                    query = f"SELECT * FROM {schema_clause}\"{table_name}\" SAMPLE({sample_size} ROWS)"
-                elif data_source.source_type == DataSourceType.SQLSERVER:
-                    query = f"SELECT TOP {sample_size} * FROM {schema_clause}[{table_name}] ORDER BY NEWID()"
-                
-                # Execute the query and return the results as a DataFrame
-                return pd.read_sql(query, engine)
-                
-            elif data_source.source_type == DataSourceType.MONGODB:
-                # Handle MongoDB
-                connection_uri = f"mongodb://{data_source.username}:{password}@{data_source.host}:{data_source.port}"
-                client = MongoClient(connection_uri)
-                db = client[data_source.database_name]
-                collection = db[table_name]
-                
-                # Sample documents from the collection
-                pipeline = [
-                    {"$sample": {"size": sample_size}}
-                ]
-                cursor = collection.aggregate(pipeline)
-                
-                # Convert to DataFrame
-                data = list(cursor)
-                if not data:
-                    return pd.DataFrame()
-                return pd.DataFrame(data)
-            
-            else:
-                logger.error(f"Unsupported data source type for sampling: {data_source.source_type}")
+            chunks = list(TableSamplingService.iter_sample(
+                data_source, table_name, schema_name, sample_size, seed, chunk_size, sample_method, app_secret
+            ))
+            if not chunks:
                 return pd.DataFrame()
+            sample = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+            sample.attrs["sampling"] = chunks[0].attrs.get("sampling", {})
+            return sample
                 
         except Exception as e:
             logger.error(f"Error sampling data: {str(e)}")
             raise
     
+    @staticmethod
+    def profile_sample(data_source: DataSource, table_name: str, schema_name: Optional[str] = None,
+                       sample_size: int = 100000, seed: Optional[int] = None, chunk_size: int = 10000,
+                       include_correlations: bool = True, app_secret: Optional[str] = None) -> Dict[str, Any]:
+        """Profile a native sample, streaming it chunk by chunk into the sketch profiler.
+        
+        Args:
+            data_source: The data source to sample from
+            table_name: The name of the table to sample
+            schema_name: The schema name
+            sample_size: The number of rows to sample
+            seed: Seed for a reproducible sample
+            chunk_size: Rows fetched and profiled per chunk
+            include_correlations: Whether to include the correlation matrix
+            app_secret: Optional app secret for decrypting passwords
+            
+        Returns:
+            A profile in the same shape as profile_data plus the sampling plan
+        """
+        sketches = TableSketchProfile()
+        sampling: Dict[str, Any] = {}
+        for chunk in TableSamplingService.iter_sample(
+            data_source, table_name, schema_name, sample_size, seed, chunk_size, "auto", app_secret
+        ):
+            sampling = chunk.attrs.get("sampling", sampling)
+            sketches.update(chunk)
+        profile = sketches.to_profile(include_correlations)
+        profile["sampling"] = sampling
+        return profile
+    
+    @staticmethod
+    def _build_connection_uri(data_source: DataSource, password: Optional[str]) -> str:
+        """Build the SQLAlchemy URI for a SQL data source."""
+        base = f"{data_source.username}:{password}@{data_source.host}:{data_source.port}/{data_source.database_name or ''}"
+        if data_source.source_type == DataSourceType.MYSQL:
+            return f"mysql+pymysql://{base}"
+        if data_source.source_type == DataSourceType.POSTGRESQL:
+            return f"postgresql+psycopg2://{base}"
+        if data_source.source_type == DataSourceType.ORACLE:
+            return f"oracle+cx_oracle://{base}"
+        if data_source.source_type == DataSourceType.SQLSERVER:
+            return f"mssql+pyodbc://{base}?driver=ODBC+Driver+17+for+SQL+Server"
+        raise ValueError(f"Unsupported data source type for SQL profiling: {data_source.source_type}")
+    
     @staticmethod
     def profile_data(df: pd.DataFrame) -> Dict[str, Any]:
         """Generate a profile of the data.
@@ -176,6 +189,167 @@ class DataProfilingService:
             logger.error(f"Error profiling data: {str(e)}")
             return {"error": str(e)}
     
+    @staticmethod
+    def profile_data_streaming(chunks: Iterable[pd.DataFrame], include_correlations: bool = True,
+                               base_profile: Optional[TableSketchProfile] = None) -> Dict[str, Any]:
+        """Profile a stream of DataFrame chunks in bounded memory.
+        
+        Args:
+            chunks: DataFrame chunks (e.g. from pd.read_sql(..., chunksize=n))
+            include_correlations: Whether to include the correlation matrix
+            base_profile: Optional sketch profile to continue from
+            
+        Returns:
+            A profile in the same shape as profile_data, with approximate
+            cardinality, quantiles and top values
+        """
+        try:
+            sketches = base_profile or TableSketchProfile()
+            sketches.update_many(chunks)
+            return sketches.to_profile(include_correlations)
+        except Exception as e:
+            logger.error(f"Error profiling data stream: {str(e)}")
+            return {"error": str(e)}
+    
+    @staticmethod
+    def merge_sketch_profiles(states: Iterable[Dict[str, Any]]) -> TableSketchProfile:
+        """Merge serialized partial profiles produced by separate workers or scans."""
+        merged = TableSketchProfile()
+        for state in states:
+            merged.merge(TableSketchProfile.from_dict(state))
+        return merged
+    
+    @staticmethod
+    def get_sketch_state(session: Session, data_source_id: int, table_name: str,
+                         schema_name: Optional[str] = None) -> Optional[ProfileSketchState]:
+        """Get the persisted sketch state for a table, if any."""
+        return session.exec(
+            select(ProfileSketchState).where(
+                ProfileSketchState.data_source_id == data_source_id,
+                ProfileSketchState.schema_name == (schema_name or ""),
+                ProfileSketchState.table_name == table_name
+            )
+        ).first()
+    
+    @staticmethod
+    def save_sketch_state(session: Session, data_source_id: int, table_name: str, schema_name: Optional[str],
+                          sketches: TableSketchProfile, watermark_column: Optional[str] = None,
+                          watermark_value: Optional[str] = None) -> ProfileSketchState:
+        """Persist sketch state so the next profile only has to read new rows."""
+        state = DataProfilingService.get_sketch_state(session, data_source_id, table_name, schema_name)
+        if state is None:
+            state = ProfileSketchState(
+                data_source_id=data_source_id,
+                schema_name=schema_name or "",
+                table_name=table_name
+            )
+        state.row_count = sketches.row_count
+        state.sketch_state = sketches.to_dict()
+        state.watermark_column = watermark_column
+        state.watermark_value = watermark_value
+        state.updated_at = datetime.utcnow()
+        session.add(state)
+        session.commit()
+        session.refresh(state)
+        return state
+    
+    @staticmethod
+    def profile_table_incremental(session: Session, data_source: DataSource, table_name: str,
+                                  schema_name: Optional[str] = None, watermark_column: Optional[str] = None,
+                                  chunk_size: int = 50000, include_correlations: bool = True,
+                                  app_secret: Optional[str] = None) -> Dict[str, Any]:
+        """Profile a whole table by streaming it through mergeable sketches.
+        
+        With a watermark column (e.g. an increasing id or updated_at), only rows
+        above the last persisted watermark are read and folded into the stored
+        sketches. Sketches cannot retract values, so updated rows are counted
+        again; run without a watermark to rebuild from scratch.
+        
+        Args:
+            session: Metadata database session used to persist sketch state
+            data_source: The data source to profile
+            table_name: The name of the table (collection for MongoDB)
+            schema_name: The schema name
+            watermark_column: Optional monotonically increasing column
+            chunk_size: Rows per streamed chunk
+            include_correlations: Whether to include the correlation matrix
+            app_secret: Optional app secret for decrypting passwords
+            
+        Returns:
+            A profile in the same shape as profile_data plus scan details
+        """
+        state = DataProfilingService.get_sketch_state(session, data_source.id, table_name, schema_name)
+        resume = bool(state and watermark_column and state.watermark_column == watermark_column
+                      and state.watermark_value is not None)
+        sketches = TableSketchProfile.from_dict(state.sketch_state) if resume else TableSketchProfile()
+        since = state.watermark_value if resume else None
+        
+        rows_scanned = 0
+        watermark = since
+        for chunk in DataProfilingService.iter_table_chunks(
+            data_source, table_name, schema_name, chunk_size, watermark_column, since, app_secret
+        ):
+            rows_scanned += len(chunk)
+            sketches.update(chunk)
+            if watermark_column and watermark_column in chunk.columns and chunk[watermark_column].notna().any():
+                watermark = str(chunk[watermark_column].max())
+        
+        DataProfilingService.save_sketch_state(
+            session, data_source.id, table_name, schema_name, sketches, watermark_column, watermark
+        )
+        profile = sketches.to_profile(include_correlations)
+        profile.update({
+            "incremental": resume,
+            "rows_scanned": rows_scanned,
+            "watermark_column": watermark_column,
+            "watermark_value": watermark
+        })
+        return profile
+    
+    @staticmethod
+    def iter_table_chunks(data_source: DataSource, table_name: str, schema_name: Optional[str] = None,
+                          chunk_size: int = 50000, watermark_column: Optional[str] = None,
+                          since: Optional[str] = None, app_secret: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Stream a table (optionally rows above a watermark) as DataFrame chunks."""
+        password = DataSourceService.get_data_source_password(data_source, app_secret)
+        
+        if data_source.source_type == DataSourceType.MONGODB:
+            if watermark_column:
+                raise ValueError("Watermark-based incremental profiling is only supported for SQL sources")
+            client = MongoClient(f"mongodb://{data_source.username}:{password}@{data_source.host}:{data_source.port}")
+            try:
+                cursor = client[data_source.database_name][table_name].find({}, batch_size=chunk_size)
+                batch = []
+                for document in cursor:
+                    batch.append(document)
+                    if len(batch) >= chunk_size:
+                        yield pd.DataFrame(batch)
+                        batch = []
+                if batch:
+                    yield pd.DataFrame(batch)
+            finally:
+                client.close()
+            return
+        
+        engine = connection_pool_registry.get_engine(
+            data_source, DataProfilingService._build_connection_uri(data_source, password), credential=password
+        )
+        quote = engine.dialect.identifier_preparer.quote
+        source = f"{quote(schema_name)}.{quote(table_name)}" if schema_name else quote(table_name)
+        query = f"SELECT * FROM {source}"
+        params: Dict[str, Any] = {}
+        if watermark_column:
+            if since is not None:
+                query += f" WHERE {quote(watermark_column)} > :since"
+                params["since"] = since
+            query += f" ORDER BY {quote(watermark_column)}"
+        
+        with engine.connect() as conn:
+            # Server-side cursor so only one chunk is held in memory at a time
+            conn = conn.execution_options(stream_results=True)
+            for chunk in pd.read_sql(text(query), conn, params=params, chunksize=chunk_size):
+                yield chunk
+    
     @staticmethod
     def detect_data_patterns(df: pd.DataFrame) -> Dict[str, List[Dict[str, Any]]]:
         """Detect patterns in the data.
@@ -1,4 +1,5 @@
-from typing import Optional
+from typing import Iterable, Optional
+from sqlalchemy import update
 from app.models.schema_models import DataTableSchema
 from app.db_session import get_session
 from app.api.classifiers.data_sensitivity_classifier import classify_to_sensitivity
@@ -25,11 +26,35 @@ def assign_data_sensitivity_label(session: get_session, column: DataTableSchema)
     logger.info(f"Column {column.column_name} assigned sensitivity label: {sensitivity_label}")
     return sensitivity_label
 
-def update_all_columns_data_sensitivity(session: get_session):
+def sensitivity_label_for_categories(categories: Optional[str]) -> Optional[str]:
     """
-    Updates the data sensitivity label for all columns in the DataTableSchema table.
+    Computes the data sensitivity label for a comma-separated categories value.
     """
-    columns = session.query(DataTableSchema).all()
-    for column in columns:
-        assign_data_sensitivity_label(session, column)
+    if not categories:
+        return "Not Classified"
+    return classify_to_sensitivity([c.strip() for c in categories.split(",")])
+
+def update_all_columns_data_sensitivity(session: get_session, column_ids: Optional[Iterable[int]] = None, batch_size: int = 1000):
+    """
+    Updates the data sensitivity label for all columns in the DataTableSchema table,
+    or only for the given column ids. Labels are computed from (id, categories) and
+    only changed labels are written, as one executemany UPDATE per batch.
+    """
+    query = session.query(DataTableSchema.id, DataTableSchema.categories, DataTableSchema.datasensitivitylabel)
+    if column_ids is None:
+        batches = [query.all()]
+    else:
+        ids = sorted(set(column_ids))
+        batches = [
+            query.filter(DataTableSchema.id.in_(ids[start:start + batch_size])).all()
+            for start in range(0, len(ids), batch_size)
+        ]
+    for rows in batches:
+        changes = []
+        for column_id, categories, current_label in rows:
+            label = sensitivity_label_for_categories(categories)
+            if label != current_label:
+                changes.append({"id": column_id, "datasensitivitylabel": label})
+        if changes:
+            session.execute(update(DataTableSchema), changes)
     session.commit()
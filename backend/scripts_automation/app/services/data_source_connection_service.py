@@ -7,10 +7,13 @@ Similar to Microsoft Purview's data source connection and discovery features
 import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any, Union, cast, Sequence, TypeVar, Iterable, TYPE_CHECKING
+from typing import Dict, List, Optional, Any, Union, cast, Sequence, TypeVar, Iterable, AsyncIterator, Tuple, TYPE_CHECKING
 from datetime import datetime
 import traceback
 import os
+import random
+import re
+from contextlib import closing
 
 # Database connectors
 import psycopg2
@@ -29,6 +32,8 @@ try:
 except ImportError:
     boto3 = None
 from sqlalchemy import create_engine, MetaData, inspect, text
+from sqlalchemy.engine.reflection import ObjectKind
+from sqlalchemy.dialects import mysql as mysql_types
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.engine import Row, RowMapping, CursorResult
 from sqlalchemy.sql.expression import Select
@@ -38,6 +43,10 @@ from sqlmodel import Session, select, func, text, Column, JSON, String
 from app.models.scan_models import DataSource, DataSourceType, DataSourceLocation, CloudProvider
 from app.core.config import settings
 from app.services.data_source_service import DataSourceService
+from app.services.connection_pool_registry import connection_pool_registry
+from app.services.connector_executor import connector_executor
+from app.services.parallel_discovery_engine import discovery_engine, DEFAULT_MAX_IN_FLIGHT
+from app.services.scan_fingerprint import digest
 import aioredis
 
 # Type variables for better type hints
@@ -45,6 +54,7 @@ T = TypeVar('T')
 RowDict = Dict[str, Any]
 TablePreviewResult = List[Dict[str, Union[List[str], List[RowDict], int]]]
 ColumnProfileResult = Dict[str, Any]
+TableProfileResult = Dict[str, Any]
 MongoDocument = Dict[str, Any]
 
 # Setup logging
@@ -79,6 +89,108 @@ def row_to_dict(row: Union[Row, RowMapping, None]) -> Dict[str, Any]:
         return dict(row)
     return {}
 
+def select_profile_columns(available: List[Tuple[str, str]], columns: Optional[List[str]]) -> List[Tuple[str, str]]:
+    """Restrict (column, data_type) pairs to the requested columns, keeping table order."""
+    if not columns:
+        return available
+    known = {name for name, _ in available}
+    missing = [name for name in columns if name not in known]
+    if missing:
+        raise ValueError(f"Unknown columns: {', '.join(missing)}")
+    requested = set(columns)
+    return [(name, data_type) for name, data_type in available if name in requested]
+
+# PostgreSQL types (information_schema data_type) profiled through their text form: no equality
+# operator (json, xml, geometric), or element/extension types that may lack one (arrays, user-defined)
+PG_PROFILE_TEXT_TYPES = {
+    'json', 'xml', 'boolean', 'point', 'line', 'lseg', 'box', 'path', 'polygon', 'circle', 'ARRAY', 'USER-DEFINED'
+}
+# PostgreSQL types with MIN/MAX aggregates; others (uuid, jsonb, bytea, tsvector, ...) get no min/max
+PG_PROFILE_MIN_MAX_TYPES = {
+    'smallint', 'integer', 'bigint', 'numeric', 'real', 'double precision', 'money',
+    'character varying', 'character', 'text', 'name', '"char"',
+    'date', 'time without time zone', 'time with time zone', 'timestamp without time zone',
+    'timestamp with time zone', 'interval', 'inet', 'oid', 'json', 'xml', 'boolean',
+}
+
+def postgres_profile_columns(selected: List[Tuple[str, str]], quote) -> List[Tuple[str, bool]]:
+    """(SQL expression, has min/max) for each selected (column, data_type) of a PostgreSQL table."""
+    return [
+        (f"{quote(name)}::text" if data_type in PG_PROFILE_TEXT_TYPES else quote(name),
+         data_type in PG_PROFILE_MIN_MAX_TYPES)
+        for name, data_type in selected
+    ]
+
+def profile_aggregates(columns: List[Tuple[str, bool]], estimated: Dict[int, int]) -> List[str]:
+    """Select list of the single-pass statistics query, aliased c<i>_* per column."""
+    aggregates = ["COUNT(*) AS total_rows"]
+    for index, (expression, min_max) in enumerate(columns):
+        aggregates.append(f"COUNT({expression}) AS c{index}_non_null")
+        if index not in estimated:
+            aggregates.append(f"COUNT(DISTINCT {expression}) AS c{index}_distinct")
+        if min_max:
+            aggregates.append(f"MIN({expression}) AS c{index}_min")
+            aggregates.append(f"MAX({expression}) AS c{index}_max")
+    return aggregates
+
+MYSQL_COLUMN_TYPE = re.compile(r"(\w+)(?:\((.*)\))?((?:\s+\w+)*)\s*$", re.S)
+
+def mysql_type_name(column_type: str, collation: Optional[str] = None) -> str:
+    """The SQLAlchemy type name the MySQL inspector reflects for an information_schema COLUMN_TYPE.
+
+    Mirrors the dialect's SHOW CREATE TABLE column parsing: the type class comes from the
+    dialect's ischema_names, and collation is passed only when SHOW CREATE would print it
+    (the column's collation differs from the table's).
+    """
+    match = MYSQL_COLUMN_TYPE.match(column_type.strip())
+    if not match:
+        return column_type.upper()
+    type_name, args, flags = match.group(1).lower(), match.group(2), match.group(3).lower().split()
+    type_class = mysql_types.base.MySQLDialect.ischema_names.get(type_name)
+    if type_class is None:
+        return column_type.upper()
+    if issubclass(type_class, (mysql_types.ENUM, mysql_types.SET)):
+        type_args = re.findall(r"'((?:[^']|'')*)'", args or "")
+    else:
+        type_args = [int(value) for value in re.findall(r"\d+", args or "")]
+    type_kw: Dict[str, Any] = {flag: True for flag in ("unsigned", "zerofill") if flag in flags}
+    if issubclass(type_class, (mysql_types.DATETIME, mysql_types.TIME, mysql_types.TIMESTAMP)) and type_args:
+        type_kw["fsp"] = type_args.pop(0)
+    if collation:
+        type_kw["collation"] = collation
+    return str(type_class(*type_args, **type_kw))
+
+def assemble_column_profiles(
+    column_names: List[str],
+    stats: Dict[str, Any],
+    distribution_rows: Iterable[Dict[str, Any]],
+    estimated_distinct: Optional[Dict[int, int]] = None
+) -> Dict[str, ColumnProfileResult]:
+    """Split single-pass table statistics (aliased c<i>_*) into per-column profiles."""
+    profile_date = datetime.now().isoformat()
+    estimated_distinct = estimated_distinct or {}
+    total_rows = int(stats.get("total_rows") or 0)
+    distributions: Dict[int, List[RowDict]] = {}
+    for row in distribution_rows:
+        distributions.setdefault(int(row["column_index"]), []).append(
+            {"value": row["value"], "count": int(row["count"])}
+        )
+    profiles: Dict[str, ColumnProfileResult] = {}
+    for index, name in enumerate(column_names):
+        unique_values = estimated_distinct.get(index, stats.get(f"c{index}_distinct"))
+        profiles[name] = {
+            "statistics": {
+                "total_rows": total_rows,
+                "unique_values": int(unique_values) if unique_values is not None else None,
+                "null_count": total_rows - int(stats.get(f"c{index}_non_null") or 0),
+                "min_value": stats.get(f"c{index}_min"),
+                "max_value": stats.get(f"c{index}_max")
+            },
+            "value_distribution": distributions.get(index, []),
+            "profile_date": profile_date
+        }
+    return profiles
+
 class BaseConnector:
     """Base class for all data source connectors"""
     
@@ -87,21 +199,120 @@ class BaseConnector:
         self.connection = None
     
     async def test_connection(self) -> Dict[str, Any]:
+        """Test connection without blocking the event loop"""
+        return await self._run_blocking(self._test_connection_sync)
+    
+    async def discover_schema(self) -> Dict[str, Any]:
+        """Discover schema structure, fanning discovery units out in parallel when supported"""
+        try:
+            units = await self._run_blocking(self._list_discovery_units_sync)
+            if units is None:
+                return await self._run_blocking(self._discover_schema_sync)
+            results = await discovery_engine.gather_ordered(
+                self._discover_unit, units, self._discovery_concurrency()
+            )
+            return self._assemble_discovery(results)
+        except Exception as e:
+            return self._discovery_failed(e)
+    
+    async def iter_discovery(self) -> AsyncIterator[Tuple[Any, Dict[str, Any]]]:
+        """Stream (unit, result) pairs as each discovery unit (schema, database, bucket) finishes"""
+        units = await self._run_blocking(self._list_discovery_units_sync)
+        if units is None:
+            raise ValueError(f"{type(self).__name__} does not support partial discovery")
+        async for unit, result in discovery_engine.map_unordered(
+            self._discover_unit, units, self._discovery_concurrency()
+        ):
+            yield unit, result
+    
+    async def get_table_preview(self, *args, **kwargs) -> TablePreviewResult:
+        """Get table preview without blocking the event loop"""
+        return await self._run_blocking(self._get_table_preview_sync, *args, **kwargs)
+    
+    async def get_column_profile(self, *args, **kwargs) -> ColumnProfileResult:
+        """Get column profile without blocking the event loop"""
+        return await self._run_blocking(self._get_column_profile_sync, *args, **kwargs)
+    
+    async def get_table_profile(self, *args, **kwargs) -> TableProfileResult:
+        """Profile several columns of a table in one pass without blocking the event loop"""
+        return await self._run_blocking(self._get_table_profile_sync, *args, **kwargs)
+    
+    async def _run_blocking(self, func, *args, **kwargs):
+        """Run blocking driver I/O on the shared connector executor, bounded per data source"""
+        source_key = self.data_source.id if self.data_source.id is not None else f"adhoc:{id(self.data_source)}"
+        return await connector_executor.run(
+            source_key, func, *args, limit=getattr(self.data_source, "pool_size", None), **kwargs
+        )
+    
+    def _test_connection_sync(self) -> Dict[str, Any]:
         """Test connection - to be implemented by subclasses"""
         raise NotImplementedError
     
-    async def discover_schema(self) -> Dict[str, Any]:
+    def _discover_schema_sync(self) -> Dict[str, Any]:
         """Discover schema structure - to be implemented by subclasses"""
         raise NotImplementedError
     
-    async def get_table_preview(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
+    def _list_discovery_units_sync(self) -> Optional[List[Any]]:
+        """Independently discoverable units, or None when only whole-source discovery is supported"""
+        return None
+    
+    def _discover_unit_sync(self, unit: Any) -> Dict[str, Any]:
+        """Discover a single unit - to be implemented by subclasses listing units"""
+        raise NotImplementedError
+    
+    def _change_markers_sync(self, unit: Any) -> Optional[Dict[str, str]]:
+        """Per-table change markers of a unit from cheap catalog queries, or None when not supported.
+        
+        A marker changes whenever the table's definition may have changed (DDL only, never on writes),
+        so incremental scans only re-extract tables whose markers moved.
+        """
+        return None
+    
+    def _row_estimates_sync(self, unit: Any) -> Optional[Dict[str, int]]:
+        """Per-table row estimates of a unit from catalog statistics, or None when not supported.
+        
+        Kept apart from the change markers: estimates move on every write, analyze or vacuum.
+        """
+        return None
+    
+    async def _discover_unit(self, unit: Any) -> Dict[str, Any]:
+        """Discover a single unit - overridden to fan out per table where metadata is expensive"""
+        return await self._run_blocking(self._discover_unit_sync, unit)
+    
+    def _assemble_discovery(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine unit results (in unit order) into the connector's discovery result"""
+        raise NotImplementedError
+    
+    def _discovery_failed(self, error: Exception) -> Dict[str, Any]:
+        """Handle a discovery failure - subclasses may return an error result instead of raising"""
+        logger.error(f"{type(self).__name__} schema discovery failed: {str(error)}")
+        raise error
+    
+    def _discovery_concurrency(self) -> int:
+        """Units discovered concurrently for this data source"""
+        properties = self.data_source.connection_properties or {}
+        return int(properties.get("discovery_concurrency") or self.data_source.pool_size or DEFAULT_MAX_IN_FLIGHT)
+    
+    async def _gather_blocking(self, func, items: List[Any], *args) -> List[Any]:
+        """Run func(*args, item) for every item on the executor and return results in item order"""
+        return await discovery_engine.gather_ordered(
+            lambda item: self._run_blocking(func, *args, item), items, self._discovery_concurrency()
+        )
+    
+    def _get_table_preview_sync(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
         """Get table preview - to be implemented by subclasses"""
         raise NotImplementedError
     
-    async def get_column_profile(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
+    def _get_column_profile_sync(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
         """Get column profile - to be implemented by subclasses"""
         raise NotImplementedError
     
+    def _get_table_profile_sync(self, schema_name: str, table_name: str, columns: Optional[List[str]] = None,
+                                sample_percent: Optional[float] = None, approximate: bool = False,
+                                top_n: int = 10) -> TableProfileResult:
+        """Profile table columns in a single scan - to be implemented by subclasses"""
+        raise NotImplementedError
+    
     def _build_connection_string(self) -> str:
         """Build connection string - to be implemented by subclasses"""
         raise NotImplementedError
@@ -111,6 +322,24 @@ class BaseConnector:
         from app.services.data_source_service import DataSourceService
         return DataSourceService.get_data_source_password(self.data_source)
 
+    def _engine_connect_args(self) -> Dict[str, Any]:
+        """Driver connect arguments for the shared engine - overridden by subclasses"""
+        return {}
+
+    def _discovery_mode(self) -> str:
+        """Schema discovery mode: 'bulk' (set-based catalog queries) or 'inspector' (per table)"""
+        properties = self.data_source.connection_properties or {}
+        return properties.get("discovery_mode", "bulk")
+
+    def _get_engine(self):
+        """Get the shared pooled engine for this data source from the process-wide registry"""
+        return connection_pool_registry.get_engine(
+            self.data_source,
+            self._build_connection_string(),
+            connect_args=self._engine_connect_args(),
+            credential=self._get_password()
+        )
+
 class LocationAwareConnector:
     """Base class for location-aware connectors that handle ON_PREM, CLOUD, and HYBRID deployments"""
     
@@ -220,7 +449,10 @@ class LocationAwareConnector:
 class PostgreSQLConnector(BaseConnector):
     """PostgreSQL connector with advanced discovery capabilities"""
     
-    async def test_connection(self) -> Dict[str, Any]:
+    def _engine_connect_args(self) -> Dict[str, Any]:
+        return {"connect_timeout": 10}
+    
+    def _test_connection_sync(self) -> Dict[str, Any]:
         try:
             password = self._get_password()
             if not password:
@@ -231,8 +463,7 @@ class PostgreSQLConnector(BaseConnector):
                     "recommendations": ["Check secret manager configuration"]
                 }
 
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string, connect_args={"connect_timeout": 10})
+            engine = self._get_engine()
             
             with engine.connect() as conn:
                 result = conn.execute(text("SELECT version(), current_database(), current_user"))
@@ -269,58 +500,246 @@ class PostgreSQLConnector(BaseConnector):
                 "details": {"error": str(e)}
             }
     
-    async def discover_schema(self) -> Dict[str, Any]:
-        try:
-            password = self._get_password()
-            if not password:
-                return {"success": False, "error": "Failed to retrieve password"}
-
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
-            inspector = inspect(engine)
-            
-            databases = []
-            current_db = {
+    def _list_discovery_units_sync(self) -> List[str]:
+        """Discovery fans out per schema"""
+        engine = self._get_engine()
+        if self._discovery_mode() == "bulk":
+            with engine.connect() as conn:
+                return self._get_schema_names_bulk(conn)
+        return [
+            schema_name for schema_name in inspect(engine).get_schema_names()
+            if schema_name not in ('pg_catalog', 'information_schema')
+        ]
+    
+    def _discover_unit_sync(self, schema_name: str) -> Dict[str, Any]:
+        engine = self._get_engine()
+        if self._discovery_mode() == "bulk":
+            with engine.connect() as conn:
+                return self._discover_schema_bulk(conn, schema_name)
+        return self._discover_schema_inspector(inspect(engine), schema_name, engine)
+    
+    def _change_markers_sync(self, schema_name: str) -> Dict[str, str]:
+        """Markers from pg_catalog: column definitions, constraints and indexes"""
+        with self._get_engine().connect() as conn:
+            rows = conn.execute(text("""
+                SELECT c.relname AS name,
+                       md5(string_agg(a.attname || ' ' || format_type(a.atttypid, a.atttypmod) || ' ' ||
+                                      a.attnotnull::text || ' ' || coalesce(pg_get_expr(d.adbin, d.adrelid), ''),
+                                      ',' ORDER BY a.attnum)) AS columns_md5,
+                       (SELECT md5(string_agg(con.conname || ' ' || pg_get_constraintdef(con.oid), ',' ORDER BY con.conname))
+                        FROM pg_constraint con WHERE con.conrelid = c.oid) AS constraints_md5,
+                       (SELECT string_agg(ix.indexrelid::text, ',' ORDER BY ix.indexrelid)
+                        FROM pg_index ix WHERE ix.indrelid = c.oid) AS index_oids
+                FROM pg_class c
+                JOIN pg_namespace n ON n.oid = c.relnamespace
+                LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attnum > 0 AND NOT a.attisdropped
+                LEFT JOIN pg_attrdef d ON d.adrelid = a.attrelid AND d.adnum = a.attnum
+                WHERE n.nspname = :schema AND c.relkind IN ('r', 'p')
+                GROUP BY c.oid, c.relname
+            """), {"schema": schema_name})
+            return {row[0]: digest(list(row[1:])) for row in rows}
+    
+    def _row_estimates_sync(self, schema_name: str) -> Dict[str, int]:
+        """Planner row estimates (reltuples; -1 for never-analyzed tables)"""
+        with self._get_engine().connect() as conn:
+            rows = conn.execute(text("""
+                SELECT c.relname, c.reltuples::bigint
+                FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = :schema AND c.relkind IN ('r', 'p')
+            """), {"schema": schema_name})
+            return {row[0]: int(row[1]) for row in rows}
+    
+    async def _discover_unit(self, schema_name: str) -> Dict[str, Any]:
+        if self._discovery_mode() == "bulk":
+            return await super()._discover_unit(schema_name)
+        
+        # Inspector metadata costs several round trips per table, so fan out per table as well
+        engine = await self._run_blocking(self._get_engine)
+        table_names, view_names = await self._run_blocking(self._list_relations_sync, engine, schema_name)
+        return {
+            "name": schema_name,
+            "tables": await self._gather_blocking(
+                lambda table_name: self._get_table_info(inspect(engine), schema_name, table_name, engine),
+                table_names
+            ),
+            "views": await self._gather_blocking(
+                lambda view_name: self._get_view_info(inspect(engine), schema_name, view_name),
+                view_names
+            )
+        }
+    
+    def _list_relations_sync(self, engine, schema_name: str) -> Tuple[List[str], List[str]]:
+        inspector = inspect(engine)
+        return inspector.get_table_names(schema=schema_name), inspector.get_view_names(schema=schema_name)
+    
+    def _assemble_discovery(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "databases": [{
                 "name": self.data_source.database_name or "default",
-                "schemas": []
-            }
-            
-            # Get all schemas
-            schema_names = inspector.get_schema_names()
-            
-            for schema_name in schema_names:
-                if schema_name in ('pg_catalog', 'information_schema'):
-                    continue
-                
-                schema_info = {
-                    "name": schema_name,
-                    "tables": [],
-                    "views": []
-                }
-                
-                # Get tables in schema
-                table_names = inspector.get_table_names(schema=schema_name)
-                for table_name in table_names:
-                    table_info = await self._get_table_info(inspector, schema_name, table_name, engine)
-                    schema_info["tables"].append(table_info)
-                
-                # Get views in schema
-                view_names = inspector.get_view_names(schema=schema_name)
-                for view_name in view_names:
-                    view_info = await self._get_view_info(inspector, schema_name, view_name)
-                    schema_info["views"].append(view_info)
-                
-                current_db["schemas"].append(schema_info)
-            
-            databases.append(current_db)
-            
-            return {"databases": databases}
-            
-        except Exception as e:
-            logger.error(f"PostgreSQL schema discovery failed: {str(e)}")
-            raise
+                "schemas": results
+            }]
+        }
     
-    async def _get_table_info(self, inspector, schema_name: str, table_name: str, engine) -> Dict[str, Any]:
+    def _discover_schema_inspector(self, inspector, schema_name: str, engine) -> Dict[str, Any]:
+        """Discover a schema table by table through the SQLAlchemy inspector"""
+        schema_info = {
+            "name": schema_name,
+            "tables": [],
+            "views": []
+        }
+        
+        # Get tables in schema
+        for table_name in inspector.get_table_names(schema=schema_name):
+            table_info = self._get_table_info(inspector, schema_name, table_name, engine)
+            schema_info["tables"].append(table_info)
+        
+        # Get views in schema
+        for view_name in inspector.get_view_names(schema=schema_name):
+            view_info = self._get_view_info(inspector, schema_name, view_name)
+            schema_info["views"].append(view_info)
+        
+        return schema_info
+    
+    def _get_schema_names_bulk(self, conn) -> List[str]:
+        """List user schemas from pg_namespace"""
+        rows = conn.execute(text("""
+            SELECT nspname FROM pg_namespace
+            WHERE nspname NOT LIKE 'pg\\_%' AND nspname <> 'information_schema'
+            ORDER BY nspname
+        """))
+        return [row[0] for row in rows]
+    
+    def _discover_schema_bulk(self, conn, schema_name: str) -> Dict[str, Any]:
+        """Discover a whole schema with set-based pg_catalog queries.
+        
+        Pulls relations (with row estimates and sizes), columns, primary/foreign keys and
+        indexes in a handful of queries per schema and assembles the same structure as the
+        inspector-based path.
+        """
+        params = {"schema": schema_name}
+        
+        relations = conn.execute(text("""
+            SELECT c.relname AS name, c.relkind AS kind,
+                   c.reltuples::bigint AS row_estimate,
+                   CASE WHEN c.relkind IN ('r', 'p') THEN pg_total_relation_size(c.oid) END AS size_bytes
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = :schema AND c.relkind IN ('r', 'p', 'v')
+            ORDER BY c.relname
+        """), params).mappings().all()
+        
+        # Columns through the dialect's batched reflection (one query per schema), so
+        # data types come out as the same SQLAlchemy type names as the inspector path
+        columns_by_table: Dict[str, List[Dict[str, Any]]] = {
+            table_name: columns
+            for (_, table_name), columns in inspect(conn).get_multi_columns(
+                schema=schema_name, kind=ObjectKind.ANY
+            ).items()
+        }
+        
+        primary_keys: Dict[str, List[str]] = {}
+        foreign_keys: Dict[str, List[Dict[str, Any]]] = {}
+        fk_actions = {"r": "RESTRICT", "c": "CASCADE", "n": "SET NULL", "d": "SET DEFAULT"}
+        for row in conn.execute(text("""
+            SELECT con.conname AS name, con.contype AS kind, c.relname AS table_name,
+                   con.confupdtype AS on_update, con.confdeltype AS on_delete,
+                   ARRAY(
+                       SELECT a.attname::text FROM unnest(con.conkey) WITH ORDINALITY k(attnum, ord)
+                       JOIN pg_attribute a ON a.attrelid = con.conrelid AND a.attnum = k.attnum
+                       ORDER BY k.ord
+                   ) AS constrained_columns,
+                   rn.nspname AS referred_schema, rc.relname AS referred_table,
+                   ARRAY(
+                       SELECT a.attname::text FROM unnest(con.confkey) WITH ORDINALITY k(attnum, ord)
+                       JOIN pg_attribute a ON a.attrelid = con.confrelid AND a.attnum = k.attnum
+                       ORDER BY k.ord
+                   ) AS referred_columns
+            FROM pg_constraint con
+            JOIN pg_class c ON c.oid = con.conrelid
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            LEFT JOIN pg_class rc ON rc.oid = con.confrelid
+            LEFT JOIN pg_namespace rn ON rn.oid = rc.relnamespace
+            WHERE n.nspname = :schema AND con.contype IN ('p', 'f')
+        """), params).mappings():
+            if row["kind"] == "p":
+                primary_keys[row["table_name"]] = list(row["constrained_columns"] or [])
+                continue
+            options = {}
+            if row["on_update"] in fk_actions:
+                options["onupdate"] = fk_actions[row["on_update"]]
+            if row["on_delete"] in fk_actions:
+                options["ondelete"] = fk_actions[row["on_delete"]]
+            foreign_keys.setdefault(row["table_name"], []).append({
+                "name": row["name"],
+                "constrained_columns": list(row["constrained_columns"] or []),
+                "referred_schema": row["referred_schema"],
+                "referred_table": row["referred_table"],
+                "referred_columns": list(row["referred_columns"] or []),
+                "options": options
+            })
+        
+        indexes: Dict[str, List[Dict[str, Any]]] = {}
+        for row in conn.execute(text("""
+            SELECT t.relname AS table_name, i.relname AS name, ix.indisunique AS is_unique,
+                   ARRAY(
+                       SELECT a.attname::text FROM unnest(ix.indkey::int2[]) WITH ORDINALITY k(attnum, ord)
+                       JOIN pg_attribute a ON a.attrelid = ix.indrelid AND a.attnum = k.attnum
+                       ORDER BY k.ord
+                   ) AS column_names
+            FROM pg_index ix
+            JOIN pg_class t ON t.oid = ix.indrelid
+            JOIN pg_class i ON i.oid = ix.indexrelid
+            JOIN pg_namespace n ON n.oid = t.relnamespace
+            WHERE n.nspname = :schema AND NOT ix.indisprimary
+            ORDER BY t.relname, i.relname
+        """), params).mappings():
+            indexes.setdefault(row["table_name"], []).append({
+                "name": row["name"],
+                "column_names": list(row["column_names"] or []),
+                "unique": row["is_unique"]
+            })
+        
+        schema_info = {
+            "name": schema_name,
+            "tables": [],
+            "views": []
+        }
+        for relation in relations:
+            name = relation["name"]
+            pk_columns = primary_keys.get(name, [])
+            if relation["kind"] == "v":
+                schema_info["views"].append({
+                    "name": name,
+                    "type": "view",
+                    "columns": [
+                        {"name": col["name"], "data_type": str(col["type"]), "nullable": col.get("nullable", True)}
+                        for col in columns_by_table.get(name, [])
+                    ]
+                })
+                continue
+            schema_info["tables"].append({
+                "name": name,
+                "type": "table",
+                "columns": [
+                    {
+                        "name": col["name"],
+                        "data_type": str(col["type"]),
+                        "nullable": col.get("nullable", True),
+                        "default": str(col.get("default", "")),
+                        "primary_key": col["name"] in pk_columns
+                    }
+                    for col in columns_by_table.get(name, [])
+                ],
+                "indexes": indexes.get(name, []),
+                "foreign_keys": foreign_keys.get(name, []),
+                "row_count_estimate": relation["row_estimate"],
+                "size_bytes": relation["size_bytes"],
+                "has_primary_key": bool(pk_columns)
+            })
+        
+        return schema_info
+    
+    def _get_table_info(self, inspector, schema_name: str, table_name: str, engine) -> Dict[str, Any]:
         """Get detailed table information"""
         columns = []
         for column in inspector.get_columns(table_name, schema=schema_name):
@@ -340,15 +759,16 @@ class PostgreSQLConnector(BaseConnector):
         
         # Get additional table metadata
         with engine.connect() as conn:
-            row_count = conn.execute(text(f"""
-                SELECT reltuples::bigint AS estimate
-                FROM pg_class
-                WHERE relname = '{table_name}'
-            """)).scalar()
-            
-            size_bytes = conn.execute(text(f"""
-                SELECT pg_total_relation_size('{schema_name}.{table_name}')
-            """)).scalar()
+            params = {"schema": schema_name, "table": table_name}
+            row_count = conn.execute(text("""
+                SELECT c.reltuples::bigint AS estimate
+                FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                WHERE n.nspname = :schema AND c.relname = :table
+            """), params).scalar()
+            
+            size_bytes = conn.execute(text("""
+                SELECT pg_total_relation_size(format('%I.%I', :schema, :table)::regclass)
+            """), params).scalar()
         
         return {
             "name": table_name,
@@ -361,7 +781,7 @@ class PostgreSQLConnector(BaseConnector):
             "has_primary_key": bool(inspector.get_pk_constraint(table_name, schema=schema_name)["constrained_columns"])
         }
     
-    async def _get_view_info(self, inspector, schema_name: str, view_name: str) -> Dict[str, Any]:
+    def _get_view_info(self, inspector, schema_name: str, view_name: str) -> Dict[str, Any]:
         """Get detailed view information"""
         columns = []
         for column in inspector.get_columns(view_name, schema=schema_name):
@@ -377,26 +797,28 @@ class PostgreSQLConnector(BaseConnector):
             "columns": columns
         }
         
-    async def _get_row_count(self, schema_name: str, table_name: str) -> int:
+    def _get_row_count(self, schema_name: str, table_name: str) -> int:
         """Get approximate row count for table"""
         try:
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
+            engine = self._get_engine()
             
             with engine.connect() as conn:
-                query = text(f"SELECT reltuples::bigint FROM pg_class WHERE relname = :table_name")
-                result = conn.execute(query, {"table_name": table_name})
+                query = text("""
+                    SELECT c.reltuples::bigint
+                    FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+                    WHERE n.nspname = :schema AND c.relname = :table
+                """)
+                result = conn.execute(query, {"schema": schema_name, "table": table_name})
                 row = result.fetchone()
                 return int(row[0]) if row and row[0] else 0
                 
         except Exception:
             return 0
     
-    async def get_table_preview(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
+    def _get_table_preview_sync(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
         """Get preview of table data"""
         try:
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
+            engine = self._get_engine()
             
             with engine.connect() as conn:
                 query = text(f'SELECT * FROM "{schema_name}"."{table_name}" LIMIT :limit')
@@ -426,45 +848,94 @@ class PostgreSQLConnector(BaseConnector):
             logger.error(f"Table preview failed: {str(e)}")
             raise
     
-    async def get_column_profile(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
+    def _get_column_profile_sync(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
         """Get detailed column profile and statistics"""
+        profile = self._get_table_profile_sync(schema_name, table_name, [column_name])
+        return profile["columns"][column_name]
+    
+    def _get_table_profile_sync(self, schema_name: str, table_name: str, columns: Optional[List[str]] = None,
+                                sample_percent: Optional[float] = None, approximate: bool = False,
+                                top_n: int = 10) -> TableProfileResult:
+        """Profile all (or the selected) columns with one aggregate scan and one GROUPING SETS scan"""
         try:
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
+            engine = self._get_engine()
             
             with engine.connect() as conn:
-                # Get basic statistics
-                stats_query = text(f"""
-                    SELECT 
-                        COUNT(*) as total_rows,
-                        COUNT(DISTINCT "{column_name}") as unique_values,
-                        COUNT(CASE WHEN "{column_name}" IS NULL THEN 1 END) as null_count,
-                        MIN("{column_name}") as min_value,
-                        MAX("{column_name}") as max_value
-                    FROM "{schema_name}"."{table_name}"
-                """)
-                stats_result = conn.execute(stats_query).mappings().first()
-                stats = row_to_dict(stats_result)
-                
-                # Get value distribution (top 10 most common values)
-                dist_query = text(f"""
-                    SELECT "{column_name}" as value, COUNT(*) as count
-                    FROM "{schema_name}"."{table_name}"
-                    WHERE "{column_name}" IS NOT NULL
-                    GROUP BY "{column_name}"
-                    ORDER BY count DESC
-                    LIMIT 10
-                """)
-                distribution = [row_to_dict(row) for row in conn.execute(dist_query).mappings()]
+                quote = conn.dialect.identifier_preparer.quote
+                available = [(row[0], row[1]) for row in conn.execute(text("""
+                    SELECT column_name, data_type FROM information_schema.columns
+                    WHERE table_schema = :schema AND table_name = :table
+                    ORDER BY ordinal_position
+                """), {"schema": schema_name, "table": table_name})]
+                if not available:
+                    raise ValueError(f"Table {schema_name}.{table_name} not found")
+                selected = select_profile_columns(available, columns)
+                names = [name for name, _ in selected]
+                profiled = postgres_profile_columns(selected, quote)
+                expressions = [expression for expression, _ in profiled]
+                
+                source = f"{quote(schema_name)}.{quote(table_name)}"
+                if sample_percent:
+                    # Same seed for both scans so statistics and distribution describe one sample
+                    source += f" TABLESAMPLE SYSTEM ({float(sample_percent)}) REPEATABLE ({random.randint(1, 2 ** 31 - 1)})"
+                
+                # Planner estimates stand in for COUNT(DISTINCT), the costliest aggregate
+                estimated: Dict[int, int] = {}
+                if approximate:
+                    n_distinct = {row[0]: float(row[1]) for row in conn.execute(text("""
+                        SELECT attname, n_distinct FROM pg_stats
+                        WHERE schemaname = :schema AND tablename = :table
+                    """), {"schema": schema_name, "table": table_name}) if row[1] is not None}
+                    total_estimate = float(conn.execute(text("""
+                        SELECT c.reltuples FROM pg_class c
+                        JOIN pg_namespace n ON n.oid = c.relnamespace
+                        WHERE n.nspname = :schema AND c.relname = :table
+                    """), {"schema": schema_name, "table": table_name}).scalar() or 0)
+                    for index, name in enumerate(names):
+                        if name in n_distinct:
+                            value = n_distinct[name]
+                            estimated[index] = int(value if value >= 0 else -value * max(total_estimate, 0))
+                
+                aggregates = profile_aggregates(profiled, estimated)
+                stats = row_to_dict(conn.execute(text(
+                    f"SELECT {', '.join(aggregates)} FROM {source}"
+                )).mappings().first())
+                
+                # Top values for every column from one scan: one grouping set per column
+                projections = ", ".join(f"{expression} AS c{index}" for index, expression in enumerate(expressions))
+                column_index = " ".join(f"WHEN GROUPING(c{index}) = 0 THEN {index}" for index in range(len(names)))
+                value = ", ".join(f"c{index}::text" for index in range(len(names)))
+                grouping_sets = ", ".join(f"(c{index})" for index in range(len(names)))
+                distribution = conn.execute(text(f"""
+                    WITH src AS (SELECT {projections} FROM {source}),
+                    grouped AS (
+                        SELECT CASE {column_index} END AS column_index,
+                               COALESCE({value}) AS value,
+                               COUNT(*) AS count
+                        FROM src
+                        GROUP BY GROUPING SETS ({grouping_sets})
+                    )
+                    SELECT column_index, value, count FROM (
+                        SELECT column_index, value, count,
+                               ROW_NUMBER() OVER (PARTITION BY column_index ORDER BY count DESC, value) AS rank
+                        FROM grouped
+                        WHERE value IS NOT NULL
+                    ) ranked
+                    WHERE rank <= :top_n
+                    ORDER BY column_index, rank
+                """), {"top_n": top_n}).mappings().all()
                 
                 return {
-                    "statistics": stats,
-                    "value_distribution": distribution,
+                    "schema_name": schema_name,
+                    "table_name": table_name,
+                    "sample_percent": sample_percent,
+                    "approximate": approximate,
+                    "columns": assemble_column_profiles(names, stats, distribution, estimated),
                     "profile_date": datetime.now().isoformat()
                 }
                 
         except Exception as e:
-            logger.error(f"Column profiling failed: {str(e)}")
+            logger.error(f"Table profiling failed: {str(e)}")
             raise
     
     def _build_connection_string(self) -> str:
@@ -479,7 +950,7 @@ class PostgreSQLConnector(BaseConnector):
 class MySQLConnector(BaseConnector):
     """MySQL connector with discovery capabilities"""
     
-    async def test_connection(self) -> Dict[str, Any]:
+    def _test_connection_sync(self) -> Dict[str, Any]:
         try:
             password = self._get_password()
             if not password:
@@ -489,8 +960,7 @@ class MySQLConnector(BaseConnector):
                     "recommendations": ["Check secret manager configuration"]
                 }
 
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
+            engine = self._get_engine()
             
             start = datetime.now()
             with engine.connect() as conn:
@@ -538,79 +1008,185 @@ class MySQLConnector(BaseConnector):
                 ]
             }
     
-    async def discover_schema(self) -> Dict[str, Any]:
-        try:
-            password = self._get_password()
-            if not password:
-                return {"success": False, "error": "Failed to retrieve password"}
-
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
-            
-            inspector = inspect(engine)
-            schemas = []
-            
-            for schema_name in inspector.get_schema_names():
-                if schema_name in ('information_schema', 'performance_schema', 'mysql'):
-                    continue
-                
-                tables = []
-                for table_name in inspector.get_table_names(schema=schema_name):
-                    columns = []
-                    for column in inspector.get_columns(table_name, schema=schema_name):
-                        columns.append({
-                            "name": column["name"],
-                            "type": str(column["type"]),
-                            "nullable": column.get("nullable", True),
-                            "default": str(column.get("default", ""))
-                        })
-                    
-                    # Get additional table metadata
-                    with engine.connect() as conn:
-                        result = conn.execute(text(f"""
-                            SELECT 
-                                table_rows as row_count,
-                                data_length + index_length as total_bytes
-                            FROM information_schema.tables 
-                            WHERE table_schema = '{schema_name}'
-                            AND table_name = '{table_name}'
-                        """)).mappings().first()
-                    
-                    tables.append({
-                        "name": table_name,
-                        "columns": columns,
-                        "row_count_estimate": result["row_count"] if result else None,
-                        "size_bytes": result["total_bytes"] if result else None,
-                        "has_primary_key": bool(inspector.get_pk_constraint(table_name, schema=schema_name)["constrained_columns"])
-                    })
-                
-                schemas.append({
-                    "name": schema_name,
-                    "tables": tables
-                })
-            
-            return {
-                "success": True,
-                "schema": schemas,
-                "summary": {
-                    "total_schemas": len(schemas),
-                    "total_tables": sum(len(s["tables"]) for s in schemas),
-                    "total_columns": sum(sum(len(t["columns"]) for t in s["tables"]) for s in schemas)
-                }
-            }
-            
-        except Exception as e:
-            logger.error(f"MySQL schema discovery failed: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
+    def _list_discovery_units_sync(self) -> List[str]:
+        """Discovery fans out per schema"""
+        engine = self._get_engine()
+        if self._discovery_mode() == "bulk":
+            with engine.connect() as conn:
+                return [row[0] for row in conn.execute(text("""
+                    SELECT schema_name FROM information_schema.schemata
+                    WHERE schema_name NOT IN ('information_schema', 'performance_schema', 'mysql', 'sys')
+                    ORDER BY schema_name
+                """))]
+        return [
+            schema_name for schema_name in inspect(engine).get_schema_names()
+            if schema_name not in ('information_schema', 'performance_schema', 'mysql')
+        ]
+    
+    def _discover_unit_sync(self, schema_name: str) -> Dict[str, Any]:
+        engine = self._get_engine()
+        if self._discovery_mode() == "bulk":
+            with engine.connect() as conn:
+                return self._discover_schema_bulk(conn, schema_name)
+        return self._discover_schema_inspector(inspect(engine), schema_name, engine)
+    
+    def _change_markers_sync(self, schema_name: str) -> Dict[str, str]:
+        """Markers from information_schema: create time (bumped by table-rebuilding DDL) and a column
+        definition checksum. UPDATE_TIME and TABLE_ROWS are left out: they move on writes, not only on DDL."""
+        with self._get_engine().connect() as conn:
+            rows = conn.execute(text("""
+                SELECT t.table_name, t.create_time,
+                       SUM(CRC32(CONCAT_WS(' ', c.ordinal_position, c.column_name, c.column_type, c.is_nullable,
+                                           c.column_key, IFNULL(c.column_default, '')))) AS columns_checksum
+                FROM information_schema.tables t
+                LEFT JOIN information_schema.columns c
+                  ON c.table_schema = t.table_schema AND c.table_name = t.table_name
+                WHERE t.table_schema = :schema AND t.table_type = 'BASE TABLE'
+                GROUP BY t.table_name, t.create_time
+            """), {"schema": schema_name})
+            return {row[0]: digest(list(row[1:])) for row in rows}
+    
+    def _row_estimates_sync(self, schema_name: str) -> Dict[str, int]:
+        """InnoDB row estimates from information_schema.tables"""
+        with self._get_engine().connect() as conn:
+            rows = conn.execute(text("""
+                SELECT table_name, table_rows FROM information_schema.tables
+                WHERE table_schema = :schema AND table_type = 'BASE TABLE'
+            """), {"schema": schema_name})
+            return {row[0]: int(row[1] or 0) for row in rows}
+    
+    async def _discover_unit(self, schema_name: str) -> Dict[str, Any]:
+        if self._discovery_mode() == "bulk":
+            return await super()._discover_unit(schema_name)
+        
+        # Inspector metadata costs several round trips per table, so fan out per table as well
+        engine = await self._run_blocking(self._get_engine)
+        table_names = await self._run_blocking(lambda: inspect(engine).get_table_names(schema=schema_name))
+        return {
+            "name": schema_name,
+            "tables": await self._gather_blocking(
+                lambda table_name: self._get_table_info_inspector(inspect(engine), schema_name, table_name, engine),
+                table_names
+            )
+        }
+    
+    def _assemble_discovery(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "schema": results,
+            "summary": {
+                "total_schemas": len(results),
+                "total_tables": sum(len(s["tables"]) for s in results),
+                "total_columns": sum(sum(len(t["columns"]) for t in s["tables"]) for s in results)
             }
+        }
+    
+    def _discovery_failed(self, error: Exception) -> Dict[str, Any]:
+        logger.error(f"MySQL schema discovery failed: {str(error)}")
+        return {
+            "success": False,
+            "error": str(error)
+        }
+    
+    def _discover_schema_inspector(self, inspector, schema_name: str, engine) -> Dict[str, Any]:
+        """Discover a schema table by table through the SQLAlchemy inspector"""
+        return {
+            "name": schema_name,
+            "tables": [
+                self._get_table_info_inspector(inspector, schema_name, table_name, engine)
+                for table_name in inspector.get_table_names(schema=schema_name)
+            ]
+        }
     
-    async def get_table_preview(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
+    def _get_table_info_inspector(self, inspector, schema_name: str, table_name: str, engine) -> Dict[str, Any]:
+        """Get table information through the SQLAlchemy inspector"""
+        columns = []
+        for column in inspector.get_columns(table_name, schema=schema_name):
+            columns.append({
+                "name": column["name"],
+                "type": str(column["type"]),
+                "nullable": column.get("nullable", True),
+                "default": str(column.get("default", ""))
+            })
+        
+        # Get additional table metadata
+        with engine.connect() as conn:
+            result = conn.execute(text("""
+                SELECT 
+                    table_rows as row_count,
+                    data_length + index_length as total_bytes
+                FROM information_schema.tables 
+                WHERE table_schema = :schema
+                AND table_name = :table
+            """), {"schema": schema_name, "table": table_name}).mappings().first()
+        
+        return {
+            "name": table_name,
+            "columns": columns,
+            "row_count_estimate": result["row_count"] if result else None,
+            "size_bytes": result["total_bytes"] if result else None,
+            "has_primary_key": bool(inspector.get_pk_constraint(table_name, schema=schema_name)["constrained_columns"])
+        }
+    
+    def _discover_schema_bulk(self, conn, schema_name: str) -> Dict[str, Any]:
+        """Discover a whole schema with three information_schema queries"""
+        params = {"schema": schema_name}
+        
+        table_rows = conn.execute(text("""
+            SELECT TABLE_NAME AS table_name,
+                   TABLE_ROWS AS row_count,
+                   DATA_LENGTH + INDEX_LENGTH AS total_bytes,
+                   TABLE_COLLATION AS table_collation
+            FROM information_schema.tables
+            WHERE TABLE_SCHEMA = :schema AND TABLE_TYPE = 'BASE TABLE'
+            ORDER BY TABLE_NAME
+        """), params).mappings().all()
+        
+        table_collations = {row["table_name"]: row["table_collation"] for row in table_rows}
+        columns_by_table: Dict[str, List[Dict[str, Any]]] = {}
+        for row in conn.execute(text("""
+            SELECT TABLE_NAME AS table_name, COLUMN_NAME AS name, COLUMN_TYPE AS column_type,
+                   IS_NULLABLE AS is_nullable, COLUMN_DEFAULT AS column_default,
+                   COLLATION_NAME AS collation_name
+            FROM information_schema.columns
+            WHERE TABLE_SCHEMA = :schema
+            ORDER BY TABLE_NAME, ORDINAL_POSITION
+        """), params).mappings():
+            collation = row["collation_name"]
+            if collation == table_collations.get(row["table_name"]):
+                collation = None
+            columns_by_table.setdefault(row["table_name"], []).append({
+                "name": row["name"],
+                "type": mysql_type_name(str(row["column_type"]), collation),
+                "nullable": row["is_nullable"] == "YES",
+                "default": str(row["column_default"])
+            })
+        
+        tables_with_pk = {
+            row[0] for row in conn.execute(text("""
+                SELECT TABLE_NAME FROM information_schema.table_constraints
+                WHERE TABLE_SCHEMA = :schema AND CONSTRAINT_TYPE = 'PRIMARY KEY'
+            """), params)
+        }
+        
+        return {
+            "name": schema_name,
+            "tables": [
+                {
+                    "name": row["table_name"],
+                    "columns": columns_by_table.get(row["table_name"], []),
+                    "row_count_estimate": row["row_count"],
+                    "size_bytes": row["total_bytes"],
+                    "has_primary_key": row["table_name"] in tables_with_pk
+                }
+                for row in table_rows
+            ]
+        }
+    
+    def _get_table_preview_sync(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
         """Get preview of table data"""
         try:
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
+            engine = self._get_engine()
             
             with engine.connect() as conn:
                 query = text(f'SELECT * FROM `{schema_name}`.`{table_name}` LIMIT :limit')
@@ -639,42 +1215,91 @@ class MySQLConnector(BaseConnector):
             logger.error(f"Table preview failed: {str(e)}")
             raise
     
-    async def get_column_profile(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
+    # Spatial and JSON values are grouped and compared through their text form
+    PROFILE_SPATIAL_TYPES = {'geometry', 'point', 'linestring', 'polygon', 'multipoint',
+                             'multilinestring', 'multipolygon', 'geometrycollection'}
+    
+    def _get_column_profile_sync(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
         """Get detailed column profile and statistics"""
+        profile = self._get_table_profile_sync(schema_name, table_name, [column_name])
+        return profile["columns"][column_name]
+    
+    def _get_table_profile_sync(self, schema_name: str, table_name: str, columns: Optional[List[str]] = None,
+                                sample_percent: Optional[float] = None, approximate: bool = False,
+                                top_n: int = 10) -> TableProfileResult:
+        """Profile all (or the selected) columns with one aggregate scan and one scan of a shared CTE"""
         try:
-            connection_string = self._build_connection_string()
-            engine = create_engine(connection_string)
+            engine = self._get_engine()
             
             with engine.connect() as conn:
-                # Get basic statistics
-                stats = conn.execute(text(f"""
-                    SELECT 
-                        COUNT(*) as total_rows,
-                        COUNT(DISTINCT `{column_name}`) as unique_values,
-                        COUNT(CASE WHEN `{column_name}` IS NULL THEN 1 END) as null_count,
-                        MIN(`{column_name}`) as min_value,
-                        MAX(`{column_name}`) as max_value
-                    FROM `{schema_name}`.`{table_name}`
-                """)).mappings().first()
-                
-                # Get value distribution (top 10 most common values)
-                distribution = conn.execute(text(f"""
-                    SELECT `{column_name}` as value, COUNT(*) as count
-                    FROM `{schema_name}`.`{table_name}`
-                    WHERE `{column_name}` IS NOT NULL
-                    GROUP BY `{column_name}`
-                    ORDER BY count DESC
-                    LIMIT 10
-                """)).mappings().all()
+                quote = conn.dialect.identifier_preparer.quote
+                available = [(row[0], row[1].lower()) for row in conn.execute(text("""
+                    SELECT COLUMN_NAME, DATA_TYPE FROM information_schema.COLUMNS
+                    WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table
+                    ORDER BY ORDINAL_POSITION
+                """), {"schema": schema_name, "table": table_name})]
+                if not available:
+                    raise ValueError(f"Table {schema_name}.{table_name} not found")
+                selected = select_profile_columns(available, columns)
+                names = [name for name, _ in selected]
+                expressions = []
+                for name, data_type in selected:
+                    if data_type in self.PROFILE_SPATIAL_TYPES:
+                        expressions.append(f"ST_AsText({quote(name)})")
+                    elif data_type == 'json':
+                        expressions.append(f"CAST({quote(name)} AS CHAR)")
+                    else:
+                        expressions.append(quote(name))
+                
+                source = f"{quote(schema_name)}.{quote(table_name)}"
+                # MySQL has no TABLESAMPLE; a seeded RAND() filter keeps both scans on the same rows
+                sample_filter = ""
+                if sample_percent:
+                    sample_filter = f" WHERE RAND({random.randint(1, 2 ** 31 - 1)}) < {float(sample_percent) / 100}"
+                
+                # Index cardinality (leading index column) stands in for COUNT(DISTINCT) where available
+                estimated: Dict[int, int] = {}
+                if approximate:
+                    cardinality = {row[0]: int(row[1]) for row in conn.execute(text("""
+                        SELECT COLUMN_NAME, MAX(CARDINALITY) FROM information_schema.STATISTICS
+                        WHERE TABLE_SCHEMA = :schema AND TABLE_NAME = :table AND SEQ_IN_INDEX = 1
+                        GROUP BY COLUMN_NAME
+                    """), {"schema": schema_name, "table": table_name}) if row[1] is not None}
+                    estimated = {index: cardinality[name] for index, name in enumerate(names) if name in cardinality}
+                
+                aggregates = ["COUNT(*) AS total_rows"]
+                for index, expression in enumerate(expressions):
+                    aggregates.append(f"COUNT({expression}) AS c{index}_non_null")
+                    if index not in estimated:
+                        aggregates.append(f"COUNT(DISTINCT {expression}) AS c{index}_distinct")
+                    aggregates.append(f"MIN({expression}) AS c{index}_min")
+                    aggregates.append(f"MAX({expression}) AS c{index}_max")
+                stats = row_to_dict(conn.execute(text(
+                    f"SELECT {', '.join(aggregates)} FROM {source}{sample_filter}"
+                )).mappings().first())
+                
+                # MySQL lacks GROUPING SETS; a CTE referenced by every branch is materialized once
+                projections = ", ".join(f"{expression} AS c{index}" for index, expression in enumerate(expressions))
+                branches = " UNION ALL ".join(
+                    f"(SELECT {index} AS column_index, CAST(c{index} AS CHAR) AS value, COUNT(*) AS count "
+                    f"FROM src WHERE c{index} IS NOT NULL GROUP BY c{index} ORDER BY count DESC LIMIT {int(top_n)})"
+                    for index in range(len(names))
+                )
+                distribution = conn.execute(text(
+                    f"WITH src AS (SELECT {projections} FROM {source}{sample_filter}) {branches}"
+                )).mappings().all()
                 
                 return {
-                    "statistics": row_to_dict(stats),
-                    "value_distribution": [row_to_dict(row) for row in distribution],
+                    "schema_name": schema_name,
+                    "table_name": table_name,
+                    "sample_percent": sample_percent,
+                    "approximate": approximate,
+                    "columns": assemble_column_profiles(names, stats, distribution, estimated),
                     "profile_date": datetime.now().isoformat()
                 }
                 
         except Exception as e:
-            logger.error(f"Column profiling failed: {str(e)}")
+            logger.error(f"Table profiling failed: {str(e)}")
             raise
     
     def _build_connection_string(self) -> str:
@@ -689,7 +1314,7 @@ class MySQLConnector(BaseConnector):
 class MongoDBConnector(BaseConnector):
     """MongoDB connector with discovery capabilities"""
     
-    async def test_connection(self) -> Dict[str, Any]:
+    def _test_connection_sync(self) -> Dict[str, Any]:
         try:
             password = self._get_password()
             if not password:
@@ -726,77 +1351,105 @@ class MongoDBConnector(BaseConnector):
                 ]
             }
     
-    async def discover_schema(self) -> Dict[str, Any]:
+    def _list_discovery_units_sync(self) -> List[str]:
+        """Discovery fans out per database"""
+        client = pymongo.MongoClient(self._build_connection_string())
         try:
-            password = self._get_password()
-            if not password:
-                return {"success": False, "error": "Failed to retrieve password"}
-
-            connection_string = self._build_connection_string()
-            client = pymongo.MongoClient(connection_string)
-            
-            # Get database names
-            db_names = client.list_database_names()
+            return [
+                db_name for db_name in client.list_database_names()
+                if db_name not in ('admin', 'local', 'config')
+            ]
+        finally:
+            client.close()
+    
+    def _discover_unit_sync(self, db_name: str) -> Dict[str, Any]:
+        client = pymongo.MongoClient(self._build_connection_string())
+        try:
+            db_info = {
+                "name": db_name,
+                "collections": []
+            }
             
-            databases = []
-            for db_name in db_names:
-                if db_name in ('admin', 'local', 'config'):
-                    continue
-                
-                db_info = {
-                    "name": db_name,
-                    "collections": []
+            # Get collection names for the database
+            collection_names = client[db_name].list_collection_names()
+            
+            for collection_name in collection_names:
+                # Get collection metadata
+                collection_info = {
+                    "name": collection_name,
+                    "type": "collection",
+                    "size_bytes": 0,
+                    "row_count_estimate": 0,
+                    "has_primary_key": False
                 }
                 
-                # Get collection names for each database
-                collection_names = client[db_name].list_collection_names()
-                
-                for collection_name in collection_names:
-                    # Get collection metadata
-                    collection_info = {
-                        "name": collection_name,
-                        "type": "collection",
-                        "size_bytes": 0,
-                        "row_count_estimate": 0,
-                        "has_primary_key": False
-                    }
-                    
-                    # Attempt to get size and row count if possible
-                    try:
-                        collection_info["size_bytes"] = client[db_name][collection_name].estimated_data_size()
-                        collection_info["row_count_estimate"] = client[db_name][collection_name].count_documents({})
-                    except Exception as e:
-                        logger.warning(f"Could not get size/row count for collection {collection_name}: {e}")
-                    
-                    # Attempt to get primary key if available
-                    try:
-                        pk_info = client[db_name][collection_name].find_one({}, {"_id": 1})
-                        if pk_info and "_id" in pk_info:
-                            collection_info["has_primary_key"] = True
-                    except Exception as e:
-                        logger.warning(f"Could not get primary key for collection {collection_name}: {e}")
-                    
-                    db_info["collections"].append(collection_info)
+                # Attempt to get size and row count if possible
+                try:
+                    collection_info["size_bytes"] = client[db_name][collection_name].estimated_data_size()
+                    collection_info["row_count_estimate"] = client[db_name][collection_name].count_documents({})
+                except Exception as e:
+                    logger.warning(f"Could not get size/row count for collection {collection_name}: {e}")
+                
+                # Attempt to get primary key if available
+                try:
+                    pk_info = client[db_name][collection_name].find_one({}, {"_id": 1})
+                    if pk_info and "_id" in pk_info:
+                        collection_info["has_primary_key"] = True
+                except Exception as e:
+                    logger.warning(f"Could not get primary key for collection {collection_name}: {e}")
                 
-                databases.append(db_info)
+                db_info["collections"].append(collection_info)
             
+            return db_info
+        finally:
+            client.close()
+    
+    def _change_markers_sync(self, db_name: str) -> Dict[str, str]:
+        """Markers from listCollections options (validators, collation, capped/timeseries settings)
+        and index definitions. Fields inferred from documents are only re-sampled by full scans."""
+        client = pymongo.MongoClient(self._build_connection_string())
+        try:
+            database = client[db_name]
             return {
-                "success": True,
-                "schema": databases,
-                "summary": {
-                    "total_databases": len(databases),
-                    "total_collections": sum(len(db.get("collections", [])) for db in databases)
-                }
+                info["name"]: digest([info.get("options"), sorted(
+                    (index["name"], index.get("key")) for index in database[info["name"]].list_indexes()
+                )])
+                for info in database.list_collections()
+                if info.get("type", "collection") == "collection"
             }
-            
-        except Exception as e:
-            logger.error(f"MongoDB schema discovery failed: {str(e)}")
+        finally:
+            client.close()
+    
+    def _row_estimates_sync(self, db_name: str) -> Dict[str, int]:
+        """Metadata-based document counts"""
+        client = pymongo.MongoClient(self._build_connection_string())
+        try:
+            database = client[db_name]
             return {
-                "success": False,
-                "error": str(e)
+                name: database[name].estimated_document_count()
+                for name in database.list_collection_names(filter={"type": "collection"})
             }
+        finally:
+            client.close()
+    
+    def _assemble_discovery(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "schema": results,
+            "summary": {
+                "total_databases": len(results),
+                "total_collections": sum(len(db.get("collections", [])) for db in results)
+            }
+        }
+    
+    def _discovery_failed(self, error: Exception) -> Dict[str, Any]:
+        logger.error(f"MongoDB schema discovery failed: {str(error)}")
+        return {
+            "success": False,
+            "error": str(error)
+        }
     
-    async def get_table_preview(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
+    def _get_table_preview_sync(self, schema_name: str, table_name: str, limit: int = 100) -> TablePreviewResult:
         """Get preview of MongoDB collection data"""
         client = None
         try:
@@ -834,7 +1487,7 @@ class MongoDBConnector(BaseConnector):
             if client:
                 client.close()
     
-    async def get_column_profile(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
+    def _get_column_profile_sync(self, schema_name: str, table_name: str, column_name: str) -> ColumnProfileResult:
         """Get detailed column profile and statistics"""
         client = None
         try:
@@ -912,18 +1565,14 @@ class MongoDBConnector(BaseConnector):
 class SnowflakeConnector(BaseConnector):
     """Snowflake connector with discovery capabilities"""
     
-    async def test_connection(self) -> Dict[str, Any]:
-        try:
-            password = self._get_password()
-            if not password:
-                return {
-                    "success": False,
-                    "message": "Failed to retrieve password",
-                    "recommendations": ["Check secret manager configuration"]
-                }
+    def _get_connection(self):
+        """Check out a connection from the shared Snowflake pool; close() returns it to the pool"""
+        password = self._get_password()
+        if not password:
+            raise ValueError("Failed to retrieve password")
 
-            connection_string = self._build_connection_string()
-            conn = snowflake.connector.connect(
+        def creator():
+            return snowflake.connector.connect(
                 user=self.data_source.username,
                 password=password,
                 account=self.data_source.host,
@@ -932,9 +1581,27 @@ class SnowflakeConnector(BaseConnector):
                 role=self.data_source.username,
                 application="data_source_discovery"
             )
-            
+
+        pool = connection_pool_registry.get_pool(
+            self.data_source,
+            f"snowflake://{self.data_source.username}@{self.data_source.host}/{self.data_source.database_name or ''}",
+            creator,
+            credential=password
+        )
+        return pool.connect()
+    
+    def _test_connection_sync(self) -> Dict[str, Any]:
+        try:
+            password = self._get_password()
+            if not password:
+                return {
+                    "success": False,
+                    "message": "Failed to retrieve password",
+                    "recommendations": ["Check secret manager configuration"]
+                }
+
             # Test connection by executing a simple query
-            with conn.cursor() as cursor:
+            with closing(self._get_connection()) as conn, conn.cursor() as cursor:
                 cursor.execute("SELECT 1")
                 result = cursor.fetchone()
                 if result == (1,):
@@ -965,122 +1632,98 @@ class SnowflakeConnector(BaseConnector):
                 ]
             }
     
-    async def discover_schema(self) -> Dict[str, Any]:
-        try:
-            password = self._get_password()
-            if not password:
-                return {"success": False, "error": "Failed to retrieve password"}
-
-            connection_string = self._build_connection_string()
-            conn = snowflake.connector.connect(
-                user=self.data_source.username,
-                password=password,
-                account=self.data_source.host,
-                warehouse=self.data_source.database_name,
-                database=self.data_source.database_name,
-                role=self.data_source.username,
-                application="data_source_discovery"
-            )
+    def _list_discovery_units_sync(self) -> List[Tuple[str, str]]:
+        """Discovery fans out per (database, schema)"""
+        excluded = ('INFORMATION_SCHEMA', 'SNOWFLAKE', 'SYSTEM')
+        units = []
+        with closing(self._get_connection()) as conn, conn.cursor() as cursor:
+            # Get database names
+            cursor.execute("SHOW DATABASES")
+            databases = [row[0] for row in cursor.fetchall()]
             
-            with conn.cursor() as cursor:
-                # Get database names
-                cursor.execute("SHOW DATABASES")
-                databases = [row[0] for row in cursor.fetchall()]
-                
-                schema_info = []
-                for db_name in databases:
-                    if db_name in ('INFORMATION_SCHEMA', 'SNOWFLAKE', 'SYSTEM'):
-                        continue
-                    
-                    with conn.cursor() as inner_cursor:
-                        # Get schema names within the database
-                        inner_cursor.execute(f"SHOW SCHEMAS IN {db_name}")
-                        schema_names = [row[0] for row in inner_cursor.fetchall()]
-                        
-                        for schema_name in schema_names:
-                            if schema_name in ('INFORMATION_SCHEMA', 'SNOWFLAKE', 'SYSTEM'):
-                                continue
-                            
-                            tables = []
-                            with conn.cursor() as table_cursor:
-                                # Get table names within the schema
-                                table_cursor.execute(f"SHOW TABLES IN {db_name}.{schema_name}")
-                                table_names = [row[0] for row in table_cursor.fetchall()]
-                                
-                                for table_name in table_names:
-                                    columns = []
-                                    with conn.cursor() as column_cursor:
-                                        # Get column names and types
-                                        column_cursor.execute(f"DESCRIBE {db_name}.{schema_name}.{table_name}")
-                                        for row in column_cursor.fetchall():
-                                            columns.append({
-                                                "name": row[0],
-                                                "type": row[1],
-                                                "nullable": row[2] == 'YES',
-                                                "default": row[3] if row[3] else None
-                                            })
-                                    
-                                    # Get additional table metadata
-                                    with conn.cursor() as metadata_cursor:
-                                        metadata_cursor.execute(f"""
-                                            SELECT 
-                                                table_rows as row_count,
-                                                total_bytes as size_bytes
-                                            FROM snowflake.account_usage.table_storage_usage
-                                            WHERE database_name = '{db_name}'
-                                            AND schema_name = '{schema_name}'
-                                            AND table_name = '{table_name}'
-                                        """)
-                                        result = metadata_cursor.fetchone()
-                                        row_count = result[0] if result else 0
-                                        size_bytes = result[1] if result else 0
-                                    
-                                    tables.append({
-                                        "name": table_name,
-                                        "type": "table",
-                                        "columns": columns,
-                                        "row_count_estimate": row_count,
-                                        "size_bytes": size_bytes,
-                                        "has_primary_key": False # Snowflake doesn't have a direct PK constraint like PostgreSQL
-                                    })
-                            
-                            schema_info.append({
-                                "name": schema_name,
-                                "tables": tables
-                            })
+            for db_name in databases:
+                if db_name in excluded:
+                    continue
+                # Get schema names within the database
+                cursor.execute(f"SHOW SCHEMAS IN {db_name}")
+                units.extend(
+                    (db_name, row[0]) for row in cursor.fetchall() if row[0] not in excluded
+                )
+        return units
+    
+    def _discover_unit_sync(self, unit: Tuple[str, str]) -> Dict[str, Any]:
+        db_name, schema_name = unit
+        tables = []
+        with closing(self._get_connection()) as conn, conn.cursor() as table_cursor:
+            # Get table names within the schema
+            table_cursor.execute(f"SHOW TABLES IN {db_name}.{schema_name}")
+            table_names = [row[0] for row in table_cursor.fetchall()]
+            
+            for table_name in table_names:
+                columns = []
+                with conn.cursor() as column_cursor:
+                    # Get column names and types
+                    column_cursor.execute(f"DESCRIBE {db_name}.{schema_name}.{table_name}")
+                    for row in column_cursor.fetchall():
+                        columns.append({
+                            "name": row[0],
+                            "type": row[1],
+                            "nullable": row[2] == 'YES',
+                            "default": row[3] if row[3] else None
+                        })
                 
-                return {
-                    "success": True,
-                    "schema": schema_info,
-                    "summary": {
-                        "total_databases": len(databases),
-                        "total_schemas": sum(len(s["tables"]) for s in schema_info),
-                        "total_tables": sum(len(t["tables"]) for s in schema_info for t in s["tables"])
-                    }
-                }
-            
-        except Exception as e:
-            logger.error(f"Snowflake schema discovery failed: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
+                # Get additional table metadata
+                with conn.cursor() as metadata_cursor:
+                    metadata_cursor.execute("""
+                        SELECT 
+                            table_rows as row_count,
+                            total_bytes as size_bytes
+                        FROM snowflake.account_usage.table_storage_usage
+                        WHERE database_name = %s
+                        AND schema_name = %s
+                        AND table_name = %s
+                    """, (db_name, schema_name, table_name))
+                    result = metadata_cursor.fetchone()
+                    row_count = result[0] if result else 0
+                    size_bytes = result[1] if result else 0
+                
+                tables.append({
+                    "name": table_name,
+                    "type": "table",
+                    "columns": columns,
+                    "row_count_estimate": row_count,
+                    "size_bytes": size_bytes,
+                    "has_primary_key": False # Snowflake doesn't have a direct PK constraint like PostgreSQL
+                })
+        
+        return {
+            "database": db_name,
+            "name": schema_name,
+            "tables": tables
+        }
+    
+    def _assemble_discovery(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "success": True,
+            "schema": results,
+            "summary": {
+                "total_databases": len({s["database"] for s in results}),
+                "total_schemas": len(results),
+                "total_tables": sum(len(s["tables"]) for s in results)
             }
+        }
     
-    async def get_table_preview(self, db_name: str, schema_name: str, table_name: str, limit: int = 100) -> List[Dict]:
+    def _discovery_failed(self, error: Exception) -> Dict[str, Any]:
+        logger.error(f"Snowflake schema discovery failed: {str(error)}")
+        return {
+            "success": False,
+            "error": str(error)
+        }
+    
+    def _get_table_preview_sync(self, db_name: str, schema_name: str, table_name: str, limit: int = 100) -> List[Dict]:
         """Get preview of table data"""
         try:
-            connection_string = self._build_connection_string()
-            conn = snowflake.connector.connect(
-                user=self.data_source.username,
-                password=password,
-                account=self.data_source.host,
-                warehouse=self.data_source.database_name,
-                database=self.data_source.database_name,
-                role=self.data_source.username,
-                application="data_source_discovery"
-            )
-            
-            with conn.cursor() as cursor:
+            with closing(self._get_connection()) as conn, conn.cursor() as cursor:
                 query = text(f"""
                     SELECT * FROM {db_name}.{schema_name}.{table_name} LIMIT :limit
                 """)
@@ -1109,60 +1752,86 @@ class SnowflakeConnector(BaseConnector):
             logger.error(f"Table preview failed: {str(e)}")
             raise
     
-    async def get_column_profile(self, db_name: str, schema_name: str, table_name: str, column_name: str) -> Dict[str, Any]:
+    def _get_column_profile_sync(self, db_name: str, schema_name: str, table_name: str, column_name: str) -> Dict[str, Any]:
         """Get detailed column profile and statistics"""
+        profile = self._get_table_profile_sync(db_name, schema_name, table_name, [column_name])
+        return profile["columns"][column_name]
+    
+    def _get_table_profile_sync(self, db_name: str, schema_name: str, table_name: str, columns: Optional[List[str]] = None,
+                                sample_percent: Optional[float] = None, approximate: bool = False,
+                                top_n: int = 10) -> TableProfileResult:
+        """Profile all (or the selected) columns with one aggregate scan and one GROUPING SETS scan"""
+        def quote(identifier: str) -> str:
+            return '"' + identifier.replace('"', '""') + '"'
+        
+        def fetch_dicts(cursor) -> List[Dict[str, Any]]:
+            keys = [col[0].lower() for col in cursor.description]
+            return [dict(zip(keys, row)) for row in cursor.fetchall()]
+        
         try:
-            connection_string = self._build_connection_string()
-            conn = snowflake.connector.connect(
-                user=self.data_source.username,
-                password=password,
-                account=self.data_source.host,
-                warehouse=self.data_source.database_name,
-                database=self.data_source.database_name,
-                role=self.data_source.username,
-                application="data_source_discovery"
-            )
-            
-            with conn.cursor() as cursor:
-                # Get basic statistics
-                stats = {}
-                try:
-                    cursor.execute(f"""
-                        SELECT 
-                            COUNT(*) as total_rows,
-                            COUNT(DISTINCT "{column_name}") as unique_values,
-                            COUNT(CASE WHEN "{column_name}" IS NULL THEN 1 END) as null_count,
-                            MIN("{column_name}") as min_value,
-                            MAX("{column_name}") as max_value
-                        FROM {db_name}.{schema_name}.{table_name}
-                    """)
-                    stats = cursor.fetchone()
-                except Exception as e:
-                    logger.warning(f"Could not get stats for column {column_name}: {e}")
-                
-                # Get value distribution (top 10 most common values)
-                distribution = []
-                try:
-                    cursor.execute(f"""
-                        SELECT "{column_name}" as value, COUNT(*) as count
-                        FROM {db_name}.{schema_name}.{table_name}
-                        WHERE "{column_name}" IS NOT NULL
-                        GROUP BY "{column_name}"
-                        ORDER BY count DESC
-                        LIMIT 10
-                    """)
-                    distribution = cursor.fetchall()
-                except Exception as e:
-                    logger.warning(f"Could not get distribution for column {column_name}: {e}")
+            with closing(self._get_connection()) as conn, conn.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT COLUMN_NAME, DATA_TYPE FROM {quote(db_name)}.INFORMATION_SCHEMA.COLUMNS
+                    WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                    ORDER BY ORDINAL_POSITION
+                """, (schema_name, table_name))
+                available = [(row[0], row[1]) for row in cursor.fetchall()]
+                if not available:
+                    raise ValueError(f"Table {db_name}.{schema_name}.{table_name} not found")
+                selected = select_profile_columns(available, columns)
+                names = [name for name, _ in selected]
+                expressions = [quote(name) for name in names]
+                
+                source = f"{quote(db_name)}.{quote(schema_name)}.{quote(table_name)}"
+                if sample_percent:
+                    # Same seed for both scans so statistics and distribution describe one sample
+                    source += f" TABLESAMPLE SYSTEM ({float(sample_percent)}) SEED ({random.randint(0, 2 ** 31 - 1)})"
+                
+                # APPROX_COUNT_DISTINCT is HyperLogLog-based and avoids the per-column distinct sort
+                aggregates = ["COUNT(*) AS total_rows"]
+                for index, expression in enumerate(expressions):
+                    aggregates.append(f"COUNT({expression}) AS c{index}_non_null")
+                    distinct = f"APPROX_COUNT_DISTINCT({expression})" if approximate else f"COUNT(DISTINCT {expression})"
+                    aggregates.append(f"{distinct} AS c{index}_distinct")
+                    aggregates.append(f"MIN({expression}) AS c{index}_min")
+                    aggregates.append(f"MAX({expression}) AS c{index}_max")
+                cursor.execute(f"SELECT {', '.join(aggregates)} FROM {source}")
+                rows = fetch_dicts(cursor)
+                stats = rows[0] if rows else {}
+                
+                # Top values for every column from one scan: one grouping set per column
+                projections = ", ".join(f"{expression} AS c{index}" for index, expression in enumerate(expressions))
+                column_index = " ".join(f"WHEN GROUPING(c{index}) = 0 THEN {index}" for index in range(len(names)))
+                value = ", ".join(f"TO_VARCHAR(c{index})" for index in range(len(names)))
+                grouping_sets = ", ".join(f"(c{index})" for index in range(len(names)))
+                cursor.execute(f"""
+                    WITH src AS (SELECT {projections} FROM {source}),
+                    grouped AS (
+                        SELECT CASE {column_index} END AS column_index,
+                               COALESCE({value}) AS value,
+                               COUNT(*) AS count
+                        FROM src
+                        GROUP BY GROUPING SETS ({grouping_sets})
+                    )
+                    SELECT column_index, value, count FROM grouped
+                    WHERE value IS NOT NULL
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY column_index ORDER BY count DESC, value) <= %s
+                    ORDER BY column_index, count DESC
+                """, (int(top_n),))
+                distribution = fetch_dicts(cursor)
                 
                 return {
-                    "statistics": row_to_dict(stats),
-                    "value_distribution": [row_to_dict(row) for row in distribution],
+                    "database_name": db_name,
+                    "schema_name": schema_name,
+                    "table_name": table_name,
+                    "sample_percent": sample_percent,
+                    "approximate": approximate,
+                    "columns": assemble_column_profiles(names, stats, distribution),
                     "profile_date": datetime.now().isoformat()
                 }
                 
         except Exception as e:
-            logger.error(f"Column profiling failed: {str(e)}")
+            logger.error(f"Table profiling failed: {str(e)}")
             raise
     
     def _build_connection_string(self) -> str:
@@ -1177,7 +1846,7 @@ class SnowflakeConnector(BaseConnector):
 class S3Connector(BaseConnector):
     """S3 connector for file-based data sources"""
     
-    async def test_connection(self) -> Dict[str, Any]:
+    def _test_connection_sync(self) -> Dict[str, Any]:
         try:
             s3_client = boto3.client(
                 's3',
@@ -1213,89 +1882,89 @@ class S3Connector(BaseConnector):
                 ]
             }
     
-    async def discover_schema(self) -> Dict[str, Any]:
+    def _get_s3_client(self):
+        """boto3 clients are thread-safe, so one client serves every bucket unit"""
+        return boto3.client(
+            's3',
+            aws_access_key_id=self.data_source.username,
+            aws_secret_access_key=self.data_source.password_secret,
+            region_name=self.data_source.database_name or 'us-east-1'
+        )
+    
+    def _list_discovery_units_sync(self) -> List[Dict[str, Any]]:
+        """Discovery fans out per bucket"""
+        self._s3_client = self._get_s3_client()
+        response = self._s3_client.list_buckets()
+        return list(response.get('Buckets', []))
+    
+    def _discover_unit_sync(self, bucket: Dict[str, Any]) -> Dict[str, Any]:
+        s3_client = getattr(self, "_s3_client", None) or self._get_s3_client()
+        bucket_name = bucket['Name']
         try:
-            s3_client = boto3.client(
-                's3',
-                aws_access_key_id=self.data_source.username,
-                aws_secret_access_key=self.data_source.password_secret,
-                region_name=self.data_source.database_name or 'us-east-1'
-            )
+            # Get bucket location
+            location = s3_client.get_bucket_location(Bucket=bucket_name)
+            region = location.get('LocationConstraint') or 'us-east-1'
             
-            # List all buckets
-            response = s3_client.list_buckets()
-            buckets = []
+            # Get bucket versioning status
+            versioning = s3_client.get_bucket_versioning(Bucket=bucket_name)
+            versioning_status = versioning.get('Status', 'Disabled')
             
-            for bucket in response.get('Buckets', []):
-                bucket_name = bucket['Name']
-                try:
-                    # Get bucket location
-                    location = s3_client.get_bucket_location(Bucket=bucket_name)
-                    region = location.get('LocationConstraint') or 'us-east-1'
-                    
-                    # Get bucket versioning status
-                    versioning = s3_client.get_bucket_versioning(Bucket=bucket_name)
-                    versioning_status = versioning.get('Status', 'Disabled')
-                    
-                    # Get bucket encryption
-                    try:
-                        encryption = s3_client.get_bucket_encryption(Bucket=bucket_name)
-                        encryption_type = encryption.get('ServerSideEncryptionConfiguration', {}).get('Rules', [{}])[0].get('ApplyServerSideEncryptionByDefault', {}).get('SSEAlgorithm')
-                    except s3_client.exceptions.ClientError:
-                        encryption_type = 'None'
-                    
-                    # Get bucket objects (limited to 1000)
-                    objects = []
-                    paginator = s3_client.get_paginator('list_objects_v2')
-                    for page in paginator.paginate(Bucket=bucket_name, MaxKeys=1000):
-                        for obj in page.get('Contents', []):
-                            # Get object metadata
-                            head = s3_client.head_object(Bucket=bucket_name, Key=obj['Key'])
-                            objects.append({
-                                "key": obj['Key'],
-                                "size": obj['Size'],
-                                "last_modified": obj['LastModified'].isoformat(),
-                                "storage_class": obj['StorageClass'],
-                                "content_type": head.get('ContentType'),
-                                "metadata": head.get('Metadata', {}),
-                                "etag": head.get('ETag'),
-                                "version_id": head.get('VersionId')
-                            })
-                    
-                    buckets.append({
-                        "name": bucket_name,
-                        "creation_date": bucket['CreationDate'].isoformat(),
-                        "region": region,
-                        "versioning": versioning_status,
-                        "encryption": encryption_type,
-                        "objects": objects,
-                        "total_objects": len(objects),
-                        "total_size": sum(obj['size'] for obj in objects)
-                    })
-                    
-                except Exception as e:
-                    logger.warning(f"Error accessing bucket {bucket_name}: {str(e)}")
-                    buckets.append({
-                        "name": bucket_name,
-                        "error": str(e),
-                        "accessible": False
+            # Get bucket encryption
+            try:
+                encryption = s3_client.get_bucket_encryption(Bucket=bucket_name)
+                encryption_type = encryption.get('ServerSideEncryptionConfiguration', {}).get('Rules', [{}])[0].get('ApplyServerSideEncryptionByDefault', {}).get('SSEAlgorithm')
+            except s3_client.exceptions.ClientError:
+                encryption_type = 'None'
+            
+            # Get bucket objects (limited to 1000)
+            objects = []
+            paginator = s3_client.get_paginator('list_objects_v2')
+            for page in paginator.paginate(Bucket=bucket_name, MaxKeys=1000):
+                for obj in page.get('Contents', []):
+                    # Get object metadata
+                    head = s3_client.head_object(Bucket=bucket_name, Key=obj['Key'])
+                    objects.append({
+                        "key": obj['Key'],
+                        "size": obj['Size'],
+                        "last_modified": obj['LastModified'].isoformat(),
+                        "storage_class": obj['StorageClass'],
+                        "content_type": head.get('ContentType'),
+                        "metadata": head.get('Metadata', {}),
+                        "etag": head.get('ETag'),
+                        "version_id": head.get('VersionId')
                     })
             
             return {
-                "buckets": buckets,
-                "summary": {
-                    "total_buckets": len(buckets),
-                    "accessible_buckets": sum(1 for b in buckets if b.get('accessible', True)),
-                    "total_objects": sum(b.get('total_objects', 0) for b in buckets if b.get('accessible', True)),
-                    "total_size": sum(b.get('total_size', 0) for b in buckets if b.get('accessible', True))
-                }
+                "name": bucket_name,
+                "creation_date": bucket['CreationDate'].isoformat(),
+                "region": region,
+                "versioning": versioning_status,
+                "encryption": encryption_type,
+                "objects": objects,
+                "total_objects": len(objects),
+                "total_size": sum(obj['size'] for obj in objects)
             }
             
         except Exception as e:
-            logger.error(f"S3 schema discovery failed: {str(e)}")
-            raise
+            logger.warning(f"Error accessing bucket {bucket_name}: {str(e)}")
+            return {
+                "name": bucket_name,
+                "error": str(e),
+                "accessible": False
+            }
     
-    async def get_table_preview(self, bucket_name: str, object_key: str, limit: int = 100) -> List[Dict]:
+    def _assemble_discovery(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "buckets": results,
+            "summary": {
+                "total_buckets": len(results),
+                "accessible_buckets": sum(1 for b in results if b.get('accessible', True)),
+                "total_objects": sum(b.get('total_objects', 0) for b in results if b.get('accessible', True)),
+                "total_size": sum(b.get('total_size', 0) for b in results if b.get('accessible', True))
+            }
+        }
+    
+    def _get_table_preview_sync(self, bucket_name: str, object_key: str, limit: int = 100) -> List[Dict]:
         """Get preview of S3 object data"""
         try:
             s3_client = boto3.client(
@@ -1370,7 +2039,7 @@ class S3Connector(BaseConnector):
             logger.error(f"S3 preview failed: {str(e)}")
             raise
     
-    async def get_column_profile(self, bucket_name: str, object_key: str, column_name: str) -> Dict[str, Any]:
+    def _get_column_profile_sync(self, bucket_name: str, object_key: str, column_name: str) -> Dict[str, Any]:
         """Get detailed column profile and statistics for S3 object"""
         try:
             s3_client = boto3.client(
@@ -1522,7 +2191,7 @@ class RedisConnector(BaseConnector):
                 ]
             }
     
-    async def discover_schema(self) -> Dict[str, Any]:
+    def _discover_schema_sync(self) -> Dict[str, Any]:
         try:
             r = redis.Redis(
                 host=self.data_source.host,
@@ -1839,7 +2508,9 @@ class CloudAwarePostgreSQLConnector(PostgreSQLConnector, LocationAwareConnector)
             connection_args['password'] = self._get_password()
         
         connection_string = self._build_connection_string(is_primary=True)
-        return create_engine(connection_string, connect_args=connection_args)
+        return connection_pool_registry.get_engine(
+            self.data_source, connection_string, connect_args=connection_args, credential=self._get_password()
+        )
     
     async def _initialize_secondary(self):
         """Initialize secondary PostgreSQL connection for hybrid setup"""
@@ -1850,7 +2521,9 @@ class CloudAwarePostgreSQLConnector(PostgreSQLConnector, LocationAwareConnector)
         connection_args['password'] = self._get_password()
         
         connection_string = self._build_connection_string(is_primary=False)
-        return create_engine(connection_string, connect_args=connection_args)
+        return connection_pool_registry.get_engine(
+            self.data_source, connection_string, connect_args=connection_args, credential=self._get_password()
+        )
     
     async def _initialize_connection(self):
         """Initialize single PostgreSQL connection for ON_PREM or CLOUD"""
@@ -1869,7 +2542,9 @@ class CloudAwarePostgreSQLConnector(PostgreSQLConnector, LocationAwareConnector)
             connection_args['password'] = self._get_password()
         
         connection_string = self._build_connection_string()
-        return create_engine(connection_string, connect_args=connection_args)
+        return connection_pool_registry.get_engine(
+            self.data_source, connection_string, connect_args=connection_args, credential=self._get_password()
+        )
     
     def _build_connection_string(self, is_primary: bool = True) -> str:
         """Build connection string based on location type"""
@@ -1906,7 +2581,9 @@ class CloudAwareMySQLConnector(MySQLConnector, LocationAwareConnector):
             connection_args['password'] = self._get_password()
         
         connection_string = self._build_connection_string(is_primary=True)
-        return create_engine(connection_string, connect_args=connection_args)
+        return connection_pool_registry.get_engine(
+            self.data_source, connection_string, connect_args=connection_args, credential=self._get_password()
+        )
     
     async def _initialize_secondary(self):
         """Initialize secondary MySQL connection for hybrid setup"""
@@ -1917,7 +2594,9 @@ class CloudAwareMySQLConnector(MySQLConnector, LocationAwareConnector):
         connection_args['password'] = self._get_password()
         
         connection_string = self._build_connection_string(is_primary=False)
-        return create_engine(connection_string, connect_args=connection_args)
+        return connection_pool_registry.get_engine(
+            self.data_source, connection_string, connect_args=connection_args, credential=self._get_password()
+        )
     
     async def _initialize_connection(self):
         """Initialize single MySQL connection for ON_PREM or CLOUD"""
@@ -1942,7 +2621,9 @@ class CloudAwareMySQLConnector(MySQLConnector, LocationAwareConnector):
             connection_args['password'] = self._get_password()
         
         connection_string = self._build_connection_string()
-        return create_engine(connection_string, connect_args=connection_args)
+        return connection_pool_registry.get_engine(
+            self.data_source, connection_string, connect_args=connection_args, credential=self._get_password()
+        )
     
     def _build_connection_string(self, is_primary: bool = True) -> str:
         """Build connection string based on location type"""
@@ -2103,7 +2784,30 @@ class DataSourceConnectionService:
                 "error": str(e),
                 "data_source_id": data_source.id
             }
-    
+
+    async def stream_schema_discovery(self, data_source: DataSource) -> AsyncIterator[Dict[str, Any]]:
+        """Stream partial discovery results as each schema/database/bucket finishes"""
+        connector = self._get_connector(data_source)
+        completed = 0
+        try:
+            async for unit, result in connector.iter_discovery():
+                completed += 1
+                yield {
+                    "success": True,
+                    "data_source_id": data_source.id,
+                    "unit": unit if isinstance(unit, (str, int)) else str(unit),
+                    "completed": completed,
+                    "result": result
+                }
+        except Exception as e:
+            logger.error(f"Streaming schema discovery failed for data source {data_source.id}: {str(e)}")
+            yield {
+                "success": False,
+                "error": str(e),
+                "data_source_id": data_source.id,
+                "completed": completed
+            }
+
     async def get_table_preview(self, data_source: DataSource, schema_name: str, table_name: str, limit: int = 100) -> Dict[str, Any]:
         """Get preview of table data"""
         try:
@@ -2142,6 +2846,29 @@ class DataSourceConnectionService:
                 "error": str(e)
             }
     
+    async def get_table_profile(self, data_source: DataSource, schema_name: str, table_name: str,
+                                columns: Optional[List[str]] = None, sample_percent: Optional[float] = None,
+                                approximate: bool = False, top_n: int = 10) -> Dict[str, Any]:
+        """Profile all (or the selected) columns of a table in a single pass"""
+        try:
+            connector = self._get_connector(data_source)
+            profile_data = await connector.get_table_profile(
+                schema_name, table_name, columns=columns, sample_percent=sample_percent,
+                approximate=approximate, top_n=top_n
+            )
+            
+            return {
+                "success": True,
+                "table_profile": profile_data
+            }
+            
+        except Exception as e:
+            logger.error(f"Table profiling failed: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
     def _get_connector(self, data_source: DataSource) -> BaseConnector:
         """Get appropriate connector based on data source type and location"""
         connector_map = {
@@ -2216,16 +2943,12 @@ class DataSourceConnectionService:
             connector = self._get_connector(data_source)
             if data_source.location == DataSourceLocation.HYBRID:
                 await connector.initialize()  # This will set up both primary and failover
-            else:
-                connection = await connector._initialize_connection()
-                
-            pool_stats = {
-                "pool_size": data_source.pool_size,
-                "max_overflow": data_source.max_overflow,
-                "pool_timeout": data_source.pool_timeout,
-                "active_connections": 0,
-                "available_connections": data_source.pool_size
-            }
+            elif isinstance(connector, LocationAwareConnector):
+                await connector._initialize_connection()
+            elif hasattr(connector, '_get_engine'):
+                connector._get_engine()
+                
+            pool_stats = self._build_pool_stats(data_source)
             
             self.connection_cache[data_source.id] = connector
             self.connection_stats[data_source.id] = pool_stats
@@ -2244,9 +2967,29 @@ class DataSourceConnectionService:
                 "error": str(e)
             }
 
+    def _build_pool_stats(self, data_source: DataSource) -> Dict[str, Any]:
+        """Combine configured pool settings with live counters from the shared pool registry."""
+        settings = connection_pool_registry.get_pool_settings(data_source)
+        live = connection_pool_registry.get_stats(data_source.id) or {}
+        active = live.get("active_connections", 0)
+        return {
+            "pool_size": settings["pool_size"],
+            "max_overflow": settings["max_overflow"],
+            "pool_timeout": settings["pool_timeout"],
+            "active_connections": active,
+            "idle_connections": live.get("idle_connections", 0),
+            "overflow_connections": live.get("overflow_connections", 0),
+            "available_connections": max(settings["pool_size"] + settings["max_overflow"] - active, 0),
+            "pools": live.get("pools", []),
+            "executor": connector_executor.get_stats(data_source.id)
+        }
+
     async def get_connection_pool_stats(self, data_source_id: int) -> Dict[str, Any]:
         """Get current statistics for the connection pool."""
         stats = self.connection_stats.get(data_source_id, {})
+        live = connection_pool_registry.get_stats(data_source_id)
+        if live:
+            stats = {**stats, **live}
         if not stats:
             return {
                 "success": False,
@@ -2295,13 +3038,9 @@ class DataSourceConnectionService:
     async def close_connection_pool(self, data_source_id: int) -> Dict[str, Any]:
         """Close and cleanup connection pool."""
         try:
-            connector = self.connection_cache.pop(data_source_id, None)
-            if connector:
-                if hasattr(connector, 'connection') and connector.connection:
-                    await connector.connection.close()
-                if hasattr(connector, 'failover_connection') and connector.failover_connection:
-                    await connector.failover_connection.close()
-                    
+            self.connection_cache.pop(data_source_id, None)
+            # Engines (including hybrid primary/failover) are owned by the shared registry
+            connection_pool_registry.evict(data_source_id)
             self.connection_stats.pop(data_source_id, None)
             
             return {
@@ -2521,7 +3260,7 @@ class DataSourceConnectionService:
             test_result = await self.test_connection(data_source)
             
             # Get pool stats if available
-            pool_stats = self.connection_stats.get(data_source.id, {})
+            pool_stats = self._build_pool_stats(data_source) if connection_pool_registry.has_pool(data_source.id) else {}
             
             # Get connector instance
             connector = self.connection_cache.get(data_source.id)
@@ -13,6 +13,7 @@ from sqlalchemy.sql.expression import Select
 import logging
 from datetime import datetime, timedelta
 from app.services.secret_manager import get_secret, set_secret, delete_secret
+from app.services.connection_pool_registry import connection_pool_registry
 import uuid
 from cryptography.fernet import Fernet
 import base64
@@ -246,6 +247,9 @@ class DataSourceService:
         session.add(data_source)
         session.commit()
         session.refresh(data_source)
+        
+        # Drop pooled connections so connectors pick up new credentials/settings
+        connection_pool_registry.evict(data_source_id)
         logger.info(f"Updated data source: {data_source.name} (ID: {data_source_id}) by user: {updated_by}")
         return data_source
     
@@ -264,6 +268,7 @@ class DataSourceService:
         
         session.delete(data_source)
         session.commit()
+        connection_pool_registry.evict(data_source_id)
         logger.info(f"Deleted data source: {data_source.name} (ID: {data_source_id})")
         return True
     
@@ -884,6 +889,7 @@ class DataSourceService:
         session.add(data_source)
         session.commit()
         session.refresh(data_source)
+        connection_pool_registry.evict(data_source_id)
         return data_source
 
     @staticmethod
@@ -0,0 +1,148 @@
+"""
+Extraction Client
+Long-lived HTTP client for the metadata extraction service: pooled keep-alive connections,
+timeouts and bounded retries with exponential backoff, shared by every scan.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+EXTRACTION_SERVICE_URL = os.getenv("EXTRACTION_SERVICE_URL", "http://extractor:8000")
+EXTRACTION_CONNECT_TIMEOUT = float(os.getenv("EXTRACTION_CONNECT_TIMEOUT", "10"))
+# Extracting a large schema can take minutes
+EXTRACTION_READ_TIMEOUT = float(os.getenv("EXTRACTION_READ_TIMEOUT", "600"))
+# Connections to the extraction service across all scans (per event loop for the async client)
+EXTRACTION_MAX_CONNECTIONS = int(os.getenv("EXTRACTION_MAX_CONNECTIONS", "32"))
+EXTRACTION_MAX_KEEPALIVE = int(os.getenv("EXTRACTION_MAX_KEEPALIVE", "16"))
+EXTRACTION_MAX_RETRIES = int(os.getenv("EXTRACTION_MAX_RETRIES", "3"))
+EXTRACTION_RETRY_BACKOFF = float(os.getenv("EXTRACTION_RETRY_BACKOFF", "0.5"))
+# Response bodies larger than this are JSON-decoded off the event loop
+EXTRACTION_OFFLOAD_DECODE_BYTES = int(os.getenv("EXTRACTION_OFFLOAD_DECODE_BYTES", str(1 << 20)))
+
+# Statuses worth retrying: the extraction service is overloaded or restarting
+RETRY_STATUS_CODES = {429, 502, 503, 504}
+
+
+class ExtractionClient:
+    """Shared clients for POST /extract/{db_type}.
+
+    Extraction requests are read-only, so transport errors and retryable statuses are
+    retried with exponential backoff and jitter. The async client is bound to the loop
+    that created it, so one is kept per running loop; sync callers share one httpx.Client.
+    Bodies are read in chunks and decoded once from bytes.
+    """
+
+    def __init__(self, base_url: str = EXTRACTION_SERVICE_URL, max_retries: int = EXTRACTION_MAX_RETRIES,
+                 backoff: float = EXTRACTION_RETRY_BACKOFF, transport: Optional[httpx.BaseTransport] = None,
+                 async_transport: Optional[httpx.AsyncBaseTransport] = None):
+        self.base_url = base_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._transport = transport
+        self._async_transport = async_transport
+        self._client: Optional[httpx.Client] = None
+        # Keyed weakly by loop; clients of closed loops are dropped (their pools hold the loop)
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _client_options(self) -> Dict[str, Any]:
+        return {
+            "base_url": self.base_url,
+            "timeout": httpx.Timeout(EXTRACTION_READ_TIMEOUT, connect=EXTRACTION_CONNECT_TIMEOUT),
+            "limits": httpx.Limits(max_connections=EXTRACTION_MAX_CONNECTIONS,
+                                   max_keepalive_connections=EXTRACTION_MAX_KEEPALIVE),
+            "headers": {"Content-Type": "application/json"},
+        }
+
+    @property
+    def client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None:
+                self._client = httpx.Client(transport=self._transport, **self._client_options())
+            return self._client
+
+    def _get_async_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                for closed in [other for other in self._async_clients if other.is_closed()]:
+                    del self._async_clients[closed]
+                client = httpx.AsyncClient(transport=self._async_transport, **self._client_options())
+                self._async_clients[loop] = client
+            return client
+
+    def _retry_delay(self, attempt: int, response: Optional[httpx.Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), 60.0)
+        return self.backoff * (2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def extract(self, db_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract metadata, blocking the calling thread"""
+        attempt = 0
+        while True:
+            response = None
+            try:
+                with self.client.stream("POST", f"/extract/{db_type}", json=payload) as response:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                        response.raise_for_status()
+                        return json.loads(b"".join(response.iter_bytes()))
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Extraction request failed, retrying: {str(e)}")
+            delay = self._retry_delay(attempt, response)
+            attempt += 1
+            time.sleep(delay)
+
+    async def extract_async(self, db_type: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract metadata without blocking the event loop"""
+        client = self._get_async_client()
+        attempt = 0
+        while True:
+            response = None
+            try:
+                async with client.stream("POST", f"/extract/{db_type}", json=payload) as response:
+                    if response.status_code not in RETRY_STATUS_CODES or attempt >= self.max_retries:
+                        response.raise_for_status()
+                        body = bytearray()
+                        async for chunk in response.aiter_bytes():
+                            body.extend(chunk)
+                        if len(body) > EXTRACTION_OFFLOAD_DECODE_BYTES:
+                            return await asyncio.to_thread(json.loads, body)
+                        return json.loads(body)
+            except httpx.TransportError as e:
+                if attempt >= self.max_retries:
+                    raise
+                logger.warning(f"Extraction request failed, retrying: {str(e)}")
+            delay = self._retry_delay(attempt, response)
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        """Close the running loop's async client and the sync client"""
+        with self._lock:
+            client = self._async_clients.pop(asyncio.get_running_loop(), None)
+            sync_client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+        if sync_client is not None:
+            sync_client.close()
+
+
+# Process-wide client shared by all scans
+extraction_client = ExtractionClient()
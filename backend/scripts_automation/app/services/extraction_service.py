@@ -3,51 +3,116 @@ from pymongo import MongoClient
 from app.db_session import get_session
 from app.models.schema_models import DataTableSchema, SchemaVersion
 from sqlmodel import Session
+from typing import Any, Dict, List, Tuple
 from uuid import uuid4
 
 # ✅ Classificateurs
 from app.api.classifiers.regex_classifier import RegexClassifier
 from app.api.classifiers.dictionary_classifier import DictionaryClassifier
 from app.api.classifiers.hybrid_classifier import HybridClassifier
-from app.services.data_sensitivity_service import assign_data_sensitivity_label, update_all_columns_data_sensitivity
+from app.services.data_sensitivity_service import update_all_columns_data_sensitivity
 
 regex_classifier = RegexClassifier()
 dictionary_classifier = DictionaryClassifier()
 hybrid_classifier = HybridClassifier(use_ml=True, verbose=False)  # Activer ML ici
 
-# ✅ Fonction de classification et stockage des 3 résultats
-def classify_and_store_all(
+# Conflict target of the extraction upsert (uq_datatableschema_column_categories)
+UPSERT_KEY = ["database_type", "table_name", "column_name", "categories"]
+
+# ✅ Classification d'un lot de colonnes (un seul passage des 3 classificateurs)
+def classify_columns(column_names: List[str]) -> List[Tuple[str, str, str]]:
+    """
+    Returns the (regex, dictionary, hybrid) categories string of each column name.
+    """
+    results = hybrid_classifier.classify_batch_all(column_names)
+    return [
+        tuple(
+            ", ".join(result[key]) if result[key] else f"Unclassified [{label}]"
+            for key, label in (("regex", "Regex"), ("dictionary", "Dictionary"), ("hybrid", "Hybrid"))
+        )
+        for result in results
+    ]
+
+def _upsert_statement(session: Session, rows: List[Dict[str, Any]]):
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        return None
+    statement = insert(DataTableSchema).values(rows)
+    return statement.on_conflict_do_update(
+        index_elements=UPSERT_KEY,
+        set_={"data_type": statement.excluded.data_type, "nullable": statement.excluded.nullable},
+    ).returning(DataTableSchema.id)
+
+def upsert_table_columns(
     session: Session,
     db_type: str,
     table_name: str,
-    column_name: str,
-    data_type: str,
-    nullable: bool
-):
+    columns: List[Dict[str, Any]]
+) -> List[int]:
     """
-    Applies the 3 classifiers: regex, dictionary, hybrid (ML) separately.
-    This function now only returns classification results without adding new DB entries.
+    Classifies and stores the columns of one table in a single batch.
+    Existing rows of the table are loaded with one query and diffed in memory; new rows
+    and rows whose data_type/nullable changed are written with one INSERT ... ON CONFLICT.
+    Returns the ids of the touched rows.
     """
-    import logging
-    logger = logging.getLogger("extraction_service")
-
-    # Classify with regex
-    regex_cats = regex_classifier.classify(column_name)
-    categories_regex = ", ".join(regex_cats) if regex_cats else "Unclassified [Regex]"
-
-    # Classify with dictionary
-    dict_cats = dictionary_classifier.classify(column_name)
-    categories_dict = ", ".join(dict_cats) if dict_cats else "Unclassified [Dictionary]"
-
-    # Classify with hybrid
-    hybrid_cats = hybrid_classifier.classify(column_name)
-    categories_hybrid = ", ".join(hybrid_cats) if hybrid_cats else "Unclassified [Hybrid]"
-
-    logger.info(f"Column {column_name} regex categories: {categories_regex}")
-    logger.info(f"Column {column_name} dictionary categories: {categories_dict}")
-    logger.info(f"Column {column_name} hybrid categories: {categories_hybrid}")
-
-    return categories_regex, categories_dict, categories_hybrid
+    if not columns:
+        return []
+
+    existing = {
+        (row.column_name, row.categories): row
+        for row in session.query(DataTableSchema).filter(
+            DataTableSchema.database_type == db_type,
+            DataTableSchema.table_name == table_name
+        )
+    }
+    existing_by_column: Dict[str, List[str]] = {}
+    for column_name, categories in existing:
+        existing_by_column.setdefault(column_name, []).append(categories)
+
+    rows: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for column, categories in zip(columns, classify_columns([column["name"] for column in columns])):
+        # Current classifier results plus stale rows of the same column (kept, but refreshed)
+        for value in list(categories) + existing_by_column.get(column["name"], []):
+            key = (column["name"], value)
+            current = existing.get(key)
+            if current is not None and current.data_type == column["data_type"] and current.nullable == column["nullable"]:
+                continue
+            rows[key] = {
+                "database_type": db_type,
+                "table_name": table_name,
+                "column_name": column["name"],
+                "data_type": column["data_type"],
+                "nullable": column["nullable"],
+                "categories": value,
+            }
+
+    if not rows:
+        return []
+    statement = _upsert_statement(session, list(rows.values()))
+    if statement is not None:
+        touched = list(session.execute(statement).scalars())
+        # Keep the identity map in line with the rows rewritten behind the ORM
+        for key in rows:
+            if key in existing:
+                session.expire(existing[key])
+        return touched
+
+    # Dialects without ON CONFLICT: the diff above already tells inserts from updates
+    new_entries = []
+    for key, values in rows.items():
+        entry = existing.get(key)
+        if entry is None:
+            entry = DataTableSchema(**values)
+            new_entries.append(entry)
+        else:
+            entry.data_type, entry.nullable = values["data_type"], values["nullable"]
+        session.add(entry)
+    session.flush()
+    return [existing[key].id for key in rows if key in existing] + [entry.id for entry in new_entries]
 
 def upsert_column_classification(
     session: Session,
@@ -60,93 +125,11 @@ def upsert_column_classification(
     """
     Upsert a column classification entry for each classifier type.
     """
-    import logging
-    logger = logging.getLogger("extraction_service")
-
-    categories_regex, categories_dict, categories_hybrid = classify_and_store_all(
-        session, db_type, table_name, column_name, data_type, nullable
+    touched = upsert_table_columns(
+        session, db_type, table_name,
+        [{"name": column_name, "data_type": data_type, "nullable": nullable}]
     )
-
-    # Upsert regex classification
-    entry_regex = session.query(DataTableSchema).filter_by(
-        database_type=db_type,
-        table_name=table_name,
-        column_name=column_name,
-        categories=categories_regex
-    ).first()
-    if entry_regex:
-        entry_regex.data_type = data_type
-        entry_regex.nullable = nullable
-        entry_regex.categories = categories_regex
-        assign_data_sensitivity_label(session, entry_regex)
-        logger.info(f"Updated regex entry for {column_name} with categories: {categories_regex}")
-    else:
-        new_entry = DataTableSchema(
-            database_type=db_type,
-            table_name=table_name,
-            column_name=column_name,
-            data_type=data_type,
-            nullable=nullable,
-            categories=categories_regex
-        )
-        session.add(new_entry)
-        session.flush()
-        assign_data_sensitivity_label(session, new_entry)
-        logger.info(f"Inserted regex entry for {column_name} with categories: {categories_regex}")
-
-    # Upsert dictionary classification
-    entry_dict = session.query(DataTableSchema).filter_by(
-        database_type=db_type,
-        table_name=table_name,
-        column_name=column_name,
-        categories=categories_dict
-    ).first()
-    if entry_dict:
-        entry_dict.data_type = data_type
-        entry_dict.nullable = nullable
-        entry_dict.categories = categories_dict
-        assign_data_sensitivity_label(session, entry_dict)
-        logger.info(f"Updated dictionary entry for {column_name} with categories: {categories_dict}")
-    else:
-        new_entry = DataTableSchema(
-            database_type=db_type,
-            table_name=table_name,
-            column_name=column_name,
-            data_type=data_type,
-            nullable=nullable,
-            categories=categories_dict
-        )
-        session.add(new_entry)
-        session.flush()
-        assign_data_sensitivity_label(session, new_entry)
-        logger.info(f"Inserted dictionary entry for {column_name} with categories: {categories_dict}")
-
-    # Upsert hybrid classification
-    entry_hybrid = session.query(DataTableSchema).filter_by(
-        database_type=db_type,
-        table_name=table_name,
-        column_name=column_name,
-        categories=categories_hybrid
-    ).first()
-    if entry_hybrid:
-        entry_hybrid.data_type = data_type
-        entry_hybrid.nullable = nullable
-        entry_hybrid.categories = categories_hybrid
-        assign_data_sensitivity_label(session, entry_hybrid)
-        logger.info(f"Updated hybrid entry for {column_name} with categories: {categories_hybrid}")
-    else:
-        new_entry = DataTableSchema(
-            database_type=db_type,
-            table_name=table_name,
-            column_name=column_name,
-            data_type=data_type,
-            nullable=nullable,
-            categories=categories_hybrid
-        )
-        session.add(new_entry)
-        session.flush()
-        assign_data_sensitivity_label(session, new_entry)
-        logger.info(f"Inserted hybrid entry for {column_name} with categories: {categories_hybrid}")
+    update_all_columns_data_sensitivity(session, column_ids=touched)
 
 
 # ✅ Extraction SQL
@@ -157,42 +140,17 @@ def extract_sql_schema(db_uri: str, db_type: str):
         inspector = inspect(engine)
         with get_session() as session:
             print(f"📦 Extracting tables from {db_type}...")
+            touched = []
             for table_name in inspector.get_table_names():
-                for column in inspector.get_columns(table_name):
-                    print(f"➡️ Processing table: {table_name}, column: {column['name']}")
-                    # Check if entry exists
-                    existing_entries = session.query(DataTableSchema).filter(
-                        DataTableSchema.database_type == db_type,
-                        DataTableSchema.table_name == table_name,
-                        DataTableSchema.column_name == column["name"]
-                    ).all()
-                    if existing_entries:
-                        # Update existing entries
-                        for entry in existing_entries:
-                            entry.data_type = str(column["type"])
-                            entry.nullable = column["nullable"]
-                            # Re-classify and assign categories and sensitivity label
-                            classify_and_store_all(
-                                session=session,
-                                db_type=db_type,
-                                table_name=table_name,
-                                column_name=column["name"],
-                                data_type=str(column["type"]),
-                                nullable=column["nullable"]
-                            )
-                    else:
-                        # Insert new entry
-                        classify_and_store_all(
-                            session=session,
-                            db_type=db_type,
-                            table_name=table_name,
-                            column_name=column["name"],
-                            data_type=str(column["type"]),
-                            nullable=column["nullable"]
-                        )
+                print(f"➡️ Processing table: {table_name}")
+                columns = [
+                    {"name": column["name"], "data_type": str(column["type"]), "nullable": column["nullable"]}
+                    for column in inspector.get_columns(table_name)
+                ]
+                touched.extend(upsert_table_columns(session, db_type, table_name, columns))
 
-            # Update all data sensitivity labels after extraction/classification
-            update_all_columns_data_sensitivity(session)
+            # Update data sensitivity labels of the rows written by this extraction
+            update_all_columns_data_sensitivity(session, column_ids=touched)
 
             session.commit()
             print(f"✅ Schema extraction for {db_type} complete.")
@@ -210,23 +168,19 @@ def extract_mongo_schema(connection_uri: str, database_name: str):
         db = client[database_name]
         with get_session() as session:
             print("📦 Extracting collections from MongoDB...")
+            touched = []
             for collection_name in db.list_collection_names():
                 print(f"➡️ Processing collection: {collection_name}")
                 doc = db[collection_name].find_one()
                 if doc:
-                    for key, value in doc.items():
-                        print(f"🔍 Processing field: {key} => {type(value).__name__}")
-                        classify_and_store_all(
-                            session=session,
-                            db_type="mongodb",
-                            table_name=collection_name,
-                            column_name=key,
-                            data_type=type(value).__name__,
-                            nullable=True
-                        )
+                    columns = [
+                        {"name": key, "data_type": type(value).__name__, "nullable": True}
+                        for key, value in doc.items()
+                    ]
+                    touched.extend(upsert_table_columns(session, "mongodb", collection_name, columns))
 
-            # Update all data sensitivity labels after extraction/classification
-            update_all_columns_data_sensitivity(session)
+            # Update data sensitivity labels of the rows written by this extraction
+            update_all_columns_data_sensitivity(session, column_ids=touched)
 
             session.commit()
             print("✅ Schema extraction for MongoDB complete.")
@@ -253,28 +207,10 @@ def classify_and_store_all(
     data_type: str,
     nullable: bool
 ):
-    classifiers = [
-        ("Regex", regex_classifier.classify(column_name)),
-        ("Dictionary", dictionary_classifier.classify(column_name)),
-        ("Hybrid", hybrid_classifier.classify(column_name)),
-    ]
-    for label, cats in classifiers:
-        categories = ", ".join(cats) if cats else f"Unclassified [{label}]"
-        # Vérifier si l'entrée existe déjà
-        exists = session.query(DataTableSchema).filter_by(
-            database_type=db_type,
-            table_name=table_name,
-            column_name=column_name,
-            categories=categories
-        ).first()
-        if not exists:
-            schema_entry = DataTableSchema(
-                database_type=db_type,
-                table_name=table_name,
-                column_name=column_name,
-                data_type=data_type,
-                nullable=nullable,
-                categories=categories
-            )
-            session.add(schema_entry)
-        # Sinon, ne rien faire (pas de doublon)
+    """
+    Applies the 3 classifiers (regex, dictionary, hybrid) and stores one row per result.
+    """
+    return upsert_table_columns(
+        session, db_type, table_name,
+        [{"name": column_name, "data_type": data_type, "nullable": nullable}]
+    )
@@ -1,15 +1,22 @@
-from typing import Dict, List, Any, Optional, Union, Set
+from typing import Dict, List, Any, Optional, Union, Set, Tuple
 import logging
+import uuid
 from datetime import datetime
 from sqlmodel import Session, select
-from app.models.scan_models import DataSource, Scan, ScanResult, DataSourceType
+from app.models.scan_models import DataSource, Scan, ScanResult, ScanRuleSet, ScanStatus, DataSourceType
 from app.services.scan_service import ScanService
-import json
-import hashlib
+from app.services.scan_rule_set_service import ScanRuleSetService
+from app.services.scan_fingerprint import (
+    MetadataLayout, children, diff_fingerprints, layout_for, row_count_drift, schema_fingerprint, splice_schema,
+    stale_tables, tree_from_tables, with_row_estimates, with_schemas
+)
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# object_type of the ScanResult holding an incremental scan's changes and fingerprint tree
+INCREMENTAL_RESULT_TYPE = "incremental_scan"
+
 class IncrementalScanService:
     """Service for managing incremental scans."""
     
@@ -45,7 +52,7 @@ class IncrementalScanService:
             # Get the latest successful scan for this data source
             stmt = select(Scan).where(
                 Scan.data_source_id == data_source_id,
-                Scan.status == "completed"
+                Scan.status == ScanStatus.COMPLETED
             ).order_by(Scan.completed_at.desc()).limit(1)
             result = session.exec(stmt).first()
             if result:
@@ -62,16 +69,14 @@ class IncrementalScanService:
                 app_secret=app_secret
             )
         
-        # Create a new scan with incremental flag
+        # Create a new scan for the incremental run
         scan = Scan(
+            scan_id=str(uuid.uuid4()),
+            name=f"Incremental scan of data source {data_source_id}",
             data_source_id=data_source_id,
             scan_rule_set_id=scan_rule_set_id,
             description=description or f"Incremental scan based on scan {base_scan.id}",
-            status="pending",
-            custom_properties={
-                "is_incremental": True,
-                "base_scan_id": base_scan.id
-            }
+            status=ScanStatus.PENDING
         )
         
         session.add(scan)
@@ -84,47 +89,72 @@ class IncrementalScanService:
             data_source = session.get(DataSource, data_source_id)
             if not data_source:
                 raise ValueError(f"Data source not found: {data_source_id}")
+            scan_rule_set = session.get(ScanRuleSet, scan_rule_set_id) if scan_rule_set_id else None
+            layout = layout_for(data_source.source_type)
             
-            # Get the base scan result
-            base_scan_result = IncrementalScanService._get_latest_scan_result(session, base_scan.id)
-            if not base_scan_result:
-                raise ValueError(f"No scan result found for base scan: {base_scan.id}")
+            # Fingerprint tree of the base scan (hashes only, no metadata)
+            base_fingerprint = IncrementalScanService._get_base_fingerprint(session, base_scan.id, layout)
             
             # Update scan status
-            scan.status = "in_progress"
+            scan.status = ScanStatus.RUNNING
             scan.started_at = datetime.utcnow()
             session.add(scan)
             session.commit()
             
-            # Extract metadata from the data source
-            metadata = ScanService._extract_metadata(data_source, app_secret)
+            # Probe the source cheaply and extract only the tables whose markers moved
+            markers, row_estimates = IncrementalScanService._probe_change_markers(data_source, scan_rule_set)
+            # stale is None when schemas cannot be listed: extract everything
+            stale = stale_tables(base_fingerprint, markers, layout) if markers is not None else None
+            metadata = IncrementalScanService._extract_stale(data_source, scan_rule_set, stale, layout)
             
             # Apply scan rule set filters if provided
-            if scan_rule_set_id:
-                metadata = ScanService._apply_rule_set_filters(session, scan_rule_set_id, metadata, data_source.source_type)
+            if scan_rule_set:
+                metadata = ScanRuleSetService.apply_rule_set_filters(scan_rule_set, metadata)
             
-            # Compare with base scan and get only the changes
-            incremental_metadata = IncrementalScanService._get_incremental_changes(
-                base_metadata=base_scan_result.scan_metadata,
-                current_metadata=metadata,
-                data_source_type=data_source.source_type
-            )
+            # Fingerprint the extracted tables, splice in the base's unchanged ones and diff against the base
+            extracted = {
+                name: schema_fingerprint(schema, layout, (markers or {}).get(name))
+                for name, schema in children(metadata, layout.schema_key).items()
+            }
+            current = dict(extracted)
+            for name, tables in (stale or {}).items():
+                if tables is not None:
+                    current[name] = splice_schema(
+                        base_fingerprint[layout.schema_key][name], extracted.get(name), markers[name], tables, layout
+                    )
+            for name, node in current.items():
+                with_row_estimates(node, row_estimates.get(name), layout)
+            listed = set(markers) if markers is not None else set(current)
+            removed = set(base_fingerprint[layout.schema_key]) - listed
+            removed |= {name for name, tables in (stale or {}).items() if tables is None and name not in current}
+            incremental_metadata = diff_fingerprints(base_fingerprint, metadata, current, removed, layout)
+            refetched = stale if stale is not None else dict.fromkeys(extracted)
             
-            # Create scan result with incremental changes
+            # Create scan result with incremental changes and the merged fingerprint tree
             scan_result = ScanResult(
                 scan_id=scan.id,
-                scan_metadata=incremental_metadata,
-                custom_properties={
+                schema_name="",
+                table_name="",
+                object_type=INCREMENTAL_RESULT_TYPE,
+                scan_metadata={
                     "is_incremental": True,
                     "base_scan_id": base_scan.id,
+                    # schema -> re-extracted tables (null: the whole schema)
+                    "refetched": {
+                        name: sorted(tables) if tables is not None else None
+                        for name, tables in sorted(refetched.items()) if tables is None or tables
+                    },
+                    "changes": incremental_metadata,
+                    "row_count_drift": row_count_drift(base_fingerprint, current, layout),
                     "change_summary": IncrementalScanService._generate_change_summary(incremental_metadata, data_source.source_type)
-                }
+                },
+                fingerprint=with_schemas(base_fingerprint, current, removed, layout)
             )
             
             session.add(scan_result)
             
             # Update scan status
-            scan.status = "completed"
+            scan.status = ScanStatus.COMPLETED
             scan.completed_at = datetime.utcnow()
             session.add(scan)
             session.commit()
@@ -133,7 +163,7 @@ class IncrementalScanService:
             
         except Exception as e:
             logger.error(f"Error executing incremental scan: {str(e)}")
-            scan.status = "failed"
+            scan.status = ScanStatus.FAILED
             scan.error_message = str(e)
             scan.completed_at = datetime.utcnow()
             session.add(scan)
@@ -141,258 +171,79 @@ class IncrementalScanService:
             raise
     
     @staticmethod
-    def _get_latest_scan_result(session: Session, scan_id: int) -> Optional[ScanResult]:
-        """Get the latest scan result for a scan."""
-        stmt = select(ScanResult).where(ScanResult.scan_id == scan_id).order_by(ScanResult.created_at.desc()).limit(1)
-        return session.exec(stmt).first()
-    
-    @staticmethod
-    def _get_incremental_changes(base_metadata: Dict[str, Any], current_metadata: Dict[str, Any], 
-                                data_source_type: Union[DataSourceType, str]) -> Dict[str, Any]:
-        """Get the incremental changes between two metadata snapshots.
+    def _get_base_fingerprint(session: Session, scan_id: int, layout: MetadataLayout) -> Dict[str, Any]:
+        """Fingerprint tree of a scan: stored whole on incremental results, per table on full scan results.
         
-        Args:
-            base_metadata: The metadata from the base scan
-            current_metadata: The metadata from the current scan
-            data_source_type: The type of data source
-            
-        Returns:
-            A metadata dictionary containing only the changes
+        Tables scanned before fingerprints existed are missing from the tree, so their schemas are re-extracted.
         """
-        if isinstance(data_source_type, str):
-            data_source_type = DataSourceType(data_source_type)
-        
-        if data_source_type in [DataSourceType.MYSQL, DataSourceType.POSTGRESQL, DataSourceType.ORACLE, DataSourceType.SQLSERVER]:
-            return IncrementalScanService._get_relational_changes(base_metadata, current_metadata)
-        elif data_source_type == DataSourceType.MONGODB:
-            return IncrementalScanService._get_mongodb_changes(base_metadata, current_metadata)
-        else:
-            logger.warning(f"Unsupported data source type for incremental scan: {data_source_type}")
-            return current_metadata
+        rows = session.exec(
+            select(ScanResult.schema_name, ScanResult.table_name, ScanResult.object_type, ScanResult.fingerprint)
+            .where(ScanResult.scan_id == scan_id, ScanResult.column_name.is_(None))
+        ).all()
+        for row in rows:
+            if row.object_type == INCREMENTAL_RESULT_TYPE and row.fingerprint:
+                return row.fingerprint
+        return tree_from_tables(rows, layout)
     
     @staticmethod
-    def _get_relational_changes(base_metadata: Dict[str, Any], current_metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Get the incremental changes for relational databases."""
-        changes = {"schemas": []}
-        
-        # Create lookup dictionaries for faster access
-        base_schemas = {schema["name"]: schema for schema in base_metadata.get("schemas", [])}
-        current_schemas = {schema["name"]: schema for schema in current_metadata.get("schemas", [])}
-        
-        # Find new and changed schemas
-        for schema_name, schema in current_schemas.items():
-            if schema_name not in base_schemas:
-                # New schema
-                changes["schemas"].append(schema)
-                continue
-            
-            base_schema = base_schemas[schema_name]
-            schema_changes = {"name": schema_name, "tables": []}
-            
-            # Create lookup dictionaries for tables
-            base_tables = {table["name"]: table for table in base_schema.get("tables", [])}
-            current_tables = {table["name"]: table for table in schema.get("tables", [])}
-            
-            # Find new and changed tables
-            for table_name, table in current_tables.items():
-                if table_name not in base_tables:
-                    # New table
-                    schema_changes["tables"].append(table)
-                    continue
-                
-                base_table = base_tables[table_name]
-                table_changes = {"name": table_name, "columns": []}
-                
-                # Check if row count changed significantly
-                if "row_count" in table and "row_count" in base_table:
-                    base_count = base_table["row_count"] or 0
-                    current_count = table["row_count"] or 0
-                    if base_count != current_count:
-                        table_changes["row_count"] = current_count
-                        table_changes["previous_row_count"] = base_count
-                
-                # Create lookup dictionaries for columns
-                base_columns = {col["name"]: col for col in base_table.get("columns", [])}
-                current_columns = {col["name"]: col for col in table.get("columns", [])}
-                
-                # Find new and changed columns
-                for col_name, column in current_columns.items():
-                    if col_name not in base_columns:
-                        # New column
-                        table_changes["columns"].append(column)
-                        continue
-                    
-                    base_column = base_columns[col_name]
-                    
-                    # Check if column definition changed
-                    if IncrementalScanService._has_column_changed(base_column, column):
-                        column_changes = column.copy()
-                        column_changes["change_type"] = "modified"
-                        table_changes["columns"].append(column_changes)
-                
-                # Find deleted columns
-                for col_name in base_columns:
-                    if col_name not in current_columns:
-                        deleted_column = base_columns[col_name].copy()
-                        deleted_column["change_type"] = "deleted"
-                        table_changes["columns"].append(deleted_column)
-                
-                if table_changes["columns"] or "row_count" in table_changes:
-                    schema_changes["tables"].append(table_changes)
-            
-            # Find deleted tables
-            for table_name in base_tables:
-                if table_name not in current_tables:
-                    deleted_table = {"name": table_name, "change_type": "deleted"}
-                    schema_changes["tables"].append(deleted_table)
-            
-            if schema_changes["tables"]:
-                changes["schemas"].append(schema_changes)
-        
-        # Find deleted schemas
-        for schema_name in base_schemas:
-            if schema_name not in current_schemas:
-                deleted_schema = {"name": schema_name, "change_type": "deleted"}
-                changes["schemas"].append(deleted_schema)
-        
-        return changes
+    def _extract_stale(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet],
+                       stale: Optional[Dict[str, Optional[Set[str]]]], layout: MetadataLayout) -> Dict[str, Any]:
+        """Extract the stale part of the source: whole schemas in one request, changed tables one request per schema."""
+        db_type = data_source.source_type.value
+        if stale is None:
+            return ScanService._extract_metadata(db_type, data_source, scan_rule_set)
+        whole = sorted(name for name, tables in stale.items() if tables is None)
+        requests = [(whole, None)] if whole else []
+        requests += [([name], sorted(tables)) for name, tables in sorted(stale.items()) if tables]
+        schemas: Dict[str, Any] = {}
+        for names, tables in requests:
+            part = ScanService._extract_metadata(db_type, data_source, scan_rule_set, names, tables)
+            schemas.update(children(part, layout.schema_key))
+        return {layout.schema_key: schemas}
     
     @staticmethod
-    def _get_mongodb_changes(base_metadata: Dict[str, Any], current_metadata: Dict[str, Any]) -> Dict[str, Any]:
-        """Get the incremental changes for MongoDB databases."""
-        changes = {"databases": []}
-        
-        # Create lookup dictionaries for faster access
-        base_dbs = {db["name"]: db for db in base_metadata.get("databases", [])}
-        current_dbs = {db["name"]: db for db in current_metadata.get("databases", [])}
+    def _probe_change_markers(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None
+                              ) -> Tuple[Optional[Dict[str, Optional[Dict[str, str]]]], Dict[str, Dict[str, int]]]:
+        """Per-schema table change markers and row estimates; markers are None when the source's schemas
+        cannot be listed up front.
         
-        # Find new and changed databases
-        for db_name, db in current_dbs.items():
-            if db_name not in base_dbs:
-                # New database
-                changes["databases"].append(db)
-                continue
-            
-            base_db = base_dbs[db_name]
-            db_changes = {"name": db_name, "collections": []}
-            
-            # Create lookup dictionaries for collections
-            base_collections = {coll["name"]: coll for coll in base_db.get("collections", [])}
-            current_collections = {coll["name"]: coll for coll in db.get("collections", [])}
-            
-            # Find new and changed collections
-            for coll_name, collection in current_collections.items():
-                if coll_name not in base_collections:
-                    # New collection
-                    db_changes["collections"].append(collection)
-                    continue
-                
-                base_collection = base_collections[coll_name]
-                coll_changes = {"name": coll_name, "fields": []}
-                
-                # Check if document count changed significantly
-                if "document_count" in collection and "document_count" in base_collection:
-                    base_count = base_collection["document_count"] or 0
-                    current_count = collection["document_count"] or 0
-                    if base_count != current_count:
-                        coll_changes["document_count"] = current_count
-                        coll_changes["previous_document_count"] = base_count
-                
-                # Create lookup dictionaries for fields
-                base_fields = {field["name"]: field for field in base_collection.get("fields", [])}
-                current_fields = {field["name"]: field for field in collection.get("fields", [])}
-                
-                # Find new and changed fields
-                for field_name, field in current_fields.items():
-                    if field_name not in base_fields:
-                        # New field
-                        coll_changes["fields"].append(field)
-                        continue
-                    
-                    base_field = base_fields[field_name]
-                    
-                    # Check if field definition changed
-                    if IncrementalScanService._has_field_changed(base_field, field):
-                        field_changes = field.copy()
-                        field_changes["change_type"] = "modified"
-                        coll_changes["fields"].append(field_changes)
-                
-                # Find deleted fields
-                for field_name in base_fields:
-                    if field_name not in current_fields:
-                        deleted_field = base_fields[field_name].copy()
-                        deleted_field["change_type"] = "deleted"
-                        coll_changes["fields"].append(deleted_field)
-                
-                if coll_changes["fields"] or "document_count" in coll_changes:
-                    db_changes["collections"].append(coll_changes)
-            
-            # Find deleted collections
-            for coll_name in base_collections:
-                if coll_name not in current_collections:
-                    deleted_collection = {"name": coll_name, "change_type": "deleted"}
-                    db_changes["collections"].append(deleted_collection)
-            
-            if db_changes["collections"]:
-                changes["databases"].append(db_changes)
-        
-        # Find deleted databases
-        for db_name in base_dbs:
-            if db_name not in current_dbs:
-                deleted_db = {"name": db_name, "change_type": "deleted"}
-                changes["databases"].append(deleted_db)
-        
-        return changes
-    
-    @staticmethod
-    def _has_column_changed(base_column: Dict[str, Any], current_column: Dict[str, Any]) -> bool:
-        """Check if a column definition has changed."""
-        # Compare important attributes
-        attributes_to_compare = [
-            "data_type", "is_nullable", "is_primary_key", "is_foreign_key",
-            "character_maximum_length", "numeric_precision", "numeric_scale"
-        ]
-        
-        for attr in attributes_to_compare:
-            if attr in base_column or attr in current_column:
-                base_value = base_column.get(attr)
-                current_value = current_column.get(attr)
-                if base_value != current_value:
-                    return True
-        
-        return False
-    
-    @staticmethod
-    def _has_field_changed(base_field: Dict[str, Any], current_field: Dict[str, Any]) -> bool:
-        """Check if a MongoDB field definition has changed."""
-        # Compare important attributes
-        attributes_to_compare = [
-            "data_type", "is_array", "is_nested", "nested_fields"
-        ]
-        
-        for attr in attributes_to_compare:
-            if attr in base_field or attr in current_field:
-                base_value = base_field.get(attr)
-                current_value = current_field.get(attr)
-                
-                # Special handling for nested_fields
-                if attr == "nested_fields" and base_value and current_value:
-                    # Compare nested fields recursively
-                    base_nested = {field["name"]: field for field in base_value}
-                    current_nested = {field["name"]: field for field in current_value}
-                    
-                    # Check for new or deleted nested fields
-                    if set(base_nested.keys()) != set(current_nested.keys()):
-                        return True
-                    
-                    # Check if any nested field has changed
-                    for name, field in current_nested.items():
-                        if name in base_nested and IncrementalScanService._has_field_changed(base_nested[name], field):
-                            return True
-                elif base_value != current_value:
-                    return True
+        A schema maps to None when its markers are unavailable; it is then always re-extracted.
+        Row estimates are best effort and never make a table stale.
+        """
+        from app.services.data_source_connection_service import DataSourceConnectionService
+        try:
+            connector = DataSourceConnectionService()._get_connector(data_source)
+            schemas = connector._list_discovery_units_sync()
+        except Exception as e:
+            logger.warning(f"Could not list schemas for data source {data_source.id}, extracting everything: {str(e)}")
+            return None, {}
+        if schemas is None:
+            return None, {}
+        if scan_rule_set and scan_rule_set.include_schemas:
+            schemas = [schema for schema in schemas if schema in scan_rule_set.include_schemas]
+        if scan_rule_set and scan_rule_set.exclude_schemas:
+            schemas = [schema for schema in schemas if schema not in scan_rule_set.exclude_schemas]
         
-        return False
+        markers: Dict[str, Optional[Dict[str, str]]] = {}
+        row_estimates: Dict[str, Dict[str, int]] = {}
+        for schema in schemas:
+            try:
+                table_markers = connector._change_markers_sync(schema)
+            except Exception as e:
+                logger.warning(f"Change probe failed for {data_source.id}/{schema}: {str(e)}")
+                table_markers = None
+            if table_markers is not None and scan_rule_set:
+                table_markers = {
+                    table: marker for table, marker in table_markers.items()
+                    if not (scan_rule_set.include_tables and table not in scan_rule_set.include_tables)
+                    and not (scan_rule_set.exclude_tables and table in scan_rule_set.exclude_tables)
+                }
+            markers[schema] = table_markers
+            try:
+                row_estimates[schema] = connector._row_estimates_sync(schema) or {}
+            except Exception as e:
+                logger.warning(f"Row estimates unavailable for {data_source.id}/{schema}: {str(e)}")
+        return markers, row_estimates
     
     @staticmethod
     def _generate_change_summary(incremental_metadata: Dict[str, Any], data_source_type: Union[DataSourceType, str]) -> Dict[str, Any]:
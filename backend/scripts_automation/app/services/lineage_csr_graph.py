@@ -0,0 +1,388 @@
+"""
+Lineage CSR Graph
+Compact lineage graph backend for large graphs: node ids interned to integers, adjacency
+stored as CSR NumPy arrays and node/edge attributes kept in side columns.
+"""
+
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.services.lineage_graph_delta import LineageGraphDelta
+
+# "networkx" (MultiDiGraph, default) or "csr" (this module)
+LINEAGE_GRAPH_BACKEND = os.getenv("LINEAGE_GRAPH_BACKEND", "networkx")
+# Real-time updates arriving within this window (seconds) are applied to the CSR graph in one rebuild
+LINEAGE_CSR_BATCH_SECONDS = float(os.getenv("LINEAGE_CSR_BATCH_SECONDS", "0.5"))
+
+DOWNSTREAM = "downstream"
+UPSTREAM = "upstream"
+BIDIRECTIONAL = "bidirectional"
+
+
+class Vocabulary:
+    """Interns strings (asset types, schemas, lineage types, edge ids) to codes; 0 is None."""
+
+    def __init__(self, values: Optional[List[Optional[str]]] = None):
+        self.values: List[Optional[str]] = list(values) if values else [None]
+        self.codes: Dict[Optional[str], int] = {value: code for code, value in enumerate(self.values)}
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def copy(self) -> "Vocabulary":
+        return Vocabulary(self.values)
+
+
+@dataclass
+class Traversal:
+    """Nodes reached from a root, their BFS distance, and the edges between them."""
+    root: int
+    nodes: np.ndarray
+    distance: np.ndarray
+    edges: np.ndarray
+    tree_edges: np.ndarray
+    parent_edge: np.ndarray
+
+
+def _ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    """Concatenation of arange(start, start + count) for every pair, without a Python loop."""
+    total = int(counts.sum())
+    if not total:
+        return np.zeros(0, dtype=np.int64)
+    ends = np.cumsum(counts)
+    return np.repeat(starts - ends + counts, counts) + np.arange(total, dtype=np.int64)
+
+
+class CSRLineageGraph:
+    """Immutable lineage graph in compressed sparse row form.
+
+    Edges are stored sorted by source, so out-neighbours of node ``i`` are
+    ``dst[out_indptr[i]:out_indptr[i + 1]]``; ``in_order`` lists edge positions sorted by
+    target for the upstream direction. Edge ids are interned to int32 codes (``edge_names``)
+    so edge membership tests run on numeric arrays. Updates go through ``with_delta``, which
+    returns a new graph (copy-on-write) that the caller swaps in.
+    """
+
+    def __init__(self):
+        self.node_ids: List[str] = []
+        self.node_index: Dict[str, int] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.asset_types = Vocabulary()
+        self.names = Vocabulary()
+        self.asset_type = np.zeros(0, dtype=np.int32)
+        self.schema_name = np.zeros(0, dtype=np.int32)
+        self.database_name = np.zeros(0, dtype=np.int32)
+        self.asset_name = np.zeros(0, dtype=object)
+        self.business_importance = np.zeros(0, dtype=np.float32)
+        self.business_criticality = np.zeros(0, dtype=np.float32)
+        # Only non-empty metadata is kept: node index / edge id -> dict
+        self.node_metadata: Dict[int, Dict[str, Any]] = {}
+        self.edge_metadata: Dict[str, Dict[str, Any]] = {}
+
+        self.edge_names = Vocabulary()
+        self.lineage_types = Vocabulary()
+        self.transformation_types = Vocabulary()
+        self.src = np.zeros(0, dtype=np.int32)
+        self.dst = np.zeros(0, dtype=np.int32)
+        self.edge_codes = np.zeros(0, dtype=np.int32)
+        self.confidence = np.zeros(0, dtype=np.float32)
+        self.lineage_type = np.zeros(0, dtype=np.int16)
+        self.transformation_type = np.zeros(0, dtype=np.int16)
+        self.out_indptr = np.zeros(1, dtype=np.int64)
+        self.in_indptr = np.zeros(1, dtype=np.int64)
+        self.in_order = np.zeros(0, dtype=np.int64)
+
+    # ------------------------------------------------------------------ building
+
+    @classmethod
+    def from_delta(cls, delta: LineageGraphDelta) -> "CSRLineageGraph":
+        """Builds a graph from a full load (the rows of a LineageGraphDelta)."""
+        return cls().with_delta(delta)
+
+    def _copy_nodes(self) -> "CSRLineageGraph":
+        graph = CSRLineageGraph()
+        graph.node_ids = list(self.node_ids)
+        graph.node_index = dict(self.node_index)
+        graph.asset_types, graph.names = self.asset_types.copy(), self.names.copy()
+        graph.lineage_types, graph.transformation_types = self.lineage_types.copy(), self.transformation_types.copy()
+        graph.edge_names = self.edge_names.copy()
+        for column in ("alive", "asset_type", "schema_name", "database_name", "asset_name",
+                       "business_importance", "business_criticality"):
+            setattr(graph, column, getattr(self, column).copy())
+        graph.node_metadata = dict(self.node_metadata)
+        graph.edge_metadata = dict(self.edge_metadata)
+        return graph
+
+    def _intern_nodes(self, node_ids: Iterable[str]) -> None:
+        new_ids = [node_id for node_id in dict.fromkeys(node_ids) if node_id not in self.node_index]
+        if not new_ids:
+            return
+        start = len(self.node_ids)
+        for offset, node_id in enumerate(new_ids):
+            self.node_index[node_id] = start + offset
+        self.node_ids.extend(new_ids)
+        count = len(new_ids)
+        # Nodes only known as edge endpoints get the defaults networkx would show
+        self.alive = np.concatenate([self.alive, np.ones(count, dtype=bool)])
+        self.asset_type = np.concatenate([self.asset_type, np.zeros(count, dtype=np.int32)])
+        self.schema_name = np.concatenate([self.schema_name, np.zeros(count, dtype=np.int32)])
+        self.database_name = np.concatenate([self.database_name, np.zeros(count, dtype=np.int32)])
+        self.asset_name = np.concatenate([self.asset_name, np.array(new_ids, dtype=object)])
+        self.business_importance = np.concatenate([self.business_importance, np.full(count, 0.5, dtype=np.float32)])
+        self.business_criticality = np.concatenate([self.business_criticality, np.full(count, 0.5, dtype=np.float32)])
+
+    def _set_node(self, index: int, attributes: Dict[str, Any]) -> None:
+        metadata = attributes.get("metadata") or {}
+        self.alive[index] = True
+        self.asset_type[index] = self.asset_types.encode(attributes.get("asset_type"))
+        self.schema_name[index] = self.names.encode(attributes.get("schema_name"))
+        self.database_name[index] = self.names.encode(attributes.get("database_name"))
+        self.asset_name[index] = attributes.get("asset_name") or self.node_ids[index]
+        self.business_importance[index] = attributes.get("business_importance", 0.5)
+        self.business_criticality[index] = metadata.get("business_criticality", 0.5)
+        if metadata:
+            self.node_metadata[index] = metadata
+        else:
+            self.node_metadata.pop(index, None)
+
+    def _edge_codes(self, edge_ids: Iterable[str]) -> np.ndarray:
+        """Codes of the already interned edge ids among the given ones."""
+        codes = self.edge_names.codes
+        return np.array([codes[edge_id] for edge_id in edge_ids if edge_id in codes], dtype=np.int32)
+
+    def with_delta(self, delta: LineageGraphDelta) -> "CSRLineageGraph":
+        """Returns a new graph with the delta applied; this graph is left untouched."""
+        graph = self._copy_nodes()
+        keep = np.ones(len(self.src), dtype=bool)
+
+        if delta.removed_node_ids:
+            removed = [self.node_index[node_id] for node_id in delta.removed_node_ids if node_id in self.node_index]
+            graph.alive[removed] = False
+            for index in removed:
+                graph.node_metadata.pop(index, None)
+        # Edges of removed nodes are dropped before the delta's nodes or edges can bring them back
+        if len(self.src):
+            keep &= graph.alive[self.src] & graph.alive[self.dst]
+        # Updated edges are dropped and re-added, since their endpoints may have moved
+        replaced = set(delta.removed_edge_ids) | {edge_id for _, _, edge_id, _ in delta.edges}
+        if replaced and len(self.edge_codes):
+            keep &= ~np.isin(self.edge_codes, self._edge_codes(replaced))
+            for edge_id in delta.removed_edge_ids:
+                graph.edge_metadata.pop(edge_id, None)
+
+        graph._intern_nodes([node_id for node_id, _ in delta.nodes])
+        graph._intern_nodes(node_id for source_id, target_id, _, _ in delta.edges for node_id in (source_id, target_id))
+        for node_id, attributes in delta.nodes:
+            graph._set_node(graph.node_index[node_id], attributes)
+
+        edges = [
+            (graph.node_index[source_id], graph.node_index[target_id], edge_id, attributes)
+            for source_id, target_id, edge_id, attributes in delta.edges
+        ]
+        if edges:
+            # As with networkx add_edge, an edge brings its endpoints (back) into the graph
+            graph.alive[[e[0] for e in edges] + [e[1] for e in edges]] = True
+        for _, _, edge_id, attributes in edges:
+            if attributes.get("metadata"):
+                graph.edge_metadata[edge_id] = attributes["metadata"]
+            else:
+                graph.edge_metadata.pop(edge_id, None)
+        graph._set_edges(
+            np.concatenate([self.src[keep], np.array([e[0] for e in edges], dtype=np.int32)]),
+            np.concatenate([self.dst[keep], np.array([e[1] for e in edges], dtype=np.int32)]),
+            np.concatenate([self.edge_codes[keep], np.array(
+                [graph.edge_names.encode(e[2]) for e in edges], dtype=np.int32)]),
+            np.concatenate([self.confidence[keep], np.array(
+                [e[3].get("confidence", 1.0) for e in edges], dtype=np.float32)]),
+            np.concatenate([self.lineage_type[keep], np.array(
+                [graph.lineage_types.encode(e[3].get("lineage_type")) for e in edges], dtype=np.int16)]),
+            np.concatenate([self.transformation_type[keep], np.array(
+                [graph.transformation_types.encode(e[3].get("transformation_type")) for e in edges], dtype=np.int16)]),
+        )
+        return graph
+
+    def _set_edges(self, src, dst, edge_codes, confidence, lineage_type, transformation_type) -> None:
+        order = np.argsort(src, kind="stable")
+        self.src, self.dst, self.edge_codes = src[order], dst[order], edge_codes[order]
+        self.confidence, self.lineage_type = confidence[order], lineage_type[order]
+        self.transformation_type = transformation_type[order]
+        node_count = len(self.node_ids)
+        self.out_indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.src, minlength=node_count), out=self.out_indptr[1:])
+        self.in_order = np.argsort(self.dst, kind="stable")
+        self.in_indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.dst, minlength=node_count), out=self.in_indptr[1:])
+
+    # ------------------------------------------------------------------ inspection
+
+    def __contains__(self, node_id: str) -> bool:
+        index = self.node_index.get(node_id)
+        return index is not None and bool(self.alive[index])
+
+    def number_of_nodes(self) -> int:
+        return int(self.alive.sum())
+
+    def number_of_edges(self) -> int:
+        return len(self.src)
+
+    def nbytes(self) -> int:
+        """Bytes held by the NumPy columns (excluding interned strings and metadata dicts)."""
+        return sum(
+            getattr(self, column).nbytes for column in (
+                "alive", "asset_type", "schema_name", "database_name", "asset_name",
+                "business_importance", "business_criticality", "src", "dst", "edge_codes",
+                "confidence", "lineage_type", "transformation_type", "out_indptr", "in_indptr", "in_order",
+            )
+        )
+
+    def needs_deletion_scan(self, delta: LineageGraphDelta) -> bool:
+        """Same count check as lineage_graph_delta.needs_deletion_scan, for this backend."""
+        new_nodes = {node_id for node_id, _ in delta.nodes if node_id not in self}
+        delta_edge_ids = list({edge_id for _, _, edge_id, _ in delta.edges})
+        known = int(np.isin(self._edge_codes(delta_edge_ids), self.edge_codes).sum()) if delta_edge_ids else 0
+        return (self.number_of_nodes() + len(new_nodes) != delta.node_count
+                or self.number_of_edges() + len(delta_edge_ids) - known != delta.edge_count)
+
+    def removed_ids(self, node_ids: Set[str], edge_ids: Set[str]) -> Tuple[Set[str], Set[str]]:
+        alive_ids = {self.node_ids[index] for index in np.flatnonzero(self.alive)}
+        names = self.edge_names.values
+        return alive_ids - node_ids, {names[code] for code in self.edge_codes.tolist()} - edge_ids
+
+    def edge_ids_between(self, source_id: str, target_id: str) -> List[str]:
+        source, target = self.node_index.get(source_id), self.node_index.get(target_id)
+        if source is None or target is None:
+            return []
+        positions = np.arange(self.out_indptr[source], self.out_indptr[source + 1])
+        codes = self.edge_codes[positions[self.dst[positions] == target]]
+        return [self.edge_names.values[code] for code in codes.tolist()]
+
+    # ------------------------------------------------------------------ traversal
+
+    def _expand(self, frontier: np.ndarray, direction: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Edge positions leaving the frontier in a direction, and the node each one reaches."""
+        positions, neighbors = [], []
+        if direction in (DOWNSTREAM, BIDIRECTIONAL):
+            starts = self.out_indptr[frontier]
+            out_positions = _ranges(starts, self.out_indptr[frontier + 1] - starts)
+            positions.append(out_positions)
+            neighbors.append(self.dst[out_positions])
+        if direction in (UPSTREAM, BIDIRECTIONAL):
+            starts = self.in_indptr[frontier]
+            in_positions = self.in_order[_ranges(starts, self.in_indptr[frontier + 1] - starts)]
+            positions.append(in_positions)
+            neighbors.append(self.src[in_positions])
+        if len(positions) == 1:
+            return positions[0], neighbors[0]
+        return np.concatenate(positions), np.concatenate(neighbors)
+
+    def traverse(self, asset_id: str, direction: str = DOWNSTREAM, max_depth: int = 5,
+                 min_confidence: float = 0.0, max_nodes: Optional[int] = None) -> Optional[Traversal]:
+        """Level-synchronous BFS from an asset, up to ``max_depth`` hops.
+
+        A neighbour is reached through any edge whose confidence meets ``min_confidence``.
+        ``edges`` are all edges between reached nodes (what the networkx BFS returns) and
+        ``tree_edges`` one shortest-path edge per reached node. Returns None for an
+        unknown asset.
+        """
+        root = self.node_index.get(asset_id)
+        if root is None or not self.alive[root]:
+            return None
+        node_count = len(self.node_ids)
+        distance = np.full(node_count, -1, dtype=np.int32)
+        parent_edge = np.full(node_count, -1, dtype=np.int64)
+        distance[root] = 0
+        reached = 1
+        frontier = np.array([root], dtype=np.int64)
+        for depth in range(1, max_depth + 1):
+            if not len(frontier) or (max_nodes is not None and reached >= max_nodes):
+                break
+            positions, neighbors = self._expand(frontier, direction)
+            if min_confidence > 0:
+                passing = self.confidence[positions] >= min_confidence
+                positions, neighbors = positions[passing], neighbors[passing]
+            new = (distance[neighbors] < 0) & self.alive[neighbors]
+            frontier, first = np.unique(neighbors[new], return_index=True)
+            if max_nodes is not None:
+                frontier, first = frontier[:max_nodes - reached], first[:max_nodes - reached]
+            distance[frontier] = depth
+            parent_edge[frontier] = positions[new][first]
+            reached += len(frontier)
+
+        nodes = np.flatnonzero(distance >= 0)
+        out_positions, targets = self._expand(nodes, DOWNSTREAM)
+        edges = out_positions[distance[targets] >= 0]
+        return Traversal(
+            root=root,
+            nodes=nodes,
+            distance=distance[nodes],
+            edges=edges,
+            tree_edges=parent_edge[nodes[parent_edge[nodes] >= 0]],
+            parent_edge=parent_edge,
+        )
+
+    def path_to(self, traversal: Traversal, target: int) -> List[str]:
+        """Node ids on the BFS-tree path from the traversal root to a reached node."""
+        path = [target]
+        while path[-1] != traversal.root:
+            position = traversal.parent_edge[path[-1]]
+            if position < 0:
+                return []
+            source, target_node = int(self.src[position]), int(self.dst[position])
+            path.append(source if target_node == path[-1] else target_node)
+        return [self.node_ids[index] for index in reversed(path)]
+
+    def shortest_path(self, source_id: str, target_id: str, max_depth: Optional[int] = None) -> List[str]:
+        """Shortest downstream path between two assets (empty when unreachable)."""
+        target = self.node_index.get(target_id)
+        traversal = self.traverse(source_id, DOWNSTREAM, max_depth if max_depth is not None else len(self.node_ids))
+        if traversal is None or target is None or (traversal.parent_edge[target] < 0 and target != traversal.root):
+            return []
+        return self.path_to(traversal, target)
+
+    def critical_path(self, traversal: Traversal) -> List[str]:
+        """Path from the root to the reached node with the highest business criticality."""
+        candidates = traversal.nodes[traversal.nodes != traversal.root]
+        if not len(candidates):
+            return [self.node_ids[traversal.root]]
+        return self.path_to(traversal, int(candidates[np.argmax(self.business_criticality[candidates])]))
+
+    # ------------------------------------------------------------------ row views
+
+    def node_rows(self, nodes: np.ndarray, distance: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """LineageNode keyword arguments for node indices."""
+        rows = []
+        for position, index in enumerate(nodes.tolist()):
+            rows.append({
+                "node_id": self.node_ids[index],
+                "asset_type": self.asset_types.values[self.asset_type[index]] or "unknown",
+                "asset_name": self.asset_name[index],
+                "schema_name": self.names.values[self.schema_name[index]],
+                "database_name": self.names.values[self.database_name[index]],
+                "metadata": self.node_metadata.get(index, {}),
+                "level": int(distance[position]) if distance is not None else 0,
+                "distance": int(distance[position]) if distance is not None else 0,
+            })
+        return rows
+
+    def edge_rows(self, positions: np.ndarray) -> List[Dict[str, Any]]:
+        """Edge attributes (as stored in the networkx graph) for edge positions."""
+        rows = []
+        for position in positions.tolist():
+            edge_id = self.edge_names.values[self.edge_codes[position]]
+            rows.append({
+                "source_id": self.node_ids[self.src[position]],
+                "target_id": self.node_ids[self.dst[position]],
+                "edge_id": edge_id,
+                "lineage_type": self.lineage_types.values[self.lineage_type[position]],
+                "transformation_type": self.transformation_types.values[self.transformation_type[position]],
+                "confidence": float(self.confidence[position]),
+                "metadata": self.edge_metadata.get(edge_id, {}),
+            })
+        return rows
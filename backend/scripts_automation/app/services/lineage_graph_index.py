@@ -0,0 +1,122 @@
+"""
+Lineage Graph Index
+Adjacency-indexed, in-memory lineage graph used to answer per-entity lineage lookups
+without rebuilding the graph from scan results on every request.
+"""
+
+import json
+import threading
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class LineageGraphIndex:
+    """Adjacency-indexed lineage graph kept in memory and maintained per data source.
+
+    Each data source contributes the nodes and edges extracted from its latest completed
+    scan; replacing a source only touches its own nodes and adjacency lists. Lookups are
+    dict accesses and traversals are BFS over the in/out edge lists.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.out_edges: Dict[str, List[Dict[str, Any]]] = {}
+        self.in_edges: Dict[str, List[Dict[str, Any]]] = {}
+        self._source_nodes: Dict[int, List[str]] = {}
+        self._source_edges: Dict[int, List[Dict[str, Any]]] = {}
+        # data_source_id -> version (latest scan result timestamp) the source was built from
+        self.versions: Dict[int, Any] = {}
+        self.loaded = False
+        self.synced_at = 0.0
+
+    def replace_source(self, source_id: int, lineage_info: Dict[str, Any], version: Any = None) -> None:
+        """Replaces the nodes and edges contributed by a data source."""
+        with self._lock:
+            self.remove_source(source_id)
+            owned_nodes = []
+            for node in lineage_info.get("nodes", []):
+                if node["id"] not in self.nodes:
+                    self.nodes[node["id"]] = node
+                    owned_nodes.append(node["id"])
+            edges = []
+            seen = set()
+            for edge in lineage_info.get("edges", []):
+                key = (edge["source"], edge["target"], edge.get("label"),
+                       json.dumps(edge.get("properties") or {}, sort_keys=True, default=str))
+                if key in seen:
+                    continue
+                seen.add(key)
+                edges.append(edge)
+                self.out_edges.setdefault(edge["source"], []).append(edge)
+                self.in_edges.setdefault(edge["target"], []).append(edge)
+            self._source_nodes[source_id] = owned_nodes
+            self._source_edges[source_id] = edges
+            self.versions[source_id] = version
+
+    def remove_source(self, source_id: int) -> None:
+        with self._lock:
+            for node_id in self._source_nodes.pop(source_id, []):
+                self.nodes.pop(node_id, None)
+            removed = self._source_edges.pop(source_id, [])
+            if removed:
+                removed_ids = {id(edge) for edge in removed}
+                for adjacency, endpoint in ((self.out_edges, "source"), (self.in_edges, "target")):
+                    for node_id in {edge[endpoint] for edge in removed}:
+                        remaining = [edge for edge in adjacency.get(node_id, []) if id(edge) not in removed_ids]
+                        if remaining:
+                            adjacency[node_id] = remaining
+                        else:
+                            adjacency.pop(node_id, None)
+            self.versions.pop(source_id, None)
+
+    def traverse(self, node_id: str, depth: int, upstream: bool) -> List[str]:
+        """BFS up to `depth` hops; returns each reachable node id once, nearest first."""
+        adjacency, endpoint = (self.in_edges, "source") if upstream else (self.out_edges, "target")
+        visited = {node_id}
+        ordered = []
+        frontier = deque([(node_id, 0)])
+        while frontier:
+            current, level = frontier.popleft()
+            if level >= depth:
+                continue
+            for edge in adjacency.get(current, ()):
+                neighbor = edge[endpoint]
+                if neighbor in visited or neighbor not in self.nodes:
+                    continue
+                visited.add(neighbor)
+                ordered.append(neighbor)
+                frontier.append((neighbor, level + 1))
+        return ordered
+
+    def get_lineage(self, entity_type: str, entity_id: str, depth: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            target_node = self.nodes.get(entity_id)
+            if not target_node or target_node["type"] != entity_type:
+                return None
+            upstream_ids = self.traverse(entity_id, depth, upstream=True)
+            downstream_ids = self.traverse(entity_id, depth, upstream=False)
+
+            node_ids = [entity_id]
+            included = {entity_id}
+            for node_id in upstream_ids + downstream_ids:
+                if node_id not in included:
+                    included.add(node_id)
+                    node_ids.append(node_id)
+            edges = [
+                edge
+                for node_id in node_ids
+                for edge in self.out_edges.get(node_id, ())
+                if edge["target"] in included
+            ]
+            return {
+                "target_entity": target_node,
+                "nodes": [self.nodes[node_id] for node_id in node_ids],
+                "edges": edges,
+                "upstream_count": len(upstream_ids),
+                "downstream_count": len(downstream_ids)
+            }
+
+
+# Process-wide lineage index used by LineageService entity lookups
+lineage_index = LineageGraphIndex()
@@ -1,13 +1,19 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterable, Tuple
 import logging
+import os
+import time
 from datetime import datetime
 from sqlmodel import Session, select, func
 from app.models.scan_models import Scan, ScanResult, DataSource
+from app.services.lineage_graph_index import LineageGraphIndex, lineage_index
 import json
 
 # Setup logging
 logger = logging.getLogger(__name__)
 
+# Minimum seconds between freshness checks of the in-memory lineage index against the database
+LINEAGE_INDEX_SYNC_SECONDS = float(os.getenv("LINEAGE_INDEX_SYNC_SECONDS", "30"))
+
 class LineageService:
     """Service for generating and managing data lineage information."""
     
@@ -23,33 +29,10 @@ class LineageService:
             A dictionary containing nodes and edges for the lineage graph
         """
         try:
-            # Get the latest scan result for each data source
-            subq = select(
-                ScanResult.scan_id,
-                func.max(ScanResult.created_at).label("max_created_at")
-            ).join(
-                Scan, ScanResult.scan_id == Scan.id
-            ).where(
-                Scan.status == "completed"
+            results = LineageService._get_latest_scan_results(
+                session, [data_source_id] if data_source_id is not None else None
             )
             
-            if data_source_id is not None:
-                subq = subq.where(Scan.data_source_id == data_source_id)
-            
-            subq = subq.group_by(Scan.data_source_id).subquery()
-            
-            stmt = select(ScanResult, Scan, DataSource).join(
-                subq,
-                (ScanResult.scan_id == subq.c.scan_id) & 
-                (ScanResult.created_at == subq.c.max_created_at)
-            ).join(
-                Scan, ScanResult.scan_id == Scan.id
-            ).join(
-                DataSource, Scan.data_source_id == DataSource.id
-            )
-            
-            results = session.exec(stmt).all()
-            
             # Build lineage graph
             nodes = []
             edges = []
@@ -78,6 +61,91 @@ class LineageService:
             logger.error(f"Error generating lineage graph: {str(e)}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _get_latest_scan_results(session: Session, data_source_ids: Optional[List[int]] = None) -> List[Tuple[ScanResult, Scan, DataSource]]:
+        """Get the latest completed scan result (with its scan and data source) for each data source."""
+        subq = select(
+            ScanResult.scan_id,
+            func.max(ScanResult.created_at).label("max_created_at")
+        ).join(
+            Scan, ScanResult.scan_id == Scan.id
+        ).where(
+            Scan.status == "completed"
+        )
+        
+        if data_source_ids is not None:
+            subq = subq.where(Scan.data_source_id.in_(data_source_ids))
+        
+        subq = subq.group_by(Scan.data_source_id).subquery()
+        
+        stmt = select(ScanResult, Scan, DataSource).join(
+            subq,
+            (ScanResult.scan_id == subq.c.scan_id) & 
+            (ScanResult.created_at == subq.c.max_created_at)
+        ).join(
+            Scan, ScanResult.scan_id == Scan.id
+        ).join(
+            DataSource, Scan.data_source_id == DataSource.id
+        )
+        
+        return session.exec(stmt).all()
+    
+    @staticmethod
+    def sync_lineage_index(session: Session, force: bool = False, data_source_ids: Optional[Iterable[int]] = None) -> LineageGraphIndex:
+        """Bring the in-memory lineage index up to date with the latest completed scans.
+        
+        One aggregate query finds each data source's latest scan result timestamp; only
+        sources whose timestamp changed are re-extracted, and sources without completed
+        scans are dropped. Checks are rate-limited by LINEAGE_INDEX_SYNC_SECONDS unless
+        forced or limited to specific data sources (e.g. when a scan completes).
+        
+        Args:
+            session: The database session
+            force: Check the database even if the last check is recent
+            data_source_ids: Only refresh these data sources
+            
+        Returns:
+            The lineage index
+        """
+        index = lineage_index
+        if data_source_ids is None and not force and index.loaded \
+                and time.monotonic() - index.synced_at < LINEAGE_INDEX_SYNC_SECONDS:
+            return index
+        
+        stmt = select(
+            Scan.data_source_id,
+            func.max(ScanResult.created_at)
+        ).join(
+            Scan, ScanResult.scan_id == Scan.id
+        ).where(
+            Scan.status == "completed"
+        )
+        if data_source_ids is not None:
+            data_source_ids = list(data_source_ids)
+            stmt = stmt.where(Scan.data_source_id.in_(data_source_ids))
+        latest = dict(session.exec(stmt.group_by(Scan.data_source_id)).all())
+        
+        changed = [source_id for source_id, version in latest.items() if index.versions.get(source_id) != version]
+        stale = [
+            source_id for source_id in (data_source_ids if data_source_ids is not None else list(index.versions))
+            if source_id not in latest
+        ]
+        for source_id in stale:
+            index.remove_source(source_id)
+        if changed:
+            for result, scan, data_source in LineageService._get_latest_scan_results(session, changed):
+                lineage_info = LineageService._extract_lineage_from_metadata(
+                    result.scan_metadata, data_source.id, data_source.name, data_source.source_type
+                )
+                index.replace_source(data_source.id, lineage_info, latest.get(data_source.id))
+        if changed or stale:
+            logger.info(f"Lineage index refreshed: {len(changed)} data sources updated, {len(stale)} removed")
+        
+        if data_source_ids is None:
+            index.loaded = True
+            index.synced_at = time.monotonic()
+        return index
+    
     @staticmethod
     def _extract_lineage_from_metadata(metadata: Dict[str, Any], source_id: int, source_name: str, source_type: str) -> Dict[str, Any]:
         """Extract lineage information from metadata.
@@ -441,119 +509,19 @@ class LineageService:
             A dictionary containing lineage information for the entity
         """
         try:
-            # Generate the full lineage graph
-            full_graph = LineageService.generate_lineage_graph(session)
+            # Answer from the adjacency-indexed graph (refreshed per data source when scans change)
+            index = LineageService.sync_lineage_index(session)
+            lineage = index.get_lineage(entity_type, entity_id, depth)
             
-            if "error" in full_graph:
-                return full_graph
-            
-            # Find the target entity node
-            target_node = None
-            for node in full_graph["nodes"]:
-                if node["id"] == entity_id and node["type"] == entity_type:
-                    target_node = node
-                    break
-            
-            if not target_node:
+            if lineage is None:
                 return {"error": f"Entity not found: {entity_type} {entity_id}"}
             
-            # Extract lineage for the target entity
-            upstream_nodes = LineageService._get_upstream_nodes(
-                full_graph["nodes"], full_graph["edges"], entity_id, depth
-            )
-            
-            downstream_nodes = LineageService._get_downstream_nodes(
-                full_graph["nodes"], full_graph["edges"], entity_id, depth
-            )
-            
-            # Combine all nodes and edges
-            all_node_ids = set([entity_id] + [node["id"] for node in upstream_nodes + downstream_nodes])
-            
-            filtered_nodes = [node for node in full_graph["nodes"] if node["id"] in all_node_ids]
-            
-            filtered_edges = [edge for edge in full_graph["edges"] 
-                             if edge["source"] in all_node_ids and edge["target"] in all_node_ids]
-            
-            return {
-                "target_entity": target_node,
-                "nodes": filtered_nodes,
-                "edges": filtered_edges,
-                "upstream_count": len(upstream_nodes),
-                "downstream_count": len(downstream_nodes)
-            }
+            return lineage
             
         except Exception as e:
             logger.error(f"Error getting lineage for entity: {str(e)}")
             return {"error": str(e)}
     
-    @staticmethod
-    def _get_upstream_nodes(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]], 
-                           entity_id: str, depth: int) -> List[Dict[str, Any]]:
-        """Get upstream nodes for an entity.
-        
-        Args:
-            nodes: The list of all nodes
-            edges: The list of all edges
-            entity_id: The ID of the entity
-            depth: The depth of lineage to retrieve
-            
-        Returns:
-            A list of upstream nodes
-        """
-        if depth <= 0:
-            return []
-        
-        # Find all edges where the target is the entity_id
-        incoming_edges = [edge for edge in edges if edge["target"] == entity_id]
-        
-        # Get the source nodes for these edges
-        source_ids = [edge["source"] for edge in incoming_edges]
-        source_nodes = [node for node in nodes if node["id"] in source_ids]
-        
-        # Recursively get upstream nodes for each source node
-        upstream_nodes = []
-        for source_node in source_nodes:
-            upstream_nodes.append(source_node)
-            upstream_nodes.extend(
-                LineageService._get_upstream_nodes(nodes, edges, source_node["id"], depth - 1)
-            )
-        
-        return upstream_nodes
-    
-    @staticmethod
-    def _get_downstream_nodes(nodes: List[Dict[str, Any]], edges: List[Dict[str, Any]], 
-                             entity_id: str, depth: int) -> List[Dict[str, Any]]:
-        """Get downstream nodes for an entity.
-        
-        Args:
-            nodes: The list of all nodes
-            edges: The list of all edges
-            entity_id: The ID of the entity
-            depth: The depth of lineage to retrieve
-            
-        Returns:
-            A list of downstream nodes
-        """
-        if depth <= 0:
-            return []
-        
-        # Find all edges where the source is the entity_id
-        outgoing_edges = [edge for edge in edges if edge["source"] == entity_id]
-        
-        # Get the target nodes for these edges
-        target_ids = [edge["target"] for edge in outgoing_edges]
-        target_nodes = [node for node in nodes if node["id"] in target_ids]
-        
-        # Recursively get downstream nodes for each target node
-        downstream_nodes = []
-        for target_node in target_nodes:
-            downstream_nodes.append(target_node)
-            downstream_nodes.extend(
-                LineageService._get_downstream_nodes(nodes, edges, target_node["id"], depth - 1)
-            )
-        
-        return downstream_nodes
-    
     @staticmethod
     def export_lineage_to_purview(session: Session, data_source_id: Optional[int] = None) -> Dict[str, Any]:
         """Export lineage information to Microsoft Purview.
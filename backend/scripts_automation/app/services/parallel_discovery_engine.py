@@ -0,0 +1,96 @@
+"""
+Parallel Discovery Engine
+Fans schema discovery work (per schema, and per table for expensive metadata) out over the
+shared connector executor with bounded in-flight work, yielding results as they finish.
+"""
+
+import asyncio
+import logging
+import os
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, Optional, Set, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Work units scheduled ahead of the consumer; further units wait until results are consumed
+DEFAULT_MAX_IN_FLIGHT = int(os.getenv("DISCOVERY_MAX_IN_FLIGHT", "8"))
+
+
+class ParallelDiscoveryEngine:
+    """Runs async discovery units concurrently with backpressure.
+
+    At most ``max_in_flight`` units are scheduled at once and new units are only started
+    when the caller consumes a finished result, so a slow consumer (e.g. one persisting
+    results) throttles discovery instead of buffering the whole catalog in memory.
+    Blocking driver calls inside a unit should go through the connector executor, which
+    enforces the per-data-source concurrency cap.
+    """
+
+    def __init__(self, max_in_flight: int = DEFAULT_MAX_IN_FLIGHT):
+        self.max_in_flight = max(1, max_in_flight)
+
+    async def map_unordered(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        max_in_flight: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[T, R]]:
+        """Yield ``(item, result)`` pairs in completion order.
+
+        The first failing unit cancels the remaining ones and its exception is raised.
+        """
+        window = max(1, max_in_flight or self.max_in_flight)
+        iterator = iter(items)
+        pending: Set[asyncio.Future] = set()
+
+        def launch() -> bool:
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return False
+            task = asyncio.ensure_future(func(item))
+            task.discovery_item = item
+            pending.add(task)
+            return True
+
+        for _ in range(window):
+            if not launch():
+                break
+
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.discard(task)
+                    yield task.discovery_item, task.result()
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    async def gather_ordered(
+        self,
+        func: Callable[[T], Awaitable[R]],
+        items: Iterable[T],
+        max_in_flight: Optional[int] = None,
+    ) -> list:
+        """Run every unit concurrently and return results in input order"""
+        items = list(items)
+        results: dict = {}
+        async for (index, _), result in self.map_unordered(
+            lambda pair: self._indexed(func, pair), enumerate(items), max_in_flight
+        ):
+            results[index] = result
+        return [results[index] for index in range(len(items))]
+
+    @staticmethod
+    async def _indexed(func: Callable[[Any], Awaitable[R]], pair: Tuple[int, Any]) -> R:
+        return await func(pair[1])
+
+
+# Process-wide engine shared by connectors and scans
+discovery_engine = ParallelDiscoveryEngine()
@@ -0,0 +1,182 @@
+"""
+Permission Cache
+In-process cache for RBAC resolution: the role-inheritance closure, per-user effective
+permissions and session-token lookups, invalidated by a version bumped on RBAC writes.
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from app.models.auth_models import (
+    User, Role, Group, UserRole, UserGroup, GroupRole, RoleInheritance, Permission, RolePermission,
+    Session as UserSession,
+)
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on staleness for writes the listeners cannot see (raw SQL, other processes)
+RBAC_CACHE_TTL_SECONDS = float(os.getenv("RBAC_CACHE_TTL_SECONDS", "300"))
+RBAC_SESSION_CACHE_TTL_SECONDS = float(os.getenv("RBAC_SESSION_CACHE_TTL_SECONDS", "60"))
+RBAC_SESSION_CACHE_SIZE = int(os.getenv("RBAC_SESSION_CACHE_SIZE", "10000"))
+
+# Writes to these models change role membership, inheritance or grants
+RBAC_MODELS = (Role, Group, UserRole, UserGroup, GroupRole, RoleInheritance, Permission, RolePermission)
+# User attributes and relationships read by check_permission / ABAC conditions
+RBAC_USER_ATTRIBUTES = ("role", "department", "region", "is_active", "roles", "groups")
+
+
+class PermissionCache:
+    """Versioned cache of compiled RBAC state.
+
+    Every entry records the version it was computed at; bump() (called after a commit
+    that touched RBAC tables) makes all of them stale at once. Entries also expire after
+    a TTL so changes made outside this process are eventually picked up.
+    """
+
+    def __init__(self, ttl: float = RBAC_CACHE_TTL_SECONDS,
+                 session_ttl: float = RBAC_SESSION_CACHE_TTL_SECONDS,
+                 session_cache_size: int = RBAC_SESSION_CACHE_SIZE):
+        self.ttl = ttl
+        self.session_ttl = session_ttl
+        self.session_cache_size = session_cache_size
+        self.version = 0
+        self._lock = threading.Lock()
+        self._closure: Optional[Tuple[int, float, Dict[int, FrozenSet[int]]]] = None
+        self._users: Dict[int, Tuple[int, float, Any]] = {}
+        self._tokens: "OrderedDict[str, Tuple[int, float, Dict[str, Any]]]" = OrderedDict()
+
+    def bump(self) -> int:
+        with self._lock:
+            self.version += 1
+            self._closure = None
+            self._users.clear()
+            self._tokens.clear()
+            return self.version
+
+    def _fresh(self, entry: Optional[Tuple], ttl: float) -> bool:
+        return entry is not None and entry[0] == self.version and time.monotonic() - entry[1] < ttl
+
+    def role_closure(self, load_edges: Callable[[], List[Tuple[int, int]]]) -> Dict[int, FrozenSet[int]]:
+        """Returns role_id -> the role and all roles it inherits from (transitively)."""
+        with self._lock:
+            if self._fresh(self._closure, self.ttl):
+                return self._closure[2]
+            version = self.version
+        closure = compute_role_closure(load_edges())
+        with self._lock:
+            if version == self.version:
+                self._closure = (version, time.monotonic(), closure)
+        return closure
+
+    def get_user(self, user_id: int) -> Optional[Any]:
+        with self._lock:
+            entry = self._users.get(user_id)
+            return entry[2] if self._fresh(entry, self.ttl) else None
+
+    def set_user(self, user_id: int, value: Any, version: int) -> None:
+        with self._lock:
+            if version == self.version:
+                self._users[user_id] = (version, time.monotonic(), value)
+
+    def get_token(self, token: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._tokens.get(token)
+            if not self._fresh(entry, self.session_ttl):
+                return None
+            self._tokens.move_to_end(token)
+            return entry[2]
+
+    def set_token(self, token: str, value: Dict[str, Any], version: int) -> None:
+        with self._lock:
+            if version != self.version:
+                return
+            self._tokens[token] = (version, time.monotonic(), value)
+            self._tokens.move_to_end(token)
+            while len(self._tokens) > self.session_cache_size:
+                self._tokens.popitem(last=False)
+
+    def evict_tokens(self, tokens: Set[str]) -> None:
+        with self._lock:
+            for token in tokens:
+                self._tokens.pop(token, None)
+
+
+def compute_role_closure(edges: List[Tuple[int, int]]) -> Dict[int, FrozenSet[int]]:
+    """Transitive closure of (child_role_id, parent_role_id) edges; cycles are tolerated."""
+    parents: Dict[int, Set[int]] = {}
+    for child_id, parent_id in edges:
+        parents.setdefault(child_id, set()).add(parent_id)
+
+    closure: Dict[int, FrozenSet[int]] = {}
+    for role_id in parents:
+        if role_id in closure:
+            continue
+        reached = {role_id}
+        stack = [role_id]
+        while stack:
+            for parent_id in parents.get(stack.pop(), ()):
+                if parent_id not in reached:
+                    reached.add(parent_id)
+                    stack.append(parent_id)
+        closure[role_id] = frozenset(reached)
+    return closure
+
+
+permission_cache = PermissionCache()
+
+
+def _touches_rbac(session: Session) -> Tuple[bool, Set[str]]:
+    changed = False
+    revoked_tokens: Set[str] = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, RBAC_MODELS):
+            changed = True
+        elif isinstance(obj, User):
+            state = sa_inspect(obj)
+            if obj in session.deleted or any(state.attrs[name].history.has_changes() for name in RBAC_USER_ATTRIBUTES):
+                changed = True
+        elif isinstance(obj, UserSession) and obj not in session.new:
+            revoked_tokens.add(obj.session_token)
+    return changed, revoked_tokens
+
+
+@event.listens_for(Session, "after_flush")
+def _track_rbac_flush(session, flush_context):
+    changed, revoked_tokens = _touches_rbac(session)
+    if changed:
+        session.info["rbac_changed"] = True
+    if revoked_tokens:
+        session.info.setdefault("rbac_revoked_tokens", set()).update(revoked_tokens)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_rbac_bulk_write(orm_execute_state):
+    # Query.update()/delete() and update()/delete() statements bypass the flush
+    if orm_execute_state.is_update or orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and issubclass(mapper.class_, RBAC_MODELS + (User, UserSession)):
+            orm_execute_state.session.info["rbac_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_rbac_invalidation(session):
+    changed = session.info.pop("rbac_changed", False)
+    revoked_tokens = session.info.pop("rbac_revoked_tokens", None)
+    if changed:
+        version = permission_cache.bump()
+        logger.info(f"RBAC cache invalidated (version {version})")
+    elif revoked_tokens:
+        permission_cache.evict_tokens(revoked_tokens)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rbac_invalidation(session):
+    session.info.pop("rbac_changed", None)
+    session.info.pop("rbac_revoked_tokens", None)
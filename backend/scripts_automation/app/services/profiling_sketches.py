@@ -0,0 +1,591 @@
+"""
+Profiling Sketches
+Mergeable, serializable sketches (HyperLogLog, t-digest, space-saving, co-moments) used to
+profile tables in bounded memory from streamed chunks, across workers and across scans.
+"""
+
+import base64
+import math
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Fixed 16-byte key so value hashes are stable across processes and persisted states
+HASH_KEY = "dw-profile-hll01"
+
+
+def hash_values(values: pd.Series) -> np.ndarray:
+    """Stable 64-bit hashes of non-null values; numeric dtypes hash by value, not by dtype"""
+    values = values.dropna()
+    if values.empty:
+        return np.empty(0, dtype=np.uint64)
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+        # int and float chunks of one column must hash alike (nulls turn ints into floats)
+        array = values.to_numpy(dtype=np.float64) + 0.0
+    elif pd.api.types.is_datetime64_any_dtype(values):
+        array = values.to_numpy(dtype="datetime64[ns]").view(np.int64)
+    else:
+        array = values.astype(str).to_numpy(dtype=object)
+    return pd.util.hash_array(array, hash_key=HASH_KEY, categorize=False)
+
+
+def _clean(value: Any) -> Any:
+    """Convert numpy scalars to JSON-friendly Python values"""
+    if value is None:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+class HyperLogLog:
+    """Cardinality estimator (~0.8% standard error at precision 14, 16 KiB of registers)"""
+
+    def __init__(self, precision: int = 14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        if hashes.size == 0:
+            return
+        tail_bits = 64 - self.precision
+        index = (hashes >> np.uint64(tail_bits)).astype(np.int64)
+        tail = hashes & np.uint64((1 << tail_bits) - 1)
+        bit_length = np.zeros(tail.shape, dtype=np.int64)
+        nonzero = tail > 0
+        bit_length[nonzero] = np.floor(np.log2(tail[nonzero].astype(np.float64))).astype(np.int64) + 1
+        rank = (tail_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: "HyperLogLog") -> None:
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog sketches with different precision")
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def estimate(self) -> int:
+        m = float(self.registers.size)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / float(np.sum(np.power(2.0, -self.registers.astype(np.float64))))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate while many registers are still empty
+            raw = m * math.log(m / zeros)
+        return int(round(raw))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "precision": self.precision,
+            "registers": base64.b64encode(zlib.compress(self.registers.tobytes())).decode("ascii")
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "HyperLogLog":
+        sketch = cls(state["precision"])
+        registers = np.frombuffer(zlib.decompress(base64.b64decode(state["registers"])), dtype=np.uint8)
+        sketch.registers = registers.copy()
+        return sketch
+
+
+class TDigest:
+    """Quantile sketch keeping at most ~compression centroids, denser at the tails"""
+
+    def __init__(self, compression: int = 200):
+        self.compression = compression
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self._update_bounds(float(values.min()), float(values.max()))
+        self._compress(np.concatenate([self.means, values]),
+                       np.concatenate([self.weights, np.ones(values.size)]))
+
+    def merge(self, other: "TDigest") -> None:
+        if other.weights.size == 0:
+            return
+        self._update_bounds(other.min, other.max)
+        self._compress(np.concatenate([self.means, other.means]),
+                       np.concatenate([self.weights, other.weights]))
+
+    def _update_bounds(self, low: float, high: float) -> None:
+        self.min = low if self.min is None else min(self.min, low)
+        self.max = high if self.max is None else max(self.max, high)
+
+    def _compress(self, means: np.ndarray, weights: np.ndarray) -> None:
+        order = np.argsort(means, kind="mergesort")
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        quantiles = (np.cumsum(weights) - weights / 2) / total
+        # k1 scale function: each output centroid spans at most one unit of k
+        scale = self.compression * (np.arcsin(np.clip(2 * quantiles - 1, -1, 1)) / np.pi + 0.5)
+        buckets = np.floor(scale).astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+        self.weights = np.add.reduceat(weights, starts)
+        self.means = np.add.reduceat(means * weights, starts) / self.weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.weights.size == 0:
+            return None
+        if self.weights.size == 1:
+            return float(self.means[0])
+        total = self.weights.sum()
+        centers = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centers, [total]])
+        values = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * total, positions, values))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "compression": self.compression,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+            "min": self.min,
+            "max": self.max
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "TDigest":
+        digest = cls(state["compression"])
+        digest.means = np.asarray(state["means"], dtype=np.float64)
+        digest.weights = np.asarray(state["weights"], dtype=np.float64)
+        digest.min, digest.max = state["min"], state["max"]
+        return digest
+
+
+class SpaceSaving:
+    """Top-k frequent values with per-value overestimation bounds (mergeable summary)"""
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = capacity
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def _floor(self) -> int:
+        # Any value missing from a full summary occurred at most this many times
+        return min(self.counts.values()) if len(self.counts) >= self.capacity else 0
+
+    def add_counts(self, value_counts: pd.Series) -> None:
+        """Fold exact counts for one chunk into the summary"""
+        if value_counts.empty:
+            return
+        value_counts = value_counts.sort_values(ascending=False)
+        kept = value_counts.iloc[:self.capacity]
+        floor = int(value_counts.iloc[self.capacity]) if len(value_counts) > self.capacity else 0
+        other = SpaceSaving(self.capacity)
+        other.counts = {str(value): int(count) for value, count in kept.items()}
+        # Chunk counts are exact; the floor only bounds values that were cut
+        other.errors = {key: 0 for key in other.counts}
+        self._merge_summary(other, floor)
+
+    def merge(self, other: "SpaceSaving") -> None:
+        self._merge_summary(other, other._floor())
+
+    def _merge_summary(self, other: "SpaceSaving", other_floor: int) -> None:
+        own_floor = self._floor()
+        counts: Dict[str, int] = {}
+        errors: Dict[str, int] = {}
+        for key in set(self.counts) | set(other.counts):
+            counts[key] = self.counts.get(key, own_floor) + other.counts.get(key, other_floor)
+            errors[key] = (self.errors.get(key, own_floor) if key in self.counts else own_floor) + \
+                          (other.errors.get(key, 0) if key in other.counts else other_floor)
+        top = sorted(counts, key=lambda key: (-counts[key], key))[:self.capacity]
+        self.counts = {key: counts[key] for key in top}
+        self.errors = {key: errors[key] for key in top}
+
+    def top(self, n: int = 10) -> List[Dict[str, Any]]:
+        ranked = sorted(self.counts, key=lambda key: (-self.counts[key], key))[:n]
+        return [{"value": key, "count": self.counts[key], "error": self.errors[key]} for key in ranked]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"capacity": self.capacity, "counts": self.counts, "errors": self.errors}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "SpaceSaving":
+        summary = cls(state["capacity"])
+        summary.counts = {key: int(value) for key, value in state["counts"].items()}
+        summary.errors = {key: int(value) for key, value in state["errors"].items()}
+        return summary
+
+
+class Moments:
+    """Count, mean and variance (Chan et al. parallel update) plus min/max"""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        other = Moments()
+        other.n = int(values.size)
+        other.mean = float(values.mean())
+        other.m2 = float(((values - other.mean) ** 2).sum())
+        other.min, other.max = float(values.min()), float(values.max())
+        self.merge(other)
+
+    def merge(self, other: "Moments") -> None:
+        if other.n == 0:
+            return
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.m2 += other.m2 + delta * delta * self.n * other.n / n
+        self.mean += delta * other.n / n
+        self.n = n
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def std_dev(self) -> Optional[float]:
+        # Sample standard deviation, matching pandas' default ddof=1
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"n": self.n, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "Moments":
+        moments = cls()
+        moments.n, moments.mean, moments.m2 = state["n"], state["mean"], state["m2"]
+        moments.min, moments.max = state["min"], state["max"]
+        return moments
+
+
+class CorrelationAccumulator:
+    """Pairwise-complete Pearson correlation from additive co-moment sums.
+
+    Values are shifted by a per-column reference so the sums stay well conditioned;
+    correlation is shift-invariant, so states with different shifts still merge.
+    """
+
+    def __init__(self):
+        self.columns: List[str] = []
+        self.shift = np.empty(0)
+        self.n = np.empty((0, 0))
+        self.sx = np.empty((0, 0))
+        self.sx2 = np.empty((0, 0))
+        self.sxy = np.empty((0, 0))
+
+    def _ensure_columns(self, columns: List[str], shifts: np.ndarray) -> np.ndarray:
+        added = [(name, shift) for name, shift in zip(columns, shifts) if name not in self.columns]
+        if added:
+            size = len(self.columns) + len(added)
+            for attr in ("n", "sx", "sx2", "sxy"):
+                grown = np.zeros((size, size))
+                current = getattr(self, attr)
+                grown[:current.shape[0], :current.shape[1]] = current
+                setattr(self, attr, grown)
+            self.columns.extend(name for name, _ in added)
+            self.shift = np.concatenate([self.shift, [shift for _, shift in added]])
+        positions = {name: i for i, name in enumerate(self.columns)}
+        return np.array([positions[name] for name in columns], dtype=np.int64)
+
+    def add(self, frame: pd.DataFrame) -> None:
+        if frame.shape[1] < 2 or frame.empty:
+            return
+        values = frame.to_numpy(dtype=np.float64)
+        present = ~np.isnan(values)
+        initial_shift = np.nan_to_num(np.nanmean(np.where(present, values, np.nan), axis=0))
+        index = self._ensure_columns(list(frame.columns), initial_shift)
+        shifted = np.where(present, values - self.shift[index], 0.0)
+        mask = present.astype(np.float64)
+        block = np.ix_(index, index)
+        self.n[block] += mask.T @ mask
+        self.sx[block] += shifted.T @ mask
+        self.sx2[block] += (shifted ** 2).T @ mask
+        self.sxy[block] += shifted.T @ shifted
+
+    def merge(self, other: "CorrelationAccumulator") -> None:
+        if not other.columns:
+            return
+        index = self._ensure_columns(other.columns, other.shift)
+        # Re-express the other sums relative to this accumulator's shifts
+        d = other.shift - self.shift[index]
+        n, sx, sx2, sxy = other.n, other.sx, other.sx2, other.sxy
+        sy = sx.T
+        block = np.ix_(index, index)
+        self.n[block] += n
+        self.sx[block] += sx + d[:, None] * n
+        self.sx2[block] += sx2 + 2 * d[:, None] * sx + (d ** 2)[:, None] * n
+        self.sxy[block] += sxy + d[None, :] * sx + d[:, None] * sy + np.outer(d, d) * n
+
+    def correlations(self, columns: Optional[List[str]] = None) -> Dict[str, Dict[str, Optional[float]]]:
+        columns = [name for name in (columns or self.columns) if name in self.columns]
+        if len(columns) < 2:
+            return {}
+        index = self._ensure_columns(columns, np.zeros(len(columns)))
+        block = np.ix_(index, index)
+        n, sx, sx2, sxy = self.n[block], self.sx[block], self.sx2[block], self.sxy[block]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            numerator = n * sxy - sx * sx.T
+            denominator = np.sqrt((n * sx2 - sx ** 2) * (n * sx2.T - sx.T ** 2))
+            matrix = numerator / denominator
+        matrix[n < 2] = np.nan
+        return {
+            column: {row: _clean(round(float(matrix[i, j]), 2)) for i, row in enumerate(columns)}
+            for j, column in enumerate(columns)
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "columns": self.columns,
+            "shift": self.shift.tolist(),
+            "n": self.n.tolist(),
+            "sx": self.sx.tolist(),
+            "sx2": self.sx2.tolist(),
+            "sxy": self.sxy.tolist()
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "CorrelationAccumulator":
+        accumulator = cls()
+        accumulator.columns = list(state["columns"])
+        size = len(accumulator.columns)
+        accumulator.shift = np.asarray(state["shift"], dtype=np.float64)
+        for attr in ("n", "sx", "sx2", "sxy"):
+            setattr(accumulator, attr, np.asarray(state[attr], dtype=np.float64).reshape(size, size))
+        return accumulator
+
+
+class ColumnSketch:
+    """Streaming profile state for one column"""
+
+    def __init__(self, top_k: int = 64):
+        self.data_type: Optional[str] = None
+        self.count = 0
+        self.null_count = 0
+        self.distinct = HyperLogLog()
+        self.moments: Optional[Moments] = None
+        self.quantiles: Optional[TDigest] = None
+        self.lengths: Optional[Moments] = None
+        self.top_values: Optional[SpaceSaving] = None
+        self.top_k = top_k
+        self.min_date: Optional[int] = None
+        self.max_date: Optional[int] = None
+
+    def update(self, values: pd.Series) -> None:
+        self.data_type = str(values.dtype)
+        self.count += int(values.size)
+        nulls = values.isna()
+        self.null_count += int(nulls.sum())
+        present = values[~nulls]
+        self.distinct.add_hashes(hash_values(present))
+        if present.empty:
+            return
+
+        if pd.api.types.is_bool_dtype(present):
+            return
+        if pd.api.types.is_numeric_dtype(present):
+            numeric = present.to_numpy(dtype=np.float64)
+            self.moments = self.moments or Moments()
+            self.quantiles = self.quantiles or TDigest()
+            self.moments.add(numeric)
+            self.quantiles.add(numeric)
+        elif pd.api.types.is_datetime64_any_dtype(present):
+            stamps = present.to_numpy(dtype="datetime64[ns]").view(np.int64)
+            low, high = int(stamps.min()), int(stamps.max())
+            self.min_date = low if self.min_date is None else min(self.min_date, low)
+            self.max_date = high if self.max_date is None else max(self.max_date, high)
+        elif pd.api.types.is_string_dtype(present) or present.dtype == object:
+            text = present.astype(str)
+            self.lengths = self.lengths or Moments()
+            self.top_values = self.top_values or SpaceSaving(self.top_k)
+            self.lengths.add(text.str.len().to_numpy(dtype=np.float64))
+            self.top_values.add_counts(text.value_counts())
+
+    def merge(self, other: "ColumnSketch") -> None:
+        self.data_type = other.data_type or self.data_type
+        self.count += other.count
+        self.null_count += other.null_count
+        self.distinct.merge(other.distinct)
+        for attr, factory in (("moments", Moments), ("quantiles", TDigest), ("lengths", Moments),
+                              ("top_values", lambda: SpaceSaving(self.top_k))):
+            theirs = getattr(other, attr)
+            if theirs is not None:
+                ours = getattr(self, attr)
+                if ours is None:
+                    ours = factory()
+                    setattr(self, attr, ours)
+                ours.merge(theirs)
+        for attr, pick in (("min_date", min), ("max_date", max)):
+            theirs = getattr(other, attr)
+            if theirs is not None:
+                ours = getattr(self, attr)
+                setattr(self, attr, theirs if ours is None else pick(ours, theirs))
+
+    def to_profile(self) -> Dict[str, Any]:
+        """Render in the same shape as DataProfilingService.profile_data"""
+        profile: Dict[str, Any] = {
+            "data_type": self.data_type,
+            "null_count": self.null_count,
+            "null_percentage": round(self.null_count / self.count * 100, 2) if self.count else 0,
+            "distinct_estimate": self.distinct.estimate()
+        }
+        if self.moments is not None and self.moments.n:
+            profile.update({
+                "min": _clean(self.moments.min),
+                "max": _clean(self.moments.max),
+                "mean": _clean(self.moments.mean),
+                "median": _clean(self.quantiles.quantile(0.5)),
+                "std_dev": _clean(self.moments.std_dev),
+                "quartiles": {
+                    "25%": _clean(self.quantiles.quantile(0.25)),
+                    "50%": _clean(self.quantiles.quantile(0.5)),
+                    "75%": _clean(self.quantiles.quantile(0.75))
+                }
+            })
+        elif self.top_values is not None:
+            if self.lengths is not None and self.lengths.n:
+                profile.update({
+                    "min_length": int(self.lengths.min),
+                    "max_length": int(self.lengths.max),
+                    "avg_length": _clean(self.lengths.mean)
+                })
+            profile["top_values"] = [
+                {"value": item["value"], "count": item["count"]} for item in self.top_values.top(10)
+            ]
+            cardinality = min(profile["distinct_estimate"], self.count - self.null_count)
+            profile["cardinality"] = cardinality
+            profile["cardinality_ratio"] = round(cardinality / self.count * 100, 2) if self.count else 0
+        elif self.min_date is not None:
+            profile.update({
+                "min_date": pd.Timestamp(self.min_date).strftime('%Y-%m-%d %H:%M:%S'),
+                "max_date": pd.Timestamp(self.max_date).strftime('%Y-%m-%d %H:%M:%S')
+            })
+        return profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "data_type": self.data_type,
+            "count": self.count,
+            "null_count": self.null_count,
+            "top_k": self.top_k,
+            "distinct": self.distinct.to_dict(),
+            "moments": self.moments.to_dict() if self.moments else None,
+            "quantiles": self.quantiles.to_dict() if self.quantiles else None,
+            "lengths": self.lengths.to_dict() if self.lengths else None,
+            "top_values": self.top_values.to_dict() if self.top_values else None,
+            "min_date": self.min_date,
+            "max_date": self.max_date
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "ColumnSketch":
+        sketch = cls(state.get("top_k", 64))
+        sketch.data_type = state["data_type"]
+        sketch.count, sketch.null_count = state["count"], state["null_count"]
+        sketch.distinct = HyperLogLog.from_dict(state["distinct"])
+        sketch.moments = Moments.from_dict(state["moments"]) if state.get("moments") else None
+        sketch.quantiles = TDigest.from_dict(state["quantiles"]) if state.get("quantiles") else None
+        sketch.lengths = Moments.from_dict(state["lengths"]) if state.get("lengths") else None
+        sketch.top_values = SpaceSaving.from_dict(state["top_values"]) if state.get("top_values") else None
+        sketch.min_date, sketch.max_date = state.get("min_date"), state.get("max_date")
+        return sketch
+
+
+class TableSketchProfile:
+    """Streaming, mergeable profile for a whole table.
+
+    Feed DataFrame chunks with update(), combine partial profiles from workers or
+    earlier scans with merge(), and persist with to_dict()/from_dict(). Memory is
+    bounded per column regardless of how many rows are consumed.
+    """
+
+    STATE_VERSION = 1
+
+    def __init__(self, top_k: int = 64):
+        self.top_k = top_k
+        self.row_count = 0
+        self.columns: Dict[str, ColumnSketch] = {}
+        self.correlations = CorrelationAccumulator()
+
+    def update(self, frame: pd.DataFrame) -> "TableSketchProfile":
+        if frame.empty:
+            return self
+        self.row_count += len(frame)
+        for column in frame.columns:
+            name = str(column)
+            sketch = self.columns.get(name)
+            if sketch is None:
+                sketch = self.columns[name] = ColumnSketch(self.top_k)
+                # Rows seen before the column appeared count as nulls
+                sketch.count = sketch.null_count = self.row_count - len(frame)
+            sketch.update(frame[column])
+        numeric = frame.select_dtypes(include=[np.number])
+        if numeric.shape[1] > 1:
+            numeric.columns = [str(column) for column in numeric.columns]
+            self.correlations.add(numeric)
+        return self
+
+    def update_many(self, frames: Iterable[pd.DataFrame]) -> "TableSketchProfile":
+        for frame in frames:
+            self.update(frame)
+        return self
+
+    def merge(self, other: "TableSketchProfile") -> "TableSketchProfile":
+        for name, sketch in other.columns.items():
+            if name in self.columns:
+                self.columns[name].merge(sketch)
+            else:
+                merged = self.columns[name] = ColumnSketch(self.top_k)
+                merged.count = merged.null_count = self.row_count
+                merged.merge(sketch)
+        for name, sketch in self.columns.items():
+            if name not in other.columns:
+                sketch.count += other.row_count
+                sketch.null_count += other.row_count
+        self.row_count += other.row_count
+        self.correlations.merge(other.correlations)
+        return self
+
+    def to_profile(self, include_correlations: bool = True) -> Dict[str, Any]:
+        if not self.row_count:
+            return {"error": "No data to profile"}
+        profile: Dict[str, Any] = {
+            "row_count": self.row_count,
+            "column_count": len(self.columns),
+            "approximate": True,
+            "columns": {name: sketch.to_profile() for name, sketch in self.columns.items()}
+        }
+        if include_correlations:
+            correlations = self.correlations.correlations()
+            if correlations:
+                profile["correlations"] = correlations
+        return profile
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.STATE_VERSION,
+            "top_k": self.top_k,
+            "row_count": self.row_count,
+            "columns": {name: sketch.to_dict() for name, sketch in self.columns.items()},
+            "correlations": self.correlations.to_dict()
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> "TableSketchProfile":
+        if state.get("version") != cls.STATE_VERSION:
+            raise ValueError(f"Unsupported sketch state version: {state.get('version')}")
+        profile = cls(state.get("top_k", 64))
+        profile.row_count = state["row_count"]
+        profile.columns = {name: ColumnSketch.from_dict(column) for name, column in state["columns"].items()}
+        profile.correlations = CorrelationAccumulator.from_dict(state["correlations"])
+        return profile
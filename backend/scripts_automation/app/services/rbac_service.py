@@ -1,41 +1,68 @@
 from sqlalchemy.orm import Session
-from app.models.auth_models import User, Role, Group, UserRole, GroupRole, RoleInheritance, Permission, RolePermission
-from typing import List, Dict, Any, Set
+from app.models.auth_models import User, Role, Group, UserRole, UserGroup, GroupRole, RoleInheritance, Permission, RolePermission, DenyAssignment
+from app.services.permission_cache import permission_cache
+from app.services.condition_compiler import compile_condition
+from sqlalchemy import or_
+from typing import List, Dict, Any, FrozenSet, Optional, Set, Tuple
+
+def get_role_closure(db: Session) -> Dict[int, FrozenSet[int]]:
+    """
+    Returns role_id -> the role plus every role it inherits from, computed from all
+    RoleInheritance rows in one query and cached until RBAC data changes.
+    Roles without parents are absent (their closure is the role itself).
+    """
+    return permission_cache.role_closure(
+        lambda: db.query(RoleInheritance.child_role_id, RoleInheritance.parent_role_id).all()
+    )
 
 def get_user_effective_permissions_rbac(db: Session, user_id: int) -> List[Dict[str, Any]]:
     """
     Returns all effective permissions for a user, including direct, group, and inherited roles.
     This is the single source of truth for effective permissions logic.
     """
+    return [dict(perm) for perm in _get_cached_user_permissions(db, user_id)[0]]
+
+def get_user_effective_permission_set(db: Session, user_id: int) -> FrozenSet[str]:
+    """
+    Returns the actions the user is effectively granted (conditions evaluated), cached.
+    """
+    return _get_cached_user_permissions(db, user_id)[1]
+
+def _get_cached_user_permissions(db: Session, user_id: int) -> Tuple[List[Dict[str, Any]], FrozenSet[str]]:
+    cached = permission_cache.get_user(user_id)
+    if cached is not None:
+        return cached
+    version = permission_cache.version
+    perms = _resolve_effective_permissions(db, user_id)
+    cached = (perms, frozenset(perm["action"] for perm in perms if perm["is_effective"]))
+    permission_cache.set_user(user_id, cached, version)
+    return cached
+
+def _resolve_effective_permissions(db: Session, user_id: int) -> List[Dict[str, Any]]:
     # 1. Get user
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         return []
 
     # 2. Get direct role IDs
-    direct_role_ids = [r.id for r in db.query(Role).join(UserRole, UserRole.role_id == Role.id).filter(UserRole.user_id == user_id).all()]
+    direct_role_ids = [role_id for (role_id,) in db.query(Role.id).join(UserRole, UserRole.role_id == Role.id).filter(UserRole.user_id == user_id).all()]
 
-    # 3. Get group role IDs
-    # Use ORM relationship for join
-    group_ids = [g.id for g in db.query(Group).join(Group.users).filter(User.id == user_id).all()]
-    group_role_ids = [gr.role_id for gr in db.query(GroupRole).filter(GroupRole.group_id.in_(group_ids)).all()] if group_ids else []
+    # 3. Get group role IDs (one join through the user's group memberships)
+    group_role_ids = [
+        role_id for (role_id,) in db.query(GroupRole.role_id)
+        .join(Group, Group.id == GroupRole.group_id)
+        .join(UserGroup, UserGroup.group_id == Group.id)
+        .filter(UserGroup.user_id == user_id).all()
+    ]
 
     # 4. Aggregate all role IDs
     all_role_ids = set(direct_role_ids + group_role_ids)
 
-    # 5. Recursively collect inherited roles
-    def collect_inherited_roles(role_id: int, visited: Set[int]) -> Set[int]:
-        if role_id in visited:
-            return set()
-        visited.add(role_id)
-        inherited = {role_id}
-        for inh in db.query(RoleInheritance).filter(RoleInheritance.child_role_id == role_id).all():
-            inherited |= collect_inherited_roles(inh.parent_role_id, visited)
-        return inherited
-
-    effective_role_ids = set()
+    # 5. Expand inherited roles from the precomputed closure
+    closure = get_role_closure(db)
+    effective_role_ids: Set[int] = set()
     for rid in all_role_ids:
-        effective_role_ids |= collect_inherited_roles(rid, set())
+        effective_role_ids |= closure.get(rid, {rid})
 
     if not effective_role_ids:
         return []
@@ -44,41 +71,13 @@ def get_user_effective_permissions_rbac(db: Session, user_id: int) -> List[Dict[
     perms = db.query(Permission).join(RolePermission, Permission.id == RolePermission.permission_id)
     perms = perms.filter(RolePermission.role_id.in_(effective_role_ids)).distinct(Permission.id).all()
 
-    # 7. Format output with ABAC/condition evaluation
-    import json
+    # 7. Format output with ABAC/condition evaluation (conditions compiled once, cached)
     result = []
     def check_condition(perm, user):
-        cond = getattr(perm, "conditions", None)
-        if not cond:
+        compiled = compile_condition(getattr(perm, "conditions", None))
+        if compiled is None:
             return True, None  # No condition, always effective
-        try:
-            if isinstance(cond, str):
-                cond_obj = json.loads(cond)
-            else:
-                cond_obj = cond
-        except Exception:
-            return False, "Invalid condition format"
-        # Evaluate common ABAC patterns
-        # Only basic patterns supported here; expand as needed
-        if "user_id" in cond_obj and cond_obj["user_id"] == ":current_user_id":
-            if getattr(user, "id", None) == user_id:
-                return True, None
-            else:
-                return False, "User ID does not match (:current_user_id)"
-        if "department" in cond_obj and cond_obj["department"] == ":user_department":
-            if hasattr(user, "department") and getattr(user, "department", None):
-                # If user has department, always effective (or add more logic)
-                return True, None
-            else:
-                return False, "User has no department"
-        if "region" in cond_obj and cond_obj["region"] == ":user_region":
-            if hasattr(user, "region") and getattr(user, "region", None):
-                return True, None
-            else:
-                return False, "User has no region"
-        # Add more ABAC patterns as needed
-        # Default: cannot evaluate, mark as not effective
-        return False, "Condition not matched or not evaluable"
+        return compiled.user_effective(user, user_id)
 
     for perm in perms:
         is_effective, note = check_condition(perm, user)
@@ -91,3 +90,64 @@ def get_user_effective_permissions_rbac(db: Session, user_id: int) -> List[Dict[
             "note": note if not is_effective else None
         })
     return result
+
+def get_deny_conditions(db: Session, user_id: int, action: str, resource: str) -> List[Optional[str]]:
+    """
+    Returns the conditions of the deny assignments matching the action and resource for the
+    user directly or through any of the user's groups (None for an unconditional deny).
+    """
+    group_ids = db.query(UserGroup.group_id).filter(UserGroup.user_id == user_id)
+    return [
+        conditions for (conditions,) in db.query(DenyAssignment.conditions).filter(
+            DenyAssignment.action == action,
+            DenyAssignment.resource == resource,
+            or_(DenyAssignment.user_id == user_id, DenyAssignment.group_id.in_(group_ids))
+        ).all()
+    ]
+
+def filter_resources_by_permission(db: Session, user: Any, action: str, resource: str, items: List[Any], granted: bool = False) -> List[Any]:
+    """
+    Returns the items (dicts or objects of attributes) the user may perform `action` on,
+    using the user's cached permissions for `resource`. An unconditional grant (or
+    `granted`, when the action is already granted another way such as the user's role)
+    allows all items; otherwise each item is kept if any compiled permission condition
+    matches it. Deny assignments then win as in role_service.user_has_permission: an
+    unconditional deny removes every item, a conditional one the items it matches.
+    All conditions are evaluated in one pass over the items.
+    """
+    user_id = user.get("id") if isinstance(user, dict) else getattr(user, "id", None)
+    if not user_id:
+        return []
+    denies = []
+    for conditions in get_deny_conditions(db, user_id, action, resource):
+        condition = compile_condition(conditions)
+        if condition is None:
+            return []
+        if condition.is_valid:
+            denies.append(condition)
+    items = list(items)
+    if not granted:
+        items = _filter_allowed(db, user, user_id, action, resource, items)
+    for condition in denies:
+        items = [item for item, denied in zip(items, condition.evaluate_many(items, user)) if not denied]
+    return items
+
+def _filter_allowed(db: Session, user: Any, user_id: int, action: str, resource: str, items: List[Any]) -> List[Any]:
+    perms = [
+        perm for perm in _get_cached_user_permissions(db, user_id)[0]
+        if perm["action"] == action and perm["resource"] == resource
+    ]
+    compiled = []
+    for perm in perms:
+        condition = compile_condition(perm["conditions"])
+        if condition is None:
+            return items
+        if condition.is_valid:
+            compiled.append(condition)
+    if not compiled:
+        return []
+    allowed = [False] * len(items)
+    for condition in compiled:
+        for index, ok in enumerate(condition.evaluate_many(items, user)):
+            allowed[index] = allowed[index] or ok
+    return [item for item, ok in zip(items, allowed) if ok]
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.models.auth_models import Group, UserGroup, User, GroupRole, Role, DenyAssignment, Permission, RolePermission, ResourceRole, AccessRequest, RbacAuditLog
 from typing import List, Optional
 from datetime import datetime
+from app.services.condition_compiler import compile_condition, validate_condition
 
 # --- Notification System (Pluggable) ---
 def notify_admins(subject: str, body: str):
@@ -312,6 +313,10 @@ def list_permissions(db: Session) -> List[Permission]:
     return db.query(Permission).all()
 
 def create_permission(db: Session, action: str, resource: str, conditions: Optional[str] = None) -> Permission:
+    # Compile (and cache) the condition up front; reject conditions that cannot be compiled
+    error = validate_condition(conditions)
+    if error:
+        raise ValueError(f"Invalid permission conditions: {error}")
     perm = Permission(action=action, resource=resource, conditions=conditions)
     db.add(perm)
     db.commit()
@@ -344,9 +349,7 @@ def get_user_permissions(db: Session, user: User) -> List[Permission]:
     return list(perms)
 
 def user_has_permission(db: Session, user: User, action: str, resource: str, conditions: Optional[dict] = None) -> bool:
-    import fnmatch
     import json
-    import re
     # --- DENY CHECK ---
     from app.models.auth_models import DenyAssignment, UserGroup
     # Check direct user denies
@@ -393,84 +396,14 @@ def user_has_permission(db: Session, user: User, action: str, resource: str, con
         if perm.action == action and perm.resource == resource:
             if not perm.conditions:
                 return True
-            try:
-                cond = json.loads(perm.conditions)
-                if not conditions:
-                    continue
-                # --- EXTENSION POINT: Integrate with OPA or other policy engine here ---
-                # Example: if opa_client.evaluate(cond, conditions, user): return True
-                # For now, use built-in evaluator:
-                match = True
-                for k, v in cond.items():
-                    val = conditions.get(k)
-                    # Wildcard support
-                    if isinstance(v, str) and ('*' in v or '?' in v):
-                        if not (isinstance(val, str) and fnmatch.fnmatch(val, v)):
-                            match = False
-                            break
-                    # List support
-                    elif isinstance(v, list):
-                        if val not in v:
-                            match = False
-                            break
-                    # Custom evaluator: dict with $op
-                    elif isinstance(v, dict) and "$op" in v:
-                        op = v["$op"]
-                        operand = v.get("value")
-                        if op == "in":
-                            if val not in operand:
-                                match = False
-                                break
-                        elif op == "not_in":
-                            if val in operand:
-                                match = False
-                                break
-                        elif op == "eq":
-                            if val != operand:
-                                match = False
-                                break
-                        elif op == "ne":
-                            if val == operand:
-                                match = False
-                                break
-                        elif op == "regex":
-                            if not (isinstance(val, str) and re.match(operand, val)):
-                                match = False
-                                break
-                        elif op == "gt":
-                            if not (isinstance(val, (int, float)) and val > operand):
-                                match = False
-                                break
-                        elif op == "gte":
-                            if not (isinstance(val, (int, float)) and val >= operand):
-                                match = False
-                                break
-                        elif op == "lt":
-                            if not (isinstance(val, (int, float)) and val < operand):
-                                match = False
-                                break
-                        elif op == "lte":
-                            if not (isinstance(val, (int, float)) and val <= operand):
-                                match = False
-                                break
-                        elif op == "user_attr":
-                            # Check user attribute (e.g., department, region)
-                            user_val = getattr(user, operand, None)
-                            if user_val != val:
-                                match = False
-                                break
-                        # Add more custom ops as needed
-                        else:
-                            match = False
-                            break
-                    else:
-                        if val != v:
-                            match = False
-                            break
-                if match:
-                    return True
-            except Exception:
+            if not conditions:
                 continue
+            # --- EXTENSION POINT: Integrate with OPA or other policy engine here ---
+            # Example: if opa_client.evaluate(cond, conditions, user): return True
+            # For now, use the compiled built-in evaluator (wildcards, lists, $op, placeholders):
+            compiled = compile_condition(perm.conditions)
+            if compiled.matches(conditions, user):
+                return True
     return False
 
 def delete_permission(db: Session, permission_id: int) -> bool:
@@ -490,6 +423,9 @@ def update_permission(db: Session, permission_id: int, action: Optional[str] = N
     if resource is not None:
         perm.resource = resource
     if conditions is not None:
+        error = validate_condition(conditions)
+        if error:
+            raise ValueError(f"Invalid permission conditions: {error}")
         perm.conditions = conditions
     db.commit()
     db.refresh(perm)
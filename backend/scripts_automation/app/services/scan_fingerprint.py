@@ -0,0 +1,248 @@
+"""
+Scan Fingerprint
+Hierarchical (Merkle) fingerprints of scan metadata: a hash per column, per table over its column
+hashes and per schema over its table hashes. Incremental scans compare them, together with cheap
+DDL-only change-probe markers, to re-extract only the tables that changed and to report the diff.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+
+
+class MetadataLayout(NamedTuple):
+    """Keys of a source type's metadata levels and of its row count."""
+    schema_key: str
+    table_key: str
+    column_key: str
+    count_key: str
+
+
+RELATIONAL_LAYOUT = MetadataLayout("schemas", "tables", "columns", "row_count")
+MONGODB_LAYOUT = MetadataLayout("databases", "collections", "fields", "document_count")
+
+# Attributes defining a column/field; statistics and samples are left out so they don't churn the hashes
+COLUMN_ATTRIBUTES = (
+    "data_type", "type", "nullable", "is_nullable", "primary_key", "is_primary_key", "is_foreign_key",
+    "character_maximum_length", "numeric_precision", "numeric_scale", "default",
+    "is_array", "is_nested", "nested_fields",
+)
+
+# Row count keys, in order of preference, on a table or its "metadata"
+COUNT_KEYS = ("row_count", "document_count", "row_count_estimate")
+
+
+def layout_for(source_type: Any) -> MetadataLayout:
+    return MONGODB_LAYOUT if getattr(source_type, "value", source_type) == "mongodb" else RELATIONAL_LAYOUT
+
+
+def digest(value: Any) -> str:
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def children(node: Dict[str, Any], key: str) -> Dict[str, Dict[str, Any]]:
+    """Named children of a metadata node, stored either as a name-keyed dict or a list of named dicts."""
+    items = node.get(key) or {}
+    if isinstance(items, dict):
+        return items
+    return {item["name"]: item for item in items}
+
+
+def row_count(table: Dict[str, Any]) -> Optional[int]:
+    for source in (table, table.get("metadata") or {}):
+        for key in COUNT_KEYS:
+            if source.get(key) is not None:
+                return source[key]
+    return None
+
+
+def column_hash(column: Dict[str, Any]) -> str:
+    attributes = {attr: column.get(attr) for attr in COLUMN_ATTRIBUTES if attr in column}
+    if attributes.get("nested_fields"):
+        # Nested fields compare by name, not position
+        attributes["nested_fields"] = {
+            name: column_hash(field) for name, field in children(attributes, "nested_fields").items()
+        }
+    return digest(attributes)
+
+
+def combine(nodes: Dict[str, Dict[str, Any]]) -> str:
+    return digest(sorted((name, node["hash"]) for name, node in nodes.items()))
+
+
+def table_fingerprint(table: Dict[str, Any], layout: MetadataLayout, marker: Optional[str] = None) -> Dict[str, Any]:
+    columns = {name: column_hash(column) for name, column in children(table, layout.column_key).items()}
+    return {
+        "hash": digest(sorted(columns.items())),
+        "marker": marker,
+        "row_count": row_count(table),
+        layout.column_key: columns,
+    }
+
+
+def schema_fingerprint(schema: Dict[str, Any], layout: MetadataLayout,
+                       markers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    markers = markers or {}
+    tables = {
+        name: table_fingerprint(table, layout, markers.get(name))
+        for name, table in children(schema, layout.table_key).items()
+    }
+    return {"hash": combine(tables), layout.table_key: tables}
+
+
+def tree(schemas: Dict[str, Dict[str, Any]], layout: MetadataLayout) -> Dict[str, Any]:
+    return {"hash": combine(schemas), layout.schema_key: schemas}
+
+
+def fingerprint_metadata(metadata: Dict[str, Any], layout: MetadataLayout,
+                         markers: Optional[Dict[str, Dict[str, str]]] = None) -> Dict[str, Any]:
+    """Fingerprint tree of a whole metadata document; markers are schema -> table -> probe marker."""
+    markers = markers or {}
+    return tree({
+        name: schema_fingerprint(schema, layout, markers.get(name))
+        for name, schema in children(metadata, layout.schema_key).items()
+    }, layout)
+
+
+def tree_from_tables(rows: Iterable[Any], layout: MetadataLayout) -> Dict[str, Any]:
+    """Fingerprint tree assembled from per-table fingerprints (schema_name, table_name, fingerprint rows)."""
+    schemas: Dict[str, Dict[str, Any]] = {}
+    for row in rows:
+        if row.fingerprint:
+            schemas.setdefault(row.schema_name, {})[row.table_name] = row.fingerprint
+    return tree({name: {"hash": combine(tables), layout.table_key: tables} for name, tables in schemas.items()}, layout)
+
+
+def with_schemas(base: Dict[str, Any], schemas: Dict[str, Dict[str, Any]], removed: Set[str],
+                 layout: MetadataLayout) -> Dict[str, Any]:
+    """The base tree with the given schema subtrees replaced and the removed ones dropped."""
+    merged = {name: node for name, node in base.get(layout.schema_key, {}).items() if name not in removed}
+    merged.update(schemas)
+    return tree(merged, layout)
+
+
+def stale_tables(base: Dict[str, Any], markers: Dict[str, Optional[Dict[str, str]]],
+                 layout: MetadataLayout) -> Dict[str, Optional[Set[str]]]:
+    """Per probed schema, the tables to re-extract: those whose probe markers differ from the base
+    fingerprint's or that are new. None means the whole schema (new, or it could not be probed)."""
+    base_schemas = base.get(layout.schema_key, {})
+    stale: Dict[str, Optional[Set[str]]] = {}
+    for name, table_markers in markers.items():
+        node = base_schemas.get(name)
+        if node is None or table_markers is None:
+            stale[name] = None
+            continue
+        base_tables = node[layout.table_key]
+        stale[name] = {
+            table for table, marker in table_markers.items()
+            if table not in base_tables or base_tables[table].get("marker") != marker
+        }
+    return stale
+
+
+def splice_schema(base: Dict[str, Any], extracted: Optional[Dict[str, Any]], table_markers: Dict[str, str],
+                  stale: Set[str], layout: MetadataLayout) -> Dict[str, Any]:
+    """A schema subtree from the base's unchanged tables and the re-extracted ones.
+
+    Tables no longer listed by the probe are dropped, as are stale tables the extraction did not return.
+    """
+    tables = {
+        table: dict(node) for table, node in base[layout.table_key].items()
+        if table in table_markers and table not in stale
+    }
+    if extracted is not None:
+        tables.update(extracted[layout.table_key])
+    return {"hash": combine(tables), layout.table_key: tables}
+
+
+def with_row_estimates(schema: Dict[str, Any], estimates: Optional[Dict[str, int]],
+                       layout: MetadataLayout) -> Dict[str, Any]:
+    """Records the probe's row estimates on the schema's table nodes (they are not part of any hash)."""
+    for table, node in schema[layout.table_key].items():
+        if estimates and table in estimates:
+            node["row_estimate"] = estimates[table]
+    return schema
+
+
+def row_count_drift(base: Dict[str, Any], current: Dict[str, Dict[str, Any]],
+                    layout: MetadataLayout) -> List[Dict[str, Any]]:
+    """Tables whose probed row estimate moved since the base, without their metadata having changed."""
+    base_schemas = base.get(layout.schema_key, {})
+    drift = []
+    for name, schema in sorted(current.items()):
+        base_tables = base_schemas.get(name, {}).get(layout.table_key, {})
+        for table, node in sorted(schema[layout.table_key].items()):
+            previous = base_tables.get(table, {}).get("row_estimate")
+            if previous is not None and node.get("row_estimate") is not None and node["row_estimate"] != previous:
+                drift.append({"schema": name, "table": table, "previous": previous, "current": node["row_estimate"]})
+    return drift
+
+
+def _named(name: str, node: Dict[str, Any], **extra: Any) -> Dict[str, Any]:
+    return dict(node, name=name, **extra)
+
+
+def _added_table(name: str, table: Dict[str, Any], layout: MetadataLayout) -> Dict[str, Any]:
+    return {
+        "name": name,
+        layout.column_key: [_named(col, column) for col, column in children(table, layout.column_key).items()],
+        layout.count_key: row_count(table),
+    }
+
+
+def diff_schema(name: str, base: Optional[Dict[str, Any]], schema: Dict[str, Any], current: Dict[str, Any],
+                layout: MetadataLayout) -> Optional[Dict[str, Any]]:
+    """Changes of one re-extracted schema against its base fingerprint, or None when unchanged."""
+    tables = children(schema, layout.table_key)
+    if base is None:
+        return {"name": name, "change_type": "added",
+                layout.table_key: [_added_table(table, data, layout) for table, data in tables.items()]}
+    if base["hash"] == current["hash"] and all(
+        base[layout.table_key][table]["row_count"] == node["row_count"]
+        for table, node in current[layout.table_key].items()
+    ):
+        return None
+
+    changes = []
+    base_tables = base[layout.table_key]
+    for table, node in current[layout.table_key].items():
+        base_table = base_tables.get(table)
+        if base_table is None:
+            changes.append(_added_table(table, tables[table], layout))
+            continue
+        table_changes: Dict[str, Any] = {"name": table, layout.column_key: []}
+        if node["row_count"] != base_table["row_count"]:
+            table_changes[layout.count_key] = node["row_count"]
+            table_changes[f"previous_{layout.count_key}"] = base_table["row_count"]
+        if node["hash"] != base_table["hash"]:
+            columns = children(tables[table], layout.column_key)
+            base_columns = base_table[layout.column_key]
+            for col, column_digest in node[layout.column_key].items():
+                if col not in base_columns:
+                    table_changes[layout.column_key].append(_named(col, columns[col]))
+                elif base_columns[col] != column_digest:
+                    table_changes[layout.column_key].append(_named(col, columns[col], change_type="modified"))
+            for col in base_columns:
+                if col not in node[layout.column_key]:
+                    table_changes[layout.column_key].append({"name": col, "change_type": "deleted"})
+        if table_changes[layout.column_key] or layout.count_key in table_changes:
+            changes.append(table_changes)
+    for table in base_tables:
+        if table not in current[layout.table_key]:
+            changes.append({"name": table, "change_type": "deleted"})
+    return {"name": name, layout.table_key: changes} if changes else None
+
+
+def diff_fingerprints(base: Dict[str, Any], metadata: Dict[str, Any], current: Dict[str, Dict[str, Any]],
+                      removed: Set[str], layout: MetadataLayout) -> Dict[str, Any]:
+    """Changes between the base tree and the re-extracted schemas, in the incremental scan change format."""
+    base_schemas = base.get(layout.schema_key, {})
+    schemas = children(metadata, layout.schema_key)
+    changes = []
+    for name, node in current.items():
+        schema_changes = diff_schema(name, base_schemas.get(name), schemas.get(name, {}), node, layout)
+        if schema_changes:
+            changes.append(schema_changes)
+    for name in sorted(removed & set(base_schemas)):
+        changes.append({"name": name, "change_type": "deleted"})
+    return {layout.schema_key: changes}
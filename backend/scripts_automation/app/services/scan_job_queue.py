@@ -0,0 +1,230 @@
+"""
+Scan Job Queue
+Durable, database-backed queue of scans to run. Workers on any node claim jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, hold them under a lease they renew while the scan runs,
+and report the outcome; failed jobs are retried with exponential backoff, and jobs whose
+worker died are picked up again once their lease expires.
+"""
+
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func, text, update
+from sqlmodel import Session, select
+
+from app.models.scan_models import ScanJob, ScanJobStatus
+
+logger = logging.getLogger(__name__)
+
+# Scans running at once against one data source, across all workers
+SCAN_JOB_MAX_PER_DATA_SOURCE = int(os.getenv("SCAN_JOB_MAX_PER_DATA_SOURCE", "2"))
+SCAN_JOB_MAX_ATTEMPTS = int(os.getenv("SCAN_JOB_MAX_ATTEMPTS", "3"))
+# A worker renews its lease every third of this; an unrenewed lease frees the job for other workers
+SCAN_JOB_LEASE_SECONDS = int(os.getenv("SCAN_JOB_LEASE_SECONDS", "120"))
+SCAN_JOB_RETRY_BACKOFF = float(os.getenv("SCAN_JOB_RETRY_BACKOFF", "30"))
+SCAN_JOB_RETRY_BACKOFF_MAX = float(os.getenv("SCAN_JOB_RETRY_BACKOFF_MAX", "3600"))
+# Queued jobs locked per claim, so jobs of saturated data sources don't starve the rest
+SCAN_JOB_CLAIM_WINDOW = int(os.getenv("SCAN_JOB_CLAIM_WINDOW", "50"))
+
+# Manual scans go ahead of scheduled ones
+MANUAL_PRIORITY = 10
+SCHEDULED_PRIORITY = 0
+
+# First key of the PostgreSQL advisory locks serialising claims per data source
+ADVISORY_LOCK_NAMESPACE = 0x5CA7
+
+ACTIVE_STATUSES = (ScanJobStatus.QUEUED, ScanJobStatus.RUNNING)
+
+
+def retry_delay(attempts: int, backoff: float = SCAN_JOB_RETRY_BACKOFF,
+                maximum: float = SCAN_JOB_RETRY_BACKOFF_MAX) -> float:
+    """Seconds to wait before the next attempt, after the given number of attempts"""
+    return min(maximum, backoff * (2 ** max(0, attempts - 1))) * random.uniform(0.75, 1.0)
+
+
+def pick_claimable(candidates: Iterable[ScanJob], running: Dict[int, int], per_source_limit: int,
+                   limit: int) -> List[ScanJob]:
+    """Candidates (in priority order) that fit under their data source's concurrency limit"""
+    running = dict(running)
+    picked = []
+    for job in candidates:
+        if len(picked) >= limit:
+            break
+        if running.get(job.data_source_id, 0) < per_source_limit:
+            running[job.data_source_id] = running.get(job.data_source_id, 0) + 1
+            picked.append(job)
+    return picked
+
+
+class ScanJobQueue:
+    """Operations on the scan_jobs table; each commits its own transaction."""
+
+    @staticmethod
+    def active_job(session: Session, scan_id: int) -> Optional[ScanJob]:
+        return session.exec(
+            select(ScanJob).where(ScanJob.scan_id == scan_id).where(ScanJob.status.in_(ACTIVE_STATUSES))
+        ).first()
+
+    @staticmethod
+    def enqueue(session: Session, scan_id: int, data_source_id: int, priority: int = MANUAL_PRIORITY,
+                max_attempts: int = SCAN_JOB_MAX_ATTEMPTS, run_after: Optional[datetime] = None) -> ScanJob:
+        """Queue a scan, or return its job if it is already queued or running"""
+        job = ScanJobQueue.active_job(session, scan_id)
+        if job:
+            return job
+        job = ScanJob(scan_id=scan_id, data_source_id=data_source_id, priority=priority,
+                      max_attempts=max_attempts, run_after=run_after or datetime.utcnow())
+        session.add(job)
+        session.commit()
+        session.refresh(job)
+        logger.info(f"Queued scan job {job.id} for scan {scan_id} (priority {priority})")
+        return job
+
+    @staticmethod
+    def claim(session: Session, worker_id: str, limit: int = 1,
+              per_source_limit: int = SCAN_JOB_MAX_PER_DATA_SOURCE,
+              lease_seconds: int = SCAN_JOB_LEASE_SECONDS) -> List[ScanJob]:
+        """Lease up to `limit` due jobs to the worker, highest priority first.
+
+        Queued rows are locked with SKIP LOCKED, so concurrent workers never block on or
+        double-claim the same job. On PostgreSQL a transaction-scoped advisory lock per data
+        source makes the running-count check and the claim atomic across workers.
+        """
+        now = datetime.utcnow()
+        candidates = session.exec(
+            select(ScanJob)
+            .where(ScanJob.status == ScanJobStatus.QUEUED)
+            .where(ScanJob.run_after <= now)
+            .order_by(ScanJob.priority.desc(), ScanJob.run_after, ScanJob.id)
+            .limit(max(limit, SCAN_JOB_CLAIM_WINDOW))
+            .with_for_update(skip_locked=True)
+        ).all()
+        sources = ScanJobQueue._lock_data_sources(session, {job.data_source_id for job in candidates})
+        candidates = [job for job in candidates if job.data_source_id in sources]
+        if not candidates:
+            session.rollback()
+            return []
+
+        running = dict(session.exec(
+            select(ScanJob.data_source_id, func.count())
+            .where(ScanJob.status == ScanJobStatus.RUNNING)
+            .where(ScanJob.data_source_id.in_(sources))
+            .group_by(ScanJob.data_source_id)
+        ).all())
+        claimed = pick_claimable(candidates, running, per_source_limit, limit)
+        for job in claimed:
+            job.status = ScanJobStatus.RUNNING
+            job.attempts += 1
+            job.lease_owner = worker_id
+            job.lease_expires_at = now + timedelta(seconds=lease_seconds)
+            job.updated_at = now
+            session.add(job)
+        session.commit()
+        for job in claimed:
+            session.refresh(job)
+        if claimed:
+            logger.info(f"Worker {worker_id} claimed scan jobs {[job.id for job in claimed]}")
+        return claimed
+
+    @staticmethod
+    def _lock_data_sources(session: Session, data_source_ids: Set[int]) -> Set[int]:
+        """Data sources this transaction holds the claim lock of (all of them off PostgreSQL)"""
+        if session.get_bind().dialect.name != "postgresql":
+            return data_source_ids
+        locked = set()
+        for data_source_id in sorted(data_source_ids):
+            acquired = session.execute(
+                text("SELECT pg_try_advisory_xact_lock(:namespace, :data_source_id)"),
+                {"namespace": ADVISORY_LOCK_NAMESPACE, "data_source_id": data_source_id},
+            ).scalar()
+            if acquired:
+                locked.add(data_source_id)
+        return locked
+
+    @staticmethod
+    def _update_leased(session: Session, job_id: int, worker_id: str, **values) -> bool:
+        """Update a job only while the worker still holds its lease"""
+        result = session.execute(
+            update(ScanJob)
+            .where(ScanJob.id == job_id)
+            .where(ScanJob.status == ScanJobStatus.RUNNING)
+            .where(ScanJob.lease_owner == worker_id)
+            .values(updated_at=datetime.utcnow(), **values)
+        )
+        session.commit()
+        return result.rowcount == 1
+
+    @staticmethod
+    def heartbeat(session: Session, job_id: int, worker_id: str,
+                  lease_seconds: int = SCAN_JOB_LEASE_SECONDS) -> bool:
+        """Extend the lease; False when the worker has lost it"""
+        return ScanJobQueue._update_leased(
+            session, job_id, worker_id, lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds)
+        )
+
+    @staticmethod
+    def complete(session: Session, job_id: int, worker_id: str,
+                 status: ScanJobStatus = ScanJobStatus.COMPLETED) -> bool:
+        now = datetime.utcnow()
+        return ScanJobQueue._update_leased(
+            session, job_id, worker_id, status=status, lease_owner=None, lease_expires_at=None, completed_at=now
+        )
+
+    @staticmethod
+    def fail(session: Session, job: ScanJob, worker_id: str, error: str) -> bool:
+        """Record a failed attempt; returns True when the job was queued again for a retry"""
+        now = datetime.utcnow()
+        if job.attempts < job.max_attempts:
+            ScanJobQueue._update_leased(
+                session, job.id, worker_id, status=ScanJobStatus.QUEUED, lease_owner=None, lease_expires_at=None,
+                last_error=error, run_after=now + timedelta(seconds=retry_delay(job.attempts)),
+            )
+            logger.warning(f"Scan job {job.id} failed (attempt {job.attempts}/{job.max_attempts}), retrying: {error}")
+            return True
+        ScanJobQueue._update_leased(
+            session, job.id, worker_id, status=ScanJobStatus.FAILED, lease_owner=None, lease_expires_at=None,
+            last_error=error, completed_at=now,
+        )
+        logger.error(f"Scan job {job.id} failed after {job.attempts} attempts: {error}")
+        return False
+
+    @staticmethod
+    def release(session: Session, job_id: int, worker_id: str) -> bool:
+        """Hand a job back without counting the attempt (worker shutting down)"""
+        return ScanJobQueue._update_leased(
+            session, job_id, worker_id, status=ScanJobStatus.QUEUED, lease_owner=None, lease_expires_at=None,
+            attempts=ScanJob.attempts - 1,
+        )
+
+    @staticmethod
+    def requeue_expired(session: Session) -> Tuple[List[ScanJob], List[ScanJob]]:
+        """Requeue jobs whose lease ran out; returns (requeued, failed), the latter out of attempts"""
+        now = datetime.utcnow()
+        expired = session.exec(
+            select(ScanJob)
+            .where(ScanJob.status == ScanJobStatus.RUNNING)
+            .where(ScanJob.lease_expires_at < now)
+            .with_for_update(skip_locked=True)
+        ).all()
+        requeued, failed = [], []
+        for job in expired:
+            error = f"Lease of worker {job.lease_owner} expired"
+            job.lease_owner = None
+            job.lease_expires_at = None
+            job.last_error = error
+            job.updated_at = now
+            if job.attempts < job.max_attempts:
+                job.status = ScanJobStatus.QUEUED
+                job.run_after = now + timedelta(seconds=retry_delay(job.attempts))
+                requeued.append(job)
+            else:
+                job.status = ScanJobStatus.FAILED
+                job.completed_at = now
+                failed.append(job)
+            session.add(job)
+            logger.warning(f"Scan job {job.id}: {error}")
+        session.commit()
+        return requeued, failed
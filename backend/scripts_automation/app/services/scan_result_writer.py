@@ -0,0 +1,149 @@
+"""
+Scan Result Writer
+Streams scan results to the database in fixed-size chunks through Core bulk inserts, or
+PostgreSQL COPY, instead of building one ORM object per table and column.
+"""
+
+import io
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from sqlalchemy import insert
+from sqlmodel import Session
+
+from app.models.scan_models import ScanResult
+from app.services.scan_fingerprint import column_hash, layout_for, table_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Rows sent to the database per statement
+SCAN_RESULT_CHUNK_SIZE = int(os.getenv("SCAN_RESULT_CHUNK_SIZE", "5000"))
+# "auto" uses COPY on PostgreSQL (psycopg2) and Core inserts elsewhere; "copy" or "insert" force one
+SCAN_RESULT_WRITE_METHOD = os.getenv("SCAN_RESULT_WRITE_METHOD", "auto")
+
+COPY_COLUMNS = (
+    "scan_id", "schema_name", "table_name", "column_name", "object_type", "data_type", "nullable",
+    "scan_metadata", "fingerprint", "created_at", "updated_at",
+)
+JSON_COLUMNS = {"scan_metadata", "fingerprint"}
+
+
+def iter_scan_result_rows(scan_id: int, metadata: Dict[str, Any], source_type: str) -> Iterator[Dict[str, Any]]:
+    """One row per table (collection) and per column (field) of the extracted metadata."""
+    now = datetime.utcnow()
+    layout = layout_for(source_type)
+    if source_type in ["mysql", "postgresql"]:
+        schemas = metadata.get("schemas", {})
+    elif source_type == "mongodb":
+        # Database name stored as schema name, collection as table, field as column
+        schemas = metadata.get("databases", {})
+    else:
+        return
+    for schema_name, schema_data in schemas.items():
+        for table_name, table_data in schema_data.get(layout.table_key, {}).items():
+            yield {
+                "scan_id": scan_id, "schema_name": schema_name, "table_name": table_name, "column_name": None,
+                "object_type": "table", "data_type": None, "nullable": None,
+                "scan_metadata": table_data.get("metadata", {}),
+                "fingerprint": table_fingerprint(table_data, layout),
+                "created_at": now, "updated_at": now,
+            }
+            for column_name, column_data in table_data.get(layout.column_key, {}).items():
+                yield {
+                    "scan_id": scan_id, "schema_name": schema_name, "table_name": table_name,
+                    "column_name": column_name, "object_type": "table",
+                    "data_type": column_data.get("data_type"), "nullable": column_data.get("nullable"),
+                    "scan_metadata": column_data,
+                    "fingerprint": {"hash": column_hash(column_data)},
+                    "created_at": now, "updated_at": now,
+                }
+
+
+def _copy_value(column: str, value: Any) -> str:
+    """A value in COPY text format"""
+    if value is None:
+        return "\\N"
+    if column in JSON_COLUMNS:
+        value = json.dumps(value, default=str)
+    elif isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+class ScanResultWriter:
+    """Buffers scan result rows and writes them a chunk at a time.
+
+    Rows go through the session's connection, so they commit (or roll back) with the rest
+    of the scan. Only one chunk of rows is held in memory at a time.
+    """
+
+    def __init__(self, session: Session, chunk_size: int = SCAN_RESULT_CHUNK_SIZE,
+                 method: str = SCAN_RESULT_WRITE_METHOD,
+                 on_progress: Optional[Callable[[int], None]] = None):
+        self.session = session
+        self.chunk_size = max(1, chunk_size)
+        self.on_progress = on_progress
+        if method == "auto":
+            dialect = session.get_bind().dialect
+            method = "copy" if dialect.name == "postgresql" and dialect.driver == "psycopg2" else "insert"
+        self.method = method
+        self.buffer: List[Dict[str, Any]] = []
+        self.written = 0
+        self.tables = 0
+        self.columns = 0
+        # schema -> {"tables": n, "columns": n}
+        self.schemas: Dict[str, Dict[str, int]] = {}
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.buffer.append(row)
+            counts = self.schemas.setdefault(row["schema_name"], {"tables": 0, "columns": 0})
+            if row["column_name"] is None:
+                self.tables += 1
+                counts["tables"] += 1
+            else:
+                self.columns += 1
+                counts["columns"] += 1
+            if len(self.buffer) >= self.chunk_size:
+                self.flush()
+
+    def flush(self) -> None:
+        if not self.buffer:
+            return
+        connection = self.session.connection()
+        if self.method == "copy":
+            self._copy(connection, self.buffer)
+        else:
+            connection.execute(insert(ScanResult.__table__), self.buffer)
+        self.written += len(self.buffer)
+        self.buffer = []
+        logger.info(f"Stored {self.written} scan results so far ({self.tables} tables, {self.columns} columns)")
+        if self.on_progress:
+            self.on_progress(self.written)
+
+    def close(self) -> int:
+        """Write the remaining rows and return the total written"""
+        self.flush()
+        return self.written
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts of what was written, per schema; the rows themselves live in ScanResult"""
+        return {"tables": self.tables, "columns": self.columns, "schemas": self.schemas}
+
+    @staticmethod
+    def _copy(connection, rows: List[Dict[str, Any]]) -> None:
+        data = io.StringIO()
+        for row in rows:
+            data.write("\t".join(_copy_value(column, row[column]) for column in COPY_COLUMNS))
+            data.write("\n")
+        data.seek(0)
+        cursor = connection.connection.driver_connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY {ScanResult.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN", data
+            )
+        finally:
+            cursor.close()
@@ -2,6 +2,8 @@ from typing import List, Optional, Dict, Any
 from sqlmodel import Session, select
 from app.models.scan_models import ScanSchedule, Scan, DataSource, ScanRuleSet
 from app.services.scan_service import ScanService
+from app.services.scan_job_queue import SCHEDULED_PRIORITY
+from sqlalchemy import update
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 from datetime import datetime
@@ -212,7 +214,20 @@ class ScanSchedulerService:
                     ).all()
                     
                     for schedule in schedules_to_run:
-                        # Create and execute scan
+                        # Claim this run by moving next_run forward; a scheduler on another node that
+                        # read the same due schedule loses the race and skips it
+                        next_run = croniter(schedule.cron_expression, now).get_next(datetime)
+                        claimed = session.execute(
+                            update(ScanSchedule)
+                            .where(ScanSchedule.id == schedule.id)
+                            .where(ScanSchedule.next_run == schedule.next_run)
+                            .values(last_run=now, next_run=next_run, updated_at=now)
+                        ).rowcount
+                        session.commit()
+                        if not claimed:
+                            continue
+                        
+                        # Create the scan and queue it for the scan workers
                         scan_name = f"{schedule.name} (scheduled {now.strftime('%Y-%m-%d %H:%M:%S')})"
                         scan = ScanService.create_scan(
                             session=session,
@@ -221,18 +236,9 @@ class ScanSchedulerService:
                             scan_rule_set_id=schedule.scan_rule_set_id,
                             description=f"Scheduled scan from {schedule.name}"
                         )
+                        ScanService.execute_scan(session, scan.id, priority=SCHEDULED_PRIORITY)
                         
-                        # Execute scan
-                        ScanService.execute_scan(session, scan.id)
-                        
-                        # Update schedule's last run and next run times
-                        schedule.last_run = now
-                        cron = croniter(schedule.cron_expression, now)
-                        schedule.next_run = cron.get_next(datetime)
-                        session.add(schedule)
-                        session.commit()
-                        
-                        logger.info(f"Executed scheduled scan: {scan_name} (ID: {scan.id})")
+                        logger.info(f"Queued scheduled scan: {scan_name} (ID: {scan.id})")
             
             except Exception as e:
                 logger.error(f"Error in scheduler loop: {str(e)}")
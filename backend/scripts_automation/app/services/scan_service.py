@@ -1,6 +1,6 @@
 """Service for managing scan operations."""
 
-from typing import List, Optional, Dict, Any, Union
+from typing import List, Optional, Dict, Any, Union, Callable
 from sqlmodel import Session, select
 from app.models.scan_models import (
     Scan, ScanStatus, ScanResult, DataSource, ScanRuleSet,
@@ -10,11 +10,13 @@ from app.services.scan_rule_set_service import ScanRuleSetService
 from sqlalchemy.exc import SQLAlchemyError
 import logging
 from datetime import datetime
-import requests
 import json
 import uuid
-import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import httpx
+from app.services.extraction_client import EXTRACTION_SERVICE_URL, extraction_client
+from app.services.parallel_discovery_engine import discovery_engine, DEFAULT_MAX_IN_FLIGHT
+from app.services.scan_result_writer import ScanResultWriter, iter_scan_result_rows
+from app.services.scan_job_queue import MANUAL_PRIORITY, ScanJobQueue
 
 # Setup logging
 logger = logging.getLogger(__name__)
@@ -24,7 +26,7 @@ class ScanService:
     """Service for managing scan operations."""
     
     # Extraction service endpoint
-    EXTRACTION_SERVICE_URL = "http://extractor:8000"
+    EXTRACTION_SERVICE_URL = EXTRACTION_SERVICE_URL
     
     @staticmethod
     def create_scan(
@@ -138,33 +140,30 @@ class ScanService:
         return True
     
     @staticmethod
-    def execute_scan(session: Session, scan_id: int) -> Dict[str, Any]:
-        """Execute a scan."""
+    def execute_scan(session: Session, scan_id: int, priority: int = MANUAL_PRIORITY) -> Dict[str, Any]:
+        """Queue a scan for the scan workers."""
         scan = session.get(Scan, scan_id)
         if not scan:
             return {"success": False, "message": f"Scan with ID {scan_id} not found"}
         
-        # Check if scan is already running
+        # Check if scan is already running or queued
         if scan.status == ScanStatus.RUNNING:
             return {"success": False, "message": f"Scan {scan.name} is already running"}
-        
-        # Update scan status to running
-        ScanService.update_scan_status(session, scan_id, ScanStatus.RUNNING)
+        if ScanJobQueue.active_job(session, scan_id):
+            return {"success": False, "message": f"Scan {scan.name} is already queued"}
         
         try:
-            # Get data source and scan rule set
+            # Validate the data source before queueing
             data_source = session.get(DataSource, scan.data_source_id)
             if not data_source:
                 raise ValueError(f"Data source with ID {scan.data_source_id} not found")
-                
-            scan_rule_set = None
-            if scan.scan_rule_set_id:
-                scan_rule_set = session.get(ScanRuleSet, scan.scan_rule_set_id)
             
-            # Execute scan asynchronously
-            asyncio.create_task(ScanService._execute_scan_async(scan, data_source, scan_rule_set))
+            # A worker picks the job up, runs it and retries it on failure
+            job = ScanJobQueue.enqueue(session, scan.id, data_source.id, priority=priority)
+            ScanService.update_scan_status(session, scan_id, ScanStatus.PENDING)
             
-            return {"success": True, "message": f"Scan {scan.name} started successfully", "scan_id": scan.id}
+            return {"success": True, "message": f"Scan {scan.name} queued successfully", "scan_id": scan.id,
+                    "job_id": job.id}
         except Exception as e:
             logger.error(f"Error starting scan: {str(e)}")
             ScanService.update_scan_status(session, scan_id, ScanStatus.FAILED, str(e))
@@ -183,37 +182,40 @@ class ScanService:
         from app.db_session import get_session
         with get_session() as session:
             try:
-                # Extract metadata based on data source type
-                if data_source.source_type.value == "mysql":
-                    metadata = await ScanService._extract_mysql_metadata(data_source, scan_rule_set)
-                elif data_source.source_type.value == "postgresql":
-                    metadata = await ScanService._extract_postgresql_metadata(data_source, scan_rule_set)
-                elif data_source.source_type.value == "mongodb":
-                    metadata = await ScanService._extract_mongodb_metadata(data_source, scan_rule_set)
+                source_type = data_source.source_type.value
+                writer = ScanResultWriter(session)
+                
+                def store_partial(partial: Dict[str, Any]) -> Dict[str, Any]:
+                    # Apply scan rule set filters if provided, then stream the results to the database
+                    if scan_rule_set:
+                        partial = ScanRuleSetService.apply_rule_set_filters(scan_rule_set, partial)
+                    writer.write(iter_scan_result_rows(scan.id, partial, source_type))
+                    return partial
+                
+                # Extract metadata based on data source type; results are stored as each schema arrives
+                if source_type == "mysql":
+                    await ScanService._extract_mysql_metadata(data_source, scan_rule_set, store_partial)
+                elif source_type == "postgresql":
+                    await ScanService._extract_postgresql_metadata(data_source, scan_rule_set, store_partial)
+                elif source_type == "mongodb":
+                    store_partial(await ScanService._extract_mongodb_metadata(data_source, scan_rule_set))
                 else:
                     raise ValueError(f"Unsupported data source type: {data_source.source_type}")
                 
-                # Apply scan rule set filters if provided
-                if scan_rule_set:
-                    metadata = ScanRuleSetService.apply_rule_set_filters(scan_rule_set, metadata)
-                
-                # Store scan results
-                await ScanService._store_scan_results(session, scan.id, metadata, data_source.source_type.value)
+                written = writer.close()
+                logger.info(f"Stored {written} scan results for scan ID {scan.id}")
                 
                 # Create discovery history entry
                 discovery = DiscoveryHistory(
                     discovery_id=str(uuid.uuid4()),  # Generate unique ID
                     data_source_id=data_source.id,
                     status=DiscoveryStatus.COMPLETED,  # Use enum
-                    tables_discovered=sum(len(schema.get("tables", [])) for schema in metadata.get("schemas", [])),
-                    columns_discovered=sum(
-                        len(table.get("columns", []))
-                        for schema in metadata.get("schemas", [])
-                        for table in schema.get("tables", [])
-                    ),
+                    tables_discovered=writer.tables,
+                    columns_discovered=writer.columns,
                     duration_seconds=int((datetime.utcnow() - scan.started_at).total_seconds()) if scan.started_at else 0,  # Cast to int
                     triggered_by=scan.created_by if scan.created_by else "system",
-                    discovery_details=metadata
+                    # Counts only: the full metadata is already stored as ScanResult rows
+                    discovery_details=writer.summary()
                 )
                 session.add(discovery)
                 
@@ -224,6 +226,13 @@ class ScanService:
                 # Commit all changes
                 session.commit()
                 
+                # Refresh this data source's part of the in-memory lineage index
+                try:
+                    from app.services.lineage_service import LineageService
+                    LineageService.sync_lineage_index(session, data_source_ids=[data_source.id])
+                except Exception as e:
+                    logger.warning(f"Lineage index refresh failed for data source {data_source.id}: {str(e)}")
+                
             except Exception as e:
                 logger.error(f"Error executing scan: {str(e)}")
                 ScanService.update_scan_status(session, scan.id, ScanStatus.FAILED, str(e))
@@ -243,36 +252,76 @@ class ScanService:
                 session.commit()
     
     @staticmethod
-    async def _extract_mysql_metadata(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None) -> Dict[str, Any]:
+    async def _extract_mysql_metadata(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None,
+                                      on_partial: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Dict[str, Any]:
         """Extract metadata from MySQL database."""
-        # Use ThreadPoolExecutor to run blocking I/O operations
-        with ThreadPoolExecutor() as executor:
-            return await asyncio.get_event_loop().run_in_executor(
-                executor, ScanService._extract_metadata, "mysql", data_source, scan_rule_set
-            )
+        return await ScanService._extract_sql_metadata_parallel("mysql", data_source, scan_rule_set, on_partial)
     
     @staticmethod
-    async def _extract_postgresql_metadata(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None) -> Dict[str, Any]:
+    async def _extract_postgresql_metadata(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None,
+                                           on_partial: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Dict[str, Any]:
         """Extract metadata from PostgreSQL database."""
-        # Use ThreadPoolExecutor to run blocking I/O operations
-        with ThreadPoolExecutor() as executor:
-            return await asyncio.get_event_loop().run_in_executor(
-                executor, ScanService._extract_metadata, "postgresql", data_source, scan_rule_set
-            )
+        return await ScanService._extract_sql_metadata_parallel("postgresql", data_source, scan_rule_set, on_partial)
     
     @staticmethod
     async def _extract_mongodb_metadata(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None) -> Dict[str, Any]:
         """Extract metadata from MongoDB database."""
-        # Use ThreadPoolExecutor to run blocking I/O operations
-        with ThreadPoolExecutor() as executor:
-            return await asyncio.get_event_loop().run_in_executor(
-                executor, ScanService._extract_metadata, "mongodb", data_source, scan_rule_set
-            )
+        return await ScanService._extract_metadata_async("mongodb", data_source, scan_rule_set)
     
     @staticmethod
-    def _extract_metadata(db_type: str, data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None) -> Dict[str, Any]:
-        """Extract metadata from a database using the extraction service."""
-        # Prepare extraction request payload
+    async def _list_scan_schemas(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None) -> Optional[List[str]]:
+        """List the schemas a scan covers, or None when they cannot be listed up front"""
+        from app.services.data_source_connection_service import DataSourceConnectionService
+        try:
+            connector = DataSourceConnectionService()._get_connector(data_source)
+            schemas = await connector._run_blocking(connector._list_discovery_units_sync)
+        except Exception as e:
+            logger.warning(f"Could not list schemas for data source {data_source.id}, extracting in one request: {str(e)}")
+            return None
+        if schemas is None:
+            return None
+        if scan_rule_set and scan_rule_set.include_schemas:
+            schemas = [schema for schema in schemas if schema in scan_rule_set.include_schemas]
+        if scan_rule_set and scan_rule_set.exclude_schemas:
+            schemas = [schema for schema in schemas if schema not in scan_rule_set.exclude_schemas]
+        return schemas
+    
+    @staticmethod
+    async def _extract_sql_metadata_parallel(db_type: str, data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None,
+                                             on_partial: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Extract metadata with one extraction request per schema, run with bounded concurrency.
+        
+        With on_partial, each schema's metadata is passed to it as soon as it arrives (in completion
+        order) and its return value is what gets merged, so results can be stored during extraction.
+        """
+        schemas = await ScanService._list_scan_schemas(data_source, scan_rule_set)
+        if not schemas:
+            metadata = await ScanService._extract_metadata_async(db_type, data_source, scan_rule_set)
+            return on_partial(metadata) if on_partial else metadata
+        
+        async def extract_schema(schema_name: str) -> Dict[str, Any]:
+            return await ScanService._extract_metadata_async(db_type, data_source, scan_rule_set, [schema_name])
+        
+        properties = data_source.connection_properties or {}
+        max_in_flight = int(properties.get("discovery_concurrency") or data_source.pool_size or DEFAULT_MAX_IN_FLIGHT)
+        if on_partial is None:
+            results = await discovery_engine.gather_ordered(extract_schema, schemas, max_in_flight)
+        else:
+            # The engine only starts another schema once a finished one has been consumed
+            results = [
+                on_partial(result)
+                async for _, result in discovery_engine.map_unordered(extract_schema, schemas, max_in_flight)
+            ]
+        
+        metadata: Dict[str, Any] = {"schemas": {}}
+        for result in results:
+            metadata["schemas"].update(result.get("schemas", {}))
+        return metadata
+    
+    @staticmethod
+    def _extraction_payload(data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None,
+                            schemas: Optional[List[str]] = None, tables: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Build the extraction service request payload."""
         payload = {
             "host": data_source.host,
             "port": data_source.port,
@@ -299,81 +348,51 @@ class ScanService:
             if scan_rule_set.exclude_tables:
                 payload["exclude_tables"] = scan_rule_set.exclude_tables
         
-        # Make request to extraction service
-        url = f"{ScanService.EXTRACTION_SERVICE_URL}/extract/{db_type}"
-        headers = {"Content-Type": "application/json"}
-        
+        # Restrict to the given schemas when extraction is split per schema
+        if schemas is not None:
+            payload["include_schemas"] = schemas
+            payload.pop("exclude_schemas", None)
+        # And to the given tables of those schemas (incremental scans re-extracting changed tables)
+        if tables is not None:
+            payload["include_tables"] = tables
+        return payload
+    
+    @staticmethod
+    def _extract_metadata(db_type: str, data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None,
+                          schemas: Optional[List[str]] = None, tables: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Extract metadata from a database using the extraction service (blocking, for sync callers)."""
         try:
-            response = requests.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
+            return extraction_client.extract(
+                db_type, ScanService._extraction_payload(data_source, scan_rule_set, schemas, tables)
+            )
+        except httpx.HTTPError as e:
+            logger.error(f"Error extracting metadata: {str(e)}")
+            raise
+    
+    @staticmethod
+    async def _extract_metadata_async(db_type: str, data_source: DataSource, scan_rule_set: Optional[ScanRuleSet] = None,
+                                      schemas: Optional[List[str]] = None,
+                                      tables: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Extract metadata from a database using the extraction service over the shared async client."""
+        try:
+            return await extraction_client.extract_async(
+                db_type, ScanService._extraction_payload(data_source, scan_rule_set, schemas, tables)
+            )
+        except httpx.HTTPError as e:
             logger.error(f"Error extracting metadata: {str(e)}")
             raise
     
     @staticmethod
     async def _store_scan_results(session: Session, scan_id: int, metadata: Dict[str, Any], source_type: str):
-        """Store scan results in the database."""
+        """Store scan results in the database, streamed in chunks."""
         if not scan_id:
             raise ValueError("scan_id is required")
-            
-        scan_results = []
-        
-        if source_type in ["mysql", "postgresql"]:
-            # Process SQL database metadata
-            for schema_name, schema_data in metadata.get("schemas", {}).items():
-                for table_name, table_data in schema_data.get("tables", {}).items():
-                    # Store table metadata
-                    table_result = ScanResult(
-                        scan_id=scan_id,
-                        schema_name=schema_name,
-                        table_name=table_name,
-                        scan_metadata=table_data.get("metadata", {})
-                    )
-                    scan_results.append(table_result)
-                    
-                    # Store column metadata
-                    for column_name, column_data in table_data.get("columns", {}).items():
-                        column_result = ScanResult(
-                            scan_id=scan_id,
-                            schema_name=schema_name,
-                            table_name=table_name,
-                            column_name=column_name,
-                            data_type=column_data.get("data_type"),
-                            nullable=column_data.get("nullable"),
-                            scan_metadata=column_data
-                        )
-                        scan_results.append(column_result)
-        
-        elif source_type == "mongodb":
-            # Process MongoDB metadata
-            for db_name, db_data in metadata.get("databases", {}).items():
-                for collection_name, collection_data in db_data.get("collections", {}).items():
-                    # Store collection metadata
-                    collection_result = ScanResult(
-                        scan_id=scan_id,
-                        schema_name=db_name,  # Use database name as schema name
-                        table_name=collection_name,  # Use collection name as table name
-                        scan_metadata=collection_data.get("metadata", {})
-                    )
-                    scan_results.append(collection_result)
-                    
-                    # Store field metadata
-                    for field_name, field_data in collection_data.get("fields", {}).items():
-                        field_result = ScanResult(
-                            scan_id=scan_id,
-                            schema_name=db_name,
-                            table_name=collection_name,
-                            column_name=field_name,  # Use field name as column name
-                            data_type=field_data.get("data_type"),
-                            scan_metadata=field_data
-                        )
-                        scan_results.append(field_result)
         
-        # Batch insert scan results
-        session.add_all(scan_results)
+        writer = ScanResultWriter(session)
+        writer.write(iter_scan_result_rows(scan_id, metadata, source_type))
+        written = writer.close()
         session.commit()
-        logger.info(f"Stored {len(scan_results)} scan results for scan ID {scan_id}")
+        logger.info(f"Stored {written} scan results for scan ID {scan_id}")
     
     @staticmethod
     def get_scan_results(session: Session, scan_id: int) -> List[ScanResult]:
@@ -0,0 +1,186 @@
+"""
+Scan Worker
+Worker pool that runs queued scans: claims jobs from the scan job queue, renews their leases
+while the scans run and reports each outcome back to the queue. Run one or more per node:
+
+    python -m app.services.scan_worker --concurrency 4
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+import uuid
+from typing import Dict, Optional
+
+from sqlalchemy import delete
+
+from app.db_session import get_session
+from app.models.scan_models import DataSource, Scan, ScanJob, ScanJobStatus, ScanResult, ScanRuleSet, ScanStatus
+from app.services.scan_job_queue import SCAN_JOB_LEASE_SECONDS, ScanJobQueue
+from app.services.scan_service import ScanService
+
+logger = logging.getLogger(__name__)
+
+# Scans one worker process runs at once
+SCAN_WORKER_CONCURRENCY = int(os.getenv("SCAN_WORKER_CONCURRENCY", "4"))
+SCAN_WORKER_POLL_INTERVAL = float(os.getenv("SCAN_WORKER_POLL_INTERVAL", "2"))
+# Seconds running scans get to finish on shutdown before their jobs are handed back
+SCAN_WORKER_DRAIN_TIMEOUT = float(os.getenv("SCAN_WORKER_DRAIN_TIMEOUT", "60"))
+
+
+class ScanWorkerPool:
+    """Runs up to `concurrency` claimed scans at once on the current event loop."""
+
+    def __init__(self, concurrency: int = SCAN_WORKER_CONCURRENCY, poll_interval: float = SCAN_WORKER_POLL_INTERVAL,
+                 worker_id: Optional[str] = None):
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._scan_ids: Dict[int, int] = {}
+        self._stopping: Optional[asyncio.Event] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def run(self) -> None:
+        self._stopping = asyncio.Event()
+        self._wakeup = asyncio.Event()
+        logger.info(f"Scan worker {self.worker_id} started ({self.concurrency} slots)")
+        while not self._stopping.is_set():
+            claimed = 0
+            try:
+                with get_session() as session:
+                    requeued, failed = ScanJobQueue.requeue_expired(session)
+                    # As after a failed attempt: pending while retries remain, failed once they run out
+                    for job in requeued:
+                        ScanService.update_scan_status(session, job.scan_id, ScanStatus.PENDING, job.last_error)
+                    for job in failed:
+                        ScanService.update_scan_status(session, job.scan_id, ScanStatus.FAILED, job.last_error)
+                    free = self.concurrency - len(self._tasks)
+                    if free > 0:
+                        for job in ScanJobQueue.claim(session, self.worker_id, limit=free):
+                            self._start(job)
+                            claimed += 1
+            except Exception as e:
+                logger.error(f"Error claiming scan jobs: {str(e)}")
+            if claimed and len(self._tasks) < self.concurrency:
+                continue
+            # Sleep until the poll interval passes, a slot frees up or the pool is stopped
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        await self._drain()
+        logger.info(f"Scan worker {self.worker_id} stopped")
+
+    def stop(self) -> None:
+        if self._stopping:
+            self._stopping.set()
+            self._wakeup.set()
+
+    def _start(self, job: ScanJob) -> None:
+        task = asyncio.create_task(self._run_job(job))
+        self._tasks[job.id] = task
+        self._scan_ids[job.id] = job.scan_id
+
+        def finished(_task, job_id=job.id):
+            self._tasks.pop(job_id, None)
+            self._scan_ids.pop(job_id, None)
+            self._wakeup.set()
+
+        task.add_done_callback(finished)
+
+    async def _drain(self) -> None:
+        if not self._tasks:
+            return
+        pending = dict(self._tasks)
+        scan_ids = dict(self._scan_ids)
+        _, unfinished = await asyncio.wait(pending.values(), timeout=SCAN_WORKER_DRAIN_TIMEOUT)
+        for job_id, task in pending.items():
+            if task in unfinished:
+                task.cancel()
+                with get_session() as session:
+                    if ScanJobQueue.release(session, job_id, self.worker_id):
+                        ScanService.update_scan_status(session, scan_ids[job_id], ScanStatus.PENDING)
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def _run_job(self, job: ScanJob) -> None:
+        with get_session() as session:
+            scan = session.get(Scan, job.scan_id)
+            if scan is None or scan.status == ScanStatus.CANCELLED:
+                ScanJobQueue.complete(session, job.id, self.worker_id, ScanJobStatus.CANCELLED)
+                return
+            if job.attempts > 1:
+                # Results stored by an earlier, failed attempt
+                session.execute(delete(ScanResult).where(ScanResult.scan_id == scan.id))
+            scan.error_message = None
+            scan.completed_at = None
+            session.add(scan)
+            session.commit()
+            scan = ScanService.update_scan_status(session, scan.id, ScanStatus.RUNNING)
+            data_source = session.get(DataSource, scan.data_source_id)
+            scan_rule_set = session.get(ScanRuleSet, scan.scan_rule_set_id) if scan.scan_rule_set_id else None
+
+        scan_task = asyncio.create_task(ScanService._execute_scan_async(scan, data_source, scan_rule_set))
+        heartbeat = asyncio.create_task(self._heartbeat(job.id, scan_task))
+        error = None
+        try:
+            await scan_task
+        except asyncio.CancelledError:
+            if not scan_task.cancelled() or not heartbeat.done():
+                raise
+            error = "Scan job lease lost"
+        except Exception as e:
+            error = str(e)
+        finally:
+            heartbeat.cancel()
+
+        with get_session() as session:
+            scan = session.get(Scan, job.scan_id)
+            if error is None and scan.status == ScanStatus.FAILED:
+                error = scan.error_message or "Scan failed"
+            if error is None:
+                ScanJobQueue.complete(session, job.id, self.worker_id)
+                return
+            job = session.get(ScanJob, job.id)
+            if job.lease_owner != self.worker_id:
+                logger.warning(f"Scan job {job.id} lost its lease, leaving it to the queue")
+                return
+            if ScanJobQueue.fail(session, job, self.worker_id, error):
+                ScanService.update_scan_status(session, scan.id, ScanStatus.PENDING, error)
+            else:
+                ScanService.update_scan_status(session, scan.id, ScanStatus.FAILED, error)
+
+    async def _heartbeat(self, job_id: int, scan_task: asyncio.Task) -> None:
+        while True:
+            await asyncio.sleep(SCAN_JOB_LEASE_SECONDS / 3)
+            try:
+                with get_session() as session:
+                    alive = ScanJobQueue.heartbeat(session, job_id, self.worker_id)
+            except Exception as e:
+                logger.error(f"Error renewing lease of scan job {job_id}: {str(e)}")
+                continue
+            if not alive:
+                logger.warning(f"Scan job {job_id} lease lost, cancelling its scan")
+                scan_task.cancel()
+                return
+
+
+async def main(concurrency: int, poll_interval: float) -> None:
+    pool = ScanWorkerPool(concurrency, poll_interval)
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, pool.stop)
+    await pool.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run queued scans")
+    parser.add_argument("--concurrency", type=int, default=SCAN_WORKER_CONCURRENCY)
+    parser.add_argument("--poll-interval", type=float, default=SCAN_WORKER_POLL_INTERVAL)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main(args.concurrency, args.poll_interval))
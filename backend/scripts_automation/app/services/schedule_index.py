@@ -0,0 +1,161 @@
+"""
+Schedule Index
+Data structures behind the advanced scan scheduler: an indexed binary heap with O(log n)
+update/remove by key, and a time-bucketed index answering "how much work is scheduled
+between two instants" without scanning every schedule.
+"""
+
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+
+class IndexedHeap:
+    """Min-heap of items with a position index, so an item's key can be changed or removed in O(log n)."""
+
+    def __init__(self):
+        self._heap: List[Tuple[Any, Hashable]] = []
+        self._positions: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def key(self, item: Hashable) -> Any:
+        return self._heap[self._positions[item]][0]
+
+    def push(self, item: Hashable, key: Any) -> None:
+        """Insert the item, or move it to its new key if already queued"""
+        position = self._positions.get(item)
+        if position is not None:
+            old_key = self._heap[position][0]
+            self._heap[position] = (key, item)
+            if key < old_key:
+                self._sift_up(position)
+            else:
+                self._sift_down(position)
+            return
+        self._heap.append((key, item))
+        self._positions[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+
+    def remove(self, item: Hashable) -> bool:
+        position = self._positions.pop(item, None)
+        if position is None:
+            return False
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+        return True
+
+    def peek(self) -> Optional[Tuple[Any, Hashable]]:
+        """(key, item) with the smallest key, or None when empty"""
+        return self._heap[0] if self._heap else None
+
+    def pop(self) -> Tuple[Any, Hashable]:
+        key, item = self._heap[0]
+        self.remove(item)
+        return key, item
+
+    def _sift_up(self, position: int) -> None:
+        heap, positions = self._heap, self._positions
+        entry = heap[position]
+        while position > 0:
+            parent = (position - 1) >> 1
+            if not entry[0] < heap[parent][0]:
+                break
+            heap[position] = heap[parent]
+            positions[heap[position][1]] = position
+            position = parent
+        heap[position] = entry
+        positions[entry[1]] = position
+
+    def _sift_down(self, position: int) -> None:
+        heap, positions = self._heap, self._positions
+        size = len(heap)
+        entry = heap[position]
+        while True:
+            child = 2 * position + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if not heap[child][0] < entry[0]:
+                break
+            heap[position] = heap[child]
+            positions[heap[position][1]] = position
+            position = child
+        heap[position] = entry
+        positions[entry[1]] = position
+
+
+class TimeBucketIndex:
+    """Per-item time and weight, grouped into fixed-width time buckets with running weight totals.
+
+    A window query sums the totals of the buckets it covers and only looks at the individual
+    items of the two edge buckets, so it costs O(window / bucket width + edge bucket size).
+    """
+
+    def __init__(self, bucket_seconds: float = 300):
+        self.bucket_seconds = bucket_seconds
+        self._items: Dict[Hashable, Tuple[float, float]] = {}
+        self._buckets: Dict[int, Dict[Hashable, Tuple[float, float]]] = defaultdict(dict)
+        self._totals: Dict[int, float] = defaultdict(float)
+        self._counts: Dict[int, int] = defaultdict(int)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._items
+
+    def _bucket(self, timestamp: float) -> int:
+        return int(timestamp // self.bucket_seconds)
+
+    def add(self, item: Hashable, timestamp: float, weight: float = 1.0) -> None:
+        """Index the item at the timestamp, replacing its previous entry"""
+        self.remove(item)
+        bucket = self._bucket(timestamp)
+        self._items[item] = (timestamp, weight)
+        self._buckets[bucket][item] = (timestamp, weight)
+        self._totals[bucket] += weight
+        self._counts[bucket] += 1
+
+    def remove(self, item: Hashable) -> bool:
+        entry = self._items.pop(item, None)
+        if entry is None:
+            return False
+        bucket = self._bucket(entry[0])
+        del self._buckets[bucket][item]
+        if self._buckets[bucket]:
+            self._totals[bucket] -= entry[1]
+            self._counts[bucket] -= 1
+        else:
+            del self._buckets[bucket], self._totals[bucket], self._counts[bucket]
+        return True
+
+    def window(self, start: float, end: float) -> Tuple[int, float]:
+        """(count, total weight) of the items with start <= timestamp <= end"""
+        if end < start:
+            return 0, 0.0
+        first, last = self._bucket(start), self._bucket(end)
+        count, weight = 0, 0.0
+        if last - first + 1 > len(self._totals):
+            # Sparse index: cheaper to walk the occupied buckets than the range
+            buckets = (b for b in list(self._totals) if first <= b <= last)
+        else:
+            buckets = (b for b in range(first, last + 1) if b in self._totals)
+        for bucket in buckets:
+            if first < bucket < last:
+                count += self._counts[bucket]
+                weight += self._totals[bucket]
+                continue
+            for timestamp, item_weight in self._buckets[bucket].values():
+                if start <= timestamp <= end:
+                    count += 1
+                    weight += item_weight
+        return count, weight
@@ -0,0 +1,316 @@
+"""
+Table Sampling Service
+Chooses the cheapest reproducible sampling strategy per dialect from table size estimates
+and streams the sample in chunks instead of sorting whole tables with ORDER BY RANDOM().
+"""
+
+import logging
+import math
+import os
+import random
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from pymongo import MongoClient
+
+from app.models.scan_models import DataSource, DataSourceType
+from app.services.data_source_service import DataSourceService
+from app.services.connection_pool_registry import connection_pool_registry
+
+logger = logging.getLogger(__name__)
+
+# Below this many rows a random sort is cheap and gives an exact uniform sample
+SMALL_TABLE_ROWS = int(os.getenv("SAMPLING_SMALL_TABLE_ROWS", "100000"))
+# Above this many rows PostgreSQL samples whole blocks (SYSTEM) instead of rows (BERNOULLI)
+BLOCK_SAMPLING_ROWS = int(os.getenv("SAMPLING_BLOCK_SAMPLING_ROWS", "10000000"))
+# Block sampling returns clustered, uneven counts, so ask for more rows than needed
+OVERSAMPLE_FACTOR = 2.0
+# Index range seeks used by MySQL primary-key sampling
+PK_RANGE_COUNT = 20
+
+SAMPLE_METHODS = ("auto", "random", "first")
+
+
+@dataclass
+class SamplingPlan:
+    """Query and metadata for one sample"""
+    strategy: str
+    query: str
+    seed: int
+    estimated_rows: Optional[int] = None
+    sample_percent: Optional[float] = None
+    params: Dict[str, Any] = field(default_factory=dict)
+    dedupe_column: Optional[str] = None
+    # Statements run on the same connection before the query (seeding the session's RNG)
+    setup: List[Tuple[str, Dict[str, Any]]] = field(default_factory=list)
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "strategy": self.strategy,
+            "seed": self.seed,
+            "estimated_rows": self.estimated_rows,
+            "sample_percent": self.sample_percent
+        }
+
+
+class TableSamplingService:
+    """Service for dialect-native, reproducible table sampling."""
+
+    @staticmethod
+    def sample_percent(sample_size: int, estimated_rows: int, oversample: float = 1.0) -> float:
+        """Percentage of the table expected to yield sample_size rows."""
+        if estimated_rows <= 0:
+            return 100.0
+        return min(100.0, max(0.0001, sample_size * oversample / estimated_rows * 100))
+
+    @staticmethod
+    def iter_sample(data_source: DataSource, table_name: str, schema_name: Optional[str] = None,
+                    sample_size: int = 1000, seed: Optional[int] = None, chunk_size: int = 10000,
+                    sample_method: str = "auto", app_secret: Optional[str] = None) -> Iterator[pd.DataFrame]:
+        """Stream a sample as DataFrame chunks; each chunk carries the plan in ``attrs["sampling"]``.
+
+        Args:
+            data_source: The data source to sample from
+            table_name: The table (or MongoDB collection) to sample
+            schema_name: The schema name
+            sample_size: The number of rows to sample
+            seed: Seed for reproducible samples (random when omitted)
+            chunk_size: Rows per yielded chunk
+            sample_method: auto/random (cheapest uniform strategy) or first (leading rows)
+            app_secret: Optional app secret for decrypting passwords
+        """
+        if sample_method not in SAMPLE_METHODS:
+            raise ValueError(f"Unsupported sample method: {sample_method}")
+        seed = seed if seed is not None else random.randint(1, 2 ** 31 - 1)
+        password = DataSourceService.get_data_source_password(data_source, app_secret)
+
+        if data_source.source_type == DataSourceType.MONGODB:
+            yield from TableSamplingService._iter_mongo_sample(
+                data_source, password, table_name, sample_size, seed, chunk_size, sample_method
+            )
+            return
+
+        from app.services.data_profiling_service import DataProfilingService
+        engine = connection_pool_registry.get_engine(
+            data_source, DataProfilingService._build_connection_uri(data_source, password), credential=password
+        )
+        with engine.connect() as conn:
+            plan = TableSamplingService.plan_sql_sample(
+                conn, data_source.source_type, table_name, schema_name, sample_size, seed, sample_method
+            )
+            logger.info(f"Sampling {schema_name or ''}.{table_name} with {plan.strategy} "
+                        f"(estimated rows: {plan.estimated_rows}, seed: {plan.seed})")
+            for statement, params in plan.setup:
+                conn.execute(text(statement), params)
+            # Server-side cursor so only one chunk is held in memory at a time
+            conn = conn.execution_options(stream_results=True)
+            seen = set()
+            remaining = sample_size
+            for chunk in pd.read_sql(text(plan.query), conn, params=plan.params, chunksize=chunk_size):
+                if plan.dedupe_column and plan.dedupe_column in chunk.columns:
+                    # Neighbouring primary-key ranges can overlap
+                    chunk = chunk[~chunk[plan.dedupe_column].isin(seen)].drop_duplicates(plan.dedupe_column)
+                    seen.update(chunk[plan.dedupe_column].tolist())
+                chunk = chunk.iloc[:remaining]
+                remaining -= len(chunk)
+                chunk.attrs["sampling"] = plan.describe()
+                yield chunk
+                if remaining <= 0:
+                    break
+
+    @staticmethod
+    def plan_sql_sample(conn, source_type: DataSourceType, table_name: str, schema_name: Optional[str],
+                        sample_size: int, seed: int, sample_method: str = "auto") -> SamplingPlan:
+        """Pick a sampling query for a SQL table from its size estimate."""
+        quote = conn.dialect.identifier_preparer.quote
+        source = f"{quote(schema_name)}.{quote(table_name)}" if schema_name else quote(table_name)
+        limit = int(sample_size)
+
+        if sample_method == "first":
+            if source_type == DataSourceType.SQLSERVER:
+                return SamplingPlan("first", f"SELECT TOP {limit} * FROM {source}", seed)
+            if source_type == DataSourceType.ORACLE:
+                return SamplingPlan("first", f"SELECT * FROM {source} FETCH FIRST {limit} ROWS ONLY", seed)
+            return SamplingPlan("first", f"SELECT * FROM {source} LIMIT {limit}", seed)
+
+        if source_type == DataSourceType.POSTGRESQL:
+            return TableSamplingService._plan_postgresql(conn, source, table_name, schema_name, limit, seed)
+        if source_type == DataSourceType.MYSQL:
+            return TableSamplingService._plan_mysql(conn, quote, source, table_name, schema_name, limit, seed)
+        if source_type == DataSourceType.SQLSERVER:
+            return TableSamplingService._plan_sqlserver(conn, quote, source, table_name, schema_name, limit, seed)
+        if source_type == DataSourceType.ORACLE:
+            return TableSamplingService._plan_oracle(conn, source, table_name, schema_name, limit, seed)
+        raise ValueError(f"Unsupported data source type for sampling: {source_type}")
+
+    @staticmethod
+    def _plan_postgresql(conn, source: str, table_name: str, schema_name: Optional[str],
+                         limit: int, seed: int) -> SamplingPlan:
+        # Partitioned parents carry no statistics of their own, so sum their partitions
+        row = conn.execute(text("""
+            SELECT
+                CASE WHEN c.relkind = 'p' THEN (
+                    SELECT COALESCE(SUM(GREATEST(p.reltuples, 0)), 0)
+                    FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid
+                    WHERE i.inhparent = c.oid
+                ) ELSE c.reltuples END,
+                CASE WHEN c.relkind = 'p' THEN (
+                    SELECT COALESCE(SUM(pg_relation_size(i.inhrelid)), 0)
+                    FROM pg_inherits i WHERE i.inhparent = c.oid
+                ) ELSE pg_relation_size(c.oid) END
+            FROM pg_class c JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE c.relname = :table AND n.nspname = COALESCE(:schema, current_schema())
+        """), {"table": table_name, "schema": schema_name}).first()
+        estimated = None
+        if row:
+            reltuples, size_bytes = float(row[0] or 0), int(row[1] or 0)
+            # Never-analyzed tables report reltuples <= 0; fall back to ~100 bytes per row
+            estimated = int(reltuples) if reltuples > 0 else size_bytes // 100
+        if estimated is None or estimated <= SMALL_TABLE_ROWS:
+            # setseed() takes a value in [-1, 1] and seeds random() for the rest of the session
+            return SamplingPlan(
+                "random_order", f"SELECT * FROM {source} ORDER BY random() LIMIT {limit}", seed, estimated,
+                setup=[("SELECT setseed(:seed)", {"seed": (seed % 2 ** 31) / 2 ** 31})]
+            )
+        if estimated > BLOCK_SAMPLING_ROWS:
+            method, oversample = "SYSTEM", OVERSAMPLE_FACTOR
+        else:
+            method, oversample = "BERNOULLI", 1.2
+        percent = TableSamplingService.sample_percent(limit, estimated, oversample)
+        return SamplingPlan(
+            f"tablesample_{method.lower()}",
+            f"SELECT * FROM {source} TABLESAMPLE {method} ({percent}) REPEATABLE ({seed}) LIMIT {limit}",
+            seed, estimated, percent
+        )
+
+    @staticmethod
+    def _plan_mysql(conn, quote, source: str, table_name: str, schema_name: Optional[str],
+                    limit: int, seed: int) -> SamplingPlan:
+        params = {"table": table_name, "schema": schema_name}
+        estimated = conn.execute(text("""
+            SELECT TABLE_ROWS FROM information_schema.TABLES
+            WHERE TABLE_NAME = :table AND TABLE_SCHEMA = COALESCE(:schema, DATABASE())
+        """), params).scalar()
+        estimated = int(estimated) if estimated is not None else None
+        if estimated is None or estimated <= SMALL_TABLE_ROWS:
+            return SamplingPlan("random_order", f"SELECT * FROM {source} ORDER BY RAND({seed}) LIMIT {limit}",
+                                seed, estimated)
+
+        pk_columns = conn.execute(text("""
+            SELECT k.COLUMN_NAME, c.DATA_TYPE
+            FROM information_schema.KEY_COLUMN_USAGE k
+            JOIN information_schema.COLUMNS c
+              ON c.TABLE_SCHEMA = k.TABLE_SCHEMA AND c.TABLE_NAME = k.TABLE_NAME AND c.COLUMN_NAME = k.COLUMN_NAME
+            WHERE k.TABLE_NAME = :table AND k.TABLE_SCHEMA = COALESCE(:schema, DATABASE())
+              AND k.CONSTRAINT_NAME = 'PRIMARY'
+        """), params).all()
+        integer_types = {'tinyint', 'smallint', 'mediumint', 'int', 'integer', 'bigint'}
+        if len(pk_columns) == 1 and pk_columns[0][1].lower() in integer_types:
+            pk = quote(pk_columns[0][0])
+            bounds = conn.execute(text(f"SELECT MIN({pk}), MAX({pk}) FROM {source}")).first()
+            if bounds and bounds[0] is not None:
+                # Index seeks at seeded random key positions; each reads a short contiguous run
+                rng = random.Random(seed)
+                ranges = min(PK_RANGE_COUNT, limit)
+                per_range = int(math.ceil(limit / ranges))
+                starts = sorted(rng.randint(int(bounds[0]), int(bounds[1])) for _ in range(ranges))
+                branches = " UNION ALL ".join(
+                    f"(SELECT * FROM {source} WHERE {pk} >= {start} ORDER BY {pk} LIMIT {per_range})"
+                    for start in starts
+                )
+                return SamplingPlan("pk_range", branches, seed, estimated,
+                                    TableSamplingService.sample_percent(limit, estimated),
+                                    dedupe_column=pk_columns[0][0])
+
+        # No integer primary key: a seeded filter still avoids sorting the table
+        percent = TableSamplingService.sample_percent(limit, estimated, 1.2)
+        return SamplingPlan(
+            "rand_filter",
+            f"SELECT * FROM {source} WHERE RAND({seed}) < {percent / 100} LIMIT {limit}",
+            seed, estimated, percent
+        )
+
+    @staticmethod
+    def _plan_sqlserver(conn, quote, source: str, table_name: str, schema_name: Optional[str],
+                        limit: int, seed: int) -> SamplingPlan:
+        qualified = f"{schema_name}.{table_name}" if schema_name else table_name
+        estimated = conn.execute(text("""
+            SELECT SUM(p.rows) FROM sys.partitions p
+            WHERE p.object_id = OBJECT_ID(:name) AND p.index_id IN (0, 1)
+        """), {"name": qualified}).scalar()
+        estimated = int(estimated) if estimated is not None else None
+        if estimated is None or estimated <= SMALL_TABLE_ROWS:
+            # NEWID() cannot be seeded: order by a hash of the primary key (or the row) and the seed
+            pk_columns = [row[0] for row in conn.execute(text("""
+                SELECT c.name FROM sys.indexes i
+                JOIN sys.index_columns ic ON ic.object_id = i.object_id AND ic.index_id = i.index_id
+                JOIN sys.columns c ON c.object_id = ic.object_id AND c.column_id = ic.column_id
+                WHERE i.object_id = OBJECT_ID(:name) AND i.is_primary_key = 1
+                ORDER BY ic.key_ordinal
+            """), {"name": qualified}).all()]
+            row_key = ", '|', ".join(quote(column) for column in pk_columns) if pk_columns else "BINARY_CHECKSUM(*)"
+            return SamplingPlan(
+                "random_order",
+                f"SELECT TOP {limit} * FROM {source} "
+                f"ORDER BY HASHBYTES('SHA2_256', CONCAT({row_key}, '|', {int(seed)}))",
+                seed, estimated
+            )
+        percent = TableSamplingService.sample_percent(limit, estimated, OVERSAMPLE_FACTOR)
+        return SamplingPlan(
+            "tablesample",
+            f"SELECT TOP {limit} * FROM {source} TABLESAMPLE ({percent} PERCENT) REPEATABLE ({seed})",
+            seed, estimated, percent
+        )
+
+    @staticmethod
+    def _plan_oracle(conn, source: str, table_name: str, schema_name: Optional[str],
+                     limit: int, seed: int) -> SamplingPlan:
+        estimated = conn.execute(text("""
+            SELECT num_rows FROM all_tables
+            WHERE table_name = UPPER(:table) AND owner = COALESCE(UPPER(:schema), USER)
+        """), {"table": table_name, "schema": schema_name}).scalar()
+        estimated = int(estimated) if estimated is not None else None
+        if estimated is None or estimated <= SMALL_TABLE_ROWS:
+            return SamplingPlan("random_order",
+                                f"SELECT * FROM {source} ORDER BY DBMS_RANDOM.VALUE FETCH FIRST {limit} ROWS ONLY",
+                                seed, estimated, setup=[("BEGIN DBMS_RANDOM.SEED(:seed); END;", {"seed": seed})])
+        percent = min(TableSamplingService.sample_percent(limit, estimated, OVERSAMPLE_FACTOR), 99.999999)
+        return SamplingPlan(
+            "sample_block",
+            f"SELECT * FROM {source} SAMPLE BLOCK ({percent}) SEED ({seed % 4294967295}) FETCH FIRST {limit} ROWS ONLY",
+            seed, estimated, percent
+        )
+
+    @staticmethod
+    def _iter_mongo_sample(data_source: DataSource, password: Optional[str], collection_name: str,
+                           sample_size: int, seed: int, chunk_size: int, sample_method: str) -> Iterator[pd.DataFrame]:
+        client = MongoClient(f"mongodb://{data_source.username}:{password}@{data_source.host}:{data_source.port}")
+        try:
+            collection = client[data_source.database_name][collection_name]
+            estimated = collection.estimated_document_count()
+            if sample_method == "first":
+                cursor = collection.find({}, batch_size=chunk_size).limit(sample_size)
+                strategy = "first"
+            else:
+                # $sample uses a random cursor (no collection scan) for samples under 5% of the
+                # collection; MongoDB does not accept a seed, so these samples are not reproducible
+                cursor = collection.aggregate([{"$sample": {"size": sample_size}}], batchSize=chunk_size)
+                strategy = "mongo_sample"
+            plan = SamplingPlan(strategy, "", seed, estimated,
+                                TableSamplingService.sample_percent(sample_size, estimated))
+            batch: List[Dict[str, Any]] = []
+            for document in cursor:
+                batch.append(document)
+                if len(batch) >= chunk_size:
+                    chunk = pd.DataFrame(batch)
+                    chunk.attrs["sampling"] = plan.describe()
+                    yield chunk
+                    batch = []
+            if batch:
+                chunk = pd.DataFrame(batch)
+                chunk.attrs["sampling"] = plan.describe()
+                yield chunk
+        finally:
+            client.close()
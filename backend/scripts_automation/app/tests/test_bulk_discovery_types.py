@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy.dialects.mysql.base import MySQLDialect
+from sqlalchemy.dialects.mysql.reflection import MySQLTableDefinitionParser, ReflectedState
+
+from app.services.data_source_connection_service import mysql_type_name
+
+
+def inspector_type_name(column_definition):
+    """The type name the inspector path reports, parsed from a SHOW CREATE TABLE column line"""
+    dialect = MySQLDialect()
+    parser = MySQLTableDefinitionParser(dialect, dialect.identifier_preparer)
+    state = ReflectedState()
+    parser._parse_column(f"  `c` {column_definition} DEFAULT NULL,", state)
+    return str(state.columns[0]["type"])
+
+
+@pytest.mark.parametrize("column_type, collation", [
+    ("int(11)", None), ("int", None), ("bigint(20) unsigned", None), ("tinyint(1)", None),
+    ("smallint unsigned zerofill", None), ("decimal(10,2)", None), ("double", None),
+    ("float(7,3) unsigned", None), ("varchar(255)", None), ("varchar(64)", "utf8mb4_bin"),
+    ("char(36)", None), ("text", None), ("longtext", None), ("datetime", None),
+    ("datetime(3)", None), ("timestamp(6)", None), ("time(2)", None), ("date", None),
+    ("enum('a','b','it''s')", None), ("set('x','y')", None), ("json", None), ("blob", None),
+    ("varbinary(16)", None), ("bit(1)", None), ("year", None),
+])
+def test_mysql_bulk_types_match_inspector(column_type, collation):
+    definition = column_type + (f" COLLATE {collation}" if collation else "")
+    assert mysql_type_name(column_type, collation) == inspector_type_name(definition)
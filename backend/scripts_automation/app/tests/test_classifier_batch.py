@@ -0,0 +1,47 @@
+from app.api.classifiers.regex_classifier import RegexClassifier
+from app.api.classifiers.dictionary_classifier import DictionaryClassifier
+from app.api.classifiers.hybrid_classifier import HybridClassifier
+
+NAMES = ["email", "Customer Email", "customer_email", "iban", "order_total", "api_key", "created_at", "prenom"]
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, names):
+        self.calls += 1
+        return ["PII" if "mail" in name.lower() else "Unclassified" for name in names]
+
+
+def test_batch_matches_single_classification():
+    regex, dictionary = RegexClassifier(cache_size=0), DictionaryClassifier(cache_size=0)
+    assert RegexClassifier().classify_batch(NAMES) == [regex.classify(name) for name in NAMES]
+    assert DictionaryClassifier().classify_batch(NAMES) == [dictionary.classify(name) for name in NAMES]
+
+
+def test_hybrid_batch_predicts_once_and_memoizes():
+    hybrid = HybridClassifier(use_ml=False)
+    hybrid.use_ml, hybrid.ml_model = True, CountingModel()
+
+    results = hybrid.classify_batch_all(NAMES + NAMES)
+    assert hybrid.ml_model.calls == 1
+    assert results[0] == {"regex": ["PII"], "dictionary": ["PII"], "hybrid": ["PII"]}
+    assert results[:len(NAMES)] == results[len(NAMES):]
+
+    hybrid.classify_batch(NAMES)
+    assert hybrid.ml_model.calls == 1
+    assert hybrid.classify("email") == ["PII"]
+
+
+def test_failed_predictions_are_not_cached():
+    hybrid = HybridClassifier(use_ml=False)
+    hybrid.use_ml, hybrid.ml_model = True, CountingModel()
+    hybrid.predict_batch(["email"])
+
+    predict = hybrid.ml_model.predict
+    hybrid.ml_model.predict = lambda names: (_ for _ in ()).throw(RuntimeError("model unavailable"))
+    assert hybrid.predict_batch(["email", "iban"]) == ["PII", None]
+
+    hybrid.ml_model.predict = predict
+    assert hybrid.predict_batch(["email", "iban"]) == ["PII", "Unclassified"]
@@ -0,0 +1,50 @@
+from types import SimpleNamespace
+
+from app.services.condition_compiler import compile_condition, validate_condition
+
+USER = SimpleNamespace(id=7, department="finance", region=None)
+
+
+def test_user_effective_keeps_placeholder_patterns():
+    assert compile_condition('{"user_id": ":current_user_id"}').user_effective(USER, 7) == (True, None)
+    assert compile_condition('{"department": ":user_department"}').user_effective(USER, 7) == (True, None)
+    assert compile_condition('{"region": ":user_region"}').user_effective(USER, 7) == (False, "User has no region")
+    assert compile_condition("{not json").user_effective(USER, 7) == (False, "Invalid condition format")
+    # Compiled once per distinct condition text
+    assert compile_condition('{"region": ":user_region"}') is compile_condition('{"region": ":user_region"}')
+
+
+def test_resource_matching_operators():
+    condition = compile_condition({
+        "schema": "sales_*",
+        "sensitivity": ["public", "internal"],
+        "row_count": {"$op": "lt", "value": 1000},
+        "owner": {"$op": "regex", "value": "^team-"},
+        "department": ":user_department",
+    })
+    resource = {"schema": "sales_eu", "sensitivity": "public", "row_count": 10, "owner": "team-a", "department": "finance"}
+    assert condition.matches(resource, USER)
+    assert not condition.matches(dict(resource, row_count="10"), USER)
+    assert not condition.matches(dict(resource, department="hr"), USER)
+
+
+def test_batch_evaluation_with_composition():
+    condition = compile_condition({
+        "$or": [{"owner_id": ":current_user_id"}, {"meta.public": True}],
+        "$not": {"status": "archived"},
+    })
+    items = [
+        {"owner_id": 7, "status": "active"},
+        {"owner_id": 8, "meta": {"public": True}},
+        {"owner_id": 8, "meta": {"public": False}},
+        SimpleNamespace(owner_id=7, status="archived"),
+    ]
+    assert condition.evaluate_many(items, USER) == [True, True, False, False]
+    assert condition.filter(items, USER) == items[:2]
+
+
+def test_validation_rejects_uncompilable_conditions():
+    assert validate_condition('{"a": {"$op": "between", "value": 1}}') == "Unsupported condition operator: between"
+    assert validate_condition('{"a": {"$op": "regex", "value": "("}}')
+    assert validate_condition("[1, 2]")
+    assert validate_condition(None) is None
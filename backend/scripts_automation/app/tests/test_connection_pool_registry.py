@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from sqlalchemy import text
+
+from app.services.connection_pool_registry import ConnectionPoolRegistry
+
+
+def make_source(source_id=1, pool_size=2, max_overflow=1, pool_timeout=5):
+    return SimpleNamespace(id=source_id, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout)
+
+
+def test_engine_is_reused_per_data_source(tmp_path):
+    registry = ConnectionPoolRegistry()
+    url = f"sqlite:///{tmp_path / 'a.db'}"
+    source = make_source()
+
+    first = registry.get_engine(source, url, credential="secret")
+    second = registry.get_engine(source, url, credential="secret")
+    assert first is second
+
+    with first.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+
+    stats = registry.get_stats(source.id)
+    assert stats["pool_count"] == 1
+    assert stats["pools"][0]["checkouts"] == 2
+
+
+def test_credential_change_evicts_stale_engine(tmp_path):
+    registry = ConnectionPoolRegistry()
+    url = f"sqlite:///{tmp_path / 'b.db'}"
+    source = make_source()
+
+    old = registry.get_engine(source, url, credential="old")
+    new = registry.get_engine(source, url, credential="new")
+    assert old is not new
+    assert registry.get_stats(source.id)["pool_count"] == 1
+
+    assert registry.evict(source.id) == 1
+    assert registry.get_stats(source.id) is None
+
+
+def test_unsaved_data_source_is_not_registered(tmp_path):
+    registry = ConnectionPoolRegistry()
+    engine = registry.get_engine(make_source(source_id=None), f"sqlite:///{tmp_path / 'c.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT 1")).scalar() == 1
+    assert not registry.has_pool(None)
@@ -0,0 +1,67 @@
+import asyncio
+import gc
+import threading
+import time
+
+from app.services.connector_executor import ConnectorExecutor
+
+
+def test_per_source_concurrency_is_bounded():
+    executor = ConnectorExecutor(max_workers=8, per_source_concurrency=2)
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def blocking_call():
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return threading.current_thread().name
+
+    async def run():
+        return await asyncio.gather(*(executor.run("source-1", blocking_call) for _ in range(6)))
+
+    thread_names = asyncio.run(run())
+    executor.shutdown()
+
+    assert state["peak"] == 2
+    assert all(name.startswith("connector-io") for name in thread_names)
+    assert executor.get_stats("source-1")["calls"] == 6
+
+
+def test_failures_are_recorded_and_raised():
+    executor = ConnectorExecutor(max_workers=2)
+
+    def failing_call():
+        raise ValueError("boom")
+
+    async def run():
+        await executor.run("source-2", failing_call)
+
+    try:
+        asyncio.run(run())
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("expected ValueError")
+    finally:
+        executor.shutdown()
+
+    stats = executor.get_stats("source-2")
+    assert stats["failures"] == 1 and stats["in_flight"] == 0
+
+
+def test_semaphores_are_dropped_with_their_loops():
+    executor = ConnectorExecutor(max_workers=2, per_source_concurrency=1)
+
+    async def run():
+        await asyncio.gather(*(executor.run(f"source-{i % 2}", time.sleep, 0.01) for i in range(4)))
+        return len(executor._semaphores)
+
+    for _ in range(3):
+        assert asyncio.run(run()) == 1
+    gc.collect()
+    assert len(executor._semaphores) <= 1
+    executor.shutdown()
@@ -0,0 +1,41 @@
+import random
+import string
+from difflib import SequenceMatcher
+
+from app.api.classifiers.dictionary_classifier import DictionaryClassifier
+
+
+def naive_match(dictionary, name):
+    categories = []
+    for category, keywords in dictionary.normalized_dictionary.items():
+        for keyword in keywords:
+            if keyword in name or SequenceMatcher(None, keyword, name).ratio() > dictionary.similarity_threshold:
+                categories.append(category)
+                break
+    return categories
+
+
+def test_index_matches_naive_scan():
+    dictionary = DictionaryClassifier(cache_size=0)
+    rng = random.Random(7)
+    keywords = [keyword for values in dictionary.normalized_dictionary.values() for keyword in values]
+    names = list(keywords)
+    for _ in range(3000):
+        keyword = rng.choice(keywords)
+        # Typos, prefixes/suffixes and unrelated tokens
+        mutated = list(keyword)
+        for _ in range(rng.randint(0, 3)):
+            position = rng.randrange(len(mutated) + 1)
+            action = rng.random()
+            if action < 0.4:
+                mutated.insert(position, rng.choice(string.ascii_lowercase + "_"))
+            elif mutated and action < 0.7:
+                del mutated[min(position, len(mutated) - 1)]
+            elif mutated:
+                mutated[min(position, len(mutated) - 1)] = rng.choice(string.ascii_lowercase)
+        names.append(rng.choice(["", "customer_", "tbl_"]) + "".join(mutated) + rng.choice(["", "_id", "_2024"]))
+        names.append("".join(rng.choice(string.ascii_lowercase + "_") for _ in range(rng.randint(1, 20))))
+
+    for threshold in (0.8, 0.6):
+        dictionary.similarity_threshold = threshold
+        assert [dictionary.classify(name) for name in names] == [naive_match(dictionary, dictionary.normalize(name)) for name in names]
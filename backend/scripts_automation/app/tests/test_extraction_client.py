@@ -0,0 +1,71 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.services.extraction_client import ExtractionClient
+
+
+def flaky_handler(failures, status=503):
+    calls = []
+
+    def handler(request):
+        calls.append(json.loads(request.content))
+        if len(calls) <= failures:
+            if status is None:
+                raise httpx.ConnectError("connection refused", request=request)
+            return httpx.Response(status)
+        return httpx.Response(200, json={"schemas": {"public": {"tables": {}}}, "db": request.url.path})
+
+    return handler, calls
+
+
+def test_sync_extract_retries_then_decodes():
+    handler, calls = flaky_handler(failures=2)
+    client = ExtractionClient(base_url="http://extractor", backoff=0, transport=httpx.MockTransport(handler))
+    result = client.extract("postgresql", {"host": "db"})
+    assert result == {"schemas": {"public": {"tables": {}}}, "db": "/extract/postgresql"}
+    assert calls == [{"host": "db"}] * 3
+    assert client.client is client.client
+
+
+def test_retries_are_bounded():
+    handler, calls = flaky_handler(failures=10)
+    client = ExtractionClient(base_url="http://extractor", max_retries=2, backoff=0,
+                              transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.HTTPStatusError):
+        client.extract("mysql", {})
+    assert len(calls) == 3
+
+    handler, calls = flaky_handler(failures=1, status=400)
+    client = ExtractionClient(base_url="http://extractor", backoff=0, transport=httpx.MockTransport(handler))
+    with pytest.raises(httpx.HTTPStatusError):
+        client.extract("mysql", {})
+    assert len(calls) == 1
+
+
+def test_async_extract_shares_a_client_and_retries_transport_errors():
+    handler, calls = flaky_handler(failures=1, status=None)
+    client = ExtractionClient(base_url="http://extractor", backoff=0, async_transport=httpx.MockTransport(handler))
+
+    async def scenario():
+        results = await asyncio.gather(*(client.extract_async("mongodb", {"n": i}) for i in range(5)))
+        assert len(client._async_clients) == 1
+        await client.aclose()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(result["db"] == "/extract/mongodb" for result in results)
+    assert len(calls) == 6 and not client._async_clients
+
+
+def test_async_clients_of_closed_loops_are_dropped():
+    handler, _ = flaky_handler(failures=0)
+    client = ExtractionClient(base_url="http://extractor", async_transport=httpx.MockTransport(handler))
+
+    async def scenario():
+        await client.extract_async("postgresql", {})
+        return len(client._async_clients)
+
+    assert [asyncio.run(scenario()) for _ in range(3)] == [1, 1, 1]
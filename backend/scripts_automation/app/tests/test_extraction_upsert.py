@@ -0,0 +1,35 @@
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.models.schema_models import DataTableSchema
+from app.services.data_sensitivity_service import update_all_columns_data_sensitivity
+from app.services.extraction_service import upsert_table_columns
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[DataTableSchema.__table__])
+    return Session(engine)
+
+
+def test_upsert_writes_changed_rows_only():
+    columns = [
+        {"name": "email", "data_type": "VARCHAR", "nullable": True},
+        {"name": "created_at", "data_type": "TIMESTAMP", "nullable": False},
+    ]
+    with make_session() as session:
+        touched = upsert_table_columns(session, "postgresql", "customers", columns)
+        update_all_columns_data_sensitivity(session, column_ids=touched)
+        rows = session.query(DataTableSchema).all()
+        assert sorted(touched) == sorted(row.id for row in rows)
+        # Identical classifier results share a row
+        assert len({(row.column_name, row.categories) for row in rows}) == len(rows)
+        assert {row.datasensitivitylabel for row in rows if row.column_name == "email"} == {"Confidential"}
+
+        assert upsert_table_columns(session, "postgresql", "customers", columns) == []
+
+        columns[0]["data_type"] = "TEXT"
+        touched = upsert_table_columns(session, "postgresql", "customers", columns)
+        email_rows = session.query(DataTableSchema).filter_by(column_name="email").all()
+        assert sorted(touched) == sorted(row.id for row in email_rows)
+        assert {row.data_type for row in email_rows} == {"TEXT"}
+        assert session.query(DataTableSchema).count() == len(rows)
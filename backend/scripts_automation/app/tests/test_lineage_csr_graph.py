@@ -0,0 +1,118 @@
+import random
+
+import networkx as nx
+import numpy as np
+
+from app.services.lineage_csr_graph import CSRLineageGraph
+from app.services.lineage_graph_delta import LineageGraphDelta, apply_lineage_delta, build_lineage_graph
+
+
+def random_delta(node_count=200, edge_count=600, seed=7):
+    rng = random.Random(seed)
+    nodes = [
+        (f"n{i}", {"asset_type": "table", "asset_name": f"n{i}", "metadata": {"business_criticality": rng.random()}})
+        for i in range(node_count)
+    ]
+    edges = [
+        (f"n{rng.randrange(node_count)}", f"n{rng.randrange(node_count)}", f"e{k}",
+         {"confidence": rng.choice([0.5, 0.8, 1.0]), "lineage_type": "table_to_table"})
+        for k in range(edge_count)
+    ]
+    return LineageGraphDelta(nodes=nodes, edges=edges, full=True)
+
+
+def reachable(graph, root, direction, max_depth, min_confidence=0.0):
+    view = nx.MultiDiGraph(
+        (u, v, k, d) for u, v, k, d in graph.edges(keys=True, data=True) if d["confidence"] >= min_confidence
+    )
+    view.add_nodes_from(graph)
+    if direction == "upstream":
+        view = view.reverse()
+    elif direction == "bidirectional":
+        view = view.to_undirected()
+    return nx.single_source_shortest_path_length(view, root, cutoff=max_depth)
+
+
+def test_traversal_matches_networkx():
+    delta = random_delta()
+    graph, csr = build_lineage_graph(delta), CSRLineageGraph.from_delta(delta)
+    rng = random.Random(1)
+    for _ in range(60):
+        root = f"n{rng.randrange(200)}"
+        direction = rng.choice(["downstream", "upstream", "bidirectional"])
+        max_depth, min_confidence = rng.randint(0, 4), rng.choice([0.0, 0.6, 0.9])
+        expected = reachable(graph, root, direction, max_depth, min_confidence)
+
+        traversal = csr.traverse(root, direction, max_depth, min_confidence)
+        distances = {csr.node_ids[i]: int(d) for i, d in zip(traversal.nodes, traversal.distance)}
+        assert distances == expected
+        assert len(traversal.edges) == graph.subgraph(expected).number_of_edges()
+        assert len(traversal.tree_edges) == len(expected) - 1
+
+    assert csr.traverse("missing", "downstream", 3) is None
+
+
+def test_shortest_and_critical_paths():
+    delta = random_delta()
+    graph, csr = build_lineage_graph(delta), CSRLineageGraph.from_delta(delta)
+    lengths = nx.single_source_shortest_path_length(graph, "n0")
+    for target, length in list(lengths.items())[:30]:
+        path = csr.shortest_path("n0", target)
+        assert len(path) - 1 == length and path[0] == "n0" and path[-1] == target
+        assert all(graph.has_edge(a, b) for a, b in zip(path, path[1:]))
+
+    traversal = csr.traverse("n0", "downstream", 10)
+    critical = csr.critical_path(traversal)
+    reached = [node for node in lengths if node != "n0" and lengths[node] <= 10]
+    assert critical[-1] == max(reached, key=lambda node: graph.nodes[node]["metadata"]["business_criticality"])
+
+
+def test_with_delta_is_copy_on_write():
+    delta = random_delta()
+    graph, csr = build_lineage_graph(delta), CSRLineageGraph.from_delta(delta)
+    change = LineageGraphDelta(
+        nodes=[("n1", {"asset_name": "renamed"}), ("new", {"asset_type": "view"})],
+        edges=[("new", "n2", "e0", {"confidence": 1.0})],
+        removed_node_ids={"n3"},
+        removed_edge_ids={"e5"},
+    )
+    updated = csr.with_delta(change)
+    apply_lineage_delta(graph, change)
+
+    assert (updated.number_of_nodes(), updated.number_of_edges()) == (graph.number_of_nodes(), graph.number_of_edges())
+    assert csr.number_of_edges() == 600 and "new" not in csr
+    assert updated.edge_ids_between("new", "n2") == ["e0"]
+    assert updated.node_rows(updated.traverse("n1", "downstream", 0).nodes)[0]["asset_name"] == "renamed"
+    for root in ("n0", "n10", "new"):
+        expected = reachable(graph, root, "bidirectional", 3)
+        assert {updated.node_ids[i] for i in updated.traverse(root, "bidirectional", 3).nodes} == set(expected)
+
+    assert not updated.needs_deletion_scan(LineageGraphDelta(node_count=200, edge_count=graph.number_of_edges()))
+    assert updated.removed_ids({f"n{i}" for i in range(200) if i != 4} | {"new"}, set())[0] == {"n4"}
+
+
+def test_merged_real_time_deltas_match_sequential_application():
+    delta = random_delta()
+    csr = CSRLineageGraph.from_delta(delta)
+    events = [
+        LineageGraphDelta(nodes=[("x", {"asset_type": "view"})], edges=[("x", "n1", "ex1", {"confidence": 1.0})]),
+        LineageGraphDelta(edges=[("n2", "x", "ex2", {"confidence": 0.8})], removed_edge_ids={"e7"}),
+        LineageGraphDelta(removed_node_ids={"x", "n5"}),
+        LineageGraphDelta(nodes=[("x", {"asset_name": "again"})], edges=[("n5", "n6", "e7", {"confidence": 1.0})]),
+        LineageGraphDelta(removed_edge_ids={"ex1"}, edges=[("n8", "n9", "e8", {"confidence": 0.5})]),
+    ]
+    sequential, graph, pending = csr, build_lineage_graph(delta), LineageGraphDelta()
+    for event in events:
+        sequential = sequential.with_delta(event)
+        apply_lineage_delta(graph, event)
+        pending.merge(event)
+    merged = csr.with_delta(pending)
+
+    assert merged.edge_codes.dtype == np.int32
+    for result in (sequential, merged):
+        assert (result.number_of_nodes(), result.number_of_edges()) == (graph.number_of_nodes(), graph.number_of_edges())
+        assert result.removed_ids(set(), set()) == (set(graph.nodes), {key for _, _, key in graph.edges(keys=True)})
+        assert result.edge_ids_between("n5", "n6") == ["e7"] and result.edge_ids_between("n8", "n9") == ["e8"]
+        for root in ("n0", "n5", "x"):
+            expected = reachable(graph, root, "bidirectional", 3)
+            assert {result.node_ids[i] for i in result.traverse(root, "bidirectional", 3).nodes} == set(expected)
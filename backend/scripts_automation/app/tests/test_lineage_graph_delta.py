@@ -0,0 +1,56 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.services.lineage_graph_delta import (
+    LineageGraphDelta, apply_lineage_delta, build_lineage_graph, edge_endpoints,
+    latest_change, needs_deletion_scan, removed_ids,
+)
+
+
+def full_delta():
+    return LineageGraphDelta(
+        nodes=[(n, {"asset_name": n}) for n in ("a", "b", "c")],
+        edges=[("a", "b", "e1", {"confidence": 1.0}), ("b", "c", "e2", {"confidence": 1.0})],
+        node_count=3, edge_count=2, full=True,
+    )
+
+
+def test_edges_are_keyed_by_edge_id_and_updates_move_them():
+    graph = build_lineage_graph(full_delta())
+    assert graph.has_edge("a", "b", key="e1")
+
+    apply_lineage_delta(graph, LineageGraphDelta(
+        nodes=[("a", {"asset_name": "renamed"})],
+        edges=[("a", "c", "e1", {"confidence": 0.5})],
+    ))
+    assert graph.nodes["a"] == {"asset_name": "renamed"}
+    assert not graph.has_edge("a", "b")
+    assert graph["a"]["c"]["e1"] == {"confidence": 0.5, "edge_id": "e1"}
+    assert graph.number_of_edges() == 2
+
+
+def test_deletions_are_detected_from_counts_then_ids():
+    graph = build_lineage_graph(full_delta())
+    unchanged = LineageGraphDelta(node_count=3, edge_count=2)
+    assert not needs_deletion_scan(graph, unchanged)
+
+    # "c" (and its edge e2) deleted, "d" added: node count still matches, edge count does not
+    delta = LineageGraphDelta(nodes=[("d", {})], node_count=3, edge_count=1)
+    assert needs_deletion_scan(graph, delta)
+    delta.removed_node_ids, delta.removed_edge_ids = removed_ids(graph, {"a", "b", "d"}, {"e1"})
+    assert delta.removed_node_ids == {"c"} and delta.removed_edge_ids == {"e2"}
+
+    apply_lineage_delta(graph, delta)
+    assert set(graph.nodes) == {"a", "b", "d"}
+    assert set(edge_endpoints(graph)) == {"e1"}
+    assert not needs_deletion_scan(graph, LineageGraphDelta(node_count=3, edge_count=1))
+
+
+def test_watermark_is_the_latest_change():
+    rows = [
+        SimpleNamespace(created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 3)),
+        SimpleNamespace(created_at=datetime(2025, 1, 2), updated_at=None),
+    ]
+    assert latest_change(rows) == datetime(2025, 1, 3)
+    assert latest_change(rows, datetime(2025, 2, 1)) == datetime(2025, 2, 1)
+    assert latest_change([], None) is None
@@ -0,0 +1,48 @@
+from app.services.lineage_graph_index import LineageGraphIndex
+
+
+def node(node_id, node_type="table"):
+    return {"id": node_id, "label": node_id, "type": node_type, "properties": {}}
+
+
+def edge(source, target, label="contains"):
+    return {"source": source, "target": target, "label": label, "properties": {}}
+
+
+def source_graph(source_id, tables):
+    source = f"source_{source_id}"
+    schema = f"schema_{source_id}_public"
+    nodes = [node(source, "data_source"), node(schema, "schema")] + [node(f"table_{source_id}_{t}") for t in tables]
+    edges = [edge(source, schema)] + [edge(schema, f"table_{source_id}_{t}") for t in tables] * 2
+    return {"nodes": nodes, "edges": edges}
+
+
+def test_bfs_is_deduplicated_and_depth_limited():
+    index = LineageGraphIndex()
+    info = source_graph(1, ["a", "b"])
+    info["edges"] += [edge("table_1_a", "table_1_b", "references"), edge("table_1_b", "table_1_missing", "references")]
+    index.replace_source(1, info)
+
+    lineage = index.get_lineage("table", "table_1_b", depth=5)
+    assert lineage["upstream_count"] == 3  # schema, table_1_a, source (each once)
+    assert lineage["downstream_count"] == 0  # edges to unscanned tables are ignored
+    assert {n["id"] for n in lineage["nodes"]} == {"table_1_b", "table_1_a", "schema_1_public", "source_1"}
+    assert len(lineage["edges"]) == 4  # duplicate contains edges collapsed
+
+    assert index.get_lineage("table", "table_1_b", depth=1)["upstream_count"] == 2
+    assert index.get_lineage("schema", "table_1_b", depth=1) is None
+
+
+def test_replacing_a_source_only_touches_its_partition():
+    index = LineageGraphIndex()
+    index.replace_source(1, source_graph(1, ["a", "b"]), version=1)
+    index.replace_source(2, source_graph(2, ["c"]), version=1)
+
+    index.replace_source(1, source_graph(1, ["a"]), version=2)
+    assert "table_1_b" not in index.nodes
+    assert index.get_lineage("schema", "schema_1_public", depth=1)["downstream_count"] == 1
+    assert index.get_lineage("table", "table_2_c", depth=2)["upstream_count"] == 2
+
+    index.remove_source(2)
+    assert "table_2_c" not in index.nodes and "schema_2_public" not in index.out_edges
+    assert index.versions == {1: 2}
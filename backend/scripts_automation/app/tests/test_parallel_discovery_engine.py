@@ -0,0 +1,45 @@
+import asyncio
+
+from app.services.parallel_discovery_engine import ParallelDiscoveryEngine
+
+
+def test_gather_ordered_bounds_in_flight_and_keeps_order():
+    engine = ParallelDiscoveryEngine(max_in_flight=3)
+    state = {"running": 0, "peak": 0}
+
+    async def discover(unit):
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        # Later units finish first so completion order differs from input order
+        await asyncio.sleep(0.001 * (10 - unit))
+        state["running"] -= 1
+        return unit * 10
+
+    results = asyncio.run(engine.gather_ordered(discover, range(10)))
+
+    assert results == [unit * 10 for unit in range(10)]
+    assert state["peak"] == 3
+
+
+def test_failure_cancels_remaining_units():
+    engine = ParallelDiscoveryEngine(max_in_flight=4)
+    cancelled = []
+
+    async def discover(unit):
+        if unit == 0:
+            raise RuntimeError("schema unavailable")
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(unit)
+            raise
+        return unit
+
+    try:
+        asyncio.run(engine.gather_ordered(discover, range(8)))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("expected RuntimeError")
+
+    assert sorted(cancelled) == [1, 2, 3]
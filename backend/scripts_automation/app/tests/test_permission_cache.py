@@ -0,0 +1,42 @@
+from app.services.permission_cache import PermissionCache, compute_role_closure
+
+
+def test_role_closure_is_transitive_and_tolerates_cycles():
+    # (child_role_id, parent_role_id)
+    closure = compute_role_closure([(1, 2), (2, 3), (3, 2), (4, 1)])
+    assert closure[1] == {1, 2, 3}
+    assert closure[4] == {1, 2, 3, 4}
+    assert closure[3] == {2, 3}
+    assert 5 not in closure
+
+
+def test_bump_invalidates_users_tokens_and_closure():
+    cache = PermissionCache()
+    loads = []
+    load_edges = lambda: loads.append(1) or [(1, 2)]
+
+    cache.role_closure(load_edges)
+    cache.role_closure(load_edges)
+    assert len(loads) == 1
+
+    version = cache.version
+    cache.set_user(7, ([], frozenset({"scan.view"})), version)
+    cache.set_token("token", {"id": 7}, version)
+    assert cache.get_user(7)[1] == {"scan.view"}
+    assert cache.get_token("token") == {"id": 7}
+
+    cache.bump()
+    assert cache.get_user(7) is None and cache.get_token("token") is None
+    cache.role_closure(load_edges)
+    assert len(loads) == 2
+
+    # A value computed before an invalidation must not be stored afterwards
+    cache.set_user(7, ([], frozenset()), version)
+    assert cache.get_user(7) is None
+
+
+def test_token_cache_is_bounded():
+    cache = PermissionCache(session_cache_size=2)
+    for token in ("a", "b", "c"):
+        cache.set_token(token, {"id": token}, cache.version)
+    assert cache.get_token("a") is None and cache.get_token("c") == {"id": "c"}
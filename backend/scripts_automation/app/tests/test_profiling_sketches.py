@@ -0,0 +1,58 @@
+import json
+
+import numpy as np
+import pandas as pd
+
+from app.services.profiling_sketches import HyperLogLog, TableSketchProfile, hash_values
+
+
+def make_frame(rows=20000, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "amount": rng.normal(100, 15, rows),
+        "customer_id": rng.integers(0, 5000, rows),
+        "country": pd.Series(rng.zipf(1.5, rows).clip(max=200)).map(lambda value: f"c{value}"),
+    })
+    frame["score"] = frame["amount"] * 2 + rng.normal(0, 5, rows)
+    frame.loc[::10, "amount"] = np.nan
+    return frame
+
+
+def test_hll_estimate_is_close_and_dtype_stable():
+    sketch = HyperLogLog()
+    sketch.add_hashes(hash_values(pd.Series(np.arange(50000))))
+    # Same values arriving as floats (e.g. a chunk with nulls) must not be counted again
+    sketch.add_hashes(hash_values(pd.Series(np.arange(50000, dtype=float))))
+    assert abs(sketch.estimate() / 50000 - 1) < 0.03
+
+
+def test_chunked_and_merged_profiles_match_exact_statistics():
+    frame = make_frame()
+    halves = [frame.iloc[:12000], frame.iloc[12000:]]
+    workers = [TableSketchProfile().update_many([half.iloc[:3000], half.iloc[3000:]]) for half in halves]
+    merged = workers[0].merge(workers[1])
+    # Round-trip through JSON as persisted state would be
+    restored = TableSketchProfile.from_dict(json.loads(json.dumps(merged.to_dict())))
+    profile = restored.to_profile()
+
+    amount = profile["columns"]["amount"]
+    assert profile["row_count"] == len(frame)
+    assert amount["null_count"] == int(frame["amount"].isna().sum())
+    assert abs(amount["mean"] - frame["amount"].mean()) < 1e-9
+    assert abs(amount["std_dev"] - frame["amount"].std()) < 1e-9
+    assert abs(amount["quartiles"]["25%"] - frame["amount"].quantile(0.25)) < 0.5
+
+    assert abs(profile["columns"]["customer_id"]["distinct_estimate"] / frame["customer_id"].nunique() - 1) < 0.03
+
+    exact_top = frame["country"].value_counts().head(3)
+    top = profile["columns"]["country"]["top_values"][:3]
+    assert [item["value"] for item in top] == list(exact_top.index)
+
+    assert profile["correlations"]["amount"]["score"] == round(frame[["amount", "score"]].corr().iloc[0, 1], 2)
+
+
+def test_columns_missing_from_a_chunk_count_as_nulls():
+    first = pd.DataFrame({"a": [1, 2]})
+    second = pd.DataFrame({"a": [3], "b": ["x"]})
+    profile = TableSketchProfile().update(first).update(second).to_profile()
+    assert profile["columns"]["b"]["null_count"] == 2
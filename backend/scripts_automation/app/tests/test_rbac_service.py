@@ -0,0 +1,55 @@
+import pytest
+
+from app.services import rbac_service
+from app.services.rbac_service import filter_resources_by_permission
+
+USER = {"id": 7, "department": "finance"}
+ITEMS = [
+    {"id": 1, "department": "finance", "classification": "public"},
+    {"id": 2, "department": "finance", "classification": "restricted"},
+    {"id": 3, "department": "sales", "classification": "public"},
+]
+
+
+def perm(conditions=None, action="scan.view", resource="catalog"):
+    return {"action": action, "resource": resource, "conditions": conditions, "is_effective": True}
+
+
+@pytest.fixture
+def rbac(monkeypatch):
+    state = {"perms": [], "denies": []}
+    monkeypatch.setattr(rbac_service, "_get_cached_user_permissions", lambda db, user_id: (state["perms"], frozenset()))
+    monkeypatch.setattr(rbac_service, "get_deny_conditions", lambda db, user_id, action, resource: state["denies"])
+    return state
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+def test_allow_and_conditions(rbac):
+    assert filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS) == []
+
+    rbac["perms"] = [perm('{"department": ":user_department"}'), perm(None, resource="scan")]
+    assert ids(filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS)) == [1, 2]
+
+    rbac["perms"].append(perm('{"department": "sales"}'))
+    assert ids(filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS)) == [1, 2, 3]
+
+    rbac["perms"] = [perm(None)]
+    assert ids(filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS)) == [1, 2, 3]
+
+
+def test_denies_override_grants(rbac):
+    rbac["perms"] = [perm(None)]
+    rbac["denies"] = ['{"classification": "restricted"}', "{not json"]
+    assert ids(filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS)) == [1, 3]
+
+    rbac["perms"] = [perm('{"department": "finance"}')]
+    assert ids(filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS)) == [1]
+
+    rbac["perms"] = []
+    assert ids(filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS, granted=True)) == [1, 3]
+
+    rbac["denies"].append(None)
+    assert filter_resources_by_permission(None, USER, "scan.view", "catalog", ITEMS, granted=True) == []
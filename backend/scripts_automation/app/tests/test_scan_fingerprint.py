@@ -0,0 +1,132 @@
+import copy
+from types import SimpleNamespace
+
+from app.services.scan_fingerprint import (
+    MONGODB_LAYOUT, RELATIONAL_LAYOUT, diff_fingerprints, fingerprint_metadata, row_count_drift,
+    schema_fingerprint, splice_schema, stale_tables, tree_from_tables, with_row_estimates, with_schemas,
+)
+
+
+def metadata():
+    return {"schemas": {
+        "sales": {"tables": {
+            "orders": {"columns": {"id": {"data_type": "int", "nullable": False},
+                                   "total": {"data_type": "numeric", "nullable": True, "sample": [1, 2]}},
+                       "metadata": {"row_count": 10}},
+            "customers": {"columns": {"id": {"data_type": "int"}}, "metadata": {"row_count": 3}},
+        }},
+        "hr": {"tables": {"staff": {"columns": {"id": {"data_type": "int"}}}}},
+    }}
+
+
+def test_hashes_ignore_statistics_and_order_but_not_definitions():
+    base = fingerprint_metadata(metadata(), RELATIONAL_LAYOUT)
+    changed = metadata()
+    changed["schemas"]["sales"]["tables"]["orders"]["columns"]["total"]["sample"] = [3]
+    changed["schemas"]["sales"]["tables"]["orders"]["metadata"]["row_count"] = 11
+    assert fingerprint_metadata(changed, RELATIONAL_LAYOUT)["hash"] == base["hash"]
+
+    changed["schemas"]["sales"]["tables"]["orders"]["columns"]["total"]["nullable"] = False
+    current = fingerprint_metadata(changed, RELATIONAL_LAYOUT)
+    assert current["hash"] != base["hash"]
+    assert current["schemas"]["hr"] == base["schemas"]["hr"]
+    assert current["schemas"]["sales"]["tables"]["customers"] == base["schemas"]["sales"]["tables"]["customers"]
+
+    # Per-table fingerprints of full scan results rebuild the same tree
+    rows = [SimpleNamespace(schema_name=s, table_name=t, fingerprint=node)
+            for s, schema in base["schemas"].items() for t, node in schema["tables"].items()]
+    assert tree_from_tables(rows, RELATIONAL_LAYOUT) == base
+
+
+def test_only_tables_with_moved_markers_are_stale():
+    markers = {"sales": {"orders": "m1", "customers": "m2"}, "hr": {"staff": "m3"}}
+    base = fingerprint_metadata(metadata(), RELATIONAL_LAYOUT, markers)
+    assert stale_tables(base, markers, RELATIONAL_LAYOUT) == {"sales": set(), "hr": set()}
+
+    probed = copy.deepcopy(markers)
+    probed["sales"]["orders"] = "m1b"
+    probed["sales"]["returns"] = "m5"
+    probed["finance"] = {"ledger": "m4"}
+    probed["hr"] = None  # probe unavailable
+    assert stale_tables(base, probed, RELATIONAL_LAYOUT) == {
+        "sales": {"orders", "returns"}, "finance": None, "hr": None,
+    }
+
+
+def test_splice_keeps_unchanged_tables_from_the_base():
+    markers = {"sales": {"orders": "m1", "customers": "m2"}}
+    base = fingerprint_metadata(metadata(), RELATIONAL_LAYOUT, markers)
+    sales = metadata()["schemas"]["sales"]
+    orders = sales["tables"]["orders"]
+    orders["columns"]["note"] = {"data_type": "text"}
+    extracted = schema_fingerprint({"tables": {"orders": orders}}, RELATIONAL_LAYOUT, {"orders": "m1b"})
+
+    spliced = splice_schema(base["schemas"]["sales"], extracted, {"orders": "m1b", "customers": "m2"},
+                            {"orders"}, RELATIONAL_LAYOUT)
+    assert spliced == schema_fingerprint(sales, RELATIONAL_LAYOUT, {"orders": "m1b", "customers": "m2"})
+
+    # Tables the probe no longer lists are dropped
+    dropped = splice_schema(base["schemas"]["sales"], None, {"orders": "m1"}, set(), RELATIONAL_LAYOUT)
+    assert set(dropped["tables"]) == {"orders"}
+
+
+def test_row_estimates_drift_without_changing_hashes():
+    base = fingerprint_metadata(metadata(), RELATIONAL_LAYOUT)
+    with_row_estimates(base["schemas"]["sales"], {"orders": 10, "customers": 3}, RELATIONAL_LAYOUT)
+    current = {"sales": with_row_estimates(
+        schema_fingerprint(metadata()["schemas"]["sales"], RELATIONAL_LAYOUT),
+        {"orders": 25, "customers": 3}, RELATIONAL_LAYOUT,
+    )}
+    assert current["sales"]["hash"] == base["schemas"]["sales"]["hash"]
+    assert row_count_drift(base, current, RELATIONAL_LAYOUT) == [
+        {"schema": "sales", "table": "orders", "previous": 10, "current": 25},
+    ]
+
+
+def test_diff_reports_changes_of_refetched_schemas():
+    base = fingerprint_metadata(metadata(), RELATIONAL_LAYOUT)
+    sales = metadata()["schemas"]["sales"]
+    orders = sales["tables"]["orders"]
+    orders["columns"]["total"]["data_type"] = "float"
+    orders["columns"]["note"] = {"data_type": "text"}
+    del orders["columns"]["id"]
+    orders["metadata"]["row_count"] = 12
+    del sales["tables"]["customers"]
+    extracted = {"schemas": {"sales": sales}}
+
+    current = {"sales": schema_fingerprint(sales, RELATIONAL_LAYOUT)}
+    changes = diff_fingerprints(base, extracted, current, {"hr"}, RELATIONAL_LAYOUT)
+    assert changes == {"schemas": [
+        {"name": "sales", "tables": [
+            {"name": "orders", "row_count": 12, "previous_row_count": 10, "columns": [
+                {"name": "total", "data_type": "float", "nullable": True, "sample": [1, 2], "change_type": "modified"},
+                {"name": "note", "data_type": "text"},
+                {"name": "id", "change_type": "deleted"},
+            ]},
+            {"name": "customers", "change_type": "deleted"},
+        ]},
+        {"name": "hr", "change_type": "deleted"},
+    ]}
+
+    merged = with_schemas(base, current, {"hr"}, RELATIONAL_LAYOUT)
+    assert set(merged["schemas"]) == {"sales"}
+    assert diff_fingerprints(merged, extracted, current, set(), RELATIONAL_LAYOUT) == {"schemas": []}
+
+
+def test_mongodb_layout_and_nested_fields():
+    def database(nested):
+        return {"name": "app", "collections": [
+            {"name": "users", "document_count": 5,
+             "fields": [{"name": "profile", "data_type": "object", "is_nested": True, "nested_fields": nested}]},
+        ]}
+
+    nested = [{"name": "age", "data_type": "int"}, {"name": "email", "data_type": "string"}]
+    base = fingerprint_metadata({"databases": [database(nested)]}, MONGODB_LAYOUT)
+    reordered = schema_fingerprint(database(nested[::-1]), MONGODB_LAYOUT)
+    assert reordered == base["databases"]["app"]
+
+    changed = database([{"name": "age", "data_type": "string"}])
+    current = {"app": schema_fingerprint(changed, MONGODB_LAYOUT)}
+    changes = diff_fingerprints(base, {"databases": [changed]}, current, set(), MONGODB_LAYOUT)
+    field = changes["databases"][0]["collections"][0]["fields"][0]
+    assert (field["name"], field["change_type"]) == ("profile", "modified")
@@ -0,0 +1,66 @@
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from sqlmodel import Session, SQLModel, create_engine
+from sqlmodel.pool import StaticPool
+
+from app.models.scan_models import ScanJob, ScanJobStatus
+from app.services.scan_job_queue import ScanJobQueue, pick_claimable, retry_delay
+
+
+@pytest.fixture(name="session")
+def session_fixture():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+
+
+def test_pick_claimable_respects_order_and_data_source_limits():
+    jobs = [SimpleNamespace(id=i, data_source_id=ds) for i, ds in enumerate([1, 1, 1, 2, 3])]
+    picked = pick_claimable(jobs, {2: 2}, per_source_limit=2, limit=10)
+    assert [job.id for job in picked] == [0, 1, 4]
+    assert [job.id for job in pick_claimable(jobs, {}, per_source_limit=2, limit=2)] == [0, 1]
+
+
+def test_retry_delay_backs_off_up_to_the_cap():
+    assert 7.5 <= retry_delay(1, backoff=10, maximum=100) <= 10
+    assert 30 <= retry_delay(3, backoff=10, maximum=100) <= 40
+    assert retry_delay(10, backoff=10, maximum=100) <= 100
+
+
+def test_claim_priorities_leases_and_retries(session):
+    low = ScanJobQueue.enqueue(session, scan_id=1, data_source_id=1, priority=0, max_attempts=2)
+    high = ScanJobQueue.enqueue(session, scan_id=2, data_source_id=1, priority=10, max_attempts=2)
+    assert ScanJobQueue.enqueue(session, scan_id=1, data_source_id=1).id == low.id
+
+    [claimed] = ScanJobQueue.claim(session, "w1", limit=5, per_source_limit=1)
+    assert claimed.id == high.id and claimed.attempts == 1 and claimed.lease_owner == "w1"
+    assert ScanJobQueue.claim(session, "w2", limit=5, per_source_limit=1) == []
+    assert ScanJobQueue.heartbeat(session, high.id, "w1")
+    assert not ScanJobQueue.heartbeat(session, high.id, "w2")
+
+    assert ScanJobQueue.fail(session, claimed, "w1", "boom")
+    session.refresh(claimed)
+    assert claimed.status == ScanJobStatus.QUEUED and claimed.run_after > datetime.utcnow()
+
+    # The low priority job runs while the failed one waits out its backoff
+    [claimed] = ScanJobQueue.claim(session, "w2", limit=5, per_source_limit=1)
+    assert claimed.id == low.id
+    assert ScanJobQueue.complete(session, low.id, "w2")
+
+
+def test_expired_leases_are_requeued_then_failed(session):
+    job = ScanJobQueue.enqueue(session, scan_id=1, data_source_id=1, max_attempts=2)
+    for attempt in (1, 2):
+        [claimed] = ScanJobQueue.claim(session, "w1", lease_seconds=-1)
+        assert claimed.attempts == attempt
+        requeued, failed = ScanJobQueue.requeue_expired(session)
+        assert [j.id for j in requeued + failed] == [job.id]
+        job.run_after = datetime.utcnow() - timedelta(seconds=1)
+        session.add(job)
+        session.commit()
+    assert requeued == [] and [j.id for j in failed] == [job.id]
+    session.refresh(job)
+    assert job.status == ScanJobStatus.FAILED and "expired" in job.last_error
@@ -0,0 +1,101 @@
+import json
+from datetime import datetime
+
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models.scan_models import ScanResult
+from app.services.scan_result_writer import COPY_COLUMNS, JSON_COLUMNS, ScanResultWriter, iter_scan_result_rows
+
+
+def metadata():
+    return {"schemas": {
+        "sales": {"tables": {
+            "orders": {"columns": {"id": {"data_type": "int", "nullable": False},
+                                   "note": {"data_type": "text", "nullable": True}},
+                       "metadata": {"row_count": 10}},
+            "customers": {"columns": {"id": {"data_type": "int", "nullable": False}}},
+        }},
+        "hr": {"tables": {"staff": {"columns": {"name": {"data_type": "varchar", "nullable": True}}}}},
+    }}
+
+
+def test_core_inserts_write_scan_result_rows_in_chunks():
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine, tables=[ScanResult.__table__])
+    progress = []
+    with Session(engine) as session:
+        writer = ScanResultWriter(session, chunk_size=3, method="auto", on_progress=progress.append)
+        assert writer.method == "insert"
+        writer.write(iter_scan_result_rows(7, metadata(), "postgresql"))
+        assert writer.close() == 7
+        session.commit()
+
+        assert progress == [3, 6, 7]
+        assert writer.summary() == {"tables": 3, "columns": 4, "schemas": {
+            "sales": {"tables": 2, "columns": 3}, "hr": {"tables": 1, "columns": 1},
+        }}
+        results = session.exec(select(ScanResult).order_by(ScanResult.id)).all()
+        assert len(results) == 7 and {result.scan_id for result in results} == {7}
+        orders = results[0]
+        assert (orders.schema_name, orders.table_name, orders.column_name) == ("sales", "orders", None)
+        assert orders.scan_metadata == {"row_count": 10} and set(orders.fingerprint) >= {"hash", "columns"}
+        assert isinstance(orders.created_at, datetime)
+        note = next(result for result in results if result.column_name == "note")
+        assert (note.data_type, note.nullable) == ("text", True)
+        assert note.scan_metadata == {"data_type": "text", "nullable": True}
+
+
+def unescape(field):
+    """Inverse of COPY text format escaping"""
+    if field == "\\N":
+        return None
+    escapes = {"\\": "\\", "t": "\t", "n": "\n", "r": "\r"}
+    value, chars = [], iter(field)
+    for char in chars:
+        value.append(escapes[next(chars)] if char == "\\" else char)
+    return "".join(value)
+
+
+class CopyCursor:
+    def __init__(self):
+        self.statement, self.data = None, None
+
+    def copy_expert(self, statement, data):
+        self.statement, self.data = statement, data.read()
+
+    def close(self):
+        pass
+
+
+def test_copy_text_format_escapes_special_characters():
+    cursor = CopyCursor()
+
+    class Connection:
+        class connection:
+            class driver_connection:
+                cursor = staticmethod(lambda: cursor)
+
+    now = datetime(2025, 10, 16, 12, 0)
+    rows = [
+        {"scan_id": 1, "schema_name": "we\tird", "table_name": "line\nbreak\r", "column_name": "back\\slash",
+         "object_type": "table", "data_type": None, "nullable": False,
+         "scan_metadata": {"comment": "tab\there \\N", "nested": [1, None]}, "fingerprint": None,
+         "created_at": now, "updated_at": now},
+        {"scan_id": 1, "schema_name": "plain", "table_name": "t", "column_name": None, "object_type": "table",
+         "data_type": "int", "nullable": True, "scan_metadata": {}, "fingerprint": {"hash": "abc"},
+         "created_at": now, "updated_at": now},
+    ]
+    ScanResultWriter._copy(Connection(), rows)
+
+    assert cursor.statement.startswith(f"COPY {ScanResult.__tablename__} ({', '.join(COPY_COLUMNS)}) FROM STDIN")
+    lines = cursor.data.split("\n")
+    assert lines[-1] == "" and len(lines) == len(rows) + 1
+    for line, row in zip(lines, rows):
+        fields = dict(zip(COPY_COLUMNS, (unescape(field) for field in line.split("\t"))))
+        assert len(fields) == len(COPY_COLUMNS)
+        for column in ("schema_name", "table_name", "column_name", "data_type"):
+            assert fields[column] == row[column]
+        for column in JSON_COLUMNS:
+            assert (json.loads(fields[column]) if fields[column] is not None else None) == row[column]
+        assert fields["nullable"] == ("t" if row["nullable"] else "f")
+        assert fields["created_at"] == str(now)
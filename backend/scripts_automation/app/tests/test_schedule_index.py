@@ -0,0 +1,43 @@
+import random
+
+from app.services.schedule_index import IndexedHeap, TimeBucketIndex
+
+
+def test_indexed_heap_matches_a_sorted_reference_under_updates_and_removals():
+    rng = random.Random(7)
+    heap, reference = IndexedHeap(), {}
+    for step in range(3000):
+        item = f"s{rng.randrange(300)}"
+        if item in reference and rng.random() < 0.3:
+            assert heap.remove(item)
+            del reference[item]
+        else:
+            key = (rng.uniform(0, 1000), rng.randrange(1, 6))
+            heap.push(item, key)
+            reference[item] = key
+        assert len(heap) == len(reference)
+        if reference and step % 50 == 0:
+            assert heap.peek() == min((key, item) for item, key in reference.items())
+    assert not heap.remove("missing")
+    popped = [heap.pop() for _ in range(len(heap))]
+    assert popped == sorted((key, item) for item, key in reference.items())
+
+
+def test_time_bucket_window_counts_exactly_at_bucket_edges():
+    index = TimeBucketIndex(bucket_seconds=60)
+    rng = random.Random(3)
+    items = {}
+    for i in range(500):
+        items[i] = (rng.uniform(0, 6000), rng.randrange(5, 90))
+        index.add(i, *items[i])
+    for i in range(0, 500, 3):
+        items[i] = (rng.uniform(0, 6000), items[i][1])
+        index.add(i, *items[i])
+    for i in range(1, 500, 7):
+        index.remove(i)
+        del items[i]
+
+    for start, end in [(0, 6000), (59.5, 60.5), (1234.5, 3600), (5999, 100000), (10, 5)]:
+        expected = [weight for timestamp, weight in items.values() if start <= timestamp <= end]
+        count, weight = index.window(start, end)
+        assert (count, weight) == (len(expected), sum(expected))
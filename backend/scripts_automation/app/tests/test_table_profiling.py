@@ -0,0 +1,37 @@
+from app.services.data_source_connection_service import (
+    assemble_column_profiles, postgres_profile_columns, profile_aggregates,
+)
+
+
+def quote(name):
+    return f'"{name}"'
+
+
+def test_postgres_profile_skips_min_max_for_types_without_them():
+    selected = [("id", "uuid"), ("payload", "jsonb"), ("raw", "bytea"), ("tags", "ARRAY"),
+                ("name", "character varying"), ("doc", "json"), ("created", "timestamp without time zone")]
+    columns = postgres_profile_columns(selected, quote)
+    assert columns == [
+        ('"id"', False), ('"payload"', False), ('"raw"', False), ('"tags"::text', False),
+        ('"name"', True), ('"doc"::text', True), ('"created"', True),
+    ]
+
+    sql = ", ".join(profile_aggregates(columns, estimated={}))
+    assert 'MIN("id")' not in sql and 'MAX("payload")' not in sql and 'MIN("raw")' not in sql
+    assert 'COUNT(DISTINCT "id") AS c0_distinct' in sql
+    assert 'MIN("name") AS c4_min' in sql and 'MAX("doc"::text) AS c5_max' in sql
+
+
+def test_profiles_without_min_max_report_none():
+    columns = postgres_profile_columns([("id", "uuid"), ("n", "integer")], quote)
+    assert profile_aggregates(columns, estimated={0: 10}) == [
+        "COUNT(*) AS total_rows",
+        'COUNT("id") AS c0_non_null',
+        'COUNT("n") AS c1_non_null', 'COUNT(DISTINCT "n") AS c1_distinct',
+        'MIN("n") AS c1_min', 'MAX("n") AS c1_max',
+    ]
+    stats = {"total_rows": 4, "c0_non_null": 4, "c1_non_null": 3, "c1_distinct": 2, "c1_min": 1, "c1_max": 5}
+    profiles = assemble_column_profiles(["id", "n"], stats, [], {0: 10})
+    assert profiles["id"]["statistics"]["min_value"] is None
+    assert profiles["id"]["statistics"]["unique_values"] == 10
+    assert profiles["n"]["statistics"]["max_value"] == 5
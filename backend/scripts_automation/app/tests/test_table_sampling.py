@@ -0,0 +1,152 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.dialects import mssql, mysql, oracle, postgresql
+
+from app.models.scan_models import DataSourceType
+from app.services import table_sampling_service
+from app.services.table_sampling_service import (
+    BLOCK_SAMPLING_ROWS, SMALL_TABLE_ROWS, SamplingPlan, TableSamplingService,
+)
+
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def first(self):
+        return self.rows[0] if self.rows else None
+
+    def scalar(self):
+        return self.rows[0][0] if self.rows else None
+
+    def all(self):
+        return self.rows
+
+
+class FakeConnection:
+    """Answers catalog queries with the rows of the first scripted fragment found in the SQL"""
+
+    def __init__(self, dialect, script):
+        self.dialect = dialect
+        self.script = script
+        self.executed = []
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.executed.append((sql, params))
+        for fragment, rows in self.script.items():
+            if fragment in sql:
+                return FakeResult(rows)
+        return FakeResult([])
+
+
+def plan(dialect, source_type, script, seed=42, sample_size=1000):
+    conn = FakeConnection(dialect, script)
+    return TableSamplingService.plan_sql_sample(conn, source_type, "orders", "sales", sample_size, seed)
+
+
+@pytest.mark.parametrize("reltuples, strategy", [
+    (SMALL_TABLE_ROWS, "random_order"),
+    (SMALL_TABLE_ROWS + 1, "tablesample_bernoulli"),
+    (BLOCK_SAMPLING_ROWS + 1, "tablesample_system"),
+])
+def test_postgresql_plan_follows_the_size_estimate(reltuples, strategy):
+    sample = plan(postgresql.dialect(), DataSourceType.POSTGRESQL, {"pg_class": [(reltuples, 0)]})
+    assert sample.strategy == strategy and sample.estimated_rows == reltuples
+    if strategy == "random_order":
+        assert sample.setup == [("SELECT setseed(:seed)", {"seed": 42 / 2 ** 31})]
+    else:
+        assert "REPEATABLE (42)" in sample.query and not sample.setup
+
+
+def test_never_analyzed_postgresql_table_is_estimated_from_its_size():
+    sample = plan(postgresql.dialect(), DataSourceType.POSTGRESQL, {"pg_class": [(-1, 100 * 10 ** 6)]})
+    assert sample.estimated_rows == 10 ** 6 and sample.strategy == "tablesample_bernoulli"
+
+
+def test_small_table_plans_are_seeded_on_every_dialect():
+    oracle_plan = plan(oracle.dialect(), DataSourceType.ORACLE, {"all_tables": [(10,)]}, seed=7)
+    assert oracle_plan.setup == [("BEGIN DBMS_RANDOM.SEED(:seed); END;", {"seed": 7})]
+
+    mssql_script = {"sys.partitions": [(10,)], "is_primary_key": [("id",), ("line",)]}
+    mssql_plan = plan(mssql.dialect(), DataSourceType.SQLSERVER, mssql_script, seed=7)
+    assert "NEWID" not in mssql_plan.query
+    assert "ORDER BY HASHBYTES('SHA2_256', CONCAT(id, '|', line, '|', 7))" in mssql_plan.query
+    assert plan(mssql.dialect(), DataSourceType.SQLSERVER, mssql_script, seed=8).query != mssql_plan.query
+
+    no_pk = plan(mssql.dialect(), DataSourceType.SQLSERVER, {"sys.partitions": [(10,)]}, seed=7)
+    assert "CONCAT(BINARY_CHECKSUM(*), '|', 7)" in no_pk.query
+
+    mysql_plan = plan(mysql.dialect(), DataSourceType.MYSQL, {"information_schema.TABLES": [(10,)]}, seed=7)
+    assert mysql_plan.query.endswith("ORDER BY RAND(7) LIMIT 1000")
+
+
+def test_mysql_large_tables_use_seeded_primary_key_ranges():
+    script = {
+        "information_schema.TABLES": [(SMALL_TABLE_ROWS * 10,)],
+        "KEY_COLUMN_USAGE": [("id", "bigint")],
+        "MIN(": [(1, 10 ** 6)],
+    }
+    first = plan(mysql.dialect(), DataSourceType.MYSQL, script, seed=3)
+    assert first.strategy == "pk_range" and first.dedupe_column == "id"
+    assert first.query.count("UNION ALL") == table_sampling_service.PK_RANGE_COUNT - 1
+    assert plan(mysql.dialect(), DataSourceType.MYSQL, script, seed=3).query == first.query
+    assert plan(mysql.dialect(), DataSourceType.MYSQL, script, seed=4).query != first.query
+
+    script["KEY_COLUMN_USAGE"] = [("code", "varchar")]
+    assert plan(mysql.dialect(), DataSourceType.MYSQL, script).strategy == "rand_filter"
+
+
+@pytest.fixture
+def sqlite_source(monkeypatch):
+    """A sqlite table standing in for the data source, with PostgreSQL's setseed()/random()"""
+    engine = create_engine("sqlite://")
+
+    @event.listens_for(engine, "connect")
+    def register_functions(dbapi_connection, _):
+        rng = random.Random()
+        dbapi_connection.create_function("setseed", 1, lambda value: rng.seed(value))
+        dbapi_connection.create_function("random", 0, rng.random)
+
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE orders (id INTEGER PRIMARY KEY, amount INTEGER)"))
+        conn.execute(text("INSERT INTO orders VALUES (:id, :amount)"),
+                     [{"id": i, "amount": i * 10} for i in range(1, 501)])
+    monkeypatch.setattr(table_sampling_service.connection_pool_registry, "get_engine", lambda *a, **k: engine)
+    monkeypatch.setattr(table_sampling_service.DataSourceService, "get_data_source_password", lambda *a: None)
+    return SimpleNamespace(source_type=DataSourceType.POSTGRESQL)
+
+
+def sample_ids(source, seed, chunk_size=1000, sample_size=50):
+    chunks = list(TableSamplingService.iter_sample(source, "orders", sample_size=sample_size, seed=seed,
+                                                   chunk_size=chunk_size))
+    assert all(chunk.attrs["sampling"]["seed"] == seed for chunk in chunks)
+    return [int(value) for chunk in chunks for value in chunk["id"]]
+
+
+def test_same_seed_returns_the_same_rows(sqlite_source, monkeypatch):
+    def plan_postgresql(conn, source_type, table_name, schema_name, sample_size, seed, sample_method="auto"):
+        fake = FakeConnection(conn.dialect, {"pg_class": [(500, 0)]})
+        return TableSamplingService._plan_postgresql(fake, '"orders"', table_name, schema_name, sample_size, seed)
+
+    monkeypatch.setattr(TableSamplingService, "plan_sql_sample", staticmethod(plan_postgresql))
+    first = sample_ids(sqlite_source, seed=11)
+    assert len(first) == 50 and len(set(first)) == 50
+    assert sample_ids(sqlite_source, seed=11, chunk_size=7) == first
+    assert sample_ids(sqlite_source, seed=12) != first
+
+
+def test_overlapping_primary_key_ranges_are_deduplicated(sqlite_source, monkeypatch):
+    # Two ranges overlapping on ids 10-19, as neighbouring MySQL pk_range seeks can
+    overlapping = SamplingPlan(
+        "pk_range",
+        "SELECT * FROM (SELECT * FROM orders WHERE id >= 1 ORDER BY id LIMIT 20) "
+        "UNION ALL SELECT * FROM (SELECT * FROM orders WHERE id >= 10 ORDER BY id LIMIT 20)",
+        seed=5, dedupe_column="id"
+    )
+    monkeypatch.setattr(TableSamplingService, "plan_sql_sample", staticmethod(lambda *a, **k: overlapping))
+    assert sample_ids(sqlite_source, seed=5, chunk_size=8, sample_size=25) == list(range(1, 26))
+    assert sample_ids(sqlite_source, seed=5, sample_size=100) == list(range(1, 30))
@@ -0,0 +1,139 @@
+"""
+Benchmark: lineage graph memory and query latency, networkx MultiDiGraph vs CSRLineageGraph.
+
+Builds a synthetic layered column-level lineage graph (each column feeds a few columns of
+the next layer) with the node/edge attributes the advanced lineage service stores, then
+measures build memory (tracemalloc) and the latency of the service's lineage operations:
+depth-limited BFS, shortest paths from an asset, and the impact critical path.
+
+Usage: python benchmark_lineage_graph.py [--nodes 200000] [--fanout 5] [--queries 20]
+"""
+
+import argparse
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+from collections import deque
+
+import networkx as nx
+
+from app.services.lineage_csr_graph import CSRLineageGraph
+from app.services.lineage_graph_delta import LineageGraphDelta, build_lineage_graph
+
+LAYERS = 10
+LINEAGE_TYPES = ["column_to_column", "table_to_table", "etl_transformation"]
+
+
+def synthetic_delta(node_count: int, fanout: int, seed: int = 42) -> LineageGraphDelta:
+    rng = random.Random(seed)
+    per_layer = max(node_count // LAYERS, 1)
+    nodes, edges = [], []
+    for i in range(node_count):
+        nodes.append((f"col_{i}", {
+            "asset_type": "column",
+            "asset_name": f"column_{i}",
+            "schema_name": f"schema_{i % 20}",
+            "database_name": f"db_{i % 4}",
+            "metadata": {"business_criticality": rng.random()} if i % 10 == 0 else {},
+            "business_importance": 0.5,
+        }))
+        layer = i // per_layer
+        if layer + 1 < LAYERS:
+            for _ in range(fanout):
+                target = (layer + 1) * per_layer + rng.randrange(per_layer)
+                if target < node_count:
+                    edge_id = f"edge_{len(edges)}"
+                    edges.append((f"col_{i}", f"col_{target}", edge_id, {
+                        "lineage_type": rng.choice(LINEAGE_TYPES),
+                        "transformation_type": None,
+                        "confidence": rng.choice([0.5, 0.8, 0.95, 1.0]),
+                        "metadata": {},
+                    }))
+    return LineageGraphDelta(nodes=nodes, edges=edges, full=True)
+
+
+def measure_build(label: str, build):
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    graph = build()
+    elapsed = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    current = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{label:<9} build={elapsed:6.2f}s  retained={current / 2**20:8.1f}MiB  peak={peak / 2**20:8.1f}MiB")
+    return graph
+
+
+def networkx_bfs(graph: nx.MultiDiGraph, root: str, max_depth: int, min_confidence: float) -> int:
+    """The service's _breadth_first_search loop (downstream)."""
+    visited_nodes, visited_edges = set(), set()
+    queue = deque([(root, 0)])
+    while queue:
+        current, depth = queue.popleft()
+        if depth > max_depth or current in visited_nodes:
+            continue
+        visited_nodes.add(current)
+        for neighbor in graph.successors(current):
+            edge_key = f"{current}->{neighbor}"
+            if edge_key not in visited_edges:
+                visited_edges.add(edge_key)
+                for data in graph.get_edge_data(current, neighbor).values():
+                    if data["confidence"] >= min_confidence and neighbor not in visited_nodes:
+                        queue.append((neighbor, depth + 1))
+    return len(visited_nodes)
+
+
+def networkx_shortest_paths(graph: nx.MultiDiGraph, root: str, max_depth: int) -> int:
+    paths = nx.single_source_shortest_path(graph, root, cutoff=max_depth)
+    return len(paths)
+
+
+def networkx_critical_path(graph: nx.MultiDiGraph, root: str, max_depth: int) -> int:
+    paths = nx.single_source_shortest_path(graph, root, cutoff=max_depth)
+    target = max((node for node in paths if node != root),
+                 key=lambda node: graph.nodes[node]["metadata"].get("business_criticality", 0.5), default=root)
+    return len(paths[target])
+
+
+def timed(label: str, operation, roots) -> None:
+    samples, sizes = [], []
+    for root in roots:
+        started = time.perf_counter()
+        sizes.append(operation(root))
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<26} p50={statistics.median(samples):8.2f}ms  max={max(samples):8.2f}ms  "
+          f"avg result={statistics.mean(sizes):9.1f}")
+
+
+def main(node_count: int, fanout: int, queries: int, max_depth: int) -> None:
+    delta = synthetic_delta(node_count, fanout)
+    print(f"{len(delta.nodes)} nodes, {len(delta.edges)} edges, {queries} queries, max_depth={max_depth}")
+    graph = measure_build("networkx", lambda: build_lineage_graph(delta))
+    csr = measure_build("csr", lambda: CSRLineageGraph.from_delta(delta))
+    print(f"csr NumPy columns: {csr.nbytes() / 2**20:.1f}MiB")
+
+    rng = random.Random(0)
+    per_layer = max(node_count // LAYERS, 1)
+    roots = [f"col_{rng.randrange(per_layer * 3)}" for _ in range(queries)]
+
+    print("networkx")
+    timed("bfs (confidence>=0.8)", lambda root: networkx_bfs(graph, root, max_depth, 0.8), roots)
+    timed("shortest paths", lambda root: networkx_shortest_paths(graph, root, max_depth), roots)
+    timed("impact critical path", lambda root: networkx_critical_path(graph, root, 10), roots)
+    print("csr")
+    timed("bfs (confidence>=0.8)", lambda root: len(csr.traverse(root, "downstream", max_depth, 0.8).nodes), roots)
+    timed("shortest paths", lambda root: len(csr.traverse(root, "downstream", max_depth).tree_edges) + 1, roots)
+    timed("impact critical path", lambda root: len(csr.critical_path(csr.traverse(root, "downstream", 10))), roots)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=200000)
+    parser.add_argument("--fanout", type=int, default=5)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--max-depth", type=int, default=5)
+    args = parser.parse_args()
+    main(args.nodes, args.fanout, args.queries, args.max_depth)
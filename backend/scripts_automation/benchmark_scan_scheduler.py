@@ -0,0 +1,130 @@
+"""
+Benchmark: advanced scan scheduler queue operations, rebuilt heap list vs indexed heap.
+
+Registers synthetic schedules spread over a week, then times the scheduler's hot operations
+both ways: moving a schedule (the old _update_priority_queue rebuilt and re-heapified the whole
+list), density queries over a +/-1 hour window (the old _analyze_schedule_density scanned every
+schedule), the alternative-slot search built on them, and draining the due schedules.
+
+Usage: python benchmark_scan_scheduler.py [--schedules 100000] [--updates 500] [--queries 500]
+"""
+
+import argparse
+import heapq
+import random
+import statistics
+import time
+
+from app.services.schedule_index import IndexedHeap, TimeBucketIndex
+
+WEEK = 7 * 24 * 3600
+HOUR = 3600
+ALTERNATIVE_OFFSETS = [0.5, -0.5, 1.0, -1.0, 1.5, -1.5, 2.0, -2.0]
+
+
+def synthetic_schedules(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return {
+        f"schedule_{i}": (rng.uniform(0, WEEK), rng.randrange(1, 6), rng.choice([5, 15, 30, 60, 120]))
+        for i in range(count)
+    }
+
+
+class ListScheduler:
+    """The previous structures: a (priority, time, id) heap list and a dict scanned for density."""
+
+    def __init__(self, schedules):
+        self.schedules = dict(schedules)
+        self.queue = [(priority, at, sid) for sid, (at, priority, _) in schedules.items()]
+        heapq.heapify(self.queue)
+
+    def update(self, sid, at):
+        _, priority, duration = self.schedules[sid]
+        self.schedules[sid] = (at, priority, duration)
+        queue = [entry for entry in self.queue if entry[2] != sid]
+        queue.append((priority, at, sid))
+        heapq.heapify(queue)
+        self.queue = queue
+
+    def density(self, at):
+        total = 0
+        for scheduled, _, duration in self.schedules.values():
+            if at - HOUR <= scheduled <= at + HOUR:
+                total += duration
+        return min(1.0, total / 120)
+
+    def drain(self, now):
+        # Ordered by priority first, so only a fully due queue drains completely
+        due = []
+        while self.queue and self.queue[0][1] <= now:
+            due.append(heapq.heappop(self.queue)[2])
+        return due
+
+
+class IndexedScheduler:
+    """The indexed heap keyed by (time, priority) plus the time-bucketed density index."""
+
+    def __init__(self, schedules):
+        self.schedules = dict(schedules)
+        self.queue = IndexedHeap()
+        self.density_index = TimeBucketIndex(300)
+        for sid, (at, priority, duration) in schedules.items():
+            self.queue.push(sid, (at, priority))
+            self.density_index.add(sid, at, duration)
+
+    def update(self, sid, at):
+        _, priority, duration = self.schedules[sid]
+        self.schedules[sid] = (at, priority, duration)
+        self.queue.push(sid, (at, priority))
+        self.density_index.add(sid, at, duration)
+
+    def density(self, at):
+        _, total = self.density_index.window(at - HOUR, at + HOUR)
+        return min(1.0, total / 120)
+
+    def drain(self, now):
+        due = []
+        while self.queue and self.queue.peek()[0][0] <= now:
+            due.append(self.queue.pop()[1])
+        return due
+
+
+def timed(label, operation, inputs):
+    samples = []
+    for value in inputs:
+        started = time.perf_counter()
+        operation(value)
+        samples.append((time.perf_counter() - started) * 1000)
+    print(f"  {label:<22} p50={statistics.median(samples):9.3f}ms  max={max(samples):9.3f}ms  "
+          f"total={sum(samples) / 1000:7.2f}s")
+
+
+def main(count: int, updates: int, queries: int) -> None:
+    schedules = synthetic_schedules(count)
+    rng = random.Random(0)
+    moves = [(f"schedule_{rng.randrange(count)}", rng.uniform(0, WEEK)) for _ in range(updates)]
+    probes = [rng.uniform(0, WEEK) for _ in range(queries)]
+    print(f"{count} schedules, {updates} updates, {queries} density queries")
+
+    for label, cls in (("list", ListScheduler), ("indexed", IndexedScheduler)):
+        started = time.perf_counter()
+        scheduler = cls(schedules)
+        print(f"{label}  build={time.perf_counter() - started:.2f}s")
+        timed("update schedule time", lambda move: scheduler.update(*move), moves)
+        timed("density (+/-1h)", scheduler.density, probes)
+        timed("alternative slot", lambda at: [scheduler.density(at + o * HOUR) for o in ALTERNATIVE_OFFSETS],
+              probes[: max(1, queries // 10)])
+        started = time.perf_counter()
+        due = scheduler.drain(WEEK / 2)
+        elapsed = time.perf_counter() - started
+        print(f"  drain due schedules    {len(due)} drained in {elapsed * 1000:.1f}ms "
+              f"({elapsed * 1e6 / max(1, len(due)):.2f}us each)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--schedules", type=int, default=100000)
+    parser.add_argument("--updates", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+    main(args.schedules, args.updates, args.queries)
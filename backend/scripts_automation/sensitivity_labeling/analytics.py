@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
-from . import crud, models
-from app.db_session import get_session
+from . import crud, models, analytics_summary
+from app.db_session import get_db
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from sqlalchemy import case, func
 
 router = APIRouter(prefix="/sensitivity-labels/analytics", tags=["Sensitivity Analytics"])
 
 @router.get("/coverage", response_model=Dict[str, Any])
-def get_labeling_coverage(db: Session = Depends(get_session)):
+def get_labeling_coverage(db: Session = Depends(get_db)):
     """Return labeling coverage stats by object type and user."""
-    total_objects = db.query(models.LabelProposal.object_type, models.LabelProposal.object_id).distinct().count()
-    labeled_objects = db.query(models.LabelProposal.object_type, models.LabelProposal.object_id).filter(models.LabelProposal.status == models.LabelStatus.APPROVED).distinct().count()
+    # One query: distinct objects, each flagged labeled if any of its proposals is approved
+    objects = db.query(
+        func.max(case((models.LabelProposal.status == models.LabelStatus.APPROVED, 1), else_=0)).label("labeled")
+    ).group_by(models.LabelProposal.object_type, models.LabelProposal.object_id).subquery()
+    total_objects, labeled_objects = db.query(func.count(), func.coalesce(func.sum(objects.c.labeled), 0)).select_from(objects).one()
     coverage_percent = (labeled_objects / total_objects * 100) if total_objects else 0.0
     return {
         "total_objects": total_objects,
@@ -21,9 +24,17 @@ def get_labeling_coverage(db: Session = Depends(get_session)):
     }
 
 @router.get("/pending-reviews", response_model=List[Dict[str, Any]])
-def get_pending_reviews(db: Session = Depends(get_session)):
+def get_pending_reviews(db: Session = Depends(get_db)):
     """Return proposals pending review, with days since proposal."""
-    pending = db.query(models.LabelProposal).filter(models.LabelProposal.status == models.LabelStatus.PROPOSED).all()
+    pending = db.query(
+        models.LabelProposal.id,
+        models.LabelProposal.object_type,
+        models.LabelProposal.object_id,
+        models.LabelProposal.label_id,
+        models.LabelProposal.proposed_by,
+        models.LabelProposal.created_at,
+    ).filter(models.LabelProposal.status == models.LabelStatus.PROPOSED).all()
+    now = datetime.utcnow()
     return [
         {
             "id": p.id,
@@ -32,16 +43,23 @@ def get_pending_reviews(db: Session = Depends(get_session)):
             "label_id": p.label_id,
             "proposed_by": p.proposed_by,
             "created_at": p.created_at,
-            "days_pending": (datetime.utcnow() - p.created_at).days
+            "days_pending": (now - p.created_at).days if p.created_at else None
         }
         for p in pending
     ]
 
 @router.get("/expiring-labels", response_model=List[Dict[str, Any]])
-def get_expiring_labels(db: Session = Depends(get_session)):
+def get_expiring_labels(db: Session = Depends(get_db)):
     """Return labels with expiry date within next 30 days."""
     soon = datetime.utcnow() + timedelta(days=30)
-    expiring = db.query(models.LabelProposal).filter(
+    expiring = db.query(
+        models.LabelProposal.id,
+        models.LabelProposal.object_type,
+        models.LabelProposal.object_id,
+        models.LabelProposal.label_id,
+        models.LabelProposal.expiry_date,
+        models.LabelProposal.proposed_by,
+    ).filter(
         models.LabelProposal.expiry_date != None,
         models.LabelProposal.expiry_date <= soon,
         models.LabelProposal.status == models.LabelStatus.APPROVED
@@ -59,23 +77,44 @@ def get_expiring_labels(db: Session = Depends(get_session)):
     ]
 
 @router.get("/label-usage", response_model=List[Dict[str, Any]])
-def get_label_usage_stats(db: Session = Depends(get_session)):
+def get_label_usage_stats(db: Session = Depends(get_db)):
     """Return usage stats for each label (count, last used)."""
-    labels = db.query(models.SensitivityLabel).all()
-    stats = []
-    for label in labels:
-        count = db.query(models.LabelProposal).filter(models.LabelProposal.label_id == label.id).count()
-        last = db.query(models.LabelProposal).filter(models.LabelProposal.label_id == label.id).order_by(models.LabelProposal.updated_at.desc()).first()
-        stats.append({
-            "label_id": label.id,
-            "label_name": label.name,
+    if analytics_summary.ANALYTICS_SUMMARY_ENABLED:
+        summary = models.LabelUsageSummary
+        rows = db.query(
+            models.SensitivityLabel.id,
+            models.SensitivityLabel.name,
+            func.coalesce(summary.proposal_count, 0),
+            summary.last_used,
+        ).outerjoin(summary, summary.label_id == models.SensitivityLabel.id).order_by(models.SensitivityLabel.id).all()
+    else:
+        rows = db.query(
+            models.SensitivityLabel.id,
+            models.SensitivityLabel.name,
+            func.count(models.LabelProposal.id),
+            func.max(models.LabelProposal.updated_at),
+        ).outerjoin(
+            models.LabelProposal, models.LabelProposal.label_id == models.SensitivityLabel.id
+        ).group_by(models.SensitivityLabel.id, models.SensitivityLabel.name).order_by(models.SensitivityLabel.id).all()
+    return [
+        {
+            "label_id": label_id,
+            "label_name": name,
             "count": count,
-            "last_used": last.updated_at if last else None
-        })
-    return stats
+            "last_used": last_used
+        }
+        for label_id, name, count, last_used in rows
+    ]
+
+@router.post("/label-usage/refresh", response_model=Dict[str, Any])
+def refresh_label_usage_summary(db: Session = Depends(get_db)):
+    """Rebuild the materialized label usage summary (e.g. after bulk imports or enabling it)."""
+    analytics_summary.refresh_label_usage_summary(db)
+    db.commit()
+    return {"status": "ok", "labels": db.query(models.LabelUsageSummary).count()}
 
 @router.get("/history", response_model=List[Dict[str, Any]])
-def get_label_change_history(db: Session = Depends(get_session)):
+def get_label_change_history(db: Session = Depends(get_db)):
     """Return label change history (audits) sorted by time."""
     audits = db.query(models.LabelAudit).order_by(models.LabelAudit.timestamp.desc()).limit(200).all()
     return [
@@ -91,27 +130,25 @@ def get_label_change_history(db: Session = Depends(get_session)):
     ]
 
 @router.get("/trends", response_model=List[Dict[str, Any]])
-def get_labeling_trends(db: Session = Depends(get_session)):
+def get_labeling_trends(db: Session = Depends(get_db)):
     """Return time-series data of label proposals per day (last 90 days)."""
+    return [{"date": str(r[0]), "count": r[1]} for r in _daily_proposal_counts(db)]
+
+def _daily_proposal_counts(db: Session):
     days_ago = datetime.utcnow() - timedelta(days=90)
-    results = db.query(
+    return db.query(
         func.date(models.LabelProposal.created_at).label("date"),
         func.count(models.LabelProposal.id)
     ).filter(
         models.LabelProposal.created_at >= days_ago
     ).group_by(func.date(models.LabelProposal.created_at)).order_by(func.date(models.LabelProposal.created_at)).all()
-    return [{"date": str(r[0]), "count": r[1]} for r in results]
 
 @router.get("/anomalies", response_model=List[Dict[str, Any]])
-def get_labeling_anomalies(db: Session = Depends(get_session)):
+def get_labeling_anomalies(db: Session = Depends(get_db)):
     """Detect days with anomalous spikes in label proposals (z-score > 2)."""
-    days_ago = datetime.utcnow() - timedelta(days=90)
-    results = db.query(
-        func.date(models.LabelProposal.created_at).label("date"),
-        func.count(models.LabelProposal.id)
-    ).filter(
-        models.LabelProposal.created_at >= days_ago
-    ).group_by(func.date(models.LabelProposal.created_at)).order_by(func.date(models.LabelProposal.created_at)).all()
+    return _detect_anomalies(_daily_proposal_counts(db))
+
+def _detect_anomalies(results):
     import numpy as np
     counts = np.array([r[1] for r in results])
     if len(counts) < 2:
@@ -137,29 +174,50 @@ def get_ml_model_performance():
     }
 
 @router.get("/user-analytics", response_model=List[Dict[str, Any]])
-def get_user_analytics(db: Session = Depends(get_session)):
+def get_user_analytics(db: Session = Depends(get_db)):
     """Return analytics per user (proposals, reviews, approvals)."""
-    users = db.query(models.LabelProposal.proposed_by).distinct().all()
-    stats = []
-    for (user,) in users:
-        proposals = db.query(models.LabelProposal).filter(models.LabelProposal.proposed_by == user).count()
-        reviews = db.query(models.LabelReview).filter(models.LabelReview.reviewer == user).count()
-        approvals = db.query(models.LabelProposal).filter(models.LabelProposal.proposed_by == user, models.LabelProposal.status == models.LabelStatus.APPROVED).count()
-        stats.append({
+    proposals = db.query(
+        models.LabelProposal.proposed_by.label("user"),
+        func.count(models.LabelProposal.id).label("proposals"),
+        func.sum(case((models.LabelProposal.status == models.LabelStatus.APPROVED, 1), else_=0)).label("approvals"),
+    ).group_by(models.LabelProposal.proposed_by).subquery()
+    reviews = db.query(
+        models.LabelReview.reviewer.label("user"),
+        func.count(models.LabelReview.id).label("reviews"),
+    ).group_by(models.LabelReview.reviewer).subquery()
+    rows = db.query(
+        proposals.c.user,
+        proposals.c.proposals,
+        func.coalesce(reviews.c.reviews, 0),
+        func.coalesce(proposals.c.approvals, 0),
+    ).outerjoin(reviews, reviews.c.user == proposals.c.user).order_by(proposals.c.user).all()
+    return [
+        {
             "user": user,
-            "proposals": proposals,
-            "reviews": reviews,
-            "approvals": approvals
-        })
-    return stats
+            "proposals": proposal_count,
+            "reviews": review_count,
+            "approvals": approval_count
+        }
+        for user, proposal_count, review_count, approval_count in rows
+    ]
 
 @router.get("/export", response_model=Dict[str, Any])
-def export_dashboard_data(db: Session = Depends(get_session)):
+def export_dashboard_data(db: Session = Depends(get_db)):
     """Export dashboard data as a downloadable report (JSON)."""
+    daily_counts = _daily_proposal_counts(db)
     data = {
         "coverage": get_labeling_coverage(db),
-        "trends": get_labeling_trends(db),
-        "anomalies": get_labeling_anomalies(db),
+        "trends": [{"date": str(r[0]), "count": r[1]} for r in daily_counts],
+        "anomalies": _detect_anomalies(daily_counts),
         "user_analytics": get_user_analytics(db)
     }
     return data
+
+@router.get("/dashboard", response_model=Dict[str, Any])
+def get_dashboard(db: Session = Depends(get_db)):
+    """All dashboard panels in one response, each served by a single aggregate query."""
+    data = export_dashboard_data(db)
+    data["label_usage"] = get_label_usage_stats(db)
+    data["pending_reviews"] = get_pending_reviews(db)
+    data["expiring_labels"] = get_expiring_labels(db)
+    return data
@@ -0,0 +1,89 @@
+"""
+Analytics Summary
+Optional materialized per-label usage summary (label_usage_summary) for the sensitivity
+analytics dashboard, refreshed incrementally for the labels touched by label, proposal
+and audit writes.
+"""
+import datetime
+import os
+
+from sqlalchemy import case, delete, event, func, insert, literal, select, inspect as sa_inspect
+from sqlalchemy.orm import Session
+
+from . import models
+
+# Off by default: analytics are then computed with grouped aggregate queries per request
+ANALYTICS_SUMMARY_ENABLED = os.getenv("SENSITIVITY_ANALYTICS_SUMMARY", "false").lower() == "true"
+
+SUMMARY_COLUMNS = ["label_id", "proposal_count", "approved_count", "pending_count", "last_used", "last_audit_at", "refreshed_at"]
+
+def label_usage_select(label_ids=None):
+    """
+    One grouped query over all (or the given) labels: proposal counts by status, last
+    use (latest proposal update) and latest audit, in SUMMARY_COLUMNS order.
+    """
+    label, proposal, audit = models.SensitivityLabel, models.LabelProposal, models.LabelAudit
+    last_audit = (
+        select(proposal.label_id, func.max(audit.timestamp).label("last_audit_at"))
+        .join(audit, audit.proposal_id == proposal.id)
+        .group_by(proposal.label_id)
+        .subquery()
+    )
+    q = (
+        select(
+            label.id,
+            func.count(proposal.id),
+            func.coalesce(func.sum(case((proposal.status == models.LabelStatus.APPROVED, 1), else_=0)), 0),
+            func.coalesce(func.sum(case((proposal.status == models.LabelStatus.PROPOSED, 1), else_=0)), 0),
+            func.max(proposal.updated_at),
+            func.max(last_audit.c.last_audit_at),
+            literal(datetime.datetime.utcnow()),
+        )
+        .outerjoin(proposal, proposal.label_id == label.id)
+        .outerjoin(last_audit, last_audit.c.label_id == label.id)
+        .group_by(label.id)
+    )
+    if label_ids is not None:
+        q = q.where(label.id.in_(label_ids))
+    return q
+
+def refresh_label_usage_summary(bind, label_ids=None):
+    """
+    Recomputes the summary rows of the given labels (all labels when None) with one
+    DELETE and one INSERT ... SELECT. `bind` is a Session or Connection.
+    """
+    summary = models.LabelUsageSummary.__table__
+    label_ids = None if label_ids is None else list(label_ids)
+    stale = delete(summary)
+    if label_ids is not None:
+        stale = stale.where(summary.c.label_id.in_(label_ids))
+    bind.execute(stale)
+    bind.execute(insert(summary).from_select(SUMMARY_COLUMNS, label_usage_select(label_ids)))
+
+def _touched_label_ids(session):
+    label_ids, proposal_ids = set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.SensitivityLabel):
+            label_ids.add(obj.id)
+        elif isinstance(obj, models.LabelProposal):
+            label_ids.add(obj.label_id)
+            # A proposal moved to another label changes both labels' rows
+            label_ids.update(sa_inspect(obj).attrs.label_id.history.deleted or ())
+        elif isinstance(obj, models.LabelAudit):
+            proposal_ids.add(obj.proposal_id)
+    proposal_ids.discard(None)
+    if proposal_ids:
+        label_ids.update(session.connection().execute(
+            select(models.LabelProposal.label_id).where(models.LabelProposal.id.in_(proposal_ids))
+        ).scalars())
+    label_ids.discard(None)
+    return label_ids
+
+@event.listens_for(Session, "after_flush")
+def _refresh_summary_on_flush(session, flush_context):
+    # Runs inside the flush's transaction, so the summary commits (or rolls back) with the write
+    if not ANALYTICS_SUMMARY_ENABLED:
+        return
+    label_ids = _touched_label_ids(session)
+    if label_ids:
+        refresh_label_usage_summary(session.connection(), label_ids)
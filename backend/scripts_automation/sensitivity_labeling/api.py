@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Request, Body, Co
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from . import schemas, crud, models
-from app.db_session import get_db  # Use FastAPI dependency for session
+from app.db_session import get_db, get_session  # Use FastAPI dependency for session
 import requests
 from .workflow import vote_on_proposal as workflow_vote_on_proposal, get_proposal_status as workflow_get_proposal_status, WorkflowError
 from app.models.auth_models import User, Role, UserRole
@@ -212,32 +212,38 @@ def list_audits(
 
 @router.get("/audits/export")
 def export_audits(
-    format: str = Query("csv", enum=["csv", "json"]),
+    format: str = Query("csv", enum=["csv", "ndjson", "json"]),
     user: str = None,
     entity_type: str = None,
     entity_id: int = None,
     action: str = None,
     start_date: str = None,
     end_date: str = None,
-    db: Session = Depends(get_db)
 ):
     """
-    Export audit events in the requested format (CSV/JSON).
+    Export audit events in the requested format (CSV/NDJSON/JSON), streamed in batches
+    so exports of any size run in constant memory.
     """
-    result = crud.export_audits(
-        db,
+    filters = dict(
         user=user,
         entity_type=entity_type,
         entity_id=entity_id,
         action=action,
         start_date=start_date,
         end_date=end_date,
-        format=format,
     )
-    if format == "json":
-        return result
-    from fastapi.responses import Response
-    return Response(content=result, media_type="text/csv")
+
+    def stream():
+        # Own session: the stream outlives the request handler
+        with get_session() as session:
+            yield from crud.iter_audit_export(session, format=format, **filters)
+
+    media_types = {"csv": "text/csv", "ndjson": "application/x-ndjson", "json": "application/json"}
+    return StreamingResponse(
+        stream(),
+        media_type=media_types[format],
+        headers={"Content-Disposition": f"attachment; filename=audits.{format}"}
+    )
 
 @router.get("/audits/{audit_id}")
 def get_audit_detail(audit_id: int, db: Session = Depends(get_db)):
@@ -770,12 +776,22 @@ def get_lineage(object_type: str, object_id: str, direction: str = Query("both",
     ]
 
 @router.get("/lineage/{object_type}/{object_id}/impact")
-def get_impact(object_type: str, object_id: str, recursive: bool = Query(False), db: Session = Depends(get_db), current_user: User = Depends(get_current_user)):
+def get_impact(
+    object_type: str,
+    object_id: str,
+    recursive: bool = Query(False),
+    max_depth: int = Query(crud.LINEAGE_MAX_DEPTH, ge=1, le=crud.LINEAGE_MAX_DEPTH),
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+):
     """
     Get impact analysis for a given object (all downstream edges, optionally recursive).
+    Recursive results carry each edge's depth and can be paginated with limit/offset.
     """
     if recursive:
-        edges = crud.get_impact_recursive(db, object_type, object_id)
+        edges = crud.get_impact_recursive(db, object_type, object_id, max_depth=max_depth, limit=limit, offset=offset)
     else:
         edges = crud.get_impact(db, object_type, object_id)
     return [
@@ -786,6 +802,7 @@ def get_impact(object_type: str, object_id: str, recursive: bool = Query(False),
             "target_type": e.target_type,
             "target_id": e.target_id,
             "relationship_type": e.relationship_type,
+            **({"depth": e.depth} if recursive else {}),
         }
         for e in edges
     ]
@@ -896,26 +913,23 @@ def get_label_explainability(object_id: str, db: Session = Depends(get_db)):
 from fastapi import WebSocket, WebSocketDisconnect
 from typing import Dict, Any
 
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: list[WebSocket] = []
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.append(websocket)
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
-    async def broadcast(self, message: Dict[str, Any]):
-        for connection in self.active_connections:
-            await connection.send_json(message)
-
-manager = ConnectionManager()
-
 @router.websocket("/ws")
-async def websocket_endpoint(websocket: WebSocket):
-    await manager.connect(websocket)
+async def websocket_endpoint(websocket: WebSocket, topics: Optional[str] = None):
+    """Label events stream. ``topics`` is a comma-separated subscription list (event names or
+    ``object_type:object_id``); clients may send {"action": "subscribe"|"unsubscribe", "topics": [...]}."""
+    await manager.connect(websocket, topics.split(",") if topics else None)
     try:
         while True:
-            await websocket.receive_text()  # Keep alive
+            try:
+                request = json.loads(await websocket.receive_text())
+            except ValueError:
+                continue  # Keep alive
+            if not isinstance(request, dict):
+                continue
+            if request.get("action") == "subscribe":
+                manager.subscribe(websocket, request.get("topics", []))
+            elif request.get("action") == "unsubscribe":
+                manager.unsubscribe(websocket, request.get("topics", []))
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -1002,6 +1016,18 @@ def ml_suggest_labels(
     result = ml_suggestion_service.predict(features_np, db)
     return result
 
+@router.post("/ml-suggest-labels/batch")
+def ml_suggest_labels_batch(
+    features: List[list] = Body(..., example=[[0.1, 0.5, 0.3], [0.2, 0.4, 0.9]]),
+    db: Session = Depends(get_db)
+):
+    """
+    Batched ML label suggestions: one prediction per feature list, in request order.
+    """
+    if not features:
+        return []
+    return ml_suggestion_service.predict_many(np.array(features), db)
+
 class PathRequest(BaseModel):
     path: list[str]
 
@@ -1,5 +1,5 @@
 from sqlalchemy.orm import Session
-from . import models, schemas
+from . import models, schemas, analytics_summary  # analytics_summary registers the summary refresh listener
 from typing import List, Optional
 from datetime import datetime
 
@@ -125,40 +125,114 @@ def get_impact(db, object_type, object_id):
     q = db.query(LineageEdge).filter(LineageEdge.source_type == object_type, LineageEdge.source_id == object_id)
     return q.all()
 
-def get_lineage_recursive(db, object_type, object_id, direction="both", visited=None):
+# Depth bound of the recursive lineage traversals
+LINEAGE_MAX_DEPTH = 50
+
+# Separators of the traversal path column (control characters, absent from node types and ids)
+_PATH_NODE, _PATH_FIELD = "\x1e", "\x1f"
+
+def _path_key(node_type, node_id):
+    return node_type + _PATH_FIELD + node_id + _PATH_NODE
+
+def _path_contains(path, node_type, node_id):
+    """Whether a traversal path holds the node; LIKE wildcards in the key are escaped."""
+    from sqlalchemy import func
+    key = _PATH_NODE + _path_key(node_type, node_id)
+    for char in ("\\", "%", "_"):
+        key = func.replace(key, char, "\\" + char)
+    return path.like("%" + key + "%", escape="\\")
+
+def _lineage_reach_cte(object_type, object_id, direction, max_depth):
+    """
+    Recursive CTE of (edge_id, node_type, node_id, depth, path) for every edge reachable
+    from the object in one direction ("downstream" follows source -> target). ``path``
+    holds the nodes walked to reach the edge; an edge leading back onto its path is
+    returned but not expanded, so cycles are walked once, and the depth is bounded.
+    """
+    from sqlalchemy import and_, literal, not_, select
+    from sqlalchemy.orm import aliased
     from .models import LineageEdge
-    if visited is None:
-        visited = set()
-    key = (object_type, object_id)
-    if key in visited:
-        return []
-    visited.add(key)
+
+    def columns(edge):
+        if direction == "downstream":
+            return edge.source_type, edge.source_id, edge.target_type, edge.target_id
+        return edge.target_type, edge.target_id, edge.source_type, edge.source_id
+
+    near_type, near_id, far_type, far_id = columns(LineageEdge)
+    reach = select(
+        LineageEdge.id.label("edge_id"),
+        far_type.label("node_type"),
+        far_id.label("node_id"),
+        literal(1).label("depth"),
+        (literal(_PATH_NODE) + _path_key(literal(object_type), literal(object_id))).label("path"),
+    ).where(near_type == object_type, near_id == object_id).cte(f"lineage_{direction}", recursive=True)
+
+    edge = aliased(LineageEdge)
+    near_type, near_id, far_type, far_id = columns(edge)
+    return reach.union_all(
+        select(
+            edge.id, far_type, far_id, reach.c.depth + 1,
+            reach.c.path + _path_key(reach.c.node_type, reach.c.node_id),
+        )
+        .join(reach, and_(near_type == reach.c.node_type, near_id == reach.c.node_id))
+        .where(reach.c.depth < max_depth, not_(_path_contains(reach.c.path, reach.c.node_type, reach.c.node_id)))
+    )
+
+def _get_reached_edges(db, ctes, limit=None, offset=0):
+    """
+    Runs the traversal CTEs as one query and returns the reached LineageEdge rows, each
+    once with its smallest depth in a `depth` attribute, ordered by depth then id.
+    """
+    from sqlalchemy import func, select, union_all
+    from .models import LineageEdge
+    reached = union_all(*[select(cte.c.edge_id, cte.c.depth) for cte in ctes]).subquery()
+    depths = (
+        select(reached.c.edge_id, func.min(reached.c.depth).label("depth"))
+        .group_by(reached.c.edge_id)
+        .subquery()
+    )
+    q = (
+        db.query(LineageEdge, depths.c.depth)
+        .join(depths, LineageEdge.id == depths.c.edge_id)
+        .order_by(depths.c.depth, LineageEdge.id)
+    )
+    if offset:
+        q = q.offset(offset)
+    if limit is not None:
+        q = q.limit(limit)
     edges = []
-    if direction in ("downstream", "both"):
-        ds_edges = db.query(LineageEdge).filter(LineageEdge.source_type == object_type, LineageEdge.source_id == object_id).all()
-        edges.extend(ds_edges)
-        for e in ds_edges:
-            edges.extend(get_lineage_recursive(db, e.target_type, e.target_id, "downstream", visited))
-    if direction in ("upstream", "both"):
-        us_edges = db.query(LineageEdge).filter(LineageEdge.target_type == object_type, LineageEdge.target_id == object_id).all()
-        edges.extend(us_edges)
-        for e in us_edges:
-            edges.extend(get_lineage_recursive(db, e.source_type, e.source_id, "upstream", visited))
+    for edge, depth in q.all():
+        edge.depth = depth
+        edges.append(edge)
     return edges
 
-def get_impact_recursive(db, object_type, object_id, visited=None):
-    from .models import LineageEdge
-    if visited is None:
-        visited = set()
-    key = (object_type, object_id)
-    if key in visited:
-        return []
-    visited.add(key)
-    edges = db.query(LineageEdge).filter(LineageEdge.source_type == object_type, LineageEdge.source_id == object_id).all()
-    all_edges = list(edges)
-    for e in edges:
-        all_edges.extend(get_impact_recursive(db, e.target_type, e.target_id, visited))
-    return all_edges
+def get_lineage_recursive(db, object_type, object_id, direction="both", max_depth=LINEAGE_MAX_DEPTH, limit=None, offset=0):
+    """
+    All lineage edges reachable from an object (downstream, upstream or both), in a
+    single recursive query. Supports a depth limit and limit/offset pagination.
+    """
+    directions = ("downstream", "upstream") if direction == "both" else (direction,)
+    ctes = [_lineage_reach_cte(object_type, object_id, d, max_depth) for d in directions]
+    return _get_reached_edges(db, ctes, limit=limit, offset=offset)
+
+def get_impact_recursive(db, object_type, object_id, max_depth=LINEAGE_MAX_DEPTH, limit=None, offset=0):
+    """
+    All downstream edges of an object (full impact), in a single recursive query.
+    """
+    return _get_reached_edges(
+        db, [_lineage_reach_cte(object_type, object_id, "downstream", max_depth)], limit=limit, offset=offset
+    )
+
+def _filter_audits(q, user=None, entity_type=None, entity_id=None, action=None, start_date=None, end_date=None):
+    if user:
+        q = q.filter(models.LabelAudit.performed_by == user)
+    if action:
+        q = q.filter(models.LabelAudit.action == action)
+    if start_date:
+        q = q.filter(models.LabelAudit.timestamp >= start_date)
+    if end_date:
+        q = q.filter(models.LabelAudit.timestamp <= end_date)
+    return q
 
 def list_audits(
     db: Session,
@@ -171,15 +245,7 @@ def list_audits(
     start_date: str = None,
     end_date: str = None,
 ):
-    q = db.query(models.LabelAudit)
-    if user:
-        q = q.filter(models.LabelAudit.performed_by == user)
-    if action:
-        q = q.filter(models.LabelAudit.action == action)
-    if start_date:
-        q = q.filter(models.LabelAudit.timestamp >= start_date)
-    if end_date:
-        q = q.filter(models.LabelAudit.timestamp <= end_date)
+    q = _filter_audits(db.query(models.LabelAudit), user=user, action=action, start_date=start_date, end_date=end_date)
     # Entity filtering: join with proposal if needed
     if entity_type or entity_id:
         q = q.join(models.LabelProposal)
@@ -190,6 +256,84 @@ def list_audits(
     q = q.order_by(models.LabelAudit.timestamp.desc())
     return q.offset(skip).limit(limit).all()
 
+AUDIT_EXPORT_COLUMNS = ["id", "timestamp", "user", "action", "entity_type", "entity_id", "details"]
+AUDIT_EXPORT_BATCH_SIZE = 1000
+
+def iter_audit_rows(
+    db: Session,
+    user: str = None,
+    entity_type: str = None,
+    entity_id: int = None,
+    action: str = None,
+    start_date: str = None,
+    end_date: str = None,
+    batch_size: int = AUDIT_EXPORT_BATCH_SIZE,
+):
+    """
+    Yields batches of audit export rows (tuples in AUDIT_EXPORT_COLUMNS order), newest
+    first. Proposals are joined in the same query and batches are fetched by keyset
+    (id < last id), so memory stays constant however many audits match. Rows are plain
+    column tuples and never enter the session's identity map.
+    """
+    audit, proposal = models.LabelAudit, models.LabelProposal
+    q = db.query(
+        audit.id, audit.timestamp, audit.performed_by, audit.action,
+        proposal.object_type, proposal.object_id, audit.note,
+    ).outerjoin(proposal, audit.proposal_id == proposal.id)
+    q = _filter_audits(q, user=user, action=action, start_date=start_date, end_date=end_date)
+    if entity_type:
+        q = q.filter(proposal.object_type == entity_type)
+    if entity_id:
+        q = q.filter(proposal.object_id == str(entity_id))
+    q = q.order_by(audit.id.desc())
+
+    last_id = None
+    while True:
+        page = q if last_id is None else q.filter(audit.id < last_id)
+        rows = page.limit(batch_size).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1][0]
+
+def iter_audit_export(db: Session, format: str = "csv", batch_size: int = AUDIT_EXPORT_BATCH_SIZE, **filters):
+    """
+    Yields the audit export as text chunks (one per batch): CSV with a header row,
+    NDJSON (one object per line) or a JSON array.
+    """
+    import csv
+    import json
+    from io import StringIO
+
+    def as_dict(row):
+        record = dict(zip(AUDIT_EXPORT_COLUMNS, row))
+        if record["timestamp"] is not None:
+            record["timestamp"] = record["timestamp"].isoformat()
+        return record
+
+    if format == "csv":
+        output = StringIO()
+        writer = csv.writer(output)
+        writer.writerow(AUDIT_EXPORT_COLUMNS)
+        yield output.getvalue()
+        for rows in iter_audit_rows(db, batch_size=batch_size, **filters):
+            output.seek(0)
+            output.truncate()
+            writer.writerows(rows)
+            yield output.getvalue()
+    elif format == "ndjson":
+        for rows in iter_audit_rows(db, batch_size=batch_size, **filters):
+            yield "".join(json.dumps(as_dict(row)) + "\n" for row in rows)
+    else:
+        yield "["
+        separator = ""
+        for rows in iter_audit_rows(db, batch_size=batch_size, **filters):
+            yield separator + ",".join(json.dumps(as_dict(row)) for row in rows)
+            separator = ","
+        yield "]"
+
 def export_audits(
     db: Session,
     user: str = None,
@@ -200,36 +344,20 @@ def export_audits(
     end_date: str = None,
     format: str = "csv"
 ):
-    audits = list_audits(
-        db,
-        skip=0,
-        limit=10000,  # Export up to 10k events at once
-        user=user,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action=action,
-        start_date=start_date,
-        end_date=end_date,
+    """
+    Whole export in memory (CSV text, or a list of dicts for "json"); prefer
+    iter_audit_export for large exports.
+    """
+    filters = dict(
+        user=user, entity_type=entity_type, entity_id=entity_id,
+        action=action, start_date=start_date, end_date=end_date,
     )
     if format == "json":
-        return [a.__dict__ for a in audits]
-    # CSV export
-    import csv
-    from io import StringIO
-    output = StringIO()
-    writer = csv.writer(output)
-    writer.writerow(["id", "timestamp", "user", "action", "entity_type", "entity_id", "details"])
-    for a in audits:
-        writer.writerow([
-            a.id,
-            getattr(a, "timestamp", None),
-            getattr(a, "performed_by", None),
-            getattr(a, "action", None),
-            getattr(a.proposal, "object_type", None) if hasattr(a, "proposal") else None,
-            getattr(a.proposal, "object_id", None) if hasattr(a, "proposal") else None,
-            getattr(a, "note", None)
-        ])
-    return output.getvalue()
+        return [
+            dict(zip(AUDIT_EXPORT_COLUMNS, row))
+            for rows in iter_audit_rows(db, **filters) for row in rows
+        ]
+    return "".join(iter_audit_export(db, format="csv", **filters))
 
 def get_audit_detail(db: Session, audit_id: int):
     return db.query(models.LabelAudit).filter(models.LabelAudit.id == audit_id).first()
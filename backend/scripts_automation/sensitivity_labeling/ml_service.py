@@ -7,8 +7,13 @@ Enhancements:
 - Accuracy, precision, and recall are calculated using scikit-learn metrics.
 - These metrics are stored in the ml_model_versions table for monitoring and dashboard use.
 - This enables real feedback loops, model monitoring, and production-grade ML governance.
+- Loaded model versions are kept in an in-process registry; predictions only look up the active
+  version (at most every ML_MODEL_CHECK_INTERVAL seconds) and swap engines when it changes.
 """
-from typing import List, Dict, Any
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+import threading
+import time
 import numpy as np
 from .ml_suggestion_engine import MLSuggestionEngine
 from .models import MLModelVersion, Feedback
@@ -18,10 +23,36 @@ from sklearn.metrics import accuracy_score, precision_score, recall_score
 import joblib
 import os
 
+# Seconds between lookups of the active model version (another worker may have switched it)
+ML_MODEL_CHECK_INTERVAL = float(os.getenv("ML_MODEL_CHECK_INTERVAL", "5"))
+# Loaded model versions kept in memory, so rollbacks and A/B switches skip the disk
+ML_MODEL_CACHE_SIZE = int(os.getenv("ML_MODEL_CACHE_SIZE", "3"))
+
+class ModelRegistry:
+    """Loaded engines by model version, least recently used evicted first."""
+    def __init__(self, cache_size: int = ML_MODEL_CACHE_SIZE):
+        self.cache_size = cache_size
+        self.engines: "OrderedDict[str, MLSuggestionEngine]" = OrderedDict()
+        self.lock = threading.Lock()  # Serializes loads so concurrent requests don't all hit the disk
+        self.checked_at = 0.0
+
+    def get(self, version: str) -> Optional[MLSuggestionEngine]:
+        engine = self.engines.get(version)
+        if engine is not None:
+            self.engines.move_to_end(version)
+        return engine
+
+    def put(self, version: str, engine: MLSuggestionEngine):
+        self.engines[version] = engine
+        self.engines.move_to_end(version)
+        while len(self.engines) > self.cache_size:
+            self.engines.popitem(last=False)
+
 class MLSuggestionService:
     def __init__(self):
         self.engine = MLSuggestionEngine()
         self.current_version = None
+        self.registry = ModelRegistry()
         self.model_dir = "ml_models"  # Directory to store model files
         os.makedirs(self.model_dir, exist_ok=True)
 
@@ -39,11 +70,12 @@ class MLSuggestionService:
             X = X.reshape(-1, 1)
         if X.size == 0 or X.shape[1] == 0:
             raise ValueError("Feature array must be non-empty and 2D.")
-        self.engine.train(X, y)
+        engine = MLSuggestionEngine()
+        engine.train(X, y)
         # Save model to disk
         version = f"v{datetime.utcnow().isoformat()}"
         model_path = self._model_path(version)
-        joblib.dump(self.engine.model, model_path)
+        joblib.dump({"model": engine.model, "label_encoder": engine.label_encoder}, model_path)
         # Evaluate
         if len(X) > 10:
             from sklearn.model_selection import train_test_split
@@ -52,8 +84,8 @@ class MLSuggestionService:
             X_train, y_train = X, y
             X_test, y_test = X, y
         # Predict using label encoder to ensure type consistency
-        y_pred = self.engine.model.predict(X_test)
-        y_pred = self.engine.label_encoder.inverse_transform(y_pred)
+        y_pred = engine.model.predict(X_test)
+        y_pred = engine.label_encoder.inverse_transform(y_pred)
         acc = accuracy_score(y_test, y_pred)
         prec = precision_score(y_test, y_pred, average='weighted', zero_division=0)
         rec = recall_score(y_test, y_pred, average='weighted', zero_division=0)
@@ -71,19 +103,56 @@ class MLSuggestionService:
         db.query(MLModelVersion).update({MLModelVersion.is_active: False})
         db.add(model_version)
         db.commit()
-        self.current_version = version
+        with self.registry.lock:
+            self.registry.put(version, engine)
+            self._activate(version, engine)
         return version
 
     def load_active_model(self, db: Session):
         active = db.query(MLModelVersion).filter_by(is_active=True).order_by(MLModelVersion.trained_at.desc()).first()
         if active:
-            model_path = self._model_path(active.version)
-            if os.path.exists(model_path):
-                self.engine.model = joblib.load(model_path)
-                self.current_version = active.version
-                return True
+            return self._load_version(active.version)
         return False
 
+    def _load_version(self, version: str) -> bool:
+        """Activates a version, loading it from disk only when it is not in the registry."""
+        with self.registry.lock:
+            engine = self.registry.get(version)
+            if engine is None:
+                model_path = self._model_path(version)
+                if not os.path.exists(model_path):
+                    return False
+                engine = self._load_engine(model_path)
+                self.registry.put(version, engine)
+            self._activate(version, engine)
+            return True
+
+    def _load_engine(self, model_path: str) -> MLSuggestionEngine:
+        saved = joblib.load(model_path)
+        engine = MLSuggestionEngine()
+        if isinstance(saved, dict):
+            engine.model, engine.label_encoder = saved["model"], saved["label_encoder"]
+        else:
+            # Older model files hold only the classifier
+            engine.model, engine.label_encoder = saved, self.engine.label_encoder
+        engine.is_trained = engine.label_encoder is not None
+        return engine
+
+    def _activate(self, version: str, engine: MLSuggestionEngine):
+        # Swapping the reference is atomic: in-flight predictions finish on the engine they started with
+        self.engine = engine
+        self.current_version = version
+        self.registry.checked_at = time.monotonic()
+
+    def _refresh_active_model(self, db: Optional[Session]):
+        """Follows active version changes made elsewhere, looking up at most once per interval."""
+        if db is None or time.monotonic() - self.registry.checked_at < ML_MODEL_CHECK_INTERVAL:
+            return
+        self.registry.checked_at = time.monotonic()
+        active = db.query(MLModelVersion.version).filter_by(is_active=True).order_by(MLModelVersion.trained_at.desc()).first()
+        if active and active.version != self.current_version:
+            self._load_version(active.version)
+
     def set_active_version(self, version: str, db: Session):
         # Set the specified version as active, deactivate others
         db.query(MLModelVersion).update({MLModelVersion.is_active: False})
@@ -93,10 +162,13 @@ class MLSuggestionService:
 
     def predict(self, features: np.ndarray, db: Session = None) -> Dict[str, Any]:
         # Always use the active model
-        if db is not None:
-            self.load_active_model(db)
+        self._refresh_active_model(db)
         return self.engine.predict(features)
 
+    def predict_many(self, features_batch: np.ndarray, db: Session = None) -> List[Dict[str, Any]]:
+        self._refresh_active_model(db)
+        return self.engine.predict_many(features_batch)
+
     def retrain_from_feedback(self, db: Session):
         feedbacks = db.query(Feedback).all()
         if not feedbacks:
@@ -24,20 +24,28 @@ class MLSuggestionEngine:
         self.is_trained = True
 
     def predict(self, features: np.ndarray) -> Dict[str, Any]:
+        return self.predict_many([features])[0]
+
+    def predict_many(self, features_batch: np.ndarray) -> List[Dict[str, Any]]:
+        """Predicts a batch of feature vectors with a single predict_proba call."""
         if not self.is_trained:
-            return {"suggestion": None, "confidence": 0.0, "fallback": True, "explanation": "ML model not trained"}
-        proba = self.model.predict_proba([features])[0]
-        idx = np.argmax(proba)
-        confidence = proba[idx]
-        label = self.label_encoder.inverse_transform([idx])[0]
+            return [{"suggestion": None, "confidence": 0.0, "fallback": True, "explanation": "ML model not trained"}
+                    for _ in features_batch]
+        proba = self.model.predict_proba(np.asarray(features_batch))
+        idx = np.argmax(proba, axis=1)
+        confidences = proba[np.arange(len(idx)), idx]
+        labels = self.label_encoder.inverse_transform(idx)
         explanation = self._feature_importance()
-        fallback = confidence < self.confidence_threshold
-        return {
-            "suggestion": label,
-            "confidence": float(confidence),
-            "fallback": fallback,
-            "explanation": explanation if not fallback else "Low confidence, fallback to rules-based"
-        }
+        results = []
+        for label, confidence in zip(labels, confidences):
+            fallback = confidence < self.confidence_threshold
+            results.append({
+                "suggestion": label,
+                "confidence": float(confidence),
+                "fallback": fallback,
+                "explanation": explanation if not fallback else "Low confidence, fallback to rules-based"
+            })
+        return results
 
     def _feature_importance(self) -> Dict[str, float]:
         if self.model is None:
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Boolean, JSON, Float
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Enum, Boolean, JSON, Float, Index
 from sqlalchemy.orm import relationship, declarative_base
 import enum
 import datetime
@@ -115,8 +115,25 @@ class LineageEdge(Base):
     target_id = Column(String, nullable=False)
     relationship_type = Column(String, default="data_flow")  # e.g., 'data_flow', 'reference', etc.
 
+    # Join keys of the recursive lineage/impact traversals (both directions)
+    __table_args__ = (
+        Index("ix_lineage_edges_source", "source_type", "source_id"),
+        Index("ix_lineage_edges_target", "target_type", "target_id"),
+    )
+
 class NotificationPreference(Base):
     __tablename__ = "notification_preferences"
     id = Column(Integer, primary_key=True, index=True)
     user_email = Column(String, nullable=False, unique=True)
     preferences = Column(JSON, nullable=False)
+
+class LabelUsageSummary(Base):
+    """Per-label proposal aggregates, maintained by analytics_summary on proposal/audit writes."""
+    __tablename__ = "label_usage_summary"
+    label_id = Column(Integer, primary_key=True)  # no FK: rows are removed after their label
+    proposal_count = Column(Integer, nullable=False, default=0)
+    approved_count = Column(Integer, nullable=False, default=0)
+    pending_count = Column(Integer, nullable=False, default=0)
+    last_used = Column(DateTime, nullable=True)
+    last_audit_at = Column(DateTime, nullable=True)
+    refreshed_at = Column(DateTime, default=datetime.datetime.utcnow)
@@ -1,5 +1,5 @@
 from typing import Any, Dict
-from .websocket_manager import manager
+from .websocket_manager import event_topics, manager
 
 async def notify_realtime_event(event: Dict[str, Any]):
-    await manager.broadcast(event)
\ No newline at end of file
+    await manager.broadcast(event, topics=event_topics(event))
@@ -1,19 +1,131 @@
-from typing import List
+"""
+WebSocket fan-out for real-time label events.
+Each message is serialized once and queued per client; a dedicated sender task drains each
+bounded queue so a slow or dead client never delays the others.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import Any, Dict, Iterable, Optional, Set
+
 from fastapi import WebSocket
 
+logger = logging.getLogger(__name__)
+
+# Messages buffered per client before the lag policy applies
+WS_CLIENT_QUEUE_SIZE = int(os.getenv("WS_CLIENT_QUEUE_SIZE", "256"))
+# "drop_oldest" discards the client's oldest queued message, "disconnect" closes the client
+WS_LAG_POLICY = os.getenv("WS_LAG_POLICY", "drop_oldest")
+# Close code sent to clients disconnected for lagging (1013: try again later)
+WS_LAG_CLOSE_CODE = 1013
+
+# Subscribing to this topic receives every message
+ALL_TOPICS = "*"
+
+
+class ClientConnection:
+    """A connected client: its topic subscriptions, send queue and sender task."""
+
+    def __init__(self, websocket: WebSocket, topics: Set[str], queue_size: int):
+        self.websocket = websocket
+        self.topics = topics
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.sender: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+    def wants(self, topics: Set[str]) -> bool:
+        return ALL_TOPICS in self.topics or not topics or not self.topics.isdisjoint(topics)
+
+
 class WebSocketManager:
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
+    def __init__(self, queue_size: int = WS_CLIENT_QUEUE_SIZE, lag_policy: str = WS_LAG_POLICY):
+        self.queue_size = queue_size
+        self.lag_policy = lag_policy
+        self.connections: Dict[WebSocket, ClientConnection] = {}
 
-    async def connect(self, websocket: WebSocket):
+    @property
+    def active_connections(self):
+        return list(self.connections)
+
+    async def connect(self, websocket: WebSocket, topics: Optional[Iterable[str]] = None):
+        """Accepts the socket and starts its sender; no topics subscribes to everything."""
         await websocket.accept()
-        self.active_connections.append(websocket)
+        client = ClientConnection(websocket, set(topics or [ALL_TOPICS]), self.queue_size)
+        client.sender = asyncio.create_task(self._send_loop(client))
+        self.connections[websocket] = client
+        return client
 
     def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+        client = self.connections.pop(websocket, None)
+        if client is not None and client.sender is not None and client.sender is not asyncio.current_task():
+            client.sender.cancel()
+
+    def subscribe(self, websocket: WebSocket, topics: Iterable[str]):
+        client = self.connections.get(websocket)
+        if client is not None:
+            client.topics.discard(ALL_TOPICS)
+            client.topics.update(topics)
+
+    def unsubscribe(self, websocket: WebSocket, topics: Iterable[str]):
+        client = self.connections.get(websocket)
+        if client is not None:
+            client.topics.difference_update(topics)
+
+    async def broadcast(self, message: Dict[str, Any], topics: Optional[Iterable[str]] = None):
+        """Queues the message for every client subscribed to any of the topics (all clients when none).
+
+        Never waits on a client: a full queue is handled by the lag policy.
+        """
+        topics = set(topics or ())
+        payload = json.dumps(message, default=str)
+        for client in list(self.connections.values()):
+            if client.wants(topics):
+                self._enqueue(client, payload)
+        return payload
+
+    def _enqueue(self, client: ClientConnection, payload: str):
+        try:
+            client.queue.put_nowait(payload)
+            return
+        except asyncio.QueueFull:
+            pass
+        client.dropped += 1
+        if self.lag_policy == "disconnect":
+            logger.warning(f"Disconnecting lagging websocket client after {client.queue.maxsize} queued messages")
+            self.disconnect(client.websocket)
+            asyncio.create_task(self._close(client.websocket, WS_LAG_CLOSE_CODE))
+            return
+        client.queue.get_nowait()
+        client.queue.put_nowait(payload)
+
+    async def _send_loop(self, client: ClientConnection):
+        try:
+            while True:
+                payload = await client.queue.get()
+                await client.websocket.send_text(payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.info(f"Websocket send failed, dropping client: {str(e)}")
+            self.disconnect(client.websocket)
+
+    async def _close(self, websocket: WebSocket, code: int):
+        try:
+            await websocket.close(code=code)
+        except Exception as e:
+            logger.debug(f"Error closing websocket: {str(e)}")
+
+
+def event_topics(event: Dict[str, Any]) -> Set[str]:
+    """Topics a label event is published under: its event name and the labeled object."""
+    topics = set()
+    if event.get("event"):
+        topics.add(event["event"])
+    if event.get("object_type") and event.get("object_id") is not None:
+        topics.add(f"{event['object_type']}:{event['object_id']}")
+    return topics
 
-    async def broadcast(self, message: dict):
-        for connection in self.active_connections:
-            await connection.send_json(message)
 
-manager = WebSocketManager()
\ No newline at end of file
+manager = WebSocketManager()
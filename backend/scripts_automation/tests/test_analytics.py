@@ -7,3 +7,60 @@ def test_analytics_exports_exist():
     assert hasattr(analytics, "get_labeling_trends")
     assert hasattr(analytics, "get_user_analytics")
     assert hasattr(analytics, "export_dashboard_data")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sensitivity_labeling import analytics_summary, crud, models, schemas
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite:///:memory:")
+    models.Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+
+
+def seed(db):
+    labels = [crud.create_label(db, schemas.SensitivityLabelCreate(name=name)) for name in ("PII", "PCI", "Unused")]
+    proposals = []
+    for label, object_id, user in [(labels[0], "t1", "a"), (labels[0], "t2", "b"), (labels[1], "t1", "a")]:
+        proposals.append(crud.create_proposal(db, schemas.LabelProposalCreate(
+            label_id=label.id, object_type="table", object_id=object_id, proposed_by=user
+        )))
+    crud.update_proposal_status(db, proposals[0].id, models.LabelStatus.APPROVED)
+    crud.create_review(db, schemas.LabelReviewCreate(
+        proposal_id=proposals[1].id, reviewer="a", review_status=schemas.LabelStatus.PROPOSED
+    ))
+    return labels, proposals
+
+
+def test_aggregate_analytics(db):
+    labels, proposals = seed(db)
+    assert analytics.get_labeling_coverage(db) == {"total_objects": 2, "labeled_objects": 1, "coverage_percent": 50.0}
+    usage = {row["label_name"]: row["count"] for row in analytics.get_label_usage_stats(db)}
+    assert usage == {"PII": 2, "PCI": 1, "Unused": 0}
+    assert {p["id"] for p in analytics.get_pending_reviews(db)} == {proposals[1].id, proposals[2].id}
+    assert analytics.get_user_analytics(db) == [
+        {"user": "a", "proposals": 2, "reviews": 1, "approvals": 1},
+        {"user": "b", "proposals": 1, "reviews": 0, "approvals": 0},
+    ]
+    dashboard = analytics.get_dashboard(db)
+    assert dashboard["trends"][0]["count"] == 3 and len(dashboard["label_usage"]) == 3
+
+
+def test_summary_is_refreshed_incrementally(db, monkeypatch):
+    monkeypatch.setattr(analytics_summary, "ANALYTICS_SUMMARY_ENABLED", True)
+    labels, proposals = seed(db)
+    summary = {row.label_id: row for row in db.query(models.LabelUsageSummary)}
+    assert (summary[labels[0].id].proposal_count, summary[labels[0].id].approved_count, summary[labels[0].id].pending_count) == (2, 1, 1)
+    assert summary[labels[2].id].proposal_count == 0
+
+    crud.create_audit(db, schemas.LabelAuditCreate(proposal_id=proposals[2].id, action="reviewed", performed_by="a"))
+    db.expire_all()
+    assert db.get(models.LabelUsageSummary, labels[1].id).last_audit_at is not None
+    assert [row["count"] for row in analytics.get_label_usage_stats(db)] == [2, 1, 0]
+
+    crud.delete_label(db, labels[2].id)
+    assert db.get(models.LabelUsageSummary, labels[2].id) is None
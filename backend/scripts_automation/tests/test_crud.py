@@ -90,3 +90,56 @@ def test_create_proposal_invalid_label_id(db):
         pytest.skip("SQLite in-memory does not enforce foreign keys.")
     with pytest.raises(IntegrityError):
         crud.create_proposal(db, proposal_in)
+
+def test_recursive_lineage_and_impact(db):
+    # t1 -> t2 -> t3 -> t1 (cycle), t2 -> t4, t0 -> t1
+    for source, target in [("t1", "t2"), ("t2", "t3"), ("t3", "t1"), ("t2", "t4"), ("t0", "t1")]:
+        crud.add_lineage_edge(db, "table", source, "table", target)
+
+    impact = crud.get_impact_recursive(db, "table", "t1")
+    assert [(e.source_id, e.target_id, e.depth) for e in impact] == [
+        ("t1", "t2", 1), ("t2", "t3", 2), ("t2", "t4", 2), ("t3", "t1", 3)
+    ]
+    assert len(crud.get_impact_recursive(db, "table", "t1", max_depth=2)) == 3
+    page = crud.get_impact_recursive(db, "table", "t1", limit=2, offset=2)
+    assert [(e.source_id, e.target_id) for e in page] == [("t2", "t4"), ("t3", "t1")]
+
+    upstream = crud.get_lineage_recursive(db, "table", "t4", direction="upstream")
+    assert {(e.source_id, e.target_id) for e in upstream} == {("t2", "t4"), ("t1", "t2"), ("t3", "t1"), ("t0", "t1"), ("t2", "t3")}
+    both = crud.get_lineage_recursive(db, "table", "t0", direction="both")
+    assert len(both) == 5 and both[0].depth == 1
+
+    # The cycle is walked once rather than replayed up to the depth bound
+    from sqlalchemy import func, select
+    reach = crud._lineage_reach_cte("table", "t1", "downstream", crud.LINEAGE_MAX_DEPTH)
+    assert db.execute(select(func.count()).select_from(reach)).scalar() == 4
+    # Ids holding LIKE wildcards or separators of other ids don't cut the walk short
+    for source, target in [("a_1", "a%1"), ("a%1", "ax1"), ("ax1", "a_1x")]:
+        crud.add_lineage_edge(db, "table", source, "table", target)
+    assert len(crud.get_impact_recursive(db, "table", "a_1")) == 3
+
+def test_streaming_audit_export(db):
+    import csv
+    import json
+    label = crud.create_label(db, schemas.SensitivityLabelCreate(name="Export Label", description="desc"))
+    proposal = crud.create_proposal(db, schemas.LabelProposalCreate(
+        label_id=label.id, object_type="column", object_id="col_export", proposed_by="auditor@example.com"
+    ))
+    audits = [
+        crud.create_audit(db, schemas.LabelAuditCreate(
+            proposal_id=proposal.id, action="exported", performed_by="auditor@example.com", note=f"n{i}"
+        ))
+        for i in range(5)
+    ]
+
+    chunks = list(crud.iter_audit_export(db, format="csv", batch_size=2, action="exported"))
+    assert len(chunks) == 4  # header + 3 batches (keyset pages of 2, 2, 1)
+    rows = list(csv.reader("".join(chunks).splitlines()))
+    assert rows[0] == crud.AUDIT_EXPORT_COLUMNS
+    assert [int(r[0]) for r in rows[1:]] == [a.id for a in reversed(audits)]
+    assert {(r[4], r[5]) for r in rows[1:]} == {("column", "col_export")}
+
+    lines = "".join(crud.iter_audit_export(db, format="ndjson", batch_size=3, entity_id=None, entity_type="column")).splitlines()
+    assert [json.loads(line)["details"] for line in lines] == [f"n{i}" for i in reversed(range(5))]
+    assert len(json.loads("".join(crud.iter_audit_export(db, format="json", batch_size=2, action="exported")))) == 5
+    assert list(crud.iter_audit_export(db, format="json", action="missing")) == ["[", "]"]
@@ -60,3 +60,40 @@ def test_version_switching():
     db.query.return_value.filter_by.return_value.order_by.return_value.first.side_effect = fake_first
     service.set_active_version(v1, db)
     assert service.active_version == v1
+
+def test_registry_caches_versions_and_predict_many(tmp_path, monkeypatch):
+    service = ml_service.MLSuggestionService()
+    service.model_dir = str(tmp_path)
+    db = MagicMock()
+    X = [[1, 2], [2, 3], [8, 9], [9, 8]]
+    y = ["confidential", "confidential", "public", "public"]
+    v1 = service.train(X, y, db)
+    engine_v1 = service.engine
+    service.train(X, y, db)
+
+    loads = []
+    monkeypatch.setattr(ml_service.joblib, "load", lambda path: loads.append(path))
+    db.query.return_value.filter_by.return_value.order_by.return_value.first.return_value = MagicMock(version=v1)
+    assert service.set_active_version(v1, db)
+    assert service.engine is engine_v1 and loads == []
+
+    # Predictions only look the active version up once per interval
+    db.query.reset_mock()
+    for _ in range(5):
+        service.predict([1, 2], db)
+    assert db.query.call_count == 0
+
+    batch = service.predict_many([[1, 2], [9, 8]], db)
+    assert [p["suggestion"] for p in batch] == [service.predict(f)["suggestion"] for f in ([1, 2], [9, 8])]
+
+def test_model_files_load_in_a_fresh_service(tmp_path):
+    trained = ml_service.MLSuggestionService()
+    trained.model_dir = str(tmp_path)
+    version = trained.train([[1, 2], [2, 3]], ["confidential", "public"], MagicMock())
+
+    fresh = ml_service.MLSuggestionService()
+    fresh.model_dir = str(tmp_path)
+    db = MagicMock()
+    db.query.return_value.filter_by.return_value.order_by.return_value.first.return_value = MagicMock(version=version)
+    assert fresh.predict([1, 2], db)["suggestion"] in ["confidential", "public"]
+    assert fresh.active_version == version
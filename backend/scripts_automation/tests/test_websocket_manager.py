@@ -0,0 +1,81 @@
+import asyncio
+import json
+
+from sensitivity_labeling.websocket_manager import WebSocketManager, event_topics
+
+
+class FakeWebSocket:
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.sent = []
+        self.closed_with = None
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, payload):
+        if self.fail:
+            raise RuntimeError("connection reset")
+        await asyncio.sleep(self.delay)
+        self.sent.append(json.loads(payload))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+def test_broadcast_does_not_wait_on_slow_or_dead_clients():
+    async def scenario():
+        manager = WebSocketManager(queue_size=10)
+        fast, slow, dead = FakeWebSocket(), FakeWebSocket(delay=10), FakeWebSocket(fail=True)
+        for ws in (fast, slow, dead):
+            await manager.connect(ws)
+        await asyncio.wait_for(manager.broadcast({"event": "proposal_approved"}), timeout=0.1)
+        await asyncio.sleep(0.01)
+        assert fast.sent == [{"event": "proposal_approved"}]
+        assert dead not in manager.connections and slow in manager.connections
+        manager.disconnect(slow)
+    asyncio.run(scenario())
+
+
+def test_lag_policies():
+    async def scenario(policy):
+        manager = WebSocketManager(queue_size=2, lag_policy=policy)
+        ws = FakeWebSocket(delay=10)
+        client = await manager.connect(ws)
+        for i in range(4):
+            await manager.broadcast({"n": i})
+        await asyncio.sleep(0)  # sender picks up the oldest surviving message and blocks on it
+        queued = [json.loads(client.queue.get_nowait())["n"] for _ in range(client.queue.qsize())]
+        manager.disconnect(ws)
+        return queued, ws, manager, client
+
+    queued, ws, manager, client = asyncio.run(scenario("drop_oldest"))
+    assert queued == [3] and client.dropped == 2 and ws.sent == []
+
+    queued, ws, manager, client = asyncio.run(scenario("disconnect"))
+    assert ws not in manager.connections and ws.closed_with == 1013
+
+
+def test_topic_subscriptions():
+    async def scenario():
+        manager = WebSocketManager()
+        everything, tables, approvals = FakeWebSocket(), FakeWebSocket(), FakeWebSocket()
+        await manager.connect(everything)
+        await manager.connect(tables, ["table:7"])
+        await manager.connect(approvals)
+        manager.subscribe(approvals, ["proposal_approved"])
+
+        approved = {"event": "proposal_approved", "object_type": "table", "object_id": 9}
+        rejected = {"event": "proposal_rejected", "object_type": "table", "object_id": 7}
+        for event in (approved, rejected):
+            await manager.broadcast(event, topics=event_topics(event))
+        await asyncio.sleep(0.01)
+        for ws in (everything, tables, approvals):
+            manager.disconnect(ws)
+        return everything.sent, tables.sent, approvals.sent
+
+    everything, tables, approvals = asyncio.run(scenario())
+    assert len(everything) == 2
+    assert [e["event"] for e in tables] == ["proposal_rejected"]
+    assert [e["event"] for e in approvals] == ["proposal_approved"]